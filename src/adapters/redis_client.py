@@ -2,24 +2,96 @@
 This module defines a Redis client abstraction to handle connection management and common operations.
 
 Classes:
-    RedisClient: A class to manage the Redis connection and handle exceptions.
+    RedisClient: A class to manage the Redis connections and handle exceptions.
+
+Functions:
+    parse_address(address: str) -> Tuple[str, int]: Splits a `host:port` address.
 """
 
+import itertools
+import threading
+import time
+from typing import Callable, List, Optional, Sequence, Tuple, TypeVar
+
 import redis
 
+from src.adapters.resilience import CircuitBreaker, RetryPolicy
 from src.utils.exceptions import RedisConnectionError
 
+READ_STRATEGIES = ("round-robin", "least-latency")
+
+# Errors that say nothing reached or came back from Redis, as opposed to a reply
+# such as WRONGTYPE. Only these are retried and counted by the circuit breaker.
+TRANSIENT_ERRORS = (redis.ConnectionError, redis.TimeoutError)
+
+T = TypeVar("T")
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """
+    Split a `host:port` address, defaulting the port to 6379.
+
+    Args:
+        address (str): The address to split.
+
+    Returns:
+        Tuple[str, int]: The host and the port.
+
+    Raises:
+        ValueError: If the port is not a valid number.
+    """
+    host, separator, port = address.rpartition(":")
+    if not separator:
+        return address, 6379
+    if not host or not port.isdigit():
+        raise ValueError(f"Invalid Redis address: {address!r}")
+    return host, int(port)
+
 
 class RedisClient:
     """
-    A class to manage the Redis connection and handle exceptions.
+    A class to manage the Redis connections and handle exceptions.
+
+    Writes always go to the primary. When replicas are configured, read-only
+    operations are spread over them, either in turn or by lowest measured PING
+    latency, and fall back to the primary when no replica is reachable.
+
+    Operations run through execute() are bounded by the socket timeouts, retried
+    with backoff when idempotent, and guarded by a circuit breaker that fails them
+    fast while Redis keeps timing out or refusing connections.
+
+    One client may be shared by any number of threads. Each server is reached
+    through a blocking connection pool: a command or pipeline checks a connection
+    out for its own use and returns it afterwards, and once `max_connections` are
+    in use further callers wait for one to be returned, up to the command timeout.
+    Pipelines and transactions must not be shared between threads.
 
     Methods:
-        connect() -> None: Connects to the Redis server.
-        get_client() -> redis.Redis: Returns the Redis client instance.
+        connect() -> None: Connects to the Redis primary and replicas.
+        get_client() -> redis.Redis: Returns the primary client instance.
+        get_read_client() -> redis.Redis: Returns the client to send a read to.
+        record_write() -> None: Notes that a write just reached the primary.
+        execute(operation: Callable[[redis.Redis], T], idempotent: bool, read: bool) -> T:
+            Runs an operation under the retry policy and the circuit breaker.
+        max_block(block: Optional[float]) -> Optional[float]:
+            Caps a blocking read so it ends before the command timeout.
     """
 
-    def __init__(self, host="localhost", port=6379, db=0):
+    def __init__(
+        self,
+        host="localhost",
+        port=6379,
+        db=0,
+        replicas: Optional[Sequence[Tuple[str, int]]] = None,
+        read_strategy: str = "round-robin",
+        read_your_writes: float = 0.0,
+        latency_interval: float = 10.0,
+        connect_timeout: Optional[float] = 2.0,
+        command_timeout: Optional[float] = 5.0,
+        retry_policy: Optional[RetryPolicy] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        max_connections: int = 50,
+    ):
         """
         Initializes the Redis client.
 
@@ -27,29 +99,75 @@ class RedisClient:
             host (str): The Redis server host.
             port (int): The Redis server port.
             db (int): The Redis database number.
+            replicas (Optional[Sequence[Tuple[str, int]]]): The (host, port) of each read replica.
+            read_strategy (str): How a replica is picked, "round-robin" or "least-latency".
+            read_your_writes (float): Seconds during which reads stay on the primary
+                after a write, 0 to disable.
+            latency_interval (float): Seconds between replica latency measurements
+                for the "least-latency" strategy.
+            connect_timeout (Optional[float]): Seconds allowed to open a connection,
+                None to wait indefinitely.
+            command_timeout (Optional[float]): Seconds allowed for a reply,
+                None to wait indefinitely.
+            retry_policy (Optional[RetryPolicy]): How idempotent operations are retried.
+            breaker (Optional[CircuitBreaker]): The breaker guarding every operation;
+                register listeners on its `on_state_change` to observe it.
+            max_connections (int): The size of the connection pool of each server.
+
+        Raises:
+            ValueError: If the read strategy is unknown or `max_connections` is below 1.
         """
+        if read_strategy not in READ_STRATEGIES:
+            raise ValueError(f"Unknown read strategy: {read_strategy!r}")
+        if max_connections < 1:
+            raise ValueError("max_connections must be at least 1")
         self.host = host
         self.port = port
         self.db = db
+        self.replicas: List[Tuple[str, int]] = list(replicas or [])
+        self.read_strategy: str = read_strategy
+        self.read_your_writes: float = read_your_writes
+        self.latency_interval: float = latency_interval
         self.client = None
+        self.replica_clients: List[redis.Redis] = []
+        self._latencies: List[float] = []
+        self._latencies_measured_at: float = 0.0
+        self._measuring = threading.Lock()
+        self._turn = itertools.count()
+        self._last_write: float = float("-inf")
+        self.connect_timeout: Optional[float] = connect_timeout
+        self.command_timeout: Optional[float] = command_timeout
+        self.retry_policy: RetryPolicy = retry_policy or RetryPolicy()
+        self.breaker: CircuitBreaker = breaker or CircuitBreaker()
+        self.max_connections: int = max_connections
 
     def connect(self) -> None:
         """
-        Connects to the Redis server.
+        Connects to the Redis primary and to every reachable replica.
 
         Raises:
-            RedisConnectionError: If there is an error connecting to Redis.
+            RedisConnectionError: If there is an error connecting to the primary.
         """
         try:
-            self.client = redis.Redis(host=self.host, port=self.port, db=self.db)
+            self.client = self._open(self.host, self.port)
             # Test the connection
             self.client.ping()
         except redis.RedisError as e:
             raise RedisConnectionError(f"Failed to connect to Redis: {e}")
+        self.replica_clients = []
+        for host, port in self.replicas:
+            replica = self._open(host, port)
+            try:
+                replica.ping()
+            except redis.RedisError:
+                # An unreachable replica only costs read capacity; the primary serves.
+                continue
+            self.replica_clients.append(replica)
+        self._measure_latencies()
 
     def get_client(self) -> redis.Redis:
         """
-        Returns the Redis client instance.
+        Returns the primary client instance, which every write must use.
 
         Returns:
             redis.Redis: The Redis client instance.
@@ -62,3 +180,130 @@ class RedisClient:
                 "Redis client is not connected. Call connect() first."
             )
         return self.client
+
+    def get_read_client(self) -> redis.Redis:
+        """
+        Returns the client a read-only operation should use.
+
+        Returns:
+            redis.Redis: A replica client, or the primary when there is no replica
+                or a write happened within the read-your-writes window.
+
+        Raises:
+            RedisConnectionError: If the client is not connected.
+        """
+        primary = self.get_client()
+        if not self.replica_clients:
+            return primary
+        if time.monotonic() - self._last_write < self.read_your_writes:
+            return primary
+        if self.read_strategy == "least-latency":
+            if (
+                time.monotonic() - self._latencies_measured_at >= self.latency_interval
+                and self._measuring.acquire(blocking=False)
+            ):
+                # One thread measures while the others use the previous latencies.
+                try:
+                    self._measure_latencies()
+                finally:
+                    self._measuring.release()
+            index = min(
+                range(len(self.replica_clients)), key=self._latencies.__getitem__
+            )
+            return self.replica_clients[index]
+        return self.replica_clients[next(self._turn) % len(self.replica_clients)]
+
+    def record_write(self) -> None:
+        """
+        Notes that a write just reached the primary, opening the read-your-writes window.
+        """
+        self._last_write = time.monotonic()
+
+    def execute(
+        self,
+        operation: Callable[[redis.Redis], T],
+        idempotent: bool = False,
+        read: bool = False,
+    ) -> T:
+        """
+        Run an operation under the retry policy and the circuit breaker.
+
+        Only connection errors and timeouts are retried, and only for idempotent
+        operations: a write that timed out may still have been applied, so running
+        it again could apply it twice. Retried reads may land on another replica.
+
+        Args:
+            operation (Callable[[redis.Redis], T]): Performs the commands on the client it is given.
+            idempotent (bool): Whether running the operation twice is harmless.
+            read (bool): Whether the operation only reads, so a replica may serve it.
+
+        Returns:
+            T: The result of the operation.
+
+        Raises:
+            CircuitOpenError: If the breaker rejects the call.
+            redis.RedisError: If the operation fails and may not be retried further.
+        """
+        delays = iter(self.retry_policy.delays() if idempotent else [])
+        while True:
+            client = self.get_read_client() if read else self.get_client()
+            self.breaker.before_call()
+            try:
+                result = operation(client)
+            except TRANSIENT_ERRORS:
+                self.breaker.record_failure()
+                delay = next(delays, None)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            except BaseException:
+                # Redis answered, even if with an error, so it is healthy.
+                self.breaker.record_success()
+                raise
+            self.breaker.record_success()
+            return result
+
+    def max_block(self, block: Optional[float]) -> Optional[float]:
+        """
+        Cap the wait of a blocking read so it returns before the command timeout.
+
+        Args:
+            block (Optional[float]): The requested wait in seconds.
+
+        Returns:
+            Optional[float]: The wait to send; callers polling in a loop simply wait again.
+        """
+        if not block or self.command_timeout is None:
+            return block
+        return min(block, self.command_timeout / 2)
+
+    def _open(self, host: str, port: int) -> redis.Redis:
+        """
+        Create a pooled client of one server with the configured timeouts.
+        """
+        pool = redis.BlockingConnectionPool(
+            host=host,
+            port=port,
+            db=self.db,
+            socket_connect_timeout=self.connect_timeout,
+            socket_timeout=self.command_timeout,
+            max_connections=self.max_connections,
+            timeout=self.command_timeout,
+        )
+        return redis.Redis(connection_pool=pool)
+
+    def _measure_latencies(self) -> None:
+        """
+        Time a PING to each replica; an unreachable replica sorts last.
+        """
+        latencies = []
+        for replica in self.replica_clients:
+            started = time.perf_counter()
+            try:
+                replica.ping()
+                latencies.append(time.perf_counter() - started)
+            except redis.RedisError:
+                latencies.append(float("inf"))
+        self._latencies = latencies
+        self._latencies_measured_at = time.monotonic()
@@ -0,0 +1,194 @@
+"""
+This module defines the failure handling used by the Redis adapter.
+
+Classes:
+    CircuitBreaker: Fails calls fast after repeated failures until a trial call succeeds.
+    RetryPolicy: Bounded retries with jittered exponential backoff.
+"""
+
+import random
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from src.utils.exceptions import CircuitOpenError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker guarding calls to an unreliable dependency.
+
+    The breaker starts closed. After `failure_threshold` consecutive failures it
+    opens and rejects calls without trying them. Once `reset_timeout` seconds have
+    passed it lets a single trial call through (half-open): success closes it
+    again, failure re-opens it for another `reset_timeout`.
+
+    Listeners in `on_state_change` are called after the lock is released, so they may
+    be slow or call back into the breaker; transitions made by different threads at
+    nearly the same time may reach them out of order.
+
+    Methods:
+        before_call() -> None: Raises CircuitOpenError if the call must not be attempted.
+        record_success() -> None: Records a successful call.
+        record_failure() -> None: Records a failed call.
+        state -> str: The current state, "closed", "open" or "half-open".
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the breaker.
+            reset_timeout (float): Seconds the breaker stays open before a trial call.
+            clock (Callable[[], float]): The time source, in seconds.
+        """
+        self.failure_threshold: int = failure_threshold
+        self.reset_timeout: float = reset_timeout
+        self.clock: Callable[[], float] = clock
+        self.on_state_change: List[Callable[[str, str], None]] = []
+        self._state: str = CLOSED
+        self._failures: int = 0
+        self._opened_at: float = 0.0
+        self._trial_running: bool = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        The current state, "closed", "open" or "half-open".
+        """
+        with self._lock:
+            if self._state == OPEN and self._reset_due():
+                return HALF_OPEN
+            return self._state
+
+    def before_call(self) -> None:
+        """
+        Check that a call may be attempted now.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with a trial
+                call already in flight.
+        """
+        change = None
+        try:
+            with self._lock:
+                if self._state == CLOSED:
+                    return
+                if self._state == OPEN:
+                    if not self._reset_due():
+                        raise CircuitOpenError(
+                            "Circuit breaker is open; Redis is considered unavailable"
+                        )
+                    change = self._transition(HALF_OPEN)
+                if self._trial_running:
+                    raise CircuitOpenError(
+                        "Circuit breaker is half-open; a trial call is in flight"
+                    )
+                self._trial_running = True
+        finally:
+            self._notify(change)
+
+    def record_success(self) -> None:
+        """
+        Record a successful call, closing the breaker.
+        """
+        change = None
+        with self._lock:
+            self._failures = 0
+            self._trial_running = False
+            if self._state != CLOSED:
+                change = self._transition(CLOSED)
+        self._notify(change)
+
+    def record_failure(self) -> None:
+        """
+        Record a failed call, opening the breaker past the threshold.
+        """
+        change = None
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = self.clock()
+                change = self._transition(OPEN)
+        self._notify(change)
+
+    def _reset_due(self) -> bool:
+        """
+        Whether the open breaker has waited long enough for a trial call.
+        """
+        return self.clock() - self._opened_at >= self.reset_timeout
+
+    def _transition(self, state: str) -> Tuple[str, str]:
+        """
+        Move to a new state; the caller holds the lock and notifies the listeners.
+        """
+        previous, self._state = self._state, state
+        return previous, state
+
+    def _notify(self, change: Optional[Tuple[str, str]]) -> None:
+        """
+        Call the listeners with a state change, if any, outside the lock.
+        """
+        if change is None:
+            return
+        for listener in list(self.on_state_change):
+            listener(*change)
+
+
+class RetryPolicy:
+    """
+    Bounded retries with "full jitter" exponential backoff.
+
+    Methods:
+        delays() -> List[float]: The sleep before each retry.
+    """
+
+    def __init__(
+        self,
+        retries: int = 3,
+        base_delay: float = 0.05,
+        max_delay: float = 1.0,
+        rng: Callable[[], float] = random.random,
+    ):
+        """
+        Initialize the retry policy.
+
+        Args:
+            retries (int): The number of retries after the first attempt.
+            base_delay (float): The backoff ceiling of the first retry, in seconds.
+            max_delay (float): The largest backoff ceiling, in seconds.
+            rng (Callable[[], float]): Returns a random float in [0, 1).
+        """
+        self.retries: int = retries
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.rng: Callable[[], float] = rng
+
+    def delays(self) -> List[float]:
+        """
+        Draw the sleep before each retry.
+
+        Each delay is uniform between zero and a ceiling that doubles per attempt,
+        so clients retrying after the same blip spread out instead of arriving together.
+
+        Returns:
+            List[float]: One delay per retry, in seconds.
+        """
+        return [
+            self.rng() * min(self.max_delay, self.base_delay * 2**attempt)
+            for attempt in range(self.retries)
+        ]
@@ -3,29 +3,80 @@ This module serves as the main entry point for the Task Management CLI applicati
 It groups the various commands defined in the commands package and sets up the CLI interface using Click.
 """
 
+from typing import Optional
+
 import click
 
 from src.cli.commands.add_task import add_task
 from src.cli.commands.config_redis import config_redis
+from src.cli.commands.delete_by_priority_range import delete_by_priority_range
+from src.cli.commands.delete_older_than import delete_older_than
 from src.cli.commands.delete_task import delete_task
+from src.cli.commands.delete_tasks import delete_tasks
+from src.cli.commands.dequeue import dequeue
+from src.cli.commands.fsck import fsck
 from src.cli.commands.get_by_priority import get_by_priority
 from src.cli.commands.get_by_priority_range import get_by_priority_range
 from src.cli.commands.list_tasks import list_tasks
+from src.cli.commands.loadgen import loadgen
+from src.cli.commands.memory_report import memory_report
+from src.cli.commands.promote import promote
+from src.cli.commands.prune import prune
+from src.cli.commands.queues import list_queues, move_tasks
+from src.cli.commands.search import search
+from src.cli.commands.serve import serve
+from src.cli.commands.snapshot import restore, snapshot
+from src.cli.commands.status import archive, reclaim, set_status
 from src.cli.commands.update_task import update_task
+from src.cli.commands.watch import watch
+from src.cli.commands.work import work
+from src.repositories.base_repository import validate_queue_name
 
 
 @click.group()
-def cli() -> None:
+@click.option(
+    "--queue",
+    envvar="LUCKYTASK_QUEUE",
+    default=None,
+    help="Queue to work on, overriding the configured one.",
+)
+@click.pass_context
+def cli(ctx: click.Context, queue: Optional[str]) -> None:
     """Task Management CLI."""
-    pass
+    if queue is not None:
+        try:
+            validate_queue_name(queue)
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--queue")
+    ctx.obj = {"queue": queue}
 
 
 cli.add_command(add_task)
 cli.add_command(list_tasks)
 cli.add_command(get_by_priority)
 cli.add_command(get_by_priority_range)
+cli.add_command(search)
 cli.add_command(delete_task)
+cli.add_command(delete_tasks)
+cli.add_command(delete_by_priority_range)
+cli.add_command(delete_older_than)
 cli.add_command(update_task)
+cli.add_command(dequeue)
+cli.add_command(set_status)
+cli.add_command(reclaim)
+cli.add_command(list_queues)
+cli.add_command(move_tasks)
+cli.add_command(watch)
+cli.add_command(prune)
+cli.add_command(promote)
+cli.add_command(work)
+cli.add_command(serve)
+cli.add_command(snapshot)
+cli.add_command(restore)
+cli.add_command(archive)
+cli.add_command(fsck)
+cli.add_command(memory_report)
+cli.add_command(loadgen)
 cli.add_command(config_redis)
 
 if __name__ == "__main__":
@@ -3,6 +3,10 @@ This module defines the command to add a new task to the task repository.
 The add_task function is used as a CLI command to create a new task with specified name, priority, and description.
 """
 
+import time
+from datetime import datetime
+from typing import Optional, Tuple
+
 import click
 
 from src.cli.context import ApplicationContext
@@ -13,7 +17,60 @@ from src.utils.emoji import TURTLE_EMOJI
 @click.argument("name")
 @click.argument("priority", type=int)
 @click.argument("description")
-def add_task(name: str, priority: int, description: str) -> None:
+@click.option(
+    "--ttl",
+    default=None,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds after which the task expires.",
+)
+@click.option(
+    "--delay",
+    default=None,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds before the task becomes eligible to run.",
+)
+@click.option(
+    "--at",
+    "run_at",
+    default=None,
+    type=click.DateTime(),
+    help="Local date and time at which the task becomes eligible to run.",
+)
+@click.option(
+    "--idempotency-key",
+    default=None,
+    help="Add nothing if a task was already submitted with this key.",
+)
+@click.option(
+    "--dedupe",
+    is_flag=True,
+    help="Use a hash of the name, priority and description as the idempotency key.",
+)
+@click.option(
+    "--dedup-ttl",
+    default=86400.0,
+    show_default=True,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds an idempotency key is remembered.",
+)
+@click.option(
+    "--tag",
+    "tags",
+    multiple=True,
+    help="A label for the task, such as team=payments; may be repeated.",
+)
+def add_task(
+    name: str,
+    priority: int,
+    description: str,
+    ttl: Optional[float],
+    delay: Optional[float],
+    run_at: Optional[datetime],
+    idempotency_key: Optional[str],
+    dedupe: bool,
+    dedup_ttl: float,
+    tags: Tuple[str, ...],
+) -> None:
     """
     Add a new task to the task repository.
 
@@ -21,7 +78,37 @@ def add_task(name: str, priority: int, description: str) -> None:
         name (str): The name of the task.
         priority (int): The priority of the task.
         description (str): The description of the task.
+        ttl (Optional[float]): The number of seconds after which the task expires.
+        delay (Optional[float]): The number of seconds before the task is eligible.
+        run_at (Optional[datetime]): The local time at which the task is eligible.
+        idempotency_key (Optional[str]): The key identifying this submission.
+        dedupe (bool): Whether to derive the idempotency key from the task content.
+        dedup_ttl (float): The number of seconds an idempotency key is remembered.
+        tags (Tuple[str, ...]): The labels of the task.
     """
+    if delay is not None and run_at is not None:
+        raise click.UsageError("--delay and --at cannot be used together.")
+    if dedupe and idempotency_key is not None:
+        raise click.UsageError(
+            "--dedupe and --idempotency-key cannot be used together."
+        )
+    eligible_at = None
+    if delay is not None:
+        eligible_at = time.time() + delay
+    elif run_at is not None:
+        eligible_at = run_at.timestamp()
     context = ApplicationContext()
-    task = context.task_service.add_task(name, priority, description)
+    service = context.task_service
+    service.dedup_ttl = dedup_ttl
+    if dedupe:
+        idempotency_key = service.content_key(name, priority, description)
+    task = service.add_task(
+        name,
+        priority,
+        description,
+        ttl=ttl,
+        run_at=eligible_at,
+        idempotency_key=idempotency_key,
+        tags=tags,
+    )
     click.echo(f"{TURTLE_EMOJI} Task added: {task}")
@@ -1,19 +1,169 @@
 """
 This module defines the command to configure Redis connection settings.
-The config_redis function is used as a CLI command to set the host, port, and database for Redis connection.
+The config_redis function is used as a CLI command to set the host, port, and database for Redis connection,
+along with the read replicas that serve read-only commands.
 """
 
+from typing import Optional, Tuple
+
 import click
 
+from src.adapters.redis_client import READ_STRATEGIES, parse_address
+from src.entities.ids import ID_FORMATS
+from src.repositories.base_repository import DEFAULT_QUEUE, validate_queue_name
 from src.utils.config_handler import save_config
 from src.utils.emoji import TURTLE_EMOJI
 
 
+def validate_replicas(ctx, param, value: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Check that every replica is given as `host:port`.
+
+    Raises:
+        click.BadParameter: If an address cannot be parsed.
+    """
+    for address in value:
+        try:
+            parse_address(address)
+        except ValueError as e:
+            raise click.BadParameter(str(e))
+    return value
+
+
+def validate_queue(ctx, param, value: str) -> str:
+    """
+    Check that the queue name is usable in keys.
+
+    Raises:
+        click.BadParameter: If the name is invalid.
+    """
+    try:
+        return validate_queue_name(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+
+
 @click.command()
 @click.option("--host", default="localhost", help="Redis server host.")
 @click.option("--port", default=6379, type=int, help="Redis server port.")
 @click.option("--db", default=0, type=int, help="Redis database number.")
-def config_redis(host: str, port: int, db: int) -> None:
+@click.option(
+    "--replica",
+    "replicas",
+    multiple=True,
+    callback=validate_replicas,
+    help="A read replica as host:port; repeat for several replicas.",
+)
+@click.option(
+    "--read-strategy",
+    type=click.Choice(READ_STRATEGIES),
+    default="round-robin",
+    show_default=True,
+    help="How a replica is picked for each read.",
+)
+@click.option(
+    "--read-your-writes",
+    type=click.FloatRange(min=0),
+    default=0.0,
+    show_default=True,
+    help="Seconds during which reads stay on the primary after a write.",
+)
+@click.option(
+    "--connect-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=2.0,
+    show_default=True,
+    help="Seconds allowed to open a connection.",
+)
+@click.option(
+    "--command-timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=5.0,
+    show_default=True,
+    help="Seconds allowed for a reply.",
+)
+@click.option(
+    "--retries",
+    type=click.IntRange(min=0),
+    default=3,
+    show_default=True,
+    help="Retries of idempotent operations after a connection error or timeout.",
+)
+@click.option(
+    "--max-connections",
+    type=click.IntRange(min=1),
+    default=50,
+    show_default=True,
+    help="Connections pooled per Redis server and shared by the threads of a process.",
+)
+@click.option(
+    "--fetch-workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Threads fetching the batches of a large multi-task read in parallel.",
+)
+@click.option(
+    "--cache-size",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Tasks read by ID cached in process memory; 0 disables the cache.",
+)
+@click.option(
+    "--cache-ttl",
+    type=click.FloatRange(min=0, min_open=True),
+    default=300.0,
+    show_default=True,
+    help="Seconds a task stays cached.",
+)
+@click.option(
+    "--cache-staleness",
+    type=click.FloatRange(min=0),
+    default=1.0,
+    show_default=True,
+    help="Seconds a cached task may lag behind changes made by other processes.",
+)
+@click.option(
+    "--id-format",
+    type=click.Choice(ID_FORMATS),
+    default="uuid4",
+    show_default=True,
+    help="Format of new task IDs; ulid and snowflake IDs are shorter and time-ordered.",
+)
+@click.option(
+    "--worker-id",
+    type=click.IntRange(min=0, max=1023),
+    default=None,
+    help="Snowflake worker ID, required with --id-format snowflake; it must differ "
+    "between all processes adding tasks at the same time.",
+)
+@click.option(
+    "--queue",
+    default=DEFAULT_QUEUE,
+    show_default=True,
+    callback=validate_queue,
+    help="Queue commands work on unless the global --queue option is given.",
+)
+def config_redis(
+    host: str,
+    port: int,
+    db: int,
+    replicas: Tuple[str, ...],
+    read_strategy: str,
+    read_your_writes: float,
+    connect_timeout: float,
+    command_timeout: float,
+    retries: int,
+    max_connections: int,
+    fetch_workers: int,
+    cache_size: int,
+    cache_ttl: float,
+    cache_staleness: float,
+    id_format: str,
+    worker_id: Optional[int],
+    queue: str,
+) -> None:
     """
     Configure Redis connection settings.
 
@@ -21,9 +171,50 @@ def config_redis(host: str, port: int, db: int) -> None:
         host (str): Redis server host.
         port (int): Redis server port.
         db (int): Redis database number.
+        replicas (Tuple[str, ...]): Read replica addresses as host:port.
+        read_strategy (str): How a replica is picked for each read.
+        read_your_writes (float): Seconds during which reads stay on the primary after a write.
+        connect_timeout (float): Seconds allowed to open a connection.
+        command_timeout (float): Seconds allowed for a reply.
+        retries (int): Retries of idempotent operations after a transient error.
+        max_connections (int): Connections pooled per Redis server.
+        fetch_workers (int): Threads fetching the batches of a multi-task read.
+        cache_size (int): Tasks cached in process memory, 0 to disable the cache.
+        cache_ttl (float): Seconds a task stays cached.
+        cache_staleness (float): Seconds a cached task may lag behind other writers.
+        id_format (str): The format of new task IDs.
+        worker_id (Optional[int]): The snowflake worker ID.
+        queue (str): The queue commands work on by default.
     """
-    config = {"host": host, "port": port, "db": db}
+    if id_format == "snowflake" and worker_id is None:
+        raise click.BadParameter(
+            "snowflake IDs need a worker ID unique to each process adding tasks",
+            param_hint="--worker-id",
+        )
+    config = {
+        "host": host,
+        "port": port,
+        "db": db,
+        "replicas": list(replicas),
+        "read_strategy": read_strategy,
+        "read_your_writes": read_your_writes,
+        "connect_timeout": connect_timeout,
+        "command_timeout": command_timeout,
+        "retries": retries,
+        "max_connections": max_connections,
+        "fetch_workers": fetch_workers,
+        "cache_size": cache_size,
+        "cache_ttl": cache_ttl,
+        "cache_staleness": cache_staleness,
+        "id_format": id_format,
+        "worker_id": worker_id,
+        "queue": queue,
+    }
     save_config(config)
     click.echo(
         f"{TURTLE_EMOJI} Redis configured with host={host}, port={port}, db={db}"
     )
+    if replicas:
+        click.echo(
+            f"{TURTLE_EMOJI} Reads go to {len(replicas)} replica(s) using {read_strategy}"
+        )
@@ -0,0 +1,29 @@
+"""
+This module defines the command to delete tasks by a range of priorities from the task repository.
+The delete_by_priority_range function is used as a CLI command to remove all tasks within the
+specified priority range in bounded batches.
+"""
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.cli.progress import deletion_progress
+from src.utils.emoji import TURTLE_EMOJI
+
+
+@click.command()
+@click.argument("min_priority", type=int)
+@click.argument("max_priority", type=int)
+def delete_by_priority_range(min_priority: int, max_priority: int) -> None:
+    """
+    Delete all tasks within a priority range from the task repository.
+
+    Args:
+        min_priority (int): The minimum priority of the tasks to delete.
+        max_priority (int): The maximum priority of the tasks to delete.
+    """
+    context = ApplicationContext()
+    deleted = context.task_service.delete_tasks_by_priority_range(
+        min_priority, max_priority, progress=deletion_progress()
+    )
+    click.echo(f"{TURTLE_EMOJI} {deleted} tasks deleted.")
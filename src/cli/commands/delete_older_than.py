@@ -0,0 +1,36 @@
+"""
+This module defines the command to delete tasks created before a point in time.
+The delete_older_than function is used as a CLI command to remove old tasks in bounded batches.
+"""
+
+import time
+from typing import Optional
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.cli.progress import deletion_progress
+from src.utils.emoji import TURTLE_EMOJI
+
+
+@click.command()
+@click.option(
+    "--before", default=None, type=float, help="Unix timestamp of the cutoff."
+)
+@click.option("--age", default=None, type=float, help="Minimum task age in seconds.")
+def delete_older_than(before: Optional[float], age: Optional[float]) -> None:
+    """
+    Delete the queued tasks created before a cutoff from the task repository.
+
+    Args:
+        before (Optional[float]): The cutoff as a Unix timestamp.
+        age (Optional[float]): The cutoff as a minimum age in seconds.
+    """
+    if (before is None) == (age is None):
+        raise click.UsageError("Specify exactly one of --before or --age.")
+    cutoff = before if before is not None else time.time() - age
+    context = ApplicationContext()
+    deleted = context.task_service.delete_tasks_older_than(
+        cutoff, progress=deletion_progress()
+    )
+    click.echo(f"{TURTLE_EMOJI} {deleted} tasks deleted.")
@@ -0,0 +1,36 @@
+"""
+This module defines the command to delete several tasks by ID from the task repository.
+The delete_tasks function is used as a CLI command to remove many tasks in batched round trips.
+"""
+
+from typing import Optional, TextIO, Tuple
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.cli.progress import deletion_progress
+from src.utils.emoji import TURTLE_EMOJI
+
+
+@click.command()
+@click.argument("task_ids", nargs=-1)
+@click.option(
+    "--from-file",
+    type=click.File("r"),
+    default=None,
+    help="Read task IDs, one per line, from a file ('-' for stdin).",
+)
+def delete_tasks(task_ids: Tuple[str, ...], from_file: Optional[TextIO]) -> None:
+    """
+    Delete several tasks by ID from the task repository.
+
+    Args:
+        task_ids (Tuple[str, ...]): The IDs of the tasks to delete.
+        from_file (Optional[TextIO]): A file with additional task IDs, one per line.
+    """
+    ids = list(task_ids)
+    if from_file is not None:
+        ids.extend(line.strip() for line in from_file if line.strip())
+    context = ApplicationContext()
+    deleted = context.task_service.delete_tasks(ids, progress=deletion_progress())
+    click.echo(f"{TURTLE_EMOJI} {deleted} of {len(ids)} tasks deleted.")
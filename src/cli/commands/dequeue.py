@@ -0,0 +1,67 @@
+"""
+This module defines the command to dequeue tasks from the task repository.
+The dequeue function is used as a CLI command to remove and print the next tasks
+chosen by a fair scheduling policy across the priority bands.
+"""
+
+from typing import Iterator
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.cli.formatters import format_option, write_tasks
+from src.entities.task import Task
+from src.services.scheduler import SCHEDULERS, make_scheduler
+from src.services.task_service import TaskService
+from src.utils.emoji import TURTLE_EMOJI
+
+
+def _dequeued(service: TaskService, count: int) -> Iterator[Task]:
+    """
+    Dequeue up to `count` tasks, stopping early when the queue is empty.
+    """
+    for _ in range(count):
+        task = service.dequeue_task()
+        if task is None:
+            return
+        yield task
+
+
+@click.command()
+@click.option(
+    "--count", default=1, type=click.IntRange(min=1), help="Tasks to dequeue."
+)
+@click.option(
+    "--scheduler",
+    "scheduler_name",
+    type=click.Choice(list(SCHEDULERS)),
+    default="strict",
+    show_default=True,
+    help="How the next priority band is chosen.",
+)
+@click.option(
+    "--stats", is_flag=True, help="Report per-band wait times on stderr afterwards."
+)
+@format_option
+def dequeue(count: int, scheduler_name: str, stats: bool, output_format: str) -> None:
+    """
+    Remove and print the next tasks of the queue.
+
+    Args:
+        count (int): The maximum number of tasks to dequeue.
+        scheduler_name (str): The scheduling policy across priority bands.
+        stats (bool): Whether to report per-band wait times.
+        output_format (str): The output format of the dequeued tasks.
+    """
+    context = ApplicationContext()
+    service = context.task_service
+    service.scheduler = make_scheduler(scheduler_name)
+    write_tasks(_dequeued(service, count), output_format)
+    if stats:
+        for priority, wait in service.wait_times().items():
+            click.echo(
+                f"{TURTLE_EMOJI} priority {priority}: {wait['count']} dequeued, "
+                f"wait mean {wait['mean']:.2f}s p95 {wait['p95']:.2f}s "
+                f"max {wait['max']:.2f}s",
+                err=True,
+            )
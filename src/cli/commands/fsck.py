@@ -0,0 +1,42 @@
+"""
+This module defines the command to check the task store for inconsistencies.
+The fsck function is used as a CLI command to compare the task hashes with the
+priority index and band queues in bounded batches, and optionally repair them.
+"""
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.utils.emoji import TURTLE_EMOJI
+
+
+@click.command()
+@click.option("--repair", is_flag=True, help="Fix the inconsistencies found.")
+@click.option("--verbose", is_flag=True, help="Print every inconsistent task ID.")
+def fsck(repair: bool, verbose: bool) -> None:
+    """
+    Check that task hashes and the priority index agree; exits with status 1 if
+    inconsistencies remain.
+
+    Args:
+        repair (bool): Whether to fix the inconsistencies found.
+        verbose (bool): Whether to print each inconsistent task ID.
+    """
+    context = ApplicationContext()
+
+    def report_issue(kind: str, task_id: str) -> None:
+        if verbose:
+            click.echo(f"{TURTLE_EMOJI} {kind}: {task_id}")
+
+    report = context.task_service.check_consistency(repair, report_issue)
+    found = report["dangling"] + report["orphaned"] + report["mismatched"]
+    click.echo(
+        f"{TURTLE_EMOJI} Checked {report['entries']} index entries and "
+        f"{report['hashes']} task hashes: {report['dangling']} dangling, "
+        f"{report['orphaned']} orphaned, {report['mismatched']} mismatched."
+    )
+    if repair:
+        click.echo(f"{TURTLE_EMOJI} {report['repaired']} tasks repaired.")
+    elif found:
+        click.echo(f"{TURTLE_EMOJI} Run with --repair to fix them.")
+        click.get_current_context().exit(1)
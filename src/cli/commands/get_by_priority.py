@@ -3,25 +3,29 @@ This module defines the command to retrieve tasks by a specific priority from th
 The get_by_priority function is used as a CLI command to display tasks with the specified priority.
 """
 
+from typing import Tuple
+
 import click
 
 from src.cli.context import ApplicationContext
+from src.cli.formatters import format_option, tag_filter_option, write_tasks
 from src.utils.emoji import TURTLE_EMOJI
 
 
 @click.command()
 @click.argument("priority", type=int)
-def get_by_priority(priority: int) -> None:
+@format_option
+@tag_filter_option
+def get_by_priority(priority: int, output_format: str, tags: Tuple[str, ...]) -> None:
     """
     Get tasks by specific priority from the task repository.
 
     Args:
         priority (int): The priority of the tasks to retrieve.
+        output_format (str): The output format of the listing.
+        tags (Tuple[str, ...]): Tags every listed task must carry.
     """
     context = ApplicationContext()
-    tasks = context.task_service.get_tasks_by_priority(priority)
-    if tasks:
-        for task in tasks:
-            click.echo(f"{TURTLE_EMOJI} {task}")
-    else:
+    tasks = context.task_service.iter_tasks(priority, priority, tags)
+    if not write_tasks(tasks, output_format) and output_format == "text":
         click.echo(f"{TURTLE_EMOJI} No tasks found with the specified priority.")
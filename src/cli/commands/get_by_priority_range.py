@@ -3,29 +3,35 @@ This module defines the command to retrieve tasks by a range of priorities from
 The get_by_priority_range function is used as a CLI command to display tasks within the specified priority range.
 """
 
+from typing import Tuple
+
 import click
 
 from src.cli.context import ApplicationContext
+from src.cli.formatters import format_option, tag_filter_option, write_tasks
 from src.utils.emoji import TURTLE_EMOJI
 
 
 @click.command()
 @click.argument("min_priority", type=int)
 @click.argument("max_priority", type=int)
-def get_by_priority_range(min_priority: int, max_priority: int) -> None:
+@format_option
+@tag_filter_option
+def get_by_priority_range(
+    min_priority: int, max_priority: int, output_format: str, tags: Tuple[str, ...]
+) -> None:
     """
     Get tasks by priority range from the task repository.
 
     Args:
         min_priority (int): The minimum priority of the tasks to retrieve.
         max_priority (int): The maximum priority of the tasks to retrieve.
+        output_format (str): The output format of the listing.
+        tags (Tuple[str, ...]): Tags every listed task must carry.
     """
     context = ApplicationContext()
-    tasks = context.task_service.get_tasks_by_priority_range(min_priority, max_priority)
-    if tasks:
-        for task in tasks:
-            click.echo(f"{TURTLE_EMOJI} {task}")
-    else:
+    tasks = context.task_service.iter_tasks(min_priority, max_priority, tags)
+    if not write_tasks(tasks, output_format) and output_format == "text":
         click.echo(
             f"{TURTLE_EMOJI} No tasks found within the specified priority range."
         )
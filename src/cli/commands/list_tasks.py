@@ -3,18 +3,43 @@ This module defines the command to list all tasks from the task repository.
 The list_tasks function is used as a CLI command to display all tasks stored in the repository.
 """
 
+from typing import Tuple
+
 import click
 
 from src.cli.context import ApplicationContext
-from src.utils.emoji import TURTLE_EMOJI
+from src.cli.formatters import format_option, tag_filter_option, write_tasks
+from src.entities.task import Task
 
 
 @click.command()
-def list_tasks() -> None:
+@format_option
+@tag_filter_option
+@click.option(
+    "--status",
+    type=click.Choice(Task.STATUSES),
+    default=Task.PENDING,
+    show_default=True,
+    help="List the tasks of this status.",
+)
+def list_tasks(output_format: str, tags: Tuple[str, ...], status: str) -> None:
     """
     List all tasks from the task repository.
+
+    Pending tasks are listed in priority order, others by when their status changed.
+
+    Args:
+        output_format (str): The output format of the listing.
+        tags (Tuple[str, ...]): Tags every listed task must carry.
+        status (str): The status of the listed tasks.
     """
     context = ApplicationContext()
-    tasks = context.task_service.get_all_tasks()
-    for task in tasks:
-        click.echo(f"{TURTLE_EMOJI} {task}")
+    if status == Task.PENDING:
+        tasks = context.task_service.iter_tasks(tags=tags)
+    else:
+        tasks = (
+            task
+            for task in context.task_service.iter_tasks_by_status(status)
+            if set(tags) <= set(task.tags)
+        )
+    write_tasks(tasks, output_format)
@@ -0,0 +1,234 @@
+"""
+This module defines the command to soak test the task store with a mixed workload.
+The loadgen function is used as a CLI command to replay a weighted mix of operations
+from many concurrent clients and report throughput and latency percentiles over time.
+"""
+
+import functools
+import json
+from typing import Optional
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.repositories.fake_repository import FakeTaskRepository
+from src.services.loadgen import DEFAULT_MIX, LoadWindow, parse_mix, run_load
+from src.services.task_service import TaskService
+from src.utils.emoji import TURTLE_EMOJI
+
+BACKENDS = ("redis", "memory")
+
+
+def build_service(queue: Optional[str], backend: str) -> TaskService:
+    """
+    Build the service a load process drives, with its own connections.
+
+    Args:
+        queue (Optional[str]): The queue to load.
+        backend (str): "redis" for the configured store, "memory" for an in-memory one.
+
+    Returns:
+        TaskService: The service of the queue.
+    """
+    if backend == "memory":
+        return TaskService(FakeTaskRepository())
+    return ApplicationContext(queue=queue).task_service
+
+
+def _format_latency(seconds: float) -> str:
+    """
+    Format a latency in milliseconds, or microseconds below one millisecond.
+    """
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.0f}µs"
+    return f"{seconds * 1e3:.1f}ms"
+
+
+def _percentiles(figures: dict) -> str:
+    """
+    Format the percentiles of a summary.
+    """
+    return " ".join(
+        f"{name}={_format_latency(figures[name])}"
+        for name in ("p50", "p95", "p99", "p999", "max")
+    )
+
+
+def _echo_window(window: LoadWindow, ended_at: float, as_json: bool) -> None:
+    """
+    Print the figures of one reporting window, which ended `ended_at` seconds in.
+    """
+    summary = window.summary()
+    if as_json:
+        click.echo(json.dumps(summary))
+        return
+    click.echo(
+        f"{TURTLE_EMOJI} [{ended_at:>7.1f}s] "
+        f"{summary['throughput']:>9.1f} ops/s, {summary['errors']} errors, "
+        f"{_percentiles(summary)}"
+    )
+
+
+@click.command()
+@click.option(
+    "--duration",
+    default=30.0,
+    type=click.FloatRange(min=0, min_open=True),
+    show_default=True,
+    help="Seconds the load runs for.",
+)
+@click.option(
+    "--clients",
+    default=10,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Concurrent client threads per process.",
+)
+@click.option(
+    "--processes",
+    default=1,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Load processes, each with its own connections.",
+)
+@click.option(
+    "--rate",
+    default=None,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Offer this many operations per second in total (open loop) instead of "
+    "sending each one when the previous returns (closed loop).",
+)
+@click.option(
+    "--think-time",
+    default=0.0,
+    type=click.FloatRange(min=0),
+    show_default=True,
+    help="Seconds a closed-loop client waits between operations.",
+)
+@click.option(
+    "--mix",
+    default=DEFAULT_MIX,
+    show_default=True,
+    help="Weights of the add, list, range, update, claim and delete operations.",
+)
+@click.option(
+    "--preload",
+    default=1000,
+    type=click.IntRange(min=0),
+    show_default=True,
+    help="Tasks added before the load starts.",
+)
+@click.option(
+    "--page",
+    default=100,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Tasks read by each list and range operation.",
+)
+@click.option(
+    "--payload",
+    default=64,
+    type=click.IntRange(min=0),
+    show_default=True,
+    help="Characters in the description of each added task.",
+)
+@click.option(
+    "--interval",
+    default=5.0,
+    type=click.FloatRange(min=0, min_open=True),
+    show_default=True,
+    help="Seconds between reports.",
+)
+@click.option("--seed", default=None, type=int, help="Seed for a repeatable mix.")
+@click.option(
+    "--backend",
+    type=click.Choice(BACKENDS),
+    default="redis",
+    show_default=True,
+    help="The configured Redis store, or an in-memory store of each process.",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print each report as JSON.")
+@click.pass_context
+def loadgen(
+    ctx: click.Context,
+    duration: float,
+    clients: int,
+    processes: int,
+    rate: Optional[float],
+    think_time: float,
+    mix: str,
+    preload: int,
+    page: int,
+    payload: int,
+    interval: float,
+    seed: Optional[int],
+    backend: str,
+    as_json: bool,
+) -> None:
+    """
+    Replay a mix of operations from concurrent clients and report throughput and
+    latency percentiles; tasks it adds are tagged "loadgen", so run it on a scratch
+    queue.
+
+    Args:
+        ctx (click.Context): The click context, holding the global queue option.
+        duration (float): Seconds the load runs for.
+        clients (int): Client threads per process.
+        processes (int): The number of load processes.
+        rate (Optional[float]): Total operations per second in open-loop mode.
+        think_time (float): Seconds a closed-loop client waits between operations.
+        mix (str): The weight of each operation, as operation=weight pairs.
+        preload (int): Tasks added before the load starts.
+        page (int): Tasks read by each list and range operation.
+        payload (int): Characters in the description of each added task.
+        interval (float): Seconds between reports.
+        seed (Optional[int]): Seed for the operation choices.
+        backend (str): "redis" or "memory".
+        as_json (bool): Whether to print each report as a JSON line.
+    """
+    try:
+        weights = parse_mix(mix)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--mix")
+    queue = (ctx.find_root().obj or {}).get("queue")
+    mode = f"open loop at {rate:g} ops/s" if rate else "closed loop"
+    if not as_json:
+        click.echo(
+            f"{TURTLE_EMOJI} Running {processes} process(es) of {clients} client(s), "
+            f"{mode}, for {duration:g}s..."
+        )
+    elapsed = 0.0
+
+    def report(window: LoadWindow) -> None:
+        nonlocal elapsed
+        elapsed += window.elapsed
+        _echo_window(window, elapsed, as_json)
+
+    total = run_load(
+        functools.partial(build_service, queue, backend),
+        weights,
+        duration,
+        clients=clients,
+        processes=processes,
+        rate=rate,
+        think_time=think_time,
+        interval=interval,
+        preload=preload,
+        page=page,
+        payload=payload,
+        seed=seed,
+        on_window=report,
+    )
+    summary = total.summary()
+    if as_json:
+        click.echo(json.dumps(summary))
+        return
+    click.echo(
+        f"{TURTLE_EMOJI} {summary['ops']} operations in {summary['elapsed']:.1f}s: "
+        f"{summary['throughput']:.1f} ops/s, {summary['errors']} errors"
+    )
+    for operation, figures in summary["operations"].items():
+        click.echo(
+            f"  {operation:<7} {figures['ops']:>8} ops {figures['errors']:>5} errors "
+            f"{_percentiles(figures)}"
+        )
@@ -0,0 +1,89 @@
+"""
+This module defines the command to report the memory used by the task store.
+The memory_report function is used as a CLI command to estimate the memory of each part
+of the storage layout from sampled keys, and to project it for a target task count.
+"""
+
+import json
+from typing import Optional
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.utils.emoji import TURTLE_EMOJI
+
+
+def _format_bytes(size: float) -> str:
+    """
+    Format a byte count with a binary unit.
+    """
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024 or unit == "GiB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TiB"
+
+
+@click.command()
+@click.option(
+    "--sample",
+    "sample_size",
+    default=1000,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Keys measured per group; up to 10 times as many are scanned.",
+)
+@click.option(
+    "--target",
+    "target_tasks",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Project the memory needed for this many tasks.",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print the report as JSON.")
+def memory_report(sample_size: int, target_tasks: Optional[int], as_json: bool) -> None:
+    """
+    Estimate the memory used by each part of the task store, with 95% confidence
+    intervals.
+
+    Args:
+        sample_size (int): The maximum number of keys of each group measured.
+        target_tasks (Optional[int]): The number of tasks to project memory for.
+        as_json (bool): Whether to print the report as JSON.
+    """
+    context = ApplicationContext()
+    report = context.task_service.memory_report(sample_size, target_tasks)
+    if as_json:
+        click.echo(json.dumps(report, indent=2))
+        return
+    click.echo(
+        f"{TURTLE_EMOJI} {report['tasks']} tasks use about "
+        f"{_format_bytes(report['total'])} ± {_format_bytes(report['margin'])}, "
+        f"{_format_bytes(report['per_task'])} per task."
+    )
+    for row in sorted(report["rows"], key=lambda row: -row["total"]):
+        if row["count"] is None:
+            keys = ""
+        elif row["sampled"] < row["count"]:
+            keys = f"{row['count']} keys, {row['sampled']} sampled"
+        else:
+            keys = f"{row['count']} keys"
+        click.echo(
+            f"  {row['name']:<16} {_format_bytes(row['total']):>11} "
+            f"± {_format_bytes(row['margin']):<10} {keys}".rstrip()
+        )
+    if report["settings"]:
+        settings = ", ".join(f"{k}={v}" for k, v in report["settings"].items())
+        click.echo(f"{TURTLE_EMOJI} Encoding settings: {settings}")
+    for projection in report.get("projections", []):
+        label = (
+            "sampled mix"
+            if projection["encoding"] == "mix"
+            else f"all {projection['encoding']} ({projection['share']:.0%} sampled)"
+        )
+        click.echo(
+            f"{TURTLE_EMOJI} {target_tasks} tasks as {label}: "
+            f"{_format_bytes(projection['total'])} ± "
+            f"{_format_bytes(projection['margin'])}, "
+            f"{_format_bytes(projection['per_task'])} per task."
+        )
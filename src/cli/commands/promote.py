@@ -0,0 +1,49 @@
+"""
+This module defines the command to promote delayed tasks into the task queue.
+The promote function is used as a CLI command to move tasks whose run time has come
+into the queue in bounded batches, either once or continuously in the background.
+"""
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.utils.emoji import TURTLE_EMOJI
+
+
+@click.command()
+@click.option(
+    "--batch-size", default=500, type=int, help="Maximum tasks promoted per sweep."
+)
+@click.option(
+    "--watch", is_flag=True, help="Keep promoting in the background until interrupted."
+)
+@click.option(
+    "--interval", default=1.0, type=float, help="Seconds between idle sweeps."
+)
+def promote(batch_size: int, watch: bool, interval: float) -> None:
+    """
+    Move delayed tasks that are due into the task queue.
+
+    Args:
+        batch_size (int): The maximum number of tasks promoted per sweep.
+        watch (bool): Whether to keep promoting until interrupted.
+        interval (float): The number of seconds between idle sweeps.
+    """
+    context = ApplicationContext()
+    if watch:
+        promoter = context.task_service.start_promoter(interval, batch_size)
+        click.echo(f"{TURTLE_EMOJI} Promoting delayed tasks every {interval}s...")
+        try:
+            while promoter.is_alive():
+                promoter.join(1.0)
+        except KeyboardInterrupt:
+            promoter.stop()
+        return
+
+    promoted = 0
+    while True:
+        count = context.task_service.promote_due_tasks(batch_size)
+        promoted += count
+        if count < batch_size:
+            break
+    click.echo(f"{TURTLE_EMOJI} {promoted} delayed entries promoted.")
@@ -0,0 +1,53 @@
+"""
+This module defines the command to prune expired tasks from the task repository.
+The prune function is used as a CLI command to delete expired tasks in bounded batches,
+either once or continuously in the background.
+"""
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.cli.progress import deletion_progress
+from src.utils.emoji import TURTLE_EMOJI
+
+
+@click.command()
+@click.option(
+    "--batch-size", default=500, type=int, help="Maximum tasks deleted per sweep."
+)
+@click.option(
+    "--watch", is_flag=True, help="Keep pruning in the background until interrupted."
+)
+@click.option(
+    "--interval", default=60.0, type=float, help="Seconds between idle sweeps."
+)
+def prune(batch_size: int, watch: bool, interval: float) -> None:
+    """
+    Delete expired tasks from the task repository.
+
+    Args:
+        batch_size (int): The maximum number of tasks deleted per sweep.
+        watch (bool): Whether to keep pruning until interrupted.
+        interval (float): The number of seconds between idle sweeps.
+    """
+    context = ApplicationContext()
+    if watch:
+        pruner = context.task_service.start_pruner(interval, batch_size)
+        click.echo(f"{TURTLE_EMOJI} Pruning expired tasks every {interval}s...")
+        try:
+            while pruner.is_alive():
+                pruner.join(1.0)
+        except KeyboardInterrupt:
+            pruner.stop()
+        return
+
+    report = deletion_progress()
+    deleted = 0
+    while True:
+        count = context.task_service.prune_expired_tasks(batch_size)
+        if count:
+            report(count)
+        deleted += count
+        if count < batch_size:
+            break
+    click.echo(f"{TURTLE_EMOJI} {deleted} expired entries pruned.")
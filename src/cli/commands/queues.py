@@ -0,0 +1,70 @@
+"""
+This module defines the commands to inspect and rebalance named queues.
+The list_queues function prints the task counts of every queue, and the move_tasks
+function moves tasks from the current queue to another one.
+"""
+
+from typing import Optional, TextIO, Tuple
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.cli.formatters import format_option, write_rows
+from src.utils.emoji import TURTLE_EMOJI
+
+QUEUE_FIELDS = ["queue", "queued", "delayed"]
+
+
+@click.command()
+@format_option
+def list_queues(output_format: str) -> None:
+    """
+    List every queue with its number of queued and delayed tasks.
+
+    Args:
+        output_format (str): The output format of the listing.
+    """
+    context = ApplicationContext()
+    write_rows(
+        (
+            {"queue": queue, **counts}
+            for queue, counts in context.task_service.list_queues().items()
+        ),
+        output_format,
+        QUEUE_FIELDS,
+        lambda row: (
+            f"{TURTLE_EMOJI} {row['queue']}: {row['queued']} queued, "
+            f"{row['delayed']} delayed"
+        ),
+    )
+
+
+@click.command()
+@click.argument("task_ids", nargs=-1)
+@click.option("--to", "queue", required=True, help="Destination queue.")
+@click.option(
+    "--from-file",
+    type=click.File("r"),
+    default=None,
+    help="Read task IDs, one per line, from a file ('-' for stdin).",
+)
+def move_tasks(
+    task_ids: Tuple[str, ...], queue: str, from_file: Optional[TextIO]
+) -> None:
+    """
+    Move tasks by ID from the current queue to another queue.
+
+    Args:
+        task_ids (Tuple[str, ...]): The IDs of the tasks to move.
+        queue (str): The destination queue.
+        from_file (Optional[TextIO]): A file with additional task IDs, one per line.
+    """
+    ids = list(task_ids)
+    if from_file is not None:
+        ids.extend(line.strip() for line in from_file if line.strip())
+    context = ApplicationContext()
+    try:
+        moved = context.task_service.move_tasks(ids, queue)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--to")
+    click.echo(f"{TURTLE_EMOJI} {moved} of {len(ids)} tasks moved to {queue}.")
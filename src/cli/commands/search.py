@@ -0,0 +1,56 @@
+"""
+This module defines the command to search tasks by the words of their name and description.
+The search function is used as a CLI command to display one ranked page of matching tasks.
+"""
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.cli.formatters import format_option, write_tasks
+from src.utils.emoji import TURTLE_EMOJI
+
+
+@click.command()
+@click.argument("query")
+@click.option(
+    "--limit",
+    default=20,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Tasks shown per page.",
+)
+@click.option(
+    "--offset",
+    default=0,
+    show_default=True,
+    type=click.IntRange(min=0),
+    help="Ranked matches to skip.",
+)
+@format_option
+def search(query: str, limit: int, offset: int, output_format: str) -> None:
+    """
+    Search tasks by the words of their name and description.
+
+    Terms must all match, OR separates alternatives and a trailing * matches any
+    word starting with the term. Results are ranked highest priority first.
+
+    Args:
+        query (str): The search query.
+        limit (int): The maximum number of tasks to show.
+        offset (int): The number of ranked matches to skip.
+        output_format (str): The output format of the listing.
+    """
+    context = ApplicationContext()
+    try:
+        tasks, total = context.task_service.search(query, offset, limit)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="QUERY")
+    write_tasks(tasks, output_format)
+    if output_format == "text":
+        if tasks:
+            click.echo(
+                f"{TURTLE_EMOJI} Showing {offset + 1}-{offset + len(tasks)} "
+                f"of {total} matching tasks."
+            )
+        else:
+            click.echo(f"{TURTLE_EMOJI} No tasks found matching {query!r}.")
@@ -0,0 +1,64 @@
+"""
+This module defines the command to serve the task API over HTTP.
+The serve function is used as a CLI command to run a long-lived HTTP/JSON server in
+front of the task service, so clients reuse its Redis connections.
+"""
+
+import asyncio
+import signal
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.services.http_server import TaskHttpServer
+from src.services.scheduler import SCHEDULERS, make_scheduler
+from src.utils.emoji import TURTLE_EMOJI
+
+
+async def _serve(server: TaskHttpServer) -> None:
+    """
+    Run the server until SIGINT or SIGTERM.
+    """
+    await server.start()
+    click.echo(f"{TURTLE_EMOJI} Serving tasks on http://{server.host}:{server.port}")
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopped.set)
+    await stopped.wait()
+    await server.close()
+    click.echo(f"{TURTLE_EMOJI} Server stopped.")
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", show_default=True, help="Address to bind.")
+@click.option("--port", default=8080, type=int, show_default=True, help="Port to bind.")
+@click.option(
+    "--threads",
+    default=16,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Concurrent Redis calls, and so pooled connections.",
+)
+@click.option(
+    "--scheduler",
+    "scheduler_name",
+    type=click.Choice(list(SCHEDULERS)),
+    default="strict",
+    show_default=True,
+    help="How /claim chooses the next priority band.",
+)
+def serve(host: str, port: int, threads: int, scheduler_name: str) -> None:
+    """
+    Serve the tasks of the queue over an HTTP/JSON API until interrupted.
+
+    Args:
+        host (str): The address to listen on.
+        port (int): The port to listen on.
+        threads (int): The number of service calls run at once.
+        scheduler_name (str): The scheduling policy of claims.
+    """
+    context = ApplicationContext()
+    service = context.task_service
+    service.scheduler = make_scheduler(scheduler_name)
+    asyncio.run(_serve(TaskHttpServer(service, host, port, threads)))
@@ -0,0 +1,54 @@
+"""
+This module defines the commands to snapshot and restore the task store.
+The snapshot function writes every task to a compact, checksummed file, and the restore
+function loads such a file back into the configured repository.
+"""
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.utils.emoji import TURTLE_EMOJI
+from src.utils.exceptions import SnapshotError
+
+
+@click.command()
+@click.argument("path", type=click.Path(dir_okay=False, writable=True))
+@click.option(
+    "--compress/--no-compress", default=True, help="Compress the snapshot body."
+)
+def snapshot(path: str, compress: bool) -> None:
+    """
+    Write every task to a snapshot file.
+
+    Args:
+        path (str): The file to write the snapshot to.
+        compress (bool): Whether to compress the snapshot body.
+    """
+    context = ApplicationContext()
+    with open(path, "wb") as stream:
+        count = context.task_service.export_snapshot(stream, compress=compress)
+    click.echo(f"{TURTLE_EMOJI} {count} tasks written to {path}.")
+
+
+@click.command()
+@click.argument("path", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--dedupe",
+    is_flag=True,
+    help="Skip tasks whose name, priority and description were already submitted.",
+)
+def restore(path: str, dedupe: bool) -> None:
+    """
+    Load every task of a snapshot file into the task repository.
+
+    Args:
+        path (str): The snapshot file to load.
+        dedupe (bool): Whether to skip tasks whose content was already submitted.
+    """
+    context = ApplicationContext()
+    try:
+        with open(path, "rb") as stream:
+            count = context.task_service.import_snapshot(stream, dedupe=dedupe)
+    except SnapshotError as e:
+        raise click.ClickException(str(e))
+    click.echo(f"{TURTLE_EMOJI} {count} tasks restored from {path}.")
@@ -0,0 +1,128 @@
+"""
+This module defines the commands that work with the status of tasks.
+The set_status function moves tasks between statuses, the reclaim function queues again
+tasks left running by workers that died, and the archive function writes finished tasks
+to a snapshot file before deleting them from the repository.
+"""
+
+import time
+from typing import Optional, Tuple
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.entities.task import Task
+from src.utils.emoji import TURTLE_EMOJI
+
+
+@click.command()
+@click.argument("status", type=click.Choice(Task.STATUSES))
+@click.argument("task_ids", nargs=-1, required=True)
+def set_status(status: str, task_ids: Tuple[str, ...]) -> None:
+    """
+    Move tasks to another status; a task set back to pending is queued again.
+
+    Args:
+        status (str): The new status.
+        task_ids (Tuple[str, ...]): The IDs of the tasks to change.
+    """
+    context = ApplicationContext()
+    changed = context.task_service.set_status(list(task_ids), status)
+    click.echo(
+        f"{TURTLE_EMOJI} {len(changed)} of {len(task_ids)} tasks set to {status}."
+    )
+
+
+@click.command()
+@click.option(
+    "--timeout",
+    required=True,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Seconds after which a running task is considered abandoned.",
+)
+@click.option(
+    "--batch-size", default=500, type=int, help="Maximum tasks reclaimed per sweep."
+)
+@click.option(
+    "--watch", is_flag=True, help="Keep reclaiming in the background until interrupted."
+)
+@click.option(
+    "--interval", default=60.0, type=float, help="Seconds between idle sweeps."
+)
+def reclaim(timeout: float, batch_size: int, watch: bool, interval: float) -> None:
+    """
+    Set tasks running for longer than the timeout back to pending.
+
+    Args:
+        timeout (float): The number of seconds after which a running task is stale.
+        batch_size (int): The maximum number of tasks reclaimed per sweep.
+        watch (bool): Whether to keep reclaiming until interrupted.
+        interval (float): The number of seconds between idle sweeps.
+    """
+    context = ApplicationContext()
+    if watch:
+        reclaimer = context.task_service.start_reclaimer(timeout, interval, batch_size)
+        click.echo(f"{TURTLE_EMOJI} Reclaiming stale tasks every {interval}s...")
+        try:
+            while reclaimer.is_alive():
+                reclaimer.join(1.0)
+        except KeyboardInterrupt:
+            reclaimer.stop()
+        return
+
+    reclaimed = 0
+    while True:
+        count = context.task_service.reclaim_stale_tasks(timeout, batch_size)
+        reclaimed += count
+        if count < batch_size:
+            break
+    click.echo(f"{TURTLE_EMOJI} {reclaimed} stale running tasks set back to pending.")
+
+
+@click.command()
+@click.argument("path", type=click.Path(dir_okay=False, writable=True))
+@click.option(
+    "--before", default=None, type=float, help="Unix timestamp of the cutoff."
+)
+@click.option(
+    "--age",
+    default=None,
+    type=float,
+    help="Minimum time in seconds since the task finished.",
+)
+@click.option(
+    "--status",
+    "statuses",
+    multiple=True,
+    type=click.Choice([Task.RUNNING, Task.DONE, Task.FAILED]),
+    help="Status to archive; may be repeated. Defaults to done and failed.",
+)
+@click.option(
+    "--compress/--no-compress", default=True, help="Compress the snapshot body."
+)
+def archive(
+    path: str,
+    before: Optional[float],
+    age: Optional[float],
+    statuses: Tuple[str, ...],
+    compress: bool,
+) -> None:
+    """
+    Move finished tasks to a snapshot file, which `restore` can load back.
+
+    Args:
+        path (str): The file to write the archived tasks to.
+        before (Optional[float]): The cutoff as a Unix timestamp.
+        age (Optional[float]): The cutoff as a minimum age in seconds.
+        statuses (Tuple[str, ...]): The statuses to archive.
+        compress (bool): Whether to compress the snapshot body.
+    """
+    if (before is None) == (age is None):
+        raise click.UsageError("Specify exactly one of --before or --age.")
+    cutoff = before if before is not None else time.time() - age
+    context = ApplicationContext()
+    with open(path, "wb") as stream:
+        count = context.task_service.archive_tasks(
+            stream, cutoff, statuses or (Task.DONE, Task.FAILED), compress=compress
+        )
+    click.echo(f"{TURTLE_EMOJI} {count} tasks archived to {path}.")
@@ -3,7 +3,7 @@ This module defines the command to update a task by its ID in the task repositor
 The update_task function is used as a CLI command to modify the details of a specified task.
 """
 
-from typing import Optional
+from typing import Optional, Tuple
 
 import click
 
@@ -16,11 +16,20 @@ from src.utils.emoji import TURTLE_EMOJI
 @click.option("--name", default=None, help="New name of the task.")
 @click.option("--priority", default=None, type=int, help="New priority of the task.")
 @click.option("--description", default=None, help="New description of the task.")
+@click.option(
+    "--tag",
+    "tags",
+    multiple=True,
+    help="New label of the task, replacing its tags; may be repeated.",
+)
+@click.option("--clear-tags", is_flag=True, help="Remove every tag of the task.")
 def update_task(
     task_id: str,
     name: Optional[str],
     priority: Optional[int],
     description: Optional[str],
+    tags: Tuple[str, ...],
+    clear_tags: bool,
 ) -> None:
     """
     Update a task by ID in the task repository.
@@ -30,10 +39,15 @@ def update_task(
         name (Optional[str]): The new name of the task.
         priority (Optional[int]): The new priority of the task.
         description (Optional[str]): The new description of the task.
+        tags (Tuple[str, ...]): The new tags of the task.
+        clear_tags (bool): Whether to remove every tag of the task.
     """
+    if tags and clear_tags:
+        raise click.UsageError("--tag and --clear-tags cannot be used together.")
+    new_tags = [] if clear_tags else list(tags) or None
     context = ApplicationContext()
     task = context.task_service.update_task(
-        task_id, name=name, priority=priority, description=description
+        task_id, name=name, priority=priority, description=description, tags=new_tags
     )
     if task:
         click.echo(f"{TURTLE_EMOJI} Task updated: {task}")
@@ -0,0 +1,76 @@
+"""
+This module defines the command to watch a live view of the task queue.
+The watch function is used as a CLI command to display the top tasks within a priority range,
+redrawing as the change feed reports mutations instead of re-listing the repository.
+"""
+
+import io
+import time
+from datetime import datetime
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.cli.formatters import write_tasks
+from src.entities.task import Task
+from src.services.task_view import TaskView
+from src.utils.emoji import TURTLE_EMOJI
+
+
+def _render(view: TaskView) -> str:
+    """
+    Render the view as a screen of text.
+
+    Args:
+        view (TaskView): The view to render.
+
+    Returns:
+        str: The header line followed by the task table.
+    """
+    tasks = view.tasks()
+    table = io.BytesIO()
+    write_tasks(tasks, "table", table)
+    header = (
+        f"{TURTLE_EMOJI} {len(view)} tasks with priority {view.min_priority}-"
+        f"{view.max_priority}, showing {len(tasks)} "
+        f"(updated {datetime.now():%H:%M:%S})\n\n"
+    )
+    return header + table.getvalue().decode("utf-8")
+
+
+@click.command()
+@click.option("--min-priority", default=Task.MIN_PRIORITY, type=int)
+@click.option("--max-priority", default=Task.MAX_PRIORITY, type=int)
+@click.option("--top", default=20, type=int, help="Number of tasks to display.")
+@click.option(
+    "--interval",
+    default=0.5,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Minimum seconds between redraws.",
+)
+def watch(min_priority: int, max_priority: int, top: int, interval: float) -> None:
+    """
+    Watch a live view of the top tasks within a priority range.
+
+    Args:
+        min_priority (int): The minimum priority of the tasks to display.
+        max_priority (int): The maximum priority of the tasks to display.
+        top (int): The number of tasks to display.
+        interval (float): The minimum number of seconds between redraws.
+    """
+    context = ApplicationContext()
+    view = context.task_service.open_view(min_priority, max_priority, top)
+    dirty = True
+    last_draw = 0.0
+    try:
+        while True:
+            wait = interval - (time.monotonic() - last_draw)
+            if dirty and wait <= 0:
+                click.clear()
+                click.echo(_render(view), nl=False)
+                dirty = False
+                last_draw = time.monotonic()
+                wait = interval
+            dirty = view.refresh(block=max(wait, 0.05)) or dirty
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,154 @@
+"""
+This module defines the command to run worker processes over the task queue.
+The work function is used as a CLI command to claim tasks in priority order and pass
+each one to a user handler, in several processes of several threads each.
+"""
+
+import functools
+import os
+import sys
+from typing import Optional
+
+import click
+
+from src.cli.context import ApplicationContext
+from src.services.scheduler import SCHEDULERS, make_scheduler
+from src.services.task_service import TaskService
+from src.services.worker import WorkerStats, run_worker_processes
+from src.utils.emoji import TURTLE_EMOJI
+
+
+def build_service(queue: Optional[str], scheduler_name: str) -> TaskService:
+    """
+    Build the service of a worker process, with its own Redis connections.
+
+    Args:
+        queue (Optional[str]): The queue to consume.
+        scheduler_name (str): The scheduling policy across priority bands.
+
+    Returns:
+        TaskService: The service of the queue.
+    """
+    service = ApplicationContext(queue=queue).task_service
+    service.scheduler = make_scheduler(scheduler_name)
+    return service
+
+
+def _echo_stats(stats: WorkerStats) -> None:
+    """
+    Print one line of worker statistics.
+    """
+    click.echo(
+        f"{TURTLE_EMOJI} {stats.name}: {stats.succeeded} done, {stats.failed} failed, "
+        f"{stats.throughput():.1f} tasks/s over {stats.elapsed:.1f}s"
+    )
+
+
+@click.command()
+@click.option(
+    "--handler",
+    required=True,
+    help="Function run for each task, as module:function.",
+)
+@click.option(
+    "--processes",
+    default=1,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Worker processes, for CPU-bound handlers.",
+)
+@click.option(
+    "--concurrency",
+    default=1,
+    type=click.IntRange(min=1),
+    show_default=True,
+    help="Handler threads per process, for I/O-bound handlers.",
+)
+@click.option(
+    "--prefetch",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Claimed tasks each process keeps ready [default: 2 x concurrency].",
+)
+@click.option(
+    "--scheduler",
+    "scheduler_name",
+    type=click.Choice(list(SCHEDULERS)),
+    default="strict",
+    show_default=True,
+    help="How the next priority band is chosen.",
+)
+@click.option(
+    "--burst", is_flag=True, help="Exit once the queue is empty instead of waiting."
+)
+@click.option(
+    "--reclaim-after",
+    default=None,
+    type=click.FloatRange(min=0, min_open=True),
+    help="Set tasks running for this many seconds back to pending, recovering the "
+    "tasks of killed workers; must exceed the longest handler run.",
+)
+@click.option(
+    "--report-interval",
+    default=10.0,
+    type=float,
+    show_default=True,
+    help="Seconds between throughput reports, 0 to report only on exit.",
+)
+@click.pass_context
+def work(
+    ctx: click.Context,
+    handler: str,
+    processes: int,
+    concurrency: int,
+    prefetch: Optional[int],
+    scheduler_name: str,
+    burst: bool,
+    reclaim_after: Optional[float],
+    report_interval: float,
+) -> None:
+    """
+    Run tasks from the queue with a handler until interrupted.
+
+    Args:
+        ctx (click.Context): The click context, holding the global queue option.
+        handler (str): The handler as module:function.
+        processes (int): The number of worker processes.
+        concurrency (int): The number of handler threads per process.
+        prefetch (Optional[int]): The number of claimed tasks each process keeps ready.
+        scheduler_name (str): The scheduling policy across priority bands.
+        burst (bool): Whether to exit once the queue is empty.
+        reclaim_after (Optional[float]): Seconds after which a running task is stale.
+        report_interval (float): The number of seconds between throughput reports.
+    """
+    # Handlers are usually modules of the project the worker is started from.
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    queue = (ctx.find_root().obj or {}).get("queue")
+    click.echo(
+        f"{TURTLE_EMOJI} Starting {processes} worker(s) of {concurrency} thread(s)..."
+    )
+    reclaimer = None
+    if reclaim_after:
+        reclaimer = build_service(queue, scheduler_name).start_reclaimer(
+            reclaim_after, interval=min(60.0, reclaim_after / 2)
+        )
+    try:
+        final = run_worker_processes(
+            functools.partial(build_service, queue, scheduler_name),
+            handler,
+            processes=processes,
+            concurrency=concurrency,
+            prefetch=prefetch,
+            burst=burst,
+            report_interval=report_interval or None,
+            on_report=_echo_stats,
+        )
+    except (ValueError, ImportError) as e:
+        raise click.BadParameter(str(e), param_hint="--handler")
+    finally:
+        if reclaimer is not None:
+            reclaimer.stop()
+    total = sum(stats.succeeded + stats.failed for stats in final)
+    failed = sum(stats.failed for stats in final)
+    click.echo(f"{TURTLE_EMOJI} {total} tasks run, {failed} failed.")
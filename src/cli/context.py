@@ -4,7 +4,15 @@ It defines the ApplicationContext class which holds instances of services and re
 used across different commands in the CLI application.
 """
 
-from src.adapters.redis_client import RedisClient
+from typing import Optional
+
+import click
+
+from src.adapters.redis_client import RedisClient, parse_address
+from src.adapters.resilience import RetryPolicy
+from src.entities.ids import configure_ids
+from src.repositories.base_repository import DEFAULT_QUEUE, TaskRepository
+from src.repositories.cached_repository import CachedTaskRepository
 from src.repositories.redis_repository import RedisTaskRepository
 from src.services.task_service import TaskService
 from src.utils.config_handler import load_config
@@ -17,10 +25,17 @@ class ApplicationContext:
     Attributes:
         redis_client (RedisClient): Redis client for database connections.
         task_repository (RedisTaskRepository): Repository for managing task data.
-        task_service (TaskService): Service for task business logic.
+        task_service (TaskService): Service for task business logic, reading through a
+            CachedTaskRepository when `cache_size` is configured.
     """
 
-    def __init__(self, host: str = "localhost", port: int = 6379, db: int = 0):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        queue: Optional[str] = None,
+    ):
         """
         Initializes the application context with necessary services and repositories.
 
@@ -28,12 +43,42 @@ class ApplicationContext:
             host (str): Redis server host.
             port (int): Redis server port.
             db (int): Redis database number.
+            queue (Optional[str]): The queue to work on; defaults to the global
+                `--queue` option, then to the configured queue.
         """
         config = load_config()
+        configure_ids(config.get("id_format", "uuid4"), config.get("worker_id"))
         host = config.get("host", "localhost")
         port = config.get("port", 6379)
         db = config.get("db", 0)
-        self.redis_client = RedisClient(host=host, port=port, db=db)
+        self.redis_client = RedisClient(
+            host=host,
+            port=port,
+            db=db,
+            replicas=[parse_address(address) for address in config.get("replicas", [])],
+            read_strategy=config.get("read_strategy", "round-robin"),
+            read_your_writes=config.get("read_your_writes", 0.0),
+            connect_timeout=config.get("connect_timeout", 2.0),
+            command_timeout=config.get("command_timeout", 5.0),
+            retry_policy=RetryPolicy(retries=config.get("retries", 3)),
+            max_connections=config.get("max_connections", 50),
+        )
         self.redis_client.connect()
-        self.task_repository = RedisTaskRepository(self.redis_client)
-        self.task_service = TaskService(repository=self.task_repository)
+        if queue is None:
+            click_context = click.get_current_context(silent=True)
+            if click_context is not None:
+                queue = (click_context.find_root().obj or {}).get("queue")
+        self.task_repository = RedisTaskRepository(
+            self.redis_client,
+            queue=queue or config.get("queue", DEFAULT_QUEUE),
+            fetch_workers=config.get("fetch_workers", 1),
+        )
+        repository: TaskRepository = self.task_repository
+        if config.get("cache_size", 0):
+            repository = CachedTaskRepository(
+                self.task_repository,
+                max_size=config["cache_size"],
+                ttl=config.get("cache_ttl", 300.0),
+                max_staleness=config.get("cache_staleness", 1.0),
+            )
+        self.task_service = TaskService(repository=repository)
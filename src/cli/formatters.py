@@ -0,0 +1,278 @@
+"""
+This module renders streams of tasks, or of other rows such as queue counts, in the output
+formats supported by the listing commands.
+
+Rows are encoded as they arrive and written to the binary stdout stream in large chunks,
+so a listing never holds more than one chunk in memory. JSON encoding uses orjson when it
+is installed and falls back to the standard library otherwise.
+"""
+
+import csv
+import io
+import json
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, Optional
+
+import click
+
+from src.entities.task import Task
+from src.utils.emoji import TURTLE_EMOJI
+
+try:
+    import orjson
+
+    def _dumps(value: dict) -> bytes:
+        return orjson.dumps(value)
+
+except ImportError:  # pragma: no cover - depends on the optional extra
+    _encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def _dumps(value: dict) -> bytes:
+        return _encoder.encode(value).encode("utf-8")
+
+
+OUTPUT_FORMATS = ("text", "json", "ndjson", "csv", "table")
+ROWS_PER_WRITE = 1000
+TABLE_COLUMN_WIDTH = 40
+
+
+def format_option(command: Callable) -> Callable:
+    """
+    Add the shared --format option to a listing command.
+
+    Args:
+        command (Callable): The click command function to decorate.
+
+    Returns:
+        Callable: The decorated command function.
+    """
+    return click.option(
+        "--format",
+        "output_format",
+        type=click.Choice(OUTPUT_FORMATS),
+        default="text",
+        show_default=True,
+        help="Output format.",
+    )(command)
+
+
+def tag_filter_option(command: Callable) -> Callable:
+    """
+    Add the shared repeatable --tag filter to a listing command.
+
+    Args:
+        command (Callable): The click command function to decorate.
+
+    Returns:
+        Callable: The decorated command function.
+    """
+    return click.option(
+        "--tag",
+        "tags",
+        multiple=True,
+        help="Only list tasks carrying this tag; repeat to require several.",
+    )(command)
+
+
+def _cell(value: object) -> str:
+    """Render a task field as a flat string for csv and table output."""
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return ",".join(value)
+    return str(value)
+
+
+class _RowWriter:
+    """
+    Encodes rows in one output format and writes them in buffered chunks.
+
+    Methods:
+        write(item: Any) -> None: Encodes a row and buffers it for writing.
+        close() -> None: Writes the remaining buffered output and the format trailer.
+    """
+
+    def __init__(
+        self,
+        output_format: str,
+        stream: BinaryIO,
+        fields: List[str],
+        to_dict: Callable[[Any], Dict[str, Any]],
+        to_text: Callable[[Any], str],
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            output_format (str): One of OUTPUT_FORMATS.
+            stream (BinaryIO): The binary stream to write to.
+            fields (List[str]): The columns of csv and table output, in order.
+            to_dict (Callable[[Any], Dict[str, Any]]): Turns a row into the mapping
+                of its fields, for every format but text.
+            to_text (Callable[[Any], str]): Renders a row as a line of text output.
+        """
+        self.output_format: str = output_format
+        self.stream: BinaryIO = stream
+        self.fields: List[str] = fields
+        self.to_dict: Callable[[Any], Dict[str, Any]] = to_dict
+        self.to_text: Callable[[Any], str] = to_text
+        self.buffer: List[bytes] = []
+        self.count: int = 0
+        self.widths: Optional[List[int]] = None
+        self.rows: List[List[str]] = []
+        if output_format == "json":
+            self.buffer.append(b"[")
+        elif output_format == "csv":
+            self.rows.append(self.fields)
+
+    def write(self, item: Any) -> None:
+        """
+        Encodes a row and buffers it for writing.
+
+        Args:
+            item (Any): The row to write, as accepted by `to_dict` and `to_text`.
+        """
+        if self.output_format == "text":
+            self.buffer.append(f"{self.to_text(item)}\n".encode("utf-8"))
+        elif self.output_format == "json":
+            separator = b"," if self.count else b""
+            self.buffer.append(separator + _dumps(self.to_dict(item)))
+        elif self.output_format == "ndjson":
+            self.buffer.append(_dumps(self.to_dict(item)) + b"\n")
+        else:
+            record = self.to_dict(item)
+            row = [_cell(record[field]) for field in self.fields]
+            if self.output_format == "csv":
+                self.rows.append(row)
+            else:
+                self._buffer_table_row(row)
+        self.count += 1
+        if self.count % ROWS_PER_WRITE == 0:
+            self._flush()
+
+    def close(self) -> None:
+        """
+        Writes the remaining buffered output and the format trailer.
+        """
+        if self.output_format == "json":
+            self.buffer.append(b"]\n")
+        if self.output_format == "table" and self.widths is None and self.rows:
+            self._start_table()
+        self._flush()
+        self.stream.flush()
+
+    def _buffer_table_row(self, row: List[str]) -> None:
+        """
+        Buffers a table row; column widths are fixed from the first chunk of rows.
+
+        Args:
+            row (List[str]): The cells of the row.
+        """
+        if self.widths is None:
+            self.rows.append(row)
+            if len(self.rows) == ROWS_PER_WRITE:
+                self._start_table()
+            return
+        self.buffer.append(self._table_line(row))
+
+    def _start_table(self) -> None:
+        """
+        Computes column widths from the rows seen so far and buffers the header and rows.
+        """
+        header = [field.upper() for field in self.fields]
+        self.widths = [
+            min(
+                TABLE_COLUMN_WIDTH, max(len(row[index]) for row in [header] + self.rows)
+            )
+            for index in range(len(self.fields))
+        ]
+        self.buffer.append(self._table_line(header))
+        self.buffer.append(self._table_line(["-" * width for width in self.widths]))
+        self.buffer.extend(self._table_line(row) for row in self.rows)
+        self.rows = []
+
+    def _table_line(self, row: List[str]) -> bytes:
+        """
+        Renders a table row padded and truncated to the column widths.
+
+        Args:
+            row (List[str]): The cells of the row.
+
+        Returns:
+            bytes: The encoded line.
+        """
+        widths = self.widths or []
+        cells = [cell[:width].ljust(width) for cell, width in zip(row, widths)]
+        return ("  ".join(cells).rstrip() + "\n").encode("utf-8")
+
+    def _flush(self) -> None:
+        """
+        Writes the buffered output to the stream in a single call.
+        """
+        if self.output_format == "csv" and self.rows:
+            text = io.StringIO()
+            csv.writer(text, lineterminator="\n").writerows(self.rows)
+            self.buffer.append(text.getvalue().encode("utf-8"))
+            self.rows = []
+        if self.buffer:
+            self.stream.write(b"".join(self.buffer))
+            self.buffer = []
+
+
+def write_tasks(
+    tasks: Iterable[Task], output_format: str, stream: Optional[BinaryIO] = None
+) -> int:
+    """
+    Write tasks to a stream in the requested format as they are produced.
+
+    Args:
+        tasks (Iterable[Task]): The tasks to write.
+        output_format (str): One of OUTPUT_FORMATS.
+        stream (Optional[BinaryIO]): The binary stream to write to, defaults to stdout.
+
+    Returns:
+        int: The number of tasks written.
+    """
+    writer = _RowWriter(
+        output_format,
+        stream or click.get_binary_stream("stdout"),
+        list(Task.model_fields),
+        Task.model_dump,
+        lambda task: f"{TURTLE_EMOJI} {task}",
+    )
+    for task in tasks:
+        writer.write(task)
+    writer.close()
+    return writer.count
+
+
+def write_rows(
+    rows: Iterable[Dict[str, Any]],
+    output_format: str,
+    fields: List[str],
+    to_text: Callable[[Dict[str, Any]], str],
+    stream: Optional[BinaryIO] = None,
+) -> int:
+    """
+    Write rows other than tasks, such as queue counts, in the requested format.
+
+    Args:
+        rows (Iterable[Dict[str, Any]]): The rows to write, keyed by field.
+        output_format (str): One of OUTPUT_FORMATS.
+        fields (List[str]): The columns of csv and table output, in order.
+        to_text (Callable[[Dict[str, Any]], str]): Renders a row as a line of text output.
+        stream (Optional[BinaryIO]): The binary stream to write to, defaults to stdout.
+
+    Returns:
+        int: The number of rows written.
+    """
+    writer = _RowWriter(
+        output_format,
+        stream or click.get_binary_stream("stdout"),
+        fields,
+        dict,
+        to_text,
+    )
+    for row in rows:
+        writer.write(row)
+    writer.close()
+    return writer.count
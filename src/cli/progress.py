@@ -0,0 +1,26 @@
+"""
+This module provides progress reporting helpers shared by long-running CLI commands.
+"""
+
+from typing import Callable
+
+import click
+
+from src.utils.emoji import TURTLE_EMOJI
+
+
+def deletion_progress() -> Callable[[int], None]:
+    """
+    Build a progress callback that reports the running total of deleted tasks on stderr.
+
+    Returns:
+        Callable[[int], None]: A callback receiving the number of tasks deleted per batch.
+    """
+    total = 0
+
+    def report(count: int) -> None:
+        nonlocal total
+        total += count
+        click.echo(f"{TURTLE_EMOJI} Deleted {total} tasks so far...", err=True)
+
+    return report
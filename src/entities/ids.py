@@ -0,0 +1,232 @@
+"""
+This module defines the generators of task IDs.
+
+Time-ordered IDs sort lexicographically in creation order, so index members sharing a
+score come back oldest first and the creation time can be read from the ID itself.
+
+Classes:
+    IdGenerator: The interface of a task ID generator.
+    UuidGenerator: Random 36-character uuid4 strings, the historical format.
+    UlidGenerator: 26-character ULIDs, a millisecond timestamp followed by randomness.
+    SnowflakeGenerator: 13-character 64-bit IDs made of a timestamp, a worker and a sequence.
+
+Functions:
+    configure_ids(kind: str, worker_id: Optional[int]) -> None: Selects the generator.
+    new_id() -> str: Returns a new ID from the selected generator.
+    id_timestamp(task_id: str) -> Optional[float]: Reads the creation time of an ID.
+"""
+
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+from uuid import uuid4
+
+# Crockford's base32: no I, L, O or U, and its order matches ASCII order.
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_VALUES = {character: value for value, character in enumerate(ALPHABET)}
+
+SNOWFLAKE_EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+_WORKER_BITS = 10
+_SEQUENCE_BITS = 12
+
+
+def _encode(value: int, length: int) -> str:
+    """
+    Encode a non-negative integer as fixed-width base32, so string order is numeric order.
+    """
+    characters = []
+    for _ in range(length):
+        value, digit = divmod(value, 32)
+        characters.append(ALPHABET[digit])
+    return "".join(reversed(characters))
+
+
+def _decode(text: str) -> Optional[int]:
+    """
+    Decode base32 text, or return None if it contains other characters.
+    """
+    value = 0
+    for character in text:
+        digit = _VALUES.get(character)
+        if digit is None:
+            return None
+        value = value * 32 + digit
+    return value
+
+
+class IdGenerator(ABC):
+    """
+    IdGenerator is the interface of a task ID generator.
+
+    Methods:
+        new_id() -> str: Returns a new unique ID.
+    """
+
+    @abstractmethod
+    def new_id(self) -> str:
+        """
+        Returns a new unique ID.
+        """
+        pass
+
+
+class UuidGenerator(IdGenerator):
+    """
+    Random uuid4 strings, the format tasks used before IDs were configurable.
+    """
+
+    def new_id(self) -> str:
+        """
+        Returns a new uuid4 string.
+        """
+        return str(uuid4())
+
+
+class UlidGenerator(IdGenerator):
+    """
+    ULIDs: a 48-bit millisecond timestamp and 80 random bits in 26 base32 characters.
+
+    IDs created within the same millisecond increment the random part, so the IDs of
+    one process are strictly increasing.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize the generator.
+        """
+        self._last_ms: int = 0
+        self._last_random: int = 0
+        self._lock = threading.Lock()
+
+    def new_id(self) -> str:
+        """
+        Returns a new ULID.
+        """
+        with self._lock:
+            now_ms = int(time.time() * 1000)
+            if now_ms <= self._last_ms:
+                now_ms = self._last_ms
+                self._last_random += 1
+            else:
+                self._last_random = secrets.randbits(80)
+            if self._last_random >= 1 << 80:
+                now_ms += 1
+                self._last_random = secrets.randbits(80)
+            self._last_ms = now_ms
+            return _encode(now_ms, 10) + _encode(self._last_random, 16)
+
+
+class SnowflakeGenerator(IdGenerator):
+    """
+    64-bit IDs made of 41 bits of milliseconds since 2024, a 10-bit worker ID and a
+    12-bit sequence, in 13 base32 characters.
+
+    IDs are only unique across processes if every process generating them at the
+    same time has its own worker ID: two processes sharing one create identical IDs
+    within the same millisecond, and adding the second task overwrites the first.
+    """
+
+    def __init__(self, worker_id: int):
+        """
+        Initialize the generator.
+
+        Args:
+            worker_id (int): The worker ID, from 0 to 1023, unique to this process
+                among all processes adding tasks to the same store.
+
+        Raises:
+            ValueError: If the worker ID is out of range.
+        """
+        if not 0 <= worker_id < 1 << _WORKER_BITS:
+            raise ValueError(
+                f"Worker ID must be between 0 and {(1 << _WORKER_BITS) - 1}"
+            )
+        self.worker_id: int = worker_id
+        self._last_ms: int = 0
+        self._sequence: int = 0
+        self._lock = threading.Lock()
+
+    def new_id(self) -> str:
+        """
+        Returns a new snowflake ID.
+        """
+        with self._lock:
+            # Never step back if the wall clock does; borrow from the future instead.
+            now_ms = max(int(time.time() * 1000) - SNOWFLAKE_EPOCH_MS, self._last_ms)
+            if now_ms == self._last_ms:
+                self._sequence = (self._sequence + 1) % (1 << _SEQUENCE_BITS)
+                if self._sequence == 0:
+                    now_ms += 1
+            else:
+                self._sequence = 0
+            self._last_ms = now_ms
+            value = (
+                now_ms << (_WORKER_BITS + _SEQUENCE_BITS)
+                | self.worker_id << _SEQUENCE_BITS
+                | self._sequence
+            )
+            return _encode(value, 13)
+
+
+ID_FORMATS = ("uuid4", "ulid", "snowflake")
+
+_generator: IdGenerator = UuidGenerator()
+
+
+def configure_ids(kind: str, worker_id: Optional[int] = None) -> None:
+    """
+    Select the generator used for new task IDs.
+
+    Args:
+        kind (str): One of "uuid4", "ulid" or "snowflake".
+        worker_id (Optional[int]): The snowflake worker ID, required for snowflake IDs.
+
+    Raises:
+        ValueError: If the kind is unknown, or snowflake IDs are selected without
+            a worker ID.
+    """
+    global _generator
+    if kind == "uuid4":
+        _generator = UuidGenerator()
+    elif kind == "ulid":
+        _generator = UlidGenerator()
+    elif kind == "snowflake":
+        if worker_id is None:
+            raise ValueError("Snowflake IDs need a worker ID unique to each process")
+        _generator = SnowflakeGenerator(worker_id)
+    else:
+        raise ValueError(f"Unknown ID format: {kind!r}")
+
+
+def new_id() -> str:
+    """
+    Returns a new ID from the selected generator.
+    """
+    return _generator.new_id()
+
+
+def id_timestamp(task_id: str) -> Optional[float]:
+    """
+    Read the creation time embedded in a time-ordered ID.
+
+    Args:
+        task_id (str): A task ID of any format.
+
+    Returns:
+        Optional[float]: The creation timestamp with millisecond precision, or None
+            for IDs, such as uuid4, that carry no time.
+    """
+    if len(task_id) == 26:
+        milliseconds = _decode(task_id[:10])
+    elif len(task_id) == 13:
+        value = _decode(task_id)
+        milliseconds = (
+            None
+            if value is None
+            else (value >> (_WORKER_BITS + _SEQUENCE_BITS)) + SNOWFLAKE_EPOCH_MS
+        )
+    else:
+        return None
+    return None if milliseconds is None else milliseconds / 1000
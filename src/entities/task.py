@@ -6,38 +6,77 @@ Classes:
 """
 
 import time
-from uuid import uuid4
+from typing import ClassVar, Dict, List, Optional, Tuple
 
 from pydantic import BaseModel, Field, field_validator
 
+from src.entities.ids import new_id
+
 
 class Task(BaseModel):
     """
     A class used to represent a Task.
 
     Attributes:
-        id (str): The unique identifier for the task, generated automatically.
+        id (str): The unique identifier for the task, generated automatically by the
+            generator selected with `src.entities.ids.configure_ids()`.
         name (str): The name of the task.
-        priority (int): The priority of the task, must be between 1 and 10.
+        priority (int): The priority of the task, must be between MIN_PRIORITY (1)
+            and MAX_PRIORITY (10).
         description (str): A description of the task.
         timestamp (float): The creation timestamp of the task, set automatically.
+        expires_at (Optional[float]): The timestamp after which the task is expired, if any.
+        run_at (Optional[float]): The timestamp before which the task is not eligible to
+            run, if any; such a task is delayed and left out of the queue until then.
+        tags (List[str]): Labels such as "team=payments", sorted and without duplicates.
+        status (str): Where the task is in its lifecycle: "pending" until a worker
+            claims it, "running" while it runs, then "done" or "failed".
+        status_at (Optional[float]): The timestamp of the last status change, None
+            while the task has never left "pending".
 
     Methods:
-        validate_priority(value): Validates that the priority is between 1 and 10.
+        validate_priority(value): Validates that the priority is within the allowed bounds.
         validate_name(value): Validates that the name is not empty.
+        validate_tags(value): Normalizes the tags and rejects malformed ones.
+        validate_status(value): Validates that the status is one of STATUSES.
+        is_expired(now): Checks whether the task has expired.
+        is_due(now): Checks whether the task is eligible to run.
     """
 
-    id: str = Field(default_factory=lambda: str(uuid4()))
+    MIN_PRIORITY: ClassVar[int] = 1
+    MAX_PRIORITY: ClassVar[int] = 10
+
+    PENDING: ClassVar[str] = "pending"
+    RUNNING: ClassVar[str] = "running"
+    DONE: ClassVar[str] = "done"
+    FAILED: ClassVar[str] = "failed"
+    STATUSES: ClassVar[Tuple[str, ...]] = (PENDING, RUNNING, DONE, FAILED)
+    # The statuses a task may move to from each status.
+    TRANSITIONS: ClassVar[Dict[str, Tuple[str, ...]]] = {
+        PENDING: (RUNNING, DONE, FAILED),
+        RUNNING: (PENDING, DONE, FAILED),
+        FAILED: (PENDING,),
+        DONE: (),
+    }
+
+    id: str = Field(default_factory=new_id)
     name: str
     priority: int
     description: str
     timestamp: float = Field(default_factory=time.time)
+    expires_at: Optional[float] = None
+    run_at: Optional[float] = None
+    tags: List[str] = Field(default_factory=list)
+    status: str = PENDING
+    status_at: Optional[float] = None
 
     @field_validator("priority")
     def validate_priority(cls, value: int) -> int:
-        """Validates that the priority is between 1 and 10."""
-        if not 1 <= value <= 10:
-            raise ValueError("Priority must be between 1 and 10")
+        """Validates that the priority is between MIN_PRIORITY and MAX_PRIORITY."""
+        if not cls.MIN_PRIORITY <= value <= cls.MAX_PRIORITY:
+            raise ValueError(
+                f"Priority must be between {cls.MIN_PRIORITY} and {cls.MAX_PRIORITY}"
+            )
         return value
 
     @field_validator("name")
@@ -46,3 +85,38 @@ class Task(BaseModel):
         if not value:
             raise ValueError("Name cannot be empty")
         return value
+
+    @field_validator("tags", mode="before")
+    def validate_tags(cls, value: object) -> List[str]:
+        """
+        Normalizes the tags, also accepting the comma-separated form tasks are stored in.
+        """
+        if isinstance(value, str):
+            value = value.split(",") if value else []
+        tags = sorted({str(tag).strip() for tag in value})
+        for tag in tags:
+            if not tag or "," in tag:
+                raise ValueError("Tags must be non-empty and cannot contain commas")
+        return tags
+
+    @field_validator("status")
+    def validate_status(cls, value: str) -> str:
+        """Validates that the status is one of STATUSES."""
+        if value not in cls.STATUSES:
+            raise ValueError(f"Status must be one of {', '.join(cls.STATUSES)}")
+        return value
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """Checks whether the task has expired at `now` (defaults to the current time).
+
+        Only pending tasks expire: a task a worker has claimed is kept until it ends.
+        """
+        if self.expires_at is None or self.status != self.PENDING:
+            return False
+        return self.expires_at <= (time.time() if now is None else now)
+
+    def is_due(self, now: Optional[float] = None) -> bool:
+        """Checks whether the task is eligible to run at `now` (defaults to the current time)."""
+        if self.run_at is None:
+            return True
+        return self.run_at <= (time.time() if now is None else now)
@@ -0,0 +1,41 @@
+"""
+This module defines the TaskEvent class describing a single mutation of the task store.
+
+Classes:
+    TaskEventType: The kinds of mutation recorded in the change feed.
+    TaskEvent: A Pydantic model representing one entry of the change feed.
+"""
+
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+from src.entities.task import Task
+
+
+class TaskEventType(str, Enum):
+    """The kinds of mutation recorded in the change feed."""
+
+    ADD = "add"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class TaskEvent(BaseModel):
+    """
+    A class used to represent an entry of the change feed.
+
+    Attributes:
+        id (str): The position of the event in the feed, increasing with every mutation.
+        type (TaskEventType): The kind of mutation.
+        task_id (str): The ID of the mutated task.
+        task (Optional[Task]): The task after the mutation, None for deletions.
+        timestamp (float): The time at which the mutation was recorded.
+    """
+
+    id: str
+    type: TaskEventType
+    task_id: str
+    task: Optional[Task] = None
+    timestamp: float
@@ -1,22 +1,69 @@
 """
 This module defines the TaskRepository interface.
+
+Functions:
+    validate_queue_name(name: str) -> str: Checks that a queue name is usable in keys.
 """
 
+import re
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from src.entities.task import Task
+from src.entities.task_event import TaskEvent
+from src.utils.search import matches, task_tokens
+
+DEFAULT_QUEUE = "default"
+
+CONSISTENCY_COUNTS = (
+    "entries",
+    "hashes",
+    "dangling",
+    "orphaned",
+    "mismatched",
+    "repaired",
+)
+
+# The sample_memory() group holding one entry per stored task.
+MEMORY_TASK_GROUP = "task hashes"
+
+_QUEUE_NAME = re.compile(r"[A-Za-z0-9_.-]{1,64}")
+
+
+def validate_queue_name(name: str) -> str:
+    """
+    Check that a queue name is usable in storage keys.
+
+    Args:
+        name (str): The queue name.
+
+    Returns:
+        str: The name, unchanged.
+
+    Raises:
+        ValueError: If the name is empty, too long or has characters other than
+            letters, digits, '_', '.' and '-'.
+    """
+    if not _QUEUE_NAME.fullmatch(name):
+        raise ValueError(
+            f"Invalid queue name {name!r}: use up to 64 letters, digits, '_', '.' or '-'"
+        )
+    return name
 
 
 class TaskRepository(ABC):
     """
     TaskRepository is an abstract base class that defines the interface for a task repository.
 
+    Every repository serves one named queue; for_queue() reaches the others.
+
     Methods:
         add(task: Task) -> None:
             Adds a new task to the repository.
         get_by_id(task_id: str) -> Optional[Task]:
             Retrieves a task by its ID from the repository.
+        get_many(task_ids: List[str]) -> List[Task]:
+            Retrieves several tasks by their IDs from the repository.
         list() -> List[Task]:
             Retrieves all tasks from the repository.
         list_by_priority(min_priority: int, max_priority: int) -> List[Task]:
@@ -25,6 +72,64 @@ class TaskRepository(ABC):
             Deletes a task by its ID from the repository.
         update(task: Task) -> Optional[Task]:
             Updates a task in the repository.
+        delete_many(task_ids: List[str], progress: Optional[Callable[[int], None]]) -> int:
+            Deletes several tasks by their IDs from the repository.
+        delete_by_priority(min_priority: int, max_priority: int,
+                           progress: Optional[Callable[[int], None]]) -> int:
+            Deletes all tasks within a priority range from the repository.
+        delete_older_than(timestamp: float, progress: Optional[Callable[[int], None]]) -> int:
+            Deletes the queued tasks created before a timestamp from the repository.
+        prune_expired(now: float, batch_size: int) -> int:
+            Deletes at most one batch of expired tasks from the repository.
+        iter_by_priority(min_priority: int, max_priority: int, batch_size: Optional[int])
+                -> Iterator[Task]:
+            Streams tasks within a priority range from the repository.
+        iter_by_tags(tags: Iterable[str], min_priority: int, max_priority: int,
+                     batch_size: Optional[int]) -> Iterator[Task]:
+            Streams the tasks carrying every given tag within a priority range.
+        search(clauses: List[List[str]], offset: int, limit: int) -> Tuple[List[Task], int]:
+            Returns one page of the tasks matching a parsed search query.
+        add_many(tasks: Iterable[Task]) -> int:
+            Adds several tasks to the repository.
+        iter_all(batch_size: Optional[int]) -> Iterator[Task]:
+            Streams every stored task, whether or not it is in the priority index.
+        band_heads() -> Dict[int, float]:
+            Returns the creation timestamp of the oldest task of each priority band.
+        pop_from_band(priority: int, now: float, claim: bool) -> Optional[Task]:
+            Removes and returns the oldest unexpired task of a priority band.
+        transition(task_ids: List[str], status: str, from_statuses: Iterable[str],
+                   now: float) -> List[Task]:
+            Moves tasks to another status and to the index of that status.
+        iter_by_status(status: str, before: Optional[float], batch_size: Optional[int])
+                -> Iterator[Task]:
+            Streams the tasks of a status other than "pending".
+        delete_in_status(task_ids: List[str], statuses: Iterable[str]) -> int:
+            Deletes the given tasks that still have one of the given statuses.
+        promote_due(now: float, batch_size: int) -> int:
+            Moves at most one batch of due delayed tasks into the queue.
+        for_queue(queue: str) -> TaskRepository:
+            Returns a repository over another queue of the same storage.
+        queue_counts() -> Dict[str, Dict[str, int]]:
+            Returns the number of queued and delayed tasks of every known queue.
+        move_to_queue(task_ids: List[str], queue: str) -> int:
+            Moves tasks to another queue, each one atomically.
+        check_consistency(repair: bool, on_issue: Optional[Callable[[str, str], None]])
+                -> Dict[str, int]:
+            Checks that the stored tasks and their indexes agree.
+        sample_memory(sample_size: int) -> Dict[str, Any]:
+            Measures the memory used by the store, sampling the keys it has many of.
+        add_if_absent(keyed_tasks: Iterable[Tuple[str, Task]], ttl: float)
+                -> List[Tuple[Task, bool]]:
+            Adds the tasks whose deduplication key was not seen within `ttl` seconds.
+        latest_event_id() -> str:
+            Returns the ID of the most recent change feed event.
+        read_events(after_id: str, count: int, block: Optional[float]) -> List[TaskEvent]:
+            Reads change feed events recorded after an event ID.
+        read_group_events(group: str, consumer: str, count: int, block: Optional[float],
+                          pending: bool) -> List[TaskEvent]:
+            Reads change feed events on behalf of a consumer group member.
+        ack_events(group: str, event_ids: List[str]) -> int:
+            Acknowledges change feed events processed by a consumer group.
     """
 
     @abstractmethod
@@ -56,6 +161,21 @@ class TaskRepository(ABC):
         """
         raise NotImplementedError("Method 'get_by_id' must be implemented.")
 
+    def get_many(self, task_ids: List[str]) -> List[Task]:
+        """
+        Retrieves several tasks by their IDs from the repository.
+
+        The default implementation calls get_by_id() for each ID; repositories
+        backed by remote storage should override it to fetch tasks in batches.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to retrieve.
+
+        Returns:
+            List[Task]: The tasks that exist, in the order of `task_ids`.
+        """
+        return [task for task in map(self.get_by_id, task_ids) if task is not None]
+
     @abstractmethod
     def list(self) -> List[Task]:
         """
@@ -117,3 +237,528 @@ class TaskRepository(ABC):
             NotImplementedError: This method must be implemented in a subclass.
         """
         raise NotImplementedError("Method 'update' must be implemented.")
+
+    @abstractmethod
+    def delete_many(
+        self, task_ids: List[str], progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Deletes several tasks by their IDs from the repository.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to delete.
+            progress (Optional[Callable[[int], None]]): Called with the number of
+                tasks deleted after each processed batch.
+
+        Returns:
+            int: The number of tasks that were actually deleted.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'delete_many' must be implemented.")
+
+    @abstractmethod
+    def delete_by_priority(
+        self,
+        min_priority: int,
+        max_priority: int,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Deletes all tasks within a priority range from the repository.
+
+        Args:
+            min_priority (int): The minimum priority.
+            max_priority (int): The maximum priority.
+            progress (Optional[Callable[[int], None]]): Called with the number of
+                tasks deleted after each processed batch.
+
+        Returns:
+            int: The number of tasks that were actually deleted.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'delete_by_priority' must be implemented.")
+
+    @abstractmethod
+    def delete_older_than(
+        self, timestamp: float, progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Deletes the queued tasks created before a timestamp from the repository.
+
+        Args:
+            timestamp (float): Tasks with a creation timestamp lower than this are deleted.
+            progress (Optional[Callable[[int], None]]): Called with the number of
+                tasks deleted after each processed batch.
+
+        Returns:
+            int: The number of tasks that were actually deleted.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'delete_older_than' must be implemented.")
+
+    @abstractmethod
+    def prune_expired(self, now: float, batch_size: int) -> int:
+        """
+        Deletes at most one batch of tasks that expired at or before `now`.
+
+        Args:
+            now (float): The reference timestamp.
+            batch_size (int): The maximum number of tasks to delete.
+
+        Returns:
+            int: The number of expiry index entries removed, counting entries whose
+                task was already gone; fewer than `batch_size` means none are left.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'prune_expired' must be implemented.")
+
+    def iter_by_priority(
+        self,
+        min_priority: int = Task.MIN_PRIORITY,
+        max_priority: int = Task.MAX_PRIORITY,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """
+        Streams tasks within a priority range from the repository.
+
+        The default implementation materializes `list_by_priority()`; repositories
+        backed by remote storage should override it to fetch tasks in batches.
+
+        Args:
+            min_priority (int): The minimum priority.
+            max_priority (int): The maximum priority.
+            batch_size (Optional[int]): The number of tasks fetched per batch.
+
+        Yields:
+            Task: The next task within the priority range.
+        """
+        yield from self.list_by_priority(min_priority, max_priority)
+
+    def iter_by_tags(
+        self,
+        tags: Iterable[str],
+        min_priority: int = Task.MIN_PRIORITY,
+        max_priority: int = Task.MAX_PRIORITY,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """
+        Streams the tasks carrying every given tag within a priority range.
+
+        The default implementation filters `iter_by_priority()`; repositories that
+        index tags should override it to intersect their tag indexes instead.
+
+        Args:
+            tags (Iterable[str]): The tags every returned task must carry.
+            min_priority (int): The minimum priority.
+            max_priority (int): The maximum priority.
+            batch_size (Optional[int]): The number of tasks fetched per batch.
+
+        Yields:
+            Task: The next matching task, in priority order.
+        """
+        required = set(tags)
+        for task in self.iter_by_priority(min_priority, max_priority, batch_size):
+            if required.issubset(task.tags):
+                yield task
+
+    def search(
+        self, clauses: List[List[str]], offset: int = 0, limit: int = 20
+    ) -> Tuple[List[Task], int]:
+        """
+        Returns one page of the tasks matching a parsed search query.
+
+        The default implementation scans `iter_by_priority()`; repositories that keep
+        an inverted index should override it to read only the matching tasks.
+
+        Args:
+            clauses (List[List[str]]): The query, see src.utils.search.parse_query().
+            offset (int): The number of ranked matches to skip.
+            limit (int): The maximum number of tasks to return.
+
+        Returns:
+            Tuple[List[Task], int]: The tasks of the page, highest priority and then
+                oldest first, and the total number of matches.
+        """
+        found = [
+            task
+            for task in self.iter_by_priority()
+            if matches(clauses, task_tokens(task.name, task.description))
+        ]
+        found.sort(key=lambda task: (-task.priority, task.timestamp, task.id))
+        return found[offset : offset + limit], len(found)
+
+    def add_many(self, tasks: Iterable[Task]) -> int:
+        """
+        Adds several tasks to the repository.
+
+        The default implementation calls add() for each task; repositories backed by
+        remote storage should override it to write tasks in batches.
+
+        Args:
+            tasks (Iterable[Task]): The tasks to add.
+
+        Returns:
+            int: The number of tasks added.
+        """
+        count = 0
+        for task in tasks:
+            self.add(task)
+            count += 1
+        return count
+
+    def iter_all(self, batch_size: Optional[int] = None) -> Iterator[Task]:
+        """
+        Streams every stored task, whether or not it is in the priority index.
+
+        The default implementation streams the priority index.
+
+        Args:
+            batch_size (Optional[int]): The number of tasks fetched per batch.
+
+        Yields:
+            Task: The next stored task, in no particular order.
+        """
+        yield from self.iter_by_priority(batch_size=batch_size)
+
+    @abstractmethod
+    def band_heads(self) -> Dict[int, float]:
+        """
+        Returns the creation timestamp of the oldest task of each priority band.
+
+        Each priority is a FIFO sub-queue ordered by creation time; schedulers use the
+        heads to decide which band to dequeue from next.
+
+        Returns:
+            Dict[int, float]: The oldest timestamp keyed by priority, for non-empty bands.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'band_heads' must be implemented.")
+
+    @abstractmethod
+    def pop_from_band(
+        self, priority: int, now: float, claim: bool = False
+    ) -> Optional[Task]:
+        """
+        Atomically removes and returns the oldest unexpired task of a priority band.
+
+        Expired tasks found at the head of the band are deleted on the way. The
+        removal is published as a delete event, like any other deletion. A claimed
+        task is kept instead, moved to the "running" status and published as an
+        update event.
+
+        Args:
+            priority (int): The priority band to dequeue from.
+            now (float): The reference timestamp for expiry.
+            claim (bool): Whether to keep the task as running rather than delete it.
+
+        Returns:
+            Optional[Task]: The dequeued task, or None if the band holds no unexpired task.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'pop_from_band' must be implemented.")
+
+    @abstractmethod
+    def transition(
+        self, task_ids: List[str], status: str, from_statuses: Iterable[str], now: float
+    ) -> List[Task]:
+        """
+        Atomically moves tasks to another status and to the index of that status.
+
+        A "pending" task goes back to the priority index, or to the delayed index
+        until its `run_at`; other statuses each have an index ordered by `status_at`.
+        Each change is published as an update event.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to move.
+            status (str): The new status.
+            from_statuses (Iterable[str]): The statuses a task must have to be moved;
+                other tasks are left unchanged.
+            now (float): The timestamp recorded as `status_at`.
+
+        Returns:
+            List[Task]: The tasks that were moved, as stored afterwards.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'transition' must be implemented.")
+
+    @abstractmethod
+    def iter_by_status(
+        self,
+        status: str,
+        before: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """
+        Streams the tasks of a status other than "pending", oldest status change first.
+
+        Args:
+            status (str): "running", "done" or "failed".
+            before (Optional[float]): When given, only tasks whose status changed
+                before this timestamp are returned.
+            batch_size (Optional[int]): The number of tasks fetched per batch.
+
+        Yields:
+            Task: The next task of that status.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'iter_by_status' must be implemented.")
+
+    @abstractmethod
+    def delete_in_status(self, task_ids: List[str], statuses: Iterable[str]) -> int:
+        """
+        Deletes the given tasks that still have one of the given statuses.
+
+        The check and the deletion are atomic, so a task moved to another status
+        after it was read is never deleted.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to delete.
+            statuses (Iterable[str]): The statuses a task must have to be deleted.
+
+        Returns:
+            int: The number of tasks deleted.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'delete_in_status' must be implemented.")
+
+    @abstractmethod
+    def promote_due(self, now: float, batch_size: int) -> int:
+        """
+        Moves at most one batch of delayed tasks whose `run_at` is at or before `now`
+        into the priority index and their priority band.
+
+        Tasks added with a future `run_at` are stored but left out of the queue, so
+        listings and dequeues ignore them until they are promoted.
+
+        Args:
+            now (float): The reference timestamp.
+            batch_size (int): The maximum number of tasks to promote.
+
+        Returns:
+            int: The number of delayed index entries processed, counting entries whose
+                task was already gone; fewer than `batch_size` means none are due.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'promote_due' must be implemented.")
+
+    @abstractmethod
+    @abstractmethod
+    def for_queue(self, queue: str) -> "TaskRepository":
+        """
+        Returns a repository over another queue of the same storage.
+
+        Args:
+            queue (str): The queue name.
+
+        Returns:
+            TaskRepository: The repository of that queue.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'for_queue' must be implemented.")
+
+    @abstractmethod
+    def queue_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns the number of tasks of every known queue of the storage.
+
+        Returns:
+            Dict[str, Dict[str, int]]: For each queue name, the number of "queued" and
+                "delayed" tasks, counting expired tasks not yet pruned.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'queue_counts' must be implemented.")
+
+    @abstractmethod
+    def move_to_queue(self, task_ids: List[str], queue: str) -> int:
+        """
+        Moves tasks to another queue, keeping their IDs.
+
+        Each task is moved atomically: it is never visible in both queues or in neither.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to move.
+            queue (str): The name of the destination queue.
+
+        Returns:
+            int: The number of tasks that existed and were moved.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'move_to_queue' must be implemented.")
+
+    def check_consistency(
+        self,
+        repair: bool = False,
+        on_issue: Optional[Callable[[str, str], None]] = None,
+    ) -> Dict[str, int]:
+        """
+        Checks that the stored tasks and their indexes agree, optionally repairing them.
+
+        The default implementation finds nothing to check: it suits stores whose
+        indexes are updated together with the tasks and so cannot diverge.
+
+        Args:
+            repair (bool): Whether to fix the inconsistencies found.
+            on_issue (Optional[Callable[[str, str], None]]): Called with the kind of
+                each inconsistency, "dangling", "orphaned" or "mismatched", and the
+                task ID.
+
+        Returns:
+            Dict[str, int]: The number of index "entries" and task "hashes" checked,
+                of "dangling" entries without a task, of "orphaned" tasks missing
+                from every index, of "mismatched" entries, and of tasks "repaired".
+        """
+        return dict.fromkeys(CONSISTENCY_COUNTS, 0)
+
+    @abstractmethod
+    def sample_memory(self, sample_size: int = 1000) -> Dict[str, Any]:
+        """
+        Measures the memory used by the store, sampling the keys it has many of.
+
+        Args:
+            sample_size (int): The maximum number of keys of each group measured.
+
+        Returns:
+            Dict[str, Any]: "tasks", the number of stored tasks; "groups", which maps
+                each kind of key the store has many of, such as MEMORY_TASK_GROUP, to
+                its estimated "count" of keys and the "sizes" in bytes and "encodings"
+                of the sampled keys; "structures", which maps each other structure to
+                its size in bytes; and "settings", the store settings that choose an
+                encoding.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'sample_memory' must be implemented.")
+
+    @abstractmethod
+    def add_if_absent(
+        self, keyed_tasks: Iterable[Tuple[str, Task]], ttl: float
+    ) -> List[Tuple[Task, bool]]:
+        """
+        Adds each task unless its deduplication key was recorded within the last `ttl`
+        seconds, atomically with respect to concurrent submissions of the same key.
+
+        The deduplication index keeps the task as it was first submitted, so a
+        duplicate gets the original task back even after it was dequeued or deleted.
+
+        Args:
+            keyed_tasks (Iterable[Tuple[str, Task]]): The deduplication key and task of
+                each submission.
+            ttl (float): The number of seconds a key is remembered.
+
+        Returns:
+            List[Tuple[Task, bool]]: For each submission in order, the stored task and
+                whether it was added by this call.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'add_if_absent' must be implemented.")
+
+    @abstractmethod
+    def latest_event_id(self) -> str:
+        """
+        Returns the ID of the most recent change feed event.
+
+        Returns:
+            str: The event ID, or "0-0" if no event was recorded yet.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'latest_event_id' must be implemented.")
+
+    @abstractmethod
+    def read_events(
+        self, after_id: str, count: int = 100, block: Optional[float] = None
+    ) -> List[TaskEvent]:
+        """
+        Reads change feed events recorded after an event ID.
+
+        Args:
+            after_id (str): Only events with a greater ID are returned.
+            count (int): The maximum number of events to return.
+            block (Optional[float]): Seconds to wait for new events when none are available.
+
+        Returns:
+            List[TaskEvent]: The events in feed order.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'read_events' must be implemented.")
+
+    @abstractmethod
+    def read_group_events(
+        self,
+        group: str,
+        consumer: str,
+        count: int = 100,
+        block: Optional[float] = None,
+        pending: bool = False,
+    ) -> List[TaskEvent]:
+        """
+        Reads change feed events on behalf of a consumer group member.
+
+        Each event is delivered to only one consumer of a group, and stays pending for
+        that consumer until it is acknowledged. A group that does not exist yet is
+        created and receives the events recorded from then on.
+
+        Args:
+            group (str): The consumer group name.
+            consumer (str): The consumer name within the group.
+            count (int): The maximum number of events to return.
+            block (Optional[float]): Seconds to wait for new events when none are available.
+            pending (bool): Re-read events delivered to this consumer but not acknowledged
+                instead of new events.
+
+        Returns:
+            List[TaskEvent]: The events in feed order.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'read_group_events' must be implemented.")
+
+    @abstractmethod
+    def ack_events(self, group: str, event_ids: List[str]) -> int:
+        """
+        Acknowledges change feed events processed by a consumer group.
+
+        Args:
+            group (str): The consumer group name.
+            event_ids (List[str]): The IDs of the processed events.
+
+        Returns:
+            int: The number of events that were pending and are now acknowledged.
+
+        Raises:
+            NotImplementedError: This method must be implemented in a subclass.
+        """
+        raise NotImplementedError("Method 'ack_events' must be implemented.")
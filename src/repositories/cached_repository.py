@@ -0,0 +1,520 @@
+"""
+This module implements a TaskRepository decorator caching task reads in process memory.
+
+Classes:
+    CachedTaskRepository: Serves get_by_id() and get_many() from a local LRU cache kept
+        in line with the change feed of the wrapped repository.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from src.entities.task import Task
+from src.entities.task_event import TaskEvent, TaskEventType
+from src.repositories.base_repository import TaskRepository
+
+CACHE_STATS = ("hits", "misses", "evictions", "expirations", "invalidations", "resets")
+
+
+class CachedTaskRepository(TaskRepository):
+    """
+    A TaskRepository that caches the tasks read by ID in front of another repository.
+
+    Entries are evicted least recently used first once `max_size` tasks are cached,
+    and dropped `ttl` seconds after they were stored. Writes made through this
+    repository update or drop their entries at once. Changes made elsewhere, by other
+    processes or other repositories of the same storage, are learned from the change
+    feed: at most every `max_staleness` seconds, a read first applies the events
+    recorded since the previous one, replacing the cached tasks that were updated and
+    dropping those that were deleted. A read therefore returns a task at most
+    `max_staleness` seconds older than the stored one. When a sync finds a full
+    batch of `sync_batch` events waiting, which also covers events trimmed from the
+    feed, the whole cache is cleared instead.
+
+    Each change applied bumps a generation counter, and a task fetched on a miss is
+    only stored if the generation did not move during the fetch, so a read racing a
+    change never caches the task as it was before that change.
+
+    Only get_by_id() and get_many() are cached; every other method is delegated to
+    the wrapped repository. Cached tasks are copied on the way in and out, so callers
+    may change the tasks they receive. The cache may be shared by threads.
+
+    Methods:
+        get_by_id(task_id: str) -> Optional[Task]: Retrieves a task, from the cache if
+            possible.
+        get_many(task_ids: List[str]) -> List[Task]: Retrieves several tasks, fetching
+            only the ones missing from the cache.
+        sync() -> None: Applies the change feed events recorded since the last sync.
+        clear() -> None: Drops every cached task.
+        stats() -> Dict[str, Any]: Returns the hit, miss and eviction counters.
+    """
+
+    def __init__(
+        self,
+        repository: TaskRepository,
+        max_size: int = 10000,
+        ttl: Optional[float] = 300.0,
+        max_staleness: Optional[float] = 1.0,
+        sync_batch: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initializes the cache in front of a repository.
+
+        Args:
+            repository (TaskRepository): The repository whose reads are cached.
+            max_size (int): The maximum number of cached tasks.
+            ttl (Optional[float]): Seconds a task stays cached, None to keep it until
+                it is evicted or changed.
+            max_staleness (Optional[float]): Seconds between change feed syncs, 0 to
+                sync before every read, None to rely on `ttl` alone.
+            sync_batch (int): The number of events read per sync; a full batch clears
+                the cache. It must not exceed the length of the change feed.
+            clock (Callable[[], float]): The time source, in seconds.
+
+        Raises:
+            ValueError: If `max_size` or `sync_batch` is below 1, or `ttl` or
+                `max_staleness` is negative.
+        """
+        if max_size < 1 or sync_batch < 1:
+            raise ValueError("max_size and sync_batch must be at least 1")
+        if (ttl is not None and ttl < 0) or (
+            max_staleness is not None and max_staleness < 0
+        ):
+            raise ValueError("ttl and max_staleness must not be negative")
+        self.repository: TaskRepository = repository
+        self.max_size: int = max_size
+        self.ttl: Optional[float] = ttl
+        self.max_staleness: Optional[float] = max_staleness
+        self.sync_batch: int = sync_batch
+        self.clock: Callable[[], float] = clock
+        self._entries: "OrderedDict[str, Tuple[Task, float]]" = OrderedDict()
+        self._counters: Dict[str, int] = dict.fromkeys(CACHE_STATS, 0)
+        self._generation: int = 0
+        self._lock = threading.Lock()
+        self._syncing = threading.Lock()
+        self._event_id: str = repository.latest_event_id()
+        self._synced_at: float = clock()
+
+    def get_by_id(self, task_id: str) -> Optional[Task]:
+        """
+        Retrieves a task by its ID, from the cache if it holds the task.
+
+        Args:
+            task_id (str): The ID of the task to retrieve.
+
+        Returns:
+            Optional[Task]: The task, or None if not found or expired.
+        """
+        self._sync_if_due()
+        with self._lock:
+            task = self._lookup(task_id)
+            generation = self._generation
+        if task is not None:
+            return task
+        task = self.repository.get_by_id(task_id)
+        if task is not None:
+            self._fill([task], generation)
+        return task
+
+    def get_many(self, task_ids: List[str]) -> List[Task]:
+        """
+        Retrieves several tasks by their IDs, fetching only those missing from the cache.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to retrieve.
+
+        Returns:
+            List[Task]: The tasks that exist and have not expired, in the order of
+                `task_ids`.
+        """
+        self._sync_if_due()
+        unique = list(dict.fromkeys(task_ids))
+        with self._lock:
+            found = {}
+            for task_id in unique:
+                task = self._lookup(task_id)
+                if task is not None:
+                    found[task_id] = task
+            generation = self._generation
+        missing = [task_id for task_id in unique if task_id not in found]
+        if missing:
+            fetched = self.repository.get_many(missing)
+            self._fill(fetched, generation)
+            found.update((task.id, task) for task in fetched)
+        return [found[task_id] for task_id in task_ids if task_id in found]
+
+    def sync(self) -> None:
+        """
+        Applies the change feed events recorded since the last sync to the cache.
+        """
+        with self._syncing:
+            self._sync()
+
+    def clear(self) -> None:
+        """
+        Drops every cached task.
+        """
+        with self._lock:
+            self._reset()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            Dict[str, Any]: The number of "hits", "misses", LRU "evictions", TTL
+                "expirations", "invalidations" by changes and cache "resets"; the
+                current "size"; and the "hit_rate" of the lookups so far.
+        """
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._counters)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def add(self, task: Task) -> None:
+        """Adds a task to the wrapped repository and caches it."""
+        self.repository.add(task)
+        self._store([task])
+
+    def list(self) -> List[Task]:
+        """Retrieves all tasks from the wrapped repository."""
+        return self.repository.list()
+
+    def list_by_priority(self, min_priority: int, max_priority: int) -> List[Task]:
+        """Retrieves tasks within a priority range from the wrapped repository."""
+        return self.repository.list_by_priority(min_priority, max_priority)
+
+    def delete(self, task_id: str) -> bool:
+        """Deletes a task from the wrapped repository and from the cache."""
+        deleted = self.repository.delete(task_id)
+        self._invalidate([task_id])
+        return deleted
+
+    def update(self, task: Task) -> Optional[Task]:
+        """Updates a task in the wrapped repository and caches the result."""
+        updated = self.repository.update(task)
+        if updated is None:
+            self._invalidate([task.id])
+        else:
+            self._store([updated])
+        return updated
+
+    def delete_many(
+        self, task_ids: List[str], progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """Deletes several tasks from the wrapped repository and from the cache."""
+        deleted = self.repository.delete_many(task_ids, progress)
+        self._invalidate(task_ids)
+        return deleted
+
+    def delete_by_priority(
+        self,
+        min_priority: int,
+        max_priority: int,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """Deletes tasks within a priority range and clears the cache."""
+        deleted = self.repository.delete_by_priority(
+            min_priority, max_priority, progress
+        )
+        self.clear()
+        return deleted
+
+    def delete_older_than(
+        self, timestamp: float, progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """Deletes tasks created before a timestamp and clears the cache."""
+        deleted = self.repository.delete_older_than(timestamp, progress)
+        self.clear()
+        return deleted
+
+    def prune_expired(self, now: float, batch_size: int) -> int:
+        """Deletes one batch of expired tasks; expired tasks are never served."""
+        return self.repository.prune_expired(now, batch_size)
+
+    def iter_by_priority(
+        self,
+        min_priority: int = Task.MIN_PRIORITY,
+        max_priority: int = Task.MAX_PRIORITY,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """Streams tasks within a priority range from the wrapped repository."""
+        return self.repository.iter_by_priority(min_priority, max_priority, batch_size)
+
+    def iter_by_tags(
+        self,
+        tags: Iterable[str],
+        min_priority: int = Task.MIN_PRIORITY,
+        max_priority: int = Task.MAX_PRIORITY,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """Streams tagged tasks from the wrapped repository."""
+        return self.repository.iter_by_tags(
+            tags, min_priority, max_priority, batch_size
+        )
+
+    def search(
+        self, clauses: List[List[str]], offset: int = 0, limit: int = 20
+    ) -> Tuple[List[Task], int]:
+        """Searches the wrapped repository."""
+        return self.repository.search(clauses, offset, limit)
+
+    def add_many(self, tasks: Iterable[Task]) -> int:
+        """Adds several tasks to the wrapped repository and caches them."""
+        added = list(tasks)
+        count = self.repository.add_many(added)
+        self._store(added)
+        return count
+
+    def iter_all(self, batch_size: Optional[int] = None) -> Iterator[Task]:
+        """Streams every task of the wrapped repository."""
+        return self.repository.iter_all(batch_size)
+
+    def band_heads(self) -> Dict[int, float]:
+        """Returns the band heads of the wrapped repository."""
+        return self.repository.band_heads()
+
+    def pop_from_band(
+        self, priority: int, now: float, claim: bool = False
+    ) -> Optional[Task]:
+        """Dequeues or claims a task, caching a claimed task and dropping a removed one."""
+        task = self.repository.pop_from_band(priority, now, claim)
+        if task is not None:
+            if claim:
+                self._store([task])
+            else:
+                self._invalidate([task.id])
+        return task
+
+    def transition(
+        self, task_ids: List[str], status: str, from_statuses: Iterable[str], now: float
+    ) -> List[Task]:
+        """Moves tasks to another status and caches them as stored afterwards."""
+        moved = self.repository.transition(task_ids, status, from_statuses, now)
+        self._store(moved)
+        return moved
+
+    def iter_by_status(
+        self,
+        status: str,
+        before: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """Streams the tasks of a status from the wrapped repository."""
+        return self.repository.iter_by_status(status, before, batch_size)
+
+    def delete_in_status(self, task_ids: List[str], statuses: Iterable[str]) -> int:
+        """Deletes the tasks still in one of the statuses and drops them from the cache."""
+        deleted = self.repository.delete_in_status(task_ids, statuses)
+        self._invalidate(task_ids)
+        return deleted
+
+    def promote_due(self, now: float, batch_size: int) -> int:
+        """Promotes due delayed tasks of the wrapped repository."""
+        return self.repository.promote_due(now, batch_size)
+
+    def add_if_absent(
+        self, keyed_tasks: Iterable[Tuple[str, Task]], ttl: float
+    ) -> List[Tuple[Task, bool]]:
+        """Adds the tasks whose deduplication key is new and caches them."""
+        results = self.repository.add_if_absent(keyed_tasks, ttl)
+        self._store([task for task, added in results if added])
+        return results
+
+    def for_queue(self, queue: str) -> "TaskRepository":
+        """
+        Returns a cached repository over another queue, with a cache of its own.
+        """
+        repository = self.repository.for_queue(queue)
+        if repository is self.repository:
+            return self
+        return CachedTaskRepository(
+            repository,
+            self.max_size,
+            self.ttl,
+            self.max_staleness,
+            self.sync_batch,
+            self.clock,
+        )
+
+    def queue_counts(self) -> Dict[str, Dict[str, int]]:
+        """Returns the task counts of every queue of the wrapped storage."""
+        return self.repository.queue_counts()
+
+    def move_to_queue(self, task_ids: List[str], queue: str) -> int:
+        """Moves tasks to another queue and drops them from the cache."""
+        moved = self.repository.move_to_queue(task_ids, queue)
+        self._invalidate(task_ids)
+        return moved
+
+    def check_consistency(
+        self,
+        repair: bool = False,
+        on_issue: Optional[Callable[[str, str], None]] = None,
+    ) -> Dict[str, int]:
+        """Checks the wrapped repository, clearing the cache after a repair."""
+        report = self.repository.check_consistency(repair, on_issue)
+        if repair:
+            self.clear()
+        return report
+
+    def sample_memory(self, sample_size: int = 1000) -> Dict[str, Any]:
+        """Measures the memory used by the wrapped repository."""
+        return self.repository.sample_memory(sample_size)
+
+    def latest_event_id(self) -> str:
+        """Returns the ID of the most recent change feed event."""
+        return self.repository.latest_event_id()
+
+    def read_events(
+        self, after_id: str, count: int = 100, block: Optional[float] = None
+    ) -> List[TaskEvent]:
+        """Reads change feed events from the wrapped repository."""
+        return self.repository.read_events(after_id, count, block)
+
+    def read_group_events(
+        self,
+        group: str,
+        consumer: str,
+        count: int = 100,
+        block: Optional[float] = None,
+        pending: bool = False,
+    ) -> List[TaskEvent]:
+        """Reads change feed events for a consumer group from the wrapped repository."""
+        return self.repository.read_group_events(group, consumer, count, block, pending)
+
+    def ack_events(self, group: str, event_ids: List[str]) -> int:
+        """Acknowledges consumed change feed events."""
+        return self.repository.ack_events(group, event_ids)
+
+    def _sync_if_due(self) -> None:
+        """
+        Syncs with the change feed when the last sync is older than `max_staleness`.
+        """
+        if self.max_staleness is None:
+            return
+        if self.clock() - self._synced_at < self.max_staleness:
+            return
+        with self._syncing:
+            # Another thread may have synced while this one waited.
+            if self.clock() - self._synced_at >= self.max_staleness:
+                self._sync()
+
+    def _sync(self) -> None:
+        """
+        Reads the events recorded since the last sync and applies them to the cache.
+
+        The caller holds `_syncing`, so syncs never interleave.
+        """
+        started = self.clock()
+        events = self.repository.read_events(self._event_id, self.sync_batch)
+        if len(events) >= self.sync_batch:
+            # Too far behind, or the feed was trimmed past the last event seen.
+            latest = self.repository.latest_event_id()
+            with self._lock:
+                self._reset()
+            self._event_id = latest
+        elif events:
+            with self._lock:
+                self._generation += 1
+                for event in events:
+                    self._apply(event)
+            self._event_id = events[-1].id
+        self._synced_at = started
+
+    def _apply(self, event: TaskEvent) -> None:
+        """
+        Brings the cached copy of the task of one event up to date.
+
+        The caller holds `_lock`. Tasks that are not cached are left out.
+        """
+        if event.task_id not in self._entries:
+            return
+        if event.type == TaskEventType.DELETE or event.task is None:
+            del self._entries[event.task_id]
+            self._counters["invalidations"] += 1
+        else:
+            self._entries[event.task_id] = (event.task, self._entries[event.task_id][1])
+
+    def _lookup(self, task_id: str) -> Optional[Task]:
+        """
+        Returns a copy of a cached task and counts the hit or miss.
+
+        The caller holds `_lock`.
+        """
+        entry = self._entries.get(task_id)
+        if entry is not None and entry[1] <= self.clock():
+            del self._entries[task_id]
+            self._counters["expirations"] += 1
+            entry = None
+        if entry is None or entry[0].is_expired():
+            self._counters["misses"] += 1
+            return None
+        self._entries.move_to_end(task_id)
+        self._counters["hits"] += 1
+        return entry[0].model_copy(deep=True)
+
+    def _fill(self, tasks: List[Task], generation: int) -> None:
+        """
+        Caches tasks fetched on a miss, unless a change was applied during the fetch.
+        """
+        with self._lock:
+            if generation == self._generation:
+                self._put(tasks)
+
+    def _store(self, tasks: List[Task]) -> None:
+        """
+        Caches tasks just written through this repository.
+
+        Bumping the generation keeps reads that started before the write from
+        caching the task as it was.
+        """
+        with self._lock:
+            self._generation += 1
+            self._put(tasks)
+
+    def _invalidate(self, task_ids: Iterable[str]) -> None:
+        """
+        Drops tasks just changed or deleted through this repository.
+        """
+        with self._lock:
+            self._generation += 1
+            for task_id in task_ids:
+                if self._entries.pop(task_id, None) is not None:
+                    self._counters["invalidations"] += 1
+
+    def _put(self, tasks: List[Task]) -> None:
+        """
+        Stores copies of tasks, evicting the least recently used ones beyond `max_size`.
+
+        The caller holds `_lock`.
+        """
+        expires_at = float("inf") if self.ttl is None else self.clock() + self.ttl
+        for task in tasks:
+            self._entries[task.id] = (task.model_copy(deep=True), expires_at)
+            self._entries.move_to_end(task.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _reset(self) -> None:
+        """
+        Drops every entry and invalidates the reads in flight; the caller holds `_lock`.
+        """
+        self._entries.clear()
+        self._generation += 1
+        self._counters["resets"] += 1
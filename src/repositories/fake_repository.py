@@ -6,30 +6,177 @@ Classes:
 
 """
 
-from typing import List, Optional
+import bisect
+import heapq
+import random
+import sys
+import threading
+import time
+from collections import deque
+from functools import wraps
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from src.entities.task import Task
-from src.repositories.base_repository import TaskRepository
+from src.entities.task_event import TaskEvent, TaskEventType
+from src.repositories.base_repository import (
+    DEFAULT_QUEUE,
+    MEMORY_TASK_GROUP,
+    TaskRepository,
+    validate_queue_name,
+)
+from src.utils.memory import deep_sizeof
+from src.utils.search import PREFIX_MARK, task_tokens
+
+
+def _locked(method: Callable) -> Callable:
+    """
+    Runs a store method while holding the lock of its queue.
+    """
+
+    @wraps(method)
+    def locked(self: "FakeTaskRepository", *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return locked
+
+
+def _index_score(task: Task) -> float:
+    """
+    The score of a task in the Redis priority index, `priority + timestamp / 1e10`.
+
+    Index entries are (score, ID) pairs, so tasks come back in the order of the Redis
+    sorted set, ties on score included.
+    """
+    return task.priority + task.timestamp / 1e10
+
+
+def _snapshot(task: Task) -> Task:
+    """
+    Copies a task crossing the store boundary, so it shares no state with the store.
+    """
+    return task.model_copy(deep=True)
 
 
 class FakeTaskRepository(TaskRepository):
     """
     An in-memory implementation of the TaskRepository interface for testing.
 
+    The store may be shared by threads. Each queue has its own re-entrant lock, held
+    by every operation on it; a move holds the locks of both queues, taken in name
+    order. Tasks are copied on the way in and out, so a caller changing a task it
+    was given or passed in never changes the store, and streaming methods copy
+    their matches under the lock before yielding them, so callers never see an
+    index halfway through a change.
+
     Methods:
         add(task: Task) -> None: Adds a new task to the in-memory store.
         get_by_id(task_id: str) -> Optional[Task]: Retrieves a task by its ID from the in-memory store.
+        get_many(task_ids: List[str]) -> List[Task]: Retrieves several tasks by their IDs.
         list() -> List[Task]: Retrieves all tasks from the in-memory store.
         list_by_priority(min_priority: int, max_priority: int) -> List[Task]: Retrieves tasks within a priority range from the in-memory store.
         delete(task_id: str) -> bool: Deletes a task by its ID from the in-memory store.
         update(task: Task) -> Optional[Task]: Updates a task in the in-memory store.
+        delete_many(task_ids: List[str], progress) -> int: Deletes several tasks by their IDs.
+        delete_by_priority(min_priority: int, max_priority: int, progress) -> int: Deletes tasks
+            within a priority range.
+        delete_older_than(timestamp: float, progress) -> int: Deletes tasks created before
+            a timestamp.
+        prune_expired(now: float, batch_size: int) -> int: Deletes one batch of expired tasks.
+        latest_event_id() -> str: Returns the ID of the most recent change feed event.
+        read_events(after_id: str, count: int, block: Optional[float]) -> List[TaskEvent]:
+            Reads change feed events recorded after an event ID.
+        read_group_events(group: str, consumer: str, count: int, block: Optional[float],
+            pending: bool) -> List[TaskEvent]: Reads change feed events for a consumer group.
+        ack_events(group: str, event_ids: List[str]) -> int: Acknowledges consumed events.
+        add_many(tasks: Iterable[Task]) -> int: Adds several tasks, sorting the index once.
+        iter_all(batch_size: Optional[int]) -> Iterator[Task]: Streams every stored task.
+        iter_by_tags(tags: Iterable[str], min_priority: int, max_priority: int,
+            batch_size: Optional[int]) -> Iterator[Task]: Streams the queued tasks carrying
+            every given tag, intersecting the per-tag sets smallest first.
+        search(clauses: List[List[str]], offset: int, limit: int) -> Tuple[List[Task], int]:
+            Returns a page of the queued tasks matching a query through the token sets.
+        band_heads() -> Dict[int, float]: Returns the oldest timestamp of each priority band.
+        pop_from_band(priority: int, now: float, claim: bool) -> Optional[Task]: Dequeues
+            or claims the oldest unexpired task of a priority band.
+        transition(task_ids: List[str], status: str, from_statuses: Iterable[str],
+            now: float) -> List[Task]: Moves tasks to another status.
+        iter_by_status(status: str, before: Optional[float], batch_size: Optional[int])
+            -> Iterator[Task]: Streams the tasks of a status other than "pending".
+        delete_in_status(task_ids: List[str], statuses: Iterable[str]) -> int: Deletes
+            the given tasks that still have one of the given statuses.
+        promote_due(now: float, batch_size: int) -> int: Moves one batch of due delayed
+            tasks into the queue.
+        add_if_absent(keyed_tasks: Iterable[Tuple[str, Task]], ttl: float)
+            -> List[Tuple[Task, bool]]: Adds the tasks whose deduplication key is new.
+        for_queue(queue: str) -> FakeTaskRepository: Returns the store of another queue.
+        queue_counts() -> Dict[str, Dict[str, int]]: Returns the task counts of every queue.
+        move_to_queue(task_ids: List[str], queue: str) -> int: Moves tasks to another queue.
+        sample_memory(sample_size: int) -> Dict[str, Any]: Estimates the memory held by
+            the store from a sample of tasks.
     """
 
-    def __init__(self) -> None:
-        """Initializes the in-memory task store."""
+    def __init__(
+        self,
+        events_maxlen: int = 10000,
+        queue: str = DEFAULT_QUEUE,
+        queues: Optional[Dict[str, "FakeTaskRepository"]] = None,
+    ) -> None:
+        """
+        Initializes the in-memory task store.
+
+        Args:
+            events_maxlen (int): The number of change feed events kept in memory.
+            queue (str): The name of the queue held by this store.
+            queues (Optional[Dict[str, FakeTaskRepository]]): The stores of the sibling
+                queues, shared by every queue of the same storage.
+
+        Raises:
+            ValueError: If the queue name is invalid.
+        """
+        self.queue: str = validate_queue_name(queue)
+        self.queues: Dict[str, FakeTaskRepository] = {} if queues is None else queues
+        self._lock: threading.RLock = threading.RLock()
+        self._queues_lock: threading.Lock = (
+            next(iter(self.queues.values()))._queues_lock
+            if self.queues
+            else threading.Lock()
+        )
+        self.queues[queue] = self
+        self.events_maxlen: int = events_maxlen
         self.tasks: dict[str, Task] = {}
-        self.priority_index: list[tuple[int, str]] = []
+        self.priority_index: list[tuple[float, str]] = []
+        self.expiry_index: list[tuple[float, str]] = []
+        self.band_queues: dict[int, list[tuple[float, str]]] = {}
+        self.delayed_index: list[tuple[float, str]] = []
+        self.delayed: set[str] = set()
+        self.status_index: dict[str, dict[str, float]] = {
+            status: {} for status in Task.STATUSES if status != Task.PENDING
+        }
+        self.dedup_index: dict[str, tuple[float, Task]] = {}
+        self.tag_index: dict[str, set[str]] = {}
+        self.task_tags: dict[str, frozenset[str]] = {}
+        self.token_index: dict[str, set[str]] = {}
+        self.task_token_sets: dict[str, frozenset[str]] = {}
+        self.vocabulary: list[str] = []
+        self.events: deque[TaskEvent] = deque(maxlen=events_maxlen)
+        self.event_groups: dict[str, dict] = {}
+        self._event_sequence: int = 0
+        self._events_changed: threading.Condition = threading.Condition()
 
+    @_locked
     def add(self, task: Task) -> None:
         """
         Adds a new task to the in-memory store.
@@ -37,10 +184,16 @@ class FakeTaskRepository(TaskRepository):
         Args:
             task (Task): The task to add.
         """
+        task = _snapshot(task)
         self.tasks[task.id] = task
-        self.priority_index.append((task.priority, task.id))
+        if task.expires_at is not None:
+            heapq.heappush(self.expiry_index, (task.expires_at, task.id))
+        self._index(task)
+        self._index_terms(task)
         self.priority_index.sort()
+        self._publish(TaskEventType.ADD, task.id, task)
 
+    @_locked
     def get_by_id(self, task_id: str) -> Optional[Task]:
         """
         Retrieves a task by its ID from the in-memory store.
@@ -49,19 +202,48 @@ class FakeTaskRepository(TaskRepository):
             task_id (str): The ID of the task to retrieve.
 
         Returns:
-            Optional[Task]: The retrieved task, or None if not found.
+            Optional[Task]: The retrieved task, or None if not found or expired.
         """
-        return self.tasks.get(task_id, None)
+        task = self.tasks.get(task_id, None)
+        if task is None or task.is_expired():
+            return None
+        return _snapshot(task)
 
+    @_locked
+    def get_many(self, task_ids: List[str]) -> List[Task]:
+        """
+        Retrieves several tasks by their IDs from the in-memory store.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to retrieve.
+
+        Returns:
+            List[Task]: The tasks that exist and have not expired, in the order of
+                `task_ids`.
+        """
+        now = time.time()
+        return [
+            _snapshot(task)
+            for task in map(self.tasks.get, task_ids)
+            if task is not None and not task.is_expired(now)
+        ]
+
+    @_locked
     def list(self) -> List[Task]:
         """
         Retrieves all tasks from the in-memory store.
 
         Returns:
-            List[Task]: A list of all tasks.
+            List[Task]: A list of all tasks that have not expired.
         """
-        return [self.tasks[task_id] for _, task_id in self.priority_index]
+        now = time.time()
+        return [
+            _snapshot(self.tasks[task_id])
+            for _, task_id in self.priority_index
+            if not self.tasks[task_id].is_expired(now)
+        ]
 
+    @_locked
     def list_by_priority(self, min_priority: int, max_priority: int) -> List[Task]:
         """
         Retrieves tasks within a priority range from the in-memory store.
@@ -73,12 +255,15 @@ class FakeTaskRepository(TaskRepository):
         Returns:
             List[Task]: A list of tasks within the specified priority range.
         """
+        now = time.time()
         return [
-            self.tasks[task_id]
-            for priority, task_id in self.priority_index
-            if min_priority <= priority <= max_priority
+            _snapshot(self.tasks[task_id])
+            for score, task_id in self.priority_index
+            if min_priority <= score < max_priority + 1
+            and not self.tasks[task_id].is_expired(now)
         ]
 
+    @_locked
     def delete(self, task_id: str) -> bool:
         """
         Deletes a task by its ID from the in-memory store.
@@ -90,13 +275,16 @@ class FakeTaskRepository(TaskRepository):
             bool: True if the task was deleted, False otherwise.
         """
         if task_id in self.tasks:
-            del self.tasks[task_id]
+            self._unindex_status(self.tasks.pop(task_id))
+            self._unindex_terms(task_id)
             self.priority_index = [
-                (priority, id) for priority, id in self.priority_index if id != task_id
+                (score, id) for score, id in self.priority_index if id != task_id
             ]
+            self._publish(TaskEventType.DELETE, task_id)
             return True
         return False
 
+    @_locked
     def update(self, task: Task) -> Optional[Task]:
         """
         Updates a task in the in-memory store.
@@ -108,11 +296,855 @@ class FakeTaskRepository(TaskRepository):
             Optional[Task]: The updated task, or None if not found.
         """
         if task.id in self.tasks:
+            task = _snapshot(task)
+            stored = self.tasks[task.id]
+            # The status only changes through transition().
+            task.status, task.status_at = stored.status, stored.status_at
+            self._unindex_status(stored)
             self.tasks[task.id] = task
             self.priority_index = [
-                (task.priority, task.id) if id == task.id else (priority, id)
-                for priority, id in self.priority_index
+                (score, id) for score, id in self.priority_index if id != task.id
             ]
+            # Entries of the old band are skipped once the task is dequeued.
+            self._index(task)
+            self._index_terms(task)
             self.priority_index.sort()
-            return task
+            if task.expires_at is not None:
+                heapq.heappush(self.expiry_index, (task.expires_at, task.id))
+            self._publish(TaskEventType.UPDATE, task.id, task)
+            return _snapshot(task)
+        return None
+
+    @_locked
+    def delete_many(
+        self, task_ids: List[str], progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Deletes several tasks by their IDs from the in-memory store.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to delete.
+            progress (Optional[Callable[[int], None]]): Called with the number of deleted tasks.
+
+        Returns:
+            int: The number of tasks that were deleted.
+        """
+        return self._remove(
+            {task_id for task_id in task_ids if task_id in self.tasks}, progress
+        )
+
+    @_locked
+    def delete_by_priority(
+        self,
+        min_priority: int,
+        max_priority: int,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Deletes all tasks within a priority range from the in-memory store.
+
+        Args:
+            min_priority (int): The minimum priority.
+            max_priority (int): The maximum priority.
+            progress (Optional[Callable[[int], None]]): Called with the number of deleted tasks.
+
+        Returns:
+            int: The number of tasks that were deleted.
+        """
+        return self._remove(
+            {
+                task_id
+                for score, task_id in self.priority_index
+                if min_priority <= score < max_priority + 1
+            },
+            progress,
+        )
+
+    @_locked
+    def delete_older_than(
+        self, timestamp: float, progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Deletes the queued tasks created before a timestamp from the in-memory store.
+
+        Like the Redis store, only the priority index is searched, so delayed, running
+        and finished tasks are kept.
+
+        Args:
+            timestamp (float): Tasks with a creation timestamp lower than this are deleted.
+            progress (Optional[Callable[[int], None]]): Called with the number of deleted tasks.
+
+        Returns:
+            int: The number of tasks that were deleted.
+        """
+        return self._remove(
+            {
+                task_id
+                for _, task_id in self.priority_index
+                if self.tasks[task_id].timestamp < timestamp
+            },
+            progress,
+        )
+
+    @_locked
+    def prune_expired(self, now: float, batch_size: int) -> int:
+        """
+        Deletes at most one batch of expired tasks from the in-memory store.
+
+        Entries of the expiry heap whose task was deleted or given a different
+        expiry since they were pushed are discarded lazily.
+
+        Args:
+            now (float): The reference timestamp.
+            batch_size (int): The maximum number of tasks to delete.
+
+        Returns:
+            int: The number of tasks that were deleted; fewer than `batch_size` means
+                no expired task is left.
+        """
+        expired: set = set()
+        while self.expiry_index and len(expired) < batch_size:
+            expires_at, task_id = self.expiry_index[0]
+            if expires_at > now:
+                break
+            heapq.heappop(self.expiry_index)
+            task = self.tasks.get(task_id)
+            if (
+                task is not None
+                and task.expires_at == expires_at
+                and task.status == Task.PENDING
+            ):
+                expired.add(task_id)
+        return self._remove(expired)
+
+    def _remove(
+        self, task_ids: set, progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Removes a set of existing task IDs, rebuilding the priority index only once.
+
+        Args:
+            task_ids (set): The IDs of the tasks to remove; all must exist in the store.
+            progress (Optional[Callable[[int], None]]): Called with the number of deleted tasks.
+
+        Returns:
+            int: The number of tasks that were deleted.
+        """
+        if not task_ids:
+            return 0
+        for task_id in task_ids:
+            self._unindex_status(self.tasks.pop(task_id))
+            self._unindex_terms(task_id)
+        self.priority_index = [
+            (score, id) for score, id in self.priority_index if id not in task_ids
+        ]
+        for task_id in task_ids:
+            self._publish(TaskEventType.DELETE, task_id)
+        if progress:
+            progress(len(task_ids))
+        return len(task_ids)
+
+    @_locked
+    def add_many(self, tasks: Iterable[Task]) -> int:
+        """
+        Adds several tasks to the in-memory store, sorting the priority index once.
+
+        Args:
+            tasks (Iterable[Task]): The tasks to add; existing tasks with the same ID
+                are replaced.
+
+        Returns:
+            int: The number of tasks added.
+        """
+        added = [_snapshot(task) for task in tasks]
+        replaced = {task.id for task in added if task.id in self.tasks}
+        if replaced:
+            self.priority_index = [
+                (score, id) for score, id in self.priority_index if id not in replaced
+            ]
+        for task in added:
+            if task.id in self.tasks:
+                self._unindex_status(self.tasks[task.id])
+            self.tasks[task.id] = task
+            if task.expires_at is not None:
+                heapq.heappush(self.expiry_index, (task.expires_at, task.id))
+            self._index(task)
+            self._index_terms(task)
+            self._publish(TaskEventType.ADD, task.id, task)
+        self.priority_index.sort()
+        return len(added)
+
+    def iter_all(self, batch_size: Optional[int] = None) -> Iterator[Task]:
+        """
+        Streams every stored task that has not expired.
+
+        Args:
+            batch_size (Optional[int]): Unused by the in-memory store.
+
+        Yields:
+            Task: The next stored task.
+        """
+        now = time.time()
+        with self._lock:
+            tasks = [
+                _snapshot(task)
+                for task in self.tasks.values()
+                if not task.is_expired(now)
+            ]
+        yield from tasks
+
+    def iter_by_tags(
+        self,
+        tags: Iterable[str],
+        min_priority: int = Task.MIN_PRIORITY,
+        max_priority: int = Task.MAX_PRIORITY,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """
+        Streams the queued tasks carrying every given tag within a priority range.
+
+        The tag sets are intersected from the smallest one, so the cost depends on
+        the rarest tag rather than on the number of stored tasks.
+
+        Args:
+            tags (Iterable[str]): The tags every returned task must carry.
+            min_priority (int): The minimum priority.
+            max_priority (int): The maximum priority.
+            batch_size (Optional[int]): Unused by the in-memory store.
+
+        Yields:
+            Task: The next matching task, in priority index order.
+        """
+        tags = set(tags)
+        if not tags:
+            yield from self.iter_by_priority(min_priority, max_priority, batch_size)
+            return
+        now = time.time()
+        with self._lock:
+            tag_sets = sorted((self.tag_index.get(tag, set()) for tag in tags), key=len)
+            task_ids = set(tag_sets[0]).intersection(*tag_sets[1:])
+            matches = [
+                _snapshot(self.tasks[task_id])
+                for task_id in task_ids
+                if self._queued(task_id)
+                and min_priority <= self.tasks[task_id].priority <= max_priority
+                and not self.tasks[task_id].is_expired(now)
+            ]
+        yield from sorted(matches, key=lambda task: (_index_score(task), task.id))
+
+    @_locked
+    def search(
+        self, clauses: List[List[str]], offset: int = 0, limit: int = 20
+    ) -> Tuple[List[Task], int]:
+        """
+        Returns one page of the queued tasks matching a parsed search query.
+
+        Exact terms are looked up in the token sets and prefix terms are expanded
+        through the sorted vocabulary with a binary search.
+
+        Args:
+            clauses (List[List[str]]): The query, see src.utils.search.parse_query().
+            offset (int): The number of ranked matches to skip.
+            limit (int): The maximum number of tasks to return.
+
+        Returns:
+            Tuple[List[Task], int]: The tasks of the page, highest priority and then
+                oldest first, and the total number of matches.
+        """
+        found: set = set()
+        for clause in clauses:
+            term_sets = sorted((self._term_postings(term) for term in clause), key=len)
+            found |= set(term_sets[0]).intersection(*term_sets[1:])
+        now = time.time()
+        tasks = [
+            self.tasks[task_id]
+            for task_id in found
+            if self._queued(task_id) and not self.tasks[task_id].is_expired(now)
+        ]
+        tasks.sort(key=lambda task: (-task.priority, _index_score(task), task.id))
+        return [_snapshot(task) for task in tasks[offset : offset + limit]], len(tasks)
+
+    def _term_postings(self, term: str) -> set:
+        """
+        Returns the IDs of the tasks matching one search term.
+        """
+        if not term.endswith(PREFIX_MARK):
+            return self.token_index.get(term, set())
+        prefix = term[: -len(PREFIX_MARK)]
+        postings: set = set()
+        position = bisect.bisect_left(self.vocabulary, prefix)
+        while position < len(self.vocabulary) and self.vocabulary[position].startswith(
+            prefix
+        ):
+            postings |= self.token_index[self.vocabulary[position]]
+            position += 1
+        return postings
+
+    @_locked
+    def band_heads(self) -> Dict[int, float]:
+        """
+        Returns the creation timestamp of the oldest task of each priority band.
+
+        Returns:
+            Dict[int, float]: The oldest timestamp keyed by priority, for non-empty bands.
+        """
+        heads = {}
+        for priority, queue in self.band_queues.items():
+            while queue and not self._in_band(priority, *queue[0]):
+                heapq.heappop(queue)
+            if queue:
+                heads[priority] = queue[0][0]
+        return heads
+
+    @_locked
+    def pop_from_band(
+        self, priority: int, now: float, claim: bool = False
+    ) -> Optional[Task]:
+        """
+        Removes and returns the oldest unexpired task of a priority band.
+
+        Args:
+            priority (int): The priority band to dequeue from.
+            now (float): The reference timestamp for expiry.
+            claim (bool): Whether to keep the task as running rather than delete it.
+
+        Returns:
+            Optional[Task]: The dequeued task, or None if the band holds no unexpired task.
+        """
+        queue = self.band_queues.get(priority, [])
+        while queue:
+            timestamp, task_id = heapq.heappop(queue)
+            if not self._in_band(priority, timestamp, task_id):
+                continue
+            task = self.tasks[task_id]
+            if task.is_expired(now):
+                self._remove({task_id})
+            elif claim:
+                return self.transition([task_id], Task.RUNNING, [Task.PENDING], now)[0]
+            else:
+                self._remove({task_id})
+                return _snapshot(task)
         return None
+
+    @_locked
+    def transition(
+        self, task_ids: List[str], status: str, from_statuses: Iterable[str], now: float
+    ) -> List[Task]:
+        """
+        Moves tasks to another status and to the index of that status.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to move.
+            status (str): The new status.
+            from_statuses (Iterable[str]): The statuses a task must have to be moved.
+            now (float): The timestamp recorded as `status_at`.
+
+        Returns:
+            List[Task]: The tasks that were moved.
+        """
+        sources = set(from_statuses)
+        moved = [
+            self.tasks[task_id]
+            for task_id in dict.fromkeys(task_ids)
+            if task_id in self.tasks and self.tasks[task_id].status in sources
+        ]
+        ids = {task.id for task in moved}
+        self.priority_index = [
+            (score, id) for score, id in self.priority_index if id not in ids
+        ]
+        for task in moved:
+            self._unindex_status(task)
+            task.status, task.status_at = status, now
+            self._index(task)
+            if status == Task.PENDING and task.expires_at is not None:
+                # Entries popped while the task was not pending are gone.
+                heapq.heappush(self.expiry_index, (task.expires_at, task.id))
+            self._publish(TaskEventType.UPDATE, task.id, task)
+        self.priority_index.sort()
+        return [_snapshot(task) for task in moved]
+
+    def iter_by_status(
+        self,
+        status: str,
+        before: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """
+        Streams the tasks of a status other than "pending", oldest status change first.
+
+        Args:
+            status (str): "running", "done" or "failed".
+            before (Optional[float]): When given, only tasks whose status changed
+                before this timestamp are returned.
+            batch_size (Optional[int]): Unused by the in-memory store.
+
+        Yields:
+            Task: The next task of that status.
+        """
+        with self._lock:
+            tasks = [
+                _snapshot(self.tasks[task_id])
+                for score, task_id in sorted(
+                    (score, task_id)
+                    for task_id, score in self.status_index[status].items()
+                )
+                if before is None or score < before
+            ]
+        yield from tasks
+
+    @_locked
+    def delete_in_status(self, task_ids: List[str], statuses: Iterable[str]) -> int:
+        """
+        Deletes the given tasks that still have one of the given statuses.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to delete.
+            statuses (Iterable[str]): The statuses a task must have to be deleted.
+
+        Returns:
+            int: The number of tasks deleted.
+        """
+        allowed = set(statuses)
+        return self._remove(
+            {
+                task_id
+                for task_id in task_ids
+                if task_id in self.tasks and self.tasks[task_id].status in allowed
+            }
+        )
+
+    @_locked
+    def promote_due(self, now: float, batch_size: int) -> int:
+        """
+        Moves at most one batch of delayed tasks whose `run_at` has come into the queue.
+
+        Args:
+            now (float): The reference timestamp.
+            batch_size (int): The maximum number of delayed index entries to process.
+
+        Returns:
+            int: The number of delayed index entries processed, counting entries whose
+                task was deleted or rescheduled; fewer than `batch_size` means none are due.
+        """
+        processed = 0
+        while self.delayed_index and processed < batch_size:
+            run_at, task_id = self.delayed_index[0]
+            if run_at > now:
+                break
+            heapq.heappop(self.delayed_index)
+            processed += 1
+            task = self.tasks.get(task_id)
+            if task_id in self.delayed and task.run_at == run_at:
+                self.delayed.discard(task_id)
+                bisect.insort(self.priority_index, (_index_score(task), task_id))
+                self._enqueue(task)
+        return processed
+
+    @_locked
+    def add_if_absent(
+        self, keyed_tasks: Iterable[Tuple[str, Task]], ttl: float
+    ) -> List[Tuple[Task, bool]]:
+        """
+        Adds each task unless its deduplication key was recorded within `ttl` seconds.
+
+        Args:
+            keyed_tasks (Iterable[Tuple[str, Task]]): The key and task of each submission.
+            ttl (float): The number of seconds a key is remembered.
+
+        Returns:
+            List[Tuple[Task, bool]]: The stored task of each submission and whether it
+                was added by this call.
+        """
+        now = time.time()
+        results = []
+        for key, task in keyed_tasks:
+            entry = self.dedup_index.get(key)
+            if entry is not None and entry[0] > now:
+                results.append((_snapshot(entry[1]), False))
+                continue
+            self.dedup_index[key] = (now + ttl, _snapshot(task))
+            self.add(task)
+            results.append((task, True))
+        return results
+
+    def _index(self, task: Task) -> None:
+        """
+        Indexes a stored task: delayed until its `run_at`, queued otherwise.
+
+        The caller sorts the priority index afterwards.
+
+        Args:
+            task (Task): The task to index.
+        """
+        if task.status != Task.PENDING:
+            self.status_index[task.status][task.id] = task.status_at or task.timestamp
+            return
+        if not task.is_due():
+            self.delayed.add(task.id)
+            heapq.heappush(self.delayed_index, (task.run_at, task.id))
+            return
+        self.priority_index.append((_index_score(task), task.id))
+        self._enqueue(task)
+
+    def for_queue(self, queue: str) -> "FakeTaskRepository":
+        """
+        Returns the in-memory store of another queue, creating it if needed.
+
+        Args:
+            queue (str): The queue name.
+
+        Returns:
+            FakeTaskRepository: The store of that queue.
+        """
+        with self._queues_lock:
+            if queue not in self.queues:
+                FakeTaskRepository(self.events_maxlen, queue, self.queues)
+            return self.queues[queue]
+
+    def queue_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns the number of queued and delayed tasks of every queue.
+
+        Returns:
+            Dict[str, Dict[str, int]]: For each queue name in alphabetical order, the
+                number of "queued" and "delayed" tasks.
+        """
+        with self._queues_lock:
+            stores = sorted(self.queues.items())
+        counts = {}
+        for name, store in stores:
+            with store._lock:
+                counts[name] = {
+                    "queued": len(store.priority_index),
+                    "delayed": len(store.delayed),
+                }
+        return counts
+
+    def move_to_queue(self, task_ids: List[str], queue: str) -> int:
+        """
+        Moves tasks to the store of another queue, keeping their IDs.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to move.
+            queue (str): The name of the destination queue.
+
+        Returns:
+            int: The number of tasks that existed and were moved.
+
+        Raises:
+            ValueError: If the destination is this queue.
+        """
+        if queue == self.queue:
+            raise ValueError(f"Tasks are already in queue {queue!r}")
+        target = self.for_queue(queue)
+        # Taking the locks in name order keeps opposite moves from deadlocking.
+        first, second = sorted((self, target), key=lambda store: store.queue)
+        with first._lock, second._lock:
+            moved = [
+                self.tasks[task_id]
+                for task_id in dict.fromkeys(task_ids)
+                if task_id in self.tasks
+            ]
+            self._remove({task.id for task in moved})
+            return target.add_many(moved)
+
+    @_locked
+    def sample_memory(self, sample_size: int = 1000) -> Dict[str, Any]:
+        """
+        Estimates the memory held by the in-memory store with deep_sizeof().
+
+        A random sample of tasks is measured and scaled like the Redis sample, while
+        each index is measured whole, without the task objects and IDs it shares
+        with the task table, so sizing an embedded store walks every index once.
+
+        Args:
+            sample_size (int): The maximum number of tasks measured.
+
+        Returns:
+            Dict[str, Any]: The measurements described in TaskRepository.sample_memory().
+        """
+        tasks = list(self.tasks.values())
+        sampled = random.sample(tasks, min(sample_size, len(tasks)))
+        shared = {id(task) for task in tasks} | {id(task.id) for task in tasks}
+        structures = {
+            "task table": sys.getsizeof(self.tasks),
+            "priority index": self.priority_index,
+            "expiry index": self.expiry_index,
+            "band queues": self.band_queues,
+            "delayed index": (self.delayed_index, self.delayed),
+            "status indexes": self.status_index,
+            "tag index": (self.tag_index, self.task_tags),
+            "token index": (self.token_index, self.task_token_sets, self.vocabulary),
+            "dedup index": self.dedup_index,
+            "change feed": (self.events, self.event_groups),
+        }
+        return {
+            "tasks": len(tasks),
+            "groups": {
+                MEMORY_TASK_GROUP: {
+                    "count": len(tasks),
+                    "sizes": [deep_sizeof(task) for task in sampled],
+                    "encodings": ["python"] * len(sampled),
+                }
+            },
+            "structures": {
+                name: value if isinstance(value, int) else deep_sizeof(value, shared)
+                for name, value in structures.items()
+            },
+            "settings": {},
+        }
+
+    def _index_terms(self, task: Task) -> None:
+        """
+        Brings the tag and token sets in line with the current content of a stored task.
+
+        Args:
+            task (Task): The task whose tags, name or description may have changed.
+        """
+        self._update_postings(
+            self.tag_index, self.task_tags, task.id, frozenset(task.tags)
+        )
+        self._update_postings(
+            self.token_index,
+            self.task_token_sets,
+            task.id,
+            frozenset(task_tokens(task.name, task.description)),
+            self.vocabulary,
+        )
+
+    def _unindex_terms(self, task_id: str) -> None:
+        """
+        Removes a task from the sets of all its tags and tokens.
+
+        Args:
+            task_id (str): The ID of the task being removed.
+        """
+        self._update_postings(self.tag_index, self.task_tags, task_id, frozenset())
+        self._update_postings(
+            self.token_index,
+            self.task_token_sets,
+            task_id,
+            frozenset(),
+            self.vocabulary,
+        )
+
+    @staticmethod
+    def _update_postings(
+        index: Dict[str, Set[str]],
+        entries: Dict[str, FrozenSet[str]],
+        task_id: str,
+        current: FrozenSet[str],
+        vocabulary: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Moves a task between the sets of an index, given the terms it now has.
+
+        Sets are dropped once empty, and the sorted vocabulary, when given, lists
+        exactly the terms that have a set.
+
+        Args:
+            index (Dict[str, Set[str]]): The task IDs of each term.
+            entries (Dict[str, FrozenSet[str]]): The terms of each indexed task.
+            task_id (str): The ID of the task.
+            current (FrozenSet[str]): The terms the task has now.
+            vocabulary (Optional[List[str]]): The sorted terms of the index.
+        """
+        previous = entries.get(task_id, frozenset())
+        for term in previous - current:
+            postings = index[term]
+            postings.discard(task_id)
+            if not postings:
+                del index[term]
+                if vocabulary is not None:
+                    del vocabulary[bisect.bisect_left(vocabulary, term)]
+        for term in current - previous:
+            if term not in index:
+                index[term] = set()
+                if vocabulary is not None:
+                    bisect.insort(vocabulary, term)
+            index[term].add(task_id)
+        if current:
+            entries[task_id] = current
+        else:
+            entries.pop(task_id, None)
+
+    def _enqueue(self, task: Task) -> None:
+        """
+        Pushes a task onto the FIFO queue of its priority band.
+
+        Entries left behind when a task is deleted or moved to another band are
+        discarded lazily by band_heads() and pop_from_band().
+
+        Args:
+            task (Task): The task to enqueue.
+        """
+        heapq.heappush(
+            self.band_queues.setdefault(task.priority, []), (task.timestamp, task.id)
+        )
+
+    def _in_band(self, priority: int, timestamp: float, task_id: str) -> bool:
+        """
+        Tells whether a band queue entry still refers to a stored task.
+        """
+        task = self.tasks.get(task_id)
+        return (
+            task is not None
+            and task.status == Task.PENDING
+            and task.id not in self.delayed
+            and task.priority == priority
+            and task.timestamp == timestamp
+        )
+
+    def _queued(self, task_id: str) -> bool:
+        """
+        Tells whether a stored task is pending and not delayed.
+        """
+        return (
+            task_id not in self.delayed and self.tasks[task_id].status == Task.PENDING
+        )
+
+    def _unindex_status(self, task: Task) -> None:
+        """
+        Removes a stored task from the delayed set and from its status index.
+
+        Priority index entries are filtered by the caller.
+        """
+        self.delayed.discard(task.id)
+        if task.status != Task.PENDING:
+            self.status_index[task.status].pop(task.id, None)
+
+    def latest_event_id(self) -> str:
+        """
+        Returns the ID of the most recent change feed event.
+
+        Returns:
+            str: The event ID, or "0-0" if no event was recorded yet.
+        """
+        return f"{self._event_sequence}-0"
+
+    def read_events(
+        self, after_id: str, count: int = 100, block: Optional[float] = None
+    ) -> List[TaskEvent]:
+        """
+        Reads change feed events recorded after an event ID.
+
+        Args:
+            after_id (str): Only events with a greater ID are returned.
+            count (int): The maximum number of events to return.
+            block (Optional[float]): Seconds to wait for new events when none are available.
+
+        Returns:
+            List[TaskEvent]: The events in feed order.
+        """
+        after = self._event_number(after_id)
+        with self._events_changed:
+            if block and self._event_sequence <= after:
+                self._events_changed.wait_for(
+                    lambda: self._event_sequence > after, timeout=block
+                )
+            return self._events_after(after, count)
+
+    def read_group_events(
+        self,
+        group: str,
+        consumer: str,
+        count: int = 100,
+        block: Optional[float] = None,
+        pending: bool = False,
+    ) -> List[TaskEvent]:
+        """
+        Reads change feed events on behalf of a consumer group member.
+
+        Args:
+            group (str): The consumer group name.
+            consumer (str): The consumer name within the group.
+            count (int): The maximum number of events to return.
+            block (Optional[float]): Seconds to wait for new events when none are available.
+            pending (bool): Re-read this consumer's unacknowledged events instead.
+
+        Returns:
+            List[TaskEvent]: The events in feed order.
+        """
+        with self._events_changed:
+            state = self.event_groups.setdefault(
+                group, {"last_delivered": self._event_sequence, "pending": {}}
+            )
+            delivered = state["pending"].setdefault(consumer, {})
+            if pending:
+                return list(delivered.values())[:count]
+            if block and self._event_sequence <= state["last_delivered"]:
+                self._events_changed.wait_for(
+                    lambda: self._event_sequence > state["last_delivered"],
+                    timeout=block,
+                )
+            events = self._events_after(state["last_delivered"], count)
+            if events:
+                state["last_delivered"] = self._event_number(events[-1].id)
+            for event in events:
+                delivered[event.id] = event
+            return events
+
+    def ack_events(self, group: str, event_ids: List[str]) -> int:
+        """
+        Acknowledges change feed events processed by a consumer group.
+
+        Args:
+            group (str): The consumer group name.
+            event_ids (List[str]): The IDs of the processed events.
+
+        Returns:
+            int: The number of events that were pending and are now acknowledged.
+        """
+        with self._events_changed:
+            state = self.event_groups.get(group)
+            if state is None:
+                return 0
+            acknowledged = 0
+            for delivered in state["pending"].values():
+                for event_id in event_ids:
+                    if delivered.pop(event_id, None) is not None:
+                        acknowledged += 1
+            return acknowledged
+
+    def _publish(
+        self, event_type: TaskEventType, task_id: str, task: Optional[Task] = None
+    ) -> None:
+        """
+        Appends an event to the capped change feed and wakes up blocked readers.
+
+        Args:
+            event_type (TaskEventType): The kind of mutation.
+            task_id (str): The ID of the mutated task.
+            task (Optional[Task]): The task after the mutation.
+        """
+        with self._events_changed:
+            self._event_sequence += 1
+            self.events.append(
+                TaskEvent(
+                    id=f"{self._event_sequence}-0",
+                    type=event_type,
+                    task_id=task_id,
+                    task=_snapshot(task) if task is not None else None,
+                    timestamp=time.time(),
+                )
+            )
+            self._events_changed.notify_all()
+
+    def _events_after(self, after: int, count: int) -> List[TaskEvent]:
+        """
+        Returns up to `count` retained events numbered after `after`.
+
+        Args:
+            after (int): The sequence number of the last event already seen.
+            count (int): The maximum number of events to return.
+
+        Returns:
+            List[TaskEvent]: The events in feed order.
+        """
+        skip = max(0, len(self.events) - (self._event_sequence - after))
+        return list(islice(self.events, skip, skip + count))
+
+    @staticmethod
+    def _event_number(event_id: str) -> int:
+        """Returns the sequence number encoded in an in-memory event ID."""
+        return int(event_id.split("-")[0])
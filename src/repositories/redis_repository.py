@@ -1,13 +1,426 @@
 """
 This module implements the TaskRepository interface using Redis for storage.
+
+Classes:
+    QueueKeys: The Redis key names of one queue.
+    RedisTaskRepository: A TaskRepository storing one queue in Redis.
 """
 
-from typing import List, Optional
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import redis
 
 from src.adapters.redis_client import RedisClient
 from src.entities.task import Task
-from src.repositories.base_repository import TaskRepository
+from src.entities.task_event import TaskEvent, TaskEventType
+from src.repositories.base_repository import (
+    CONSISTENCY_COUNTS,
+    DEFAULT_QUEUE,
+    MEMORY_TASK_GROUP,
+    TaskRepository,
+    validate_queue_name,
+)
+from src.utils.batching import chunked
 from src.utils.exceptions import RedisOperationError
+from src.utils.search import task_tokens
+
+BAND_KEY = "tasks:band:"
+STATUS_KEY = "tasks:status:"
+DEDUP_KEY = "tasks:dedup:"
+TAG_KEY = "tasks:tag:"
+TOKEN_KEY = "tasks:token:"
+VOCABULARY_KEY = "tasks:tokens"
+QUEUES_KEY = "queues"
+# The number of keys a memory sample may SCAN for each key it measures.
+MEMORY_SCAN_FACTOR = 10
+# The statuses kept in a `tasks:status:{status}` index; pending tasks are queued.
+STATUS_INDEXED = tuple(status for status in Task.STATUSES if status != Task.PENDING)
+
+# Drops tokens whose set became empty from the vocabulary used by prefix queries.
+FORGET_TOKENS_LUA = """
+local function forget_tokens(task_key, tokens, token_prefix, vocabulary)
+    for _, token in ipairs(tokens) do
+        local token_key = token_prefix .. token
+        if redis.call('SREM', token_key, task_key) == 1
+            and redis.call('SCARD', token_key) == 0 then
+            redis.call('ZREM', vocabulary, token)
+        end
+    end
+end
+"""
+
+# Removes a task from its band queue, status index, tag sets and token sets, all
+# found from its hash. Names and descriptions are tokenized like
+# src.utils.search.tokenize().
+UNINDEX_TASK_LUA = FORGET_TOKENS_LUA + """
+local function unindex_task(task_key, band_prefix, tag_prefix, token_prefix, vocabulary,
+        status_prefix)
+    local fields = redis.call('HMGET', task_key, 'priority', 'tags', 'name', 'description',
+        'status')
+    if fields[1] then
+        redis.call('ZREM', band_prefix .. fields[1], task_key)
+    end
+    if fields[5] and fields[5] ~= 'pending' then
+        redis.call('ZREM', status_prefix .. fields[5], task_key)
+    end
+    if fields[2] then
+        for tag in string.gmatch(fields[2], '[^,]+') do
+            redis.call('SREM', tag_prefix .. tag, task_key)
+        end
+    end
+    if fields[3] then
+        local tokens = {}
+        local text = string.lower(fields[3] .. ' ' .. (fields[4] or ''))
+        for token in string.gmatch(text, '[%l%d\\128-\\255]+') do
+            table.insert(tokens, token)
+        end
+        forget_tokens(task_key, tokens, token_prefix, vocabulary)
+    end
+end
+"""
+
+# KEYS: the priority index, the expiry index, the change feed, the delayed index,
+# then the task keys.
+# ARGV: the change feed length cap, the task key prefix, the band key prefix, the
+# tag key prefix, the token key prefix, the vocabulary key and the status key
+# prefix, then optionally the statuses a task must have to be deleted.
+DELETE_TASKS_SCRIPT = UNINDEX_TASK_LUA + """
+local allowed = nil
+if #ARGV > 7 then
+    allowed = {}
+    for index = 8, #ARGV do
+        allowed[ARGV[index]] = true
+    end
+end
+local deleted = 0
+for index = 5, #KEYS do
+    local task_key = KEYS[index]
+    if not allowed or allowed[redis.call('HGET', task_key, 'status') or 'pending'] then
+        redis.call('ZREM', KEYS[1], task_key)
+        redis.call('ZREM', KEYS[2], task_key)
+        redis.call('ZREM', KEYS[4], task_key)
+        unindex_task(task_key, ARGV[3], ARGV[4], ARGV[5], ARGV[6], ARGV[7])
+        if redis.call('UNLINK', task_key) == 1 then
+            deleted = deleted + 1
+            redis.call('XADD', KEYS[3], 'MAXLEN', '~', ARGV[1], '*',
+                'type', 'delete', 'task_id', string.sub(task_key, #ARGV[2] + 1))
+        end
+    end
+end
+return deleted
+"""
+
+# KEYS: the band queue, the priority index, the expiry index, the change feed.
+# ARGV: the change feed length cap, the task key prefix, the current time, the
+# maximum number of band entries examined, the band key prefix, the tag key prefix,
+# the token key prefix, the vocabulary key, the status key prefix and '1' to claim
+# the task rather than delete it. A claimed task is moved to `tasks:status:running`
+# and published as an update, its tags encoded as a list like Task.model_dump_json().
+# Returns the task hash, false when the band is empty, or an empty table when the
+# budget ran out on expired tasks.
+POP_BAND_SCRIPT = UNINDEX_TASK_LUA + """
+for _ = 1, tonumber(ARGV[4]) do
+    local head = redis.call('ZPOPMIN', KEYS[1])
+    if #head == 0 then
+        return false
+    end
+    local task_key = head[1]
+    local fields = redis.call('HGETALL', task_key)
+    if #fields > 0 then
+        local expires_at = redis.call('HGET', task_key, 'expires_at')
+        local live = not expires_at or tonumber(expires_at) > tonumber(ARGV[3])
+        redis.call('ZREM', KEYS[2], task_key)
+        redis.call('ZREM', KEYS[3], task_key)
+        local task_id = string.sub(task_key, #ARGV[2] + 1)
+        if live and ARGV[10] == '1' then
+            redis.call('HSET', task_key, 'status', 'running', 'status_at', ARGV[3])
+            redis.call('ZADD', ARGV[9] .. 'running', ARGV[3], task_key)
+            fields = redis.call('HGETALL', task_key)
+            local task = {}
+            for index = 1, #fields, 2 do
+                task[fields[index]] = fields[index + 1]
+            end
+            if task.tags then
+                local tags = {}
+                for tag in string.gmatch(task.tags, '[^,]+') do
+                    table.insert(tags, tag)
+                end
+                task.tags = tags
+            end
+            redis.call('XADD', KEYS[4], 'MAXLEN', '~', ARGV[1], '*',
+                'type', 'update', 'task_id', task_id, 'task', cjson.encode(task))
+            return fields
+        end
+        unindex_task(task_key, ARGV[5], ARGV[6], ARGV[7], ARGV[8], ARGV[9])
+        redis.call('UNLINK', task_key)
+        redis.call('XADD', KEYS[4], 'MAXLEN', '~', ARGV[1], '*',
+            'type', 'delete', 'task_id', task_id)
+        if live then
+            return fields
+        end
+    end
+end
+return {}
+"""
+
+# KEYS: the delayed index, the priority index.
+# ARGV: the current time, the batch size and the band key prefix.
+# The index score is formatted with 17 significant digits so it is the exact double
+# the Python client would have written.
+PROMOTE_DUE_SCRIPT = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+for _, task_key in ipairs(due) do
+    redis.call('ZREM', KEYS[1], task_key)
+    local fields = redis.call('HMGET', task_key, 'priority', 'timestamp')
+    if fields[1] then
+        local score = tonumber(fields[1]) + tonumber(fields[2]) / 1e10
+        redis.call('ZADD', KEYS[2], string.format('%.17g', score), task_key)
+        redis.call('ZADD', ARGV[3] .. fields[1], fields[2], task_key)
+    end
+end
+return #due
+"""
+
+# KEYS: the priority index, the expiry index, the delayed index, the vocabulary,
+# then the task keys.
+# ARGV: the current time, the band key prefix, the tag key prefix, the token key
+# prefix, the lowest and highest priority and the status key prefix, then the
+# statuses other than 'pending'.
+# Rebuilds every index entry of each task from its hash, or drops the sorted set
+# entries of a task whose hash is gone. A delayed task stays delayed until
+# promote_due() moves it. Returns the number of tasks whose entries changed.
+REPAIR_TASKS_SCRIPT = """
+local function set_score(key, member, score)
+    local current = redis.call('ZSCORE', key, member)
+    if current and tonumber(current) == tonumber(score) then
+        return 0
+    end
+    redis.call('ZADD', key, score, member)
+    return 1
+end
+
+local now = tonumber(ARGV[1])
+local repaired = 0
+for index = 5, #KEYS do
+    local task_key = KEYS[index]
+    local fields = redis.call('HMGET', task_key, 'priority', 'timestamp', 'run_at',
+        'expires_at', 'tags', 'name', 'description', 'status', 'status_at')
+    local priority = tonumber(fields[1])
+    local status = fields[8] or 'pending'
+    local changed = 0
+    for band = tonumber(ARGV[5]), tonumber(ARGV[6]) do
+        if band ~= priority then
+            changed = changed + redis.call('ZREM', ARGV[2] .. band, task_key)
+        end
+    end
+    for index = 8, #ARGV do
+        if ARGV[index] ~= status then
+            changed = changed + redis.call('ZREM', ARGV[7] .. ARGV[index], task_key)
+        end
+    end
+    if not priority then
+        changed = changed + redis.call('ZREM', KEYS[1], task_key)
+            + redis.call('ZREM', KEYS[2], task_key) + redis.call('ZREM', KEYS[3], task_key)
+    else
+        local band_key = ARGV[2] .. fields[1]
+        if status ~= 'pending' then
+            changed = changed + set_score(ARGV[7] .. status, task_key, fields[9] or fields[2])
+                + redis.call('ZREM', KEYS[1], task_key) + redis.call('ZREM', band_key, task_key)
+                + redis.call('ZREM', KEYS[2], task_key) + redis.call('ZREM', KEYS[3], task_key)
+        else
+            if fields[3] and (tonumber(fields[3]) > now
+                    or redis.call('ZSCORE', KEYS[3], task_key)) then
+                changed = changed + set_score(KEYS[3], task_key, fields[3])
+                    + redis.call('ZREM', KEYS[1], task_key)
+                    + redis.call('ZREM', band_key, task_key)
+            else
+                local score = string.format('%.17g', priority + tonumber(fields[2]) / 1e10)
+                changed = changed + set_score(KEYS[1], task_key, score)
+                    + set_score(band_key, task_key, fields[2])
+                    + redis.call('ZREM', KEYS[3], task_key)
+            end
+            if fields[4] then
+                changed = changed + set_score(KEYS[2], task_key, fields[4])
+            else
+                changed = changed + redis.call('ZREM', KEYS[2], task_key)
+            end
+        end
+        for tag in string.gmatch(fields[5] or '', '[^,]+') do
+            changed = changed + redis.call('SADD', ARGV[3] .. tag, task_key)
+        end
+        local text = string.lower(fields[6] .. ' ' .. (fields[7] or ''))
+        for token in string.gmatch(text, '[%l%d\\128-\\255]+') do
+            if redis.call('SADD', ARGV[4] .. token, task_key) == 1 then
+                changed = changed + 1
+                redis.call('ZADD', KEYS[4], 0, token)
+            end
+        end
+    end
+    if changed > 0 then
+        repaired = repaired + 1
+    end
+end
+return repaired
+"""
+
+# KEYS: the priority index, then the tag sets.
+# ARGV: the inclusive minimum and exclusive maximum index score.
+# Returns the task keys carrying every tag, in index order. The script only reads,
+# so unlike a ZINTERSTORE into a temporary key it can run on a replica.
+TAGGED_TASKS_SCRIPT = """
+local members = redis.call('SINTER', unpack(KEYS, 2))
+local min_score, max_score = tonumber(ARGV[1]), tonumber(ARGV[2])
+local found = {}
+for _, task_key in ipairs(members) do
+    local score = redis.call('ZSCORE', KEYS[1], task_key)
+    if score then
+        score = tonumber(score)
+        if score >= min_score and score < max_score then
+            table.insert(found, {score, task_key})
+        end
+    end
+end
+table.sort(found, function(a, b)
+    if a[1] == b[1] then
+        return a[2] < b[2]
+    end
+    return a[1] < b[1]
+end)
+local task_keys = {}
+for index, entry in ipairs(found) do
+    task_keys[index] = entry[2]
+end
+return task_keys
+"""
+
+# KEYS: the task key whose tokens are dropped, the vocabulary.
+# ARGV: the token key prefix, then the tokens.
+FORGET_TOKENS_SCRIPT = FORGET_TOKENS_LUA + """
+forget_tokens(KEYS[1], {unpack(ARGV, 2)}, ARGV[1], KEYS[2])
+"""
+
+# KEYS: the priority index, the vocabulary.
+# ARGV: the token key prefix, the offset and the page size, then each clause of the
+# query as its number of terms followed by the terms; a term ending with '*' is a
+# prefix. Returns the number of matches followed by the task keys of the page,
+# highest priority first and oldest first within a priority.
+SEARCH_SCRIPT = """
+local function as_set(task_keys, members)
+    members = members or {}
+    for _, task_key in ipairs(task_keys) do
+        members[task_key] = true
+    end
+    return members
+end
+
+local function clause_members(terms)
+    local exact, prefixed = {}, {}
+    for _, term in ipairs(terms) do
+        if string.sub(term, -1) == '*' then
+            table.insert(prefixed, string.sub(term, 1, -2))
+        else
+            table.insert(exact, ARGV[1] .. term)
+        end
+    end
+    local members = nil
+    if #exact > 0 then
+        members = as_set(redis.call('SINTER', unpack(exact)))
+    end
+    for _, prefix in ipairs(prefixed) do
+        local matching = {}
+        local tokens = redis.call('ZRANGEBYLEX', KEYS[2], '[' .. prefix, '[' .. prefix .. '\\255')
+        for _, token in ipairs(tokens) do
+            as_set(redis.call('SMEMBERS', ARGV[1] .. token), matching)
+        end
+        if members then
+            for task_key in pairs(members) do
+                if not matching[task_key] then
+                    members[task_key] = nil
+                end
+            end
+        else
+            members = matching
+        end
+    end
+    return members
+end
+
+local found, seen = {}, {}
+local index = 4
+while index <= #ARGV do
+    local count = tonumber(ARGV[index])
+    local terms = {}
+    for offset = 1, count do
+        terms[offset] = ARGV[index + offset]
+    end
+    index = index + count + 1
+    for task_key in pairs(clause_members(terms)) do
+        if not seen[task_key] then
+            seen[task_key] = true
+            local score = redis.call('ZSCORE', KEYS[1], task_key)
+            if score then
+                table.insert(found, {tonumber(score), task_key})
+            end
+        end
+    end
+end
+table.sort(found, function(a, b)
+    local priority_a, priority_b = math.floor(a[1]), math.floor(b[1])
+    if priority_a ~= priority_b then
+        return priority_a > priority_b
+    end
+    if a[1] ~= b[1] then
+        return a[1] < b[1]
+    end
+    return a[2] < b[2]
+end)
+local page = {#found}
+for position = tonumber(ARGV[2]) + 1, math.min(#found, ARGV[2] + ARGV[3]) do
+    table.insert(page, found[position][2])
+end
+return page
+"""
+
+
+class QueueKeys:
+    """
+    The Redis key names of one queue.
+
+    The default queue keeps the unprefixed names it had before queues existed, so
+    stored tasks stay where they are; every other queue lives under `queue:{name}:`.
+
+    Methods:
+        task(task_id: str) -> str: Returns the key of a task hash.
+    """
+
+    def __init__(self, queue: str = DEFAULT_QUEUE):
+        """
+        Derive the key names of a queue.
+
+        Args:
+            queue (str): The queue name.
+        """
+        namespace = "" if queue == DEFAULT_QUEUE else f"queue:{queue}:"
+        self.task_prefix: str = f"{namespace}task:"
+        self.index: str = f"{namespace}tasks"
+        self.expiry: str = f"{namespace}tasks:expiry"
+        self.events: str = f"{namespace}tasks:events"
+        self.delayed: str = f"{namespace}tasks:delayed"
+        self.band: str = f"{namespace}{BAND_KEY}"
+        self.dedup: str = f"{namespace}{DEDUP_KEY}"
+        self.tag: str = f"{namespace}{TAG_KEY}"
+        self.token: str = f"{namespace}{TOKEN_KEY}"
+        self.vocabulary: str = f"{namespace}{VOCABULARY_KEY}"
+        self.status: str = f"{namespace}{STATUS_KEY}"
+
+    def task(self, task_id: str) -> str:
+        """
+        Returns the key of a task hash.
+        """
+        return f"{self.task_prefix}{task_id}"
 
 
 class RedisTaskRepository(TaskRepository):
@@ -15,11 +428,25 @@ class RedisTaskRepository(TaskRepository):
     RedisTaskRepository is a concrete implementation of the TaskRepository interface,
     using Redis as the storage backend for tasks.
 
+    Task reads go through `RedisClient.get_read_client()` so they can be served by a
+    replica; writes, deletes and the change feed always use the primary.
+
+    Each repository serves one queue, whose keys are given by QueueKeys; the key
+    names below are those of the default queue. Queue names are recorded in the
+    `queues` set when a task is first written to them.
+
+    A repository may be shared by threads: every command and pipeline checks out a
+    connection of the client's pool for its own use, and large multi-key reads can
+    fan out over several of them with `fetch_workers`.
+
     Methods:
         add(task: Task) -> None:
             Adds a task to the Redis database.
         get_by_id(task_id: str) -> Optional[Task]:
             Retrieves a task from the Redis database by its ID.
+        get_many(task_ids: List[str]) -> List[Task]:
+            Retrieves tasks by their IDs in pipelined batches, fetched in parallel by
+            up to `fetch_workers` threads.
         list() -> List[Task]:
             Retrieves all tasks from the Redis database.
         list_by_priority(min_priority: int, max_priority: int) -> List[Task]:
@@ -28,16 +455,103 @@ class RedisTaskRepository(TaskRepository):
             Deletes a task from the Redis database by its ID.
         update(task: Task) -> Optional[Task]:
             Updates a task in the Redis database.
+        delete_many(task_ids: List[str], progress) -> int:
+            Deletes several tasks from the Redis database in pipelined batches.
+        delete_by_priority(min_priority: int, max_priority: int, progress) -> int:
+            Deletes tasks within a priority range from the Redis database in batches.
+        delete_older_than(timestamp: float, progress) -> int:
+            Deletes tasks created before a timestamp from the Redis database in batches.
+        prune_expired(now: float, batch_size: int) -> int:
+            Deletes one batch of expired tasks found through the expiry index.
+        iter_by_priority(min_priority: int, max_priority: int, batch_size: Optional[int])
+                -> Iterator[Task]:
+            Streams tasks within a priority range, one pipelined batch at a time.
+        iter_by_tags(tags: Iterable[str], min_priority: int, max_priority: int,
+                     batch_size: Optional[int]) -> Iterator[Task]:
+            Streams tagged tasks by intersecting the `tasks:tag:{tag}` sets in a Lua script.
+        search(clauses: List[List[str]], offset: int, limit: int) -> Tuple[List[Task], int]:
+            Returns a page of the tasks matching a query through the `tasks:token:{token}` sets.
+        latest_event_id() -> str:
+            Returns the ID of the last entry of the `tasks:events` stream.
+        read_events(after_id: str, count: int, block: Optional[float]) -> List[TaskEvent]:
+            Reads change feed events with XREAD.
+        read_group_events(group: str, consumer: str, count: int, block: Optional[float],
+                          pending: bool) -> List[TaskEvent]:
+            Reads change feed events with XREADGROUP.
+        ack_events(group: str, event_ids: List[str]) -> int:
+            Acknowledges change feed events with XACK.
+        add_many(tasks: Iterable[Task]) -> int:
+            Adds several tasks, one transaction per batch.
+        iter_all(batch_size: Optional[int]) -> Iterator[Task]:
+            Streams every task hash found by a cursor-based SCAN.
+        band_heads() -> Dict[int, float]:
+            Returns the oldest timestamp of each `tasks:band:{priority}` queue.
+        pop_from_band(priority: int, now: float, claim: bool) -> Optional[Task]:
+            Dequeues or claims the oldest unexpired task of a priority band with a Lua script.
+        transition(task_ids: List[str], status: str, from_statuses: Iterable[str],
+                   now: float) -> List[Task]:
+            Moves tasks between statuses, one MULTI/EXEC transaction per batch.
+        iter_by_status(status: str, before: Optional[float], batch_size: Optional[int])
+                -> Iterator[Task]:
+            Streams the tasks of a `tasks:status:{status}` index in status change order.
+        delete_in_status(task_ids: List[str], statuses: Iterable[str]) -> int:
+            Deletes the given tasks still in one of the statuses with the delete script.
+        promote_due(now: float, batch_size: int) -> int:
+            Moves one batch of due tasks from `tasks:delayed` into the queue with a Lua script.
+        add_if_absent(keyed_tasks: Iterable[Tuple[str, Task]], ttl: float)
+                -> List[Tuple[Task, bool]]:
+            Adds the tasks whose `tasks:dedup:{key}` entry is missing, one transaction per batch.
+        for_queue(queue: str) -> RedisTaskRepository:
+            Returns a repository over another queue, sharing the Redis client.
+        queue_counts() -> Dict[str, Dict[str, int]]:
+            Returns the index sizes of every queue listed in the `queues` set.
+        move_to_queue(task_ids: List[str], queue: str) -> int:
+            Moves tasks to another queue, one MULTI/EXEC transaction per batch.
+        check_consistency(repair: bool, on_issue: Optional[Callable[[str, str], None]])
+                -> Dict[str, int]:
+            Checks the task hashes against the indexes with ZSCAN and SCAN.
+        sample_memory(sample_size: int) -> Dict[str, Any]:
+            Samples MEMORY USAGE over a bounded SCAN and measures the shared keys.
     """
 
-    def __init__(self, redis_client: RedisClient):
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        batch_size: int = 500,
+        events_maxlen: int = 10000,
+        queue: str = DEFAULT_QUEUE,
+        fetch_workers: int = 1,
+    ):
         """
         Initialize the RedisTaskRepository with a RedisClient.
 
         Args:
             redis_client (RedisClient): The Redis client instance for database operations.
+            batch_size (int): The number of keys handled per round trip by bulk operations.
+            events_maxlen (int): The approximate number of entries kept in the change feed.
+            queue (str): The name of the queue stored by this repository.
+            fetch_workers (int): The number of threads get_many() fetches batches with,
+                each on its own pooled connection; 1 fetches them in turn.
+
+        Raises:
+            ValueError: If the queue name is invalid or `fetch_workers` is below 1.
         """
+        if fetch_workers < 1:
+            raise ValueError("fetch_workers must be at least 1")
         self.redis_client: RedisClient = redis_client
+        self.queue: str = validate_queue_name(queue)
+        self.keys: QueueKeys = QueueKeys(queue)
+        self.batch_size: int = batch_size
+        self.events_maxlen: int = events_maxlen
+        self.fetch_workers: int = fetch_workers
+        self._event_groups: set = set()
+        self._delete_script = None
+        self._pop_script = None
+        self._promote_script = None
+        self._tagged_script = None
+        self._forget_script = None
+        self._search_script = None
+        self._repair_script = None
 
     def add(self, task: Task) -> None:
         """
@@ -49,21 +563,16 @@ class RedisTaskRepository(TaskRepository):
         Raises:
             RedisOperationError: If there is an error adding the task to Redis.
         """
+
+        def write(client: redis.Redis) -> None:
+            pipeline = client.pipeline()
+            self._write_task(pipeline, task)
+            self._publish(pipeline, TaskEventType.ADD, task.id, task)
+            pipeline.execute()
+
         try:
-            client = self.redis_client.get_client()
-            task_key = f"task:{task.id}"
-            score = task.priority + task.timestamp / 1e10
-            client.hset(
-                task_key,
-                mapping={
-                    "id": task.id,
-                    "name": task.name,
-                    "priority": task.priority,
-                    "description": task.description,
-                    "timestamp": task.timestamp,
-                },
-            )
-            client.zadd("tasks", {task_key: score})
+            self.redis_client.execute(write)
+            self.redis_client.record_write()
         except Exception as e:
             raise RedisOperationError(f"Failed to add task to Redis: {e}")
 
@@ -75,23 +584,61 @@ class RedisTaskRepository(TaskRepository):
             task_id (str): The ID of the task to retrieve.
 
         Returns:
-            Optional[Task]: The Task object if found, None otherwise.
+            Optional[Task]: The Task object if found and not expired, None otherwise.
 
         Raises:
             RedisOperationError: If there is an error retrieving the task from Redis.
         """
+        task_key = self.keys.task(task_id)
         try:
-            client = self.redis_client.get_client()
-            task_key = f"task:{task_id}"
-            task_data = client.hgetall(task_key)
-            if task_data:
-                return Task.model_validate(
-                    {k.decode("utf-8"): v.decode("utf-8") for k, v in task_data.items()}
-                )
-            return None
+            return self.redis_client.execute(
+                lambda client: self._parse_task(client.hgetall(task_key)),
+                idempotent=True,
+                read=True,
+            )
         except Exception as e:
             raise RedisOperationError(f"Failed to retrieve task from Redis: {e}")
 
+    def get_many(self, task_ids: List[str]) -> List[Task]:
+        """
+        Retrieve several tasks from Redis by their IDs, one pipeline per batch.
+
+        With more than one batch and `fetch_workers` above 1, the batches are fetched
+        by a thread pool, each pipeline on a connection of its own, so the round
+        trips overlap instead of adding up. Each batch is retried on its own.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to retrieve.
+
+        Returns:
+            List[Task]: The tasks that exist and have not expired, in the order of
+                `task_ids`.
+
+        Raises:
+            RedisOperationError: If there is an error retrieving the tasks from Redis.
+        """
+        batches = list(
+            chunked((self.keys.task(task_id) for task_id in task_ids), self.batch_size)
+        )
+
+        def fetch(task_keys: List[str]) -> List[Task]:
+            return self.redis_client.execute(
+                lambda client: self._load_tasks(client, task_keys),
+                idempotent=True,
+                read=True,
+            )
+
+        try:
+            workers = min(self.fetch_workers, len(batches))
+            if workers < 2:
+                pages = [fetch(batch) for batch in batches]
+            else:
+                with ThreadPoolExecutor(workers) as executor:
+                    pages = list(executor.map(fetch, batches))
+        except Exception as e:
+            raise RedisOperationError(f"Failed to retrieve tasks from Redis: {e}")
+        return [task for page in pages for task in page]
+
     def list(self) -> List[Task]:
         """
         Retrieve all tasks from Redis.
@@ -103,16 +650,9 @@ class RedisTaskRepository(TaskRepository):
             RedisOperationError: If there is an error listing tasks from Redis.
         """
         try:
-            client = self.redis_client.get_client()
-            task_keys = client.zrange("tasks", 0, -1)
-            return [
-                task
-                for task in (
-                    self.get_by_id(task_key.decode("utf-8").split(":")[1])
-                    for task_key in task_keys
-                )
-                if task is not None
-            ]
+            return list(self.iter_by_priority(Task.MIN_PRIORITY, Task.MAX_PRIORITY))
+        except RedisOperationError:
+            raise
         except Exception as e:
             raise RedisOperationError(f"Failed to list tasks from Redis: {e}")
 
@@ -131,18 +671,9 @@ class RedisTaskRepository(TaskRepository):
             RedisOperationError: If there is an error listing tasks by priority from Redis.
         """
         try:
-            client = self.redis_client.get_client()
-            min_score = min_priority
-            max_score = max_priority + 1 - 1e-10
-            task_keys = client.zrangebyscore("tasks", min_score, max_score)
-            return [
-                task
-                for task in (
-                    self.get_by_id(task_key.decode("utf-8").split(":")[1])
-                    for task_key in task_keys
-                )
-                if task is not None
-            ]
+            return list(self.iter_by_priority(min_priority, max_priority))
+        except RedisOperationError:
+            raise
         except Exception as e:
             raise RedisOperationError(
                 f"Failed to list tasks by priority from Redis: {e}"
@@ -162,11 +693,7 @@ class RedisTaskRepository(TaskRepository):
             RedisOperationError: If there is an error deleting the task from Redis.
         """
         try:
-            client = self.redis_client.get_client()
-            task_key = f"task:{task_id}"
-            client.delete(task_key)
-            client.zrem("tasks", task_key)
-            return True
+            return self._delete_keys([self.keys.task(task_id)]) > 0
         except Exception as e:
             raise RedisOperationError(f"Failed to delete task from Redis: {e}")
 
@@ -180,5 +707,1750 @@ class RedisTaskRepository(TaskRepository):
         Returns:
             Optional[Task]: The updated Task object if successful, None if the task was not found.
         """
-        self.add(task)  # Re-add the task to update in Redis
-        return task
+        task_key = self.keys.task(task.id)
+
+        if self._forget_script is None:
+            self._forget_script = self.redis_client.get_client().register_script(
+                FORGET_TOKENS_SCRIPT
+            )
+
+        def write(pipeline) -> Optional[Task]:
+            previous_priority, previous_tags, name, description, status, status_at = (
+                pipeline.hmget(
+                    task_key,
+                    "priority",
+                    "tags",
+                    "name",
+                    "description",
+                    "status",
+                    "status_at",
+                )
+            )
+            if previous_priority is None:
+                return None
+            # The status only changes through transition().
+            task.status = (status or Task.PENDING.encode()).decode("utf-8")
+            task.status_at = None if status_at is None else float(status_at)
+            dropped_tokens = task_tokens(
+                name.decode("utf-8"), (description or b"").decode("utf-8")
+            ) - task_tokens(task.name, task.description)
+            pipeline.multi()
+            if dropped_tokens:
+                self._forget_script(
+                    keys=[task_key, self.keys.vocabulary],
+                    args=[self.keys.token, *sorted(dropped_tokens)],
+                    client=pipeline,
+                )
+            if int(previous_priority) != task.priority:
+                pipeline.zrem(f"{self.keys.band}{int(previous_priority)}", task_key)
+            for tag in set((previous_tags or b"").decode("utf-8").split(",")):
+                if tag and tag not in task.tags:
+                    pipeline.srem(f"{self.keys.tag}{tag}", task_key)
+            # Drop the old hash first so fields cleared on the task don't linger.
+            pipeline.delete(task_key)
+            self._write_task(pipeline, task)
+            self._publish(pipeline, TaskEventType.UPDATE, task.id, task)
+            return task
+
+        try:
+            updated = self.redis_client.execute(
+                lambda client: client.transaction(
+                    write, task_key, value_from_callable=True
+                )
+            )
+            if updated is not None:
+                self.redis_client.record_write()
+            return updated
+        except Exception as e:
+            raise RedisOperationError(f"Failed to update task in Redis: {e}")
+
+    def delete_many(
+        self, task_ids: List[str], progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Delete several tasks from Redis, one pipelined round trip per batch.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to delete.
+            progress (Optional[Callable[[int], None]]): Called with the number of
+                tasks deleted after each batch.
+
+        Returns:
+            int: The number of tasks that were actually deleted.
+
+        Raises:
+            RedisOperationError: If there is an error deleting the tasks from Redis.
+        """
+        try:
+            deleted = 0
+            for chunk in chunked(task_ids, self.batch_size):
+                count = self._delete_keys(
+                    [self.keys.task(task_id) for task_id in chunk]
+                )
+                deleted += count
+                if progress:
+                    progress(count)
+            return deleted
+        except Exception as e:
+            raise RedisOperationError(f"Failed to delete tasks from Redis: {e}")
+
+    def delete_by_priority(
+        self,
+        min_priority: int,
+        max_priority: int,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Delete all tasks within a priority range from Redis in bounded batches.
+
+        Args:
+            min_priority (int): The minimum priority value.
+            max_priority (int): The maximum priority value.
+            progress (Optional[Callable[[int], None]]): Called with the number of
+                tasks deleted after each batch.
+
+        Returns:
+            int: The number of tasks that were actually deleted.
+
+        Raises:
+            RedisOperationError: If there is an error deleting the tasks from Redis.
+        """
+        try:
+            return self._delete_score_range(
+                min_priority, f"({max_priority + 1}", progress
+            )
+        except Exception as e:
+            raise RedisOperationError(
+                f"Failed to delete tasks by priority from Redis: {e}"
+            )
+
+    def delete_older_than(
+        self, timestamp: float, progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Delete the queued tasks created before a timestamp from Redis in batches.
+
+        The index score is `priority + timestamp / 1e10`, so the tasks of each
+        priority created before `timestamp` form a contiguous score range and can
+        be found without reading the task hashes.
+
+        Args:
+            timestamp (float): Tasks with a creation timestamp lower than this are deleted.
+            progress (Optional[Callable[[int], None]]): Called with the number of
+                tasks deleted after each batch.
+
+        Returns:
+            int: The number of tasks that were actually deleted.
+
+        Raises:
+            RedisOperationError: If there is an error deleting the tasks from Redis.
+        """
+        try:
+            return sum(
+                self._delete_score_range(
+                    priority, f"({priority + timestamp / 1e10}", progress
+                )
+                for priority in range(Task.MIN_PRIORITY, Task.MAX_PRIORITY + 1)
+            )
+        except Exception as e:
+            raise RedisOperationError(f"Failed to delete old tasks from Redis: {e}")
+
+    def prune_expired(self, now: float, batch_size: int) -> int:
+        """
+        Delete at most one batch of expired tasks, found through the `tasks:expiry` index.
+
+        Args:
+            now (float): The reference timestamp.
+            batch_size (int): The maximum number of tasks to delete.
+
+        Returns:
+            int: The number of expiry index entries removed, counting entries whose
+                task was already gone; fewer than `batch_size` means none are left.
+
+        Raises:
+            RedisOperationError: If there is an error pruning tasks from Redis.
+        """
+        try:
+            task_keys = self.redis_client.execute(
+                lambda client: client.zrangebyscore(
+                    self.keys.expiry, "-inf", now, start=0, num=batch_size
+                ),
+                idempotent=True,
+            )
+            if not task_keys:
+                return 0
+            # A task claimed since the read has left the expiry index and is kept.
+            self._delete_keys(
+                [task_key.decode("utf-8") for task_key in task_keys], [Task.PENDING]
+            )
+            return len(task_keys)
+        except Exception as e:
+            raise RedisOperationError(f"Failed to prune expired tasks from Redis: {e}")
+
+    def iter_by_priority(
+        self,
+        min_priority: int = Task.MIN_PRIORITY,
+        max_priority: int = Task.MAX_PRIORITY,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """
+        Stream tasks within a priority range from Redis in index order.
+
+        Pages are read with a score cursor rather than an offset, so each page costs
+        O(log n + batch_size) regardless of how deep into the index it is, and the
+        hashes of a page are fetched in a single pipelined round trip.
+
+        Args:
+            min_priority (int): The minimum priority value.
+            max_priority (int): The maximum priority value.
+            batch_size (Optional[int]): The page size, defaults to the repository batch size.
+
+        Yields:
+            Task: The next task within the priority range.
+
+        Raises:
+            RedisOperationError: If there is an error reading tasks from Redis.
+        """
+        yield from self._iter_score_range(
+            self.keys.index, min_priority, f"({max_priority + 1}", batch_size
+        )
+
+    def iter_by_status(
+        self,
+        status: str,
+        before: Optional[float] = None,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """
+        Stream the tasks of a `tasks:status:{status}` index, oldest status change first.
+
+        Args:
+            status (str): "running", "done" or "failed".
+            before (Optional[float]): When given, only tasks whose status changed
+                before this timestamp are returned.
+            batch_size (Optional[int]): The page size, defaults to the repository batch size.
+
+        Yields:
+            Task: The next task of that status.
+
+        Raises:
+            RedisOperationError: If there is an error reading tasks from Redis.
+        """
+        yield from self._iter_score_range(
+            f"{self.keys.status}{status}",
+            "-inf",
+            "+inf" if before is None else f"({before!r}",
+            batch_size,
+        )
+
+    def _iter_score_range(
+        self,
+        sorted_set: str,
+        min_score: object,
+        max_score: str,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """
+        Stream the tasks of a sorted set within a score range, in score order.
+
+        Pages are read with a score cursor rather than an offset, so each page costs
+        O(log n + batch_size) regardless of how deep into the index it is, and the
+        hashes of a page are fetched in a single pipelined round trip.
+
+        Args:
+            sorted_set (str): The index to read.
+            min_score (object): The inclusive minimum score.
+            max_score (str): The maximum score in Redis range syntax.
+            batch_size (Optional[int]): The page size, defaults to the repository batch size.
+
+        Yields:
+            Task: The next task within the range.
+
+        Raises:
+            RedisOperationError: If there is an error reading tasks from Redis.
+        """
+        batch_size = batch_size or self.batch_size
+        seen_at_score: set = set()
+
+        def read_page(client: redis.Redis) -> tuple:
+            entries = client.zrangebyscore(
+                sorted_set,
+                min_score,
+                max_score,
+                start=0,
+                num=batch_size + len(seen_at_score),
+                withscores=True,
+            )
+            page = [key for key, _ in entries if key not in seen_at_score]
+            return entries, self._load_tasks(client, page) if page else None
+
+        try:
+            while True:
+                entries, tasks = self.redis_client.execute(
+                    read_page, idempotent=True, read=True
+                )
+                if tasks is None:
+                    return
+                yield from tasks
+                if len(entries) < batch_size + len(seen_at_score):
+                    return
+                last_score = entries[-1][1]
+                if last_score != min_score:
+                    seen_at_score = set()
+                seen_at_score.update(
+                    key for key, score in entries if score == last_score
+                )
+                min_score = last_score
+        except RedisOperationError:
+            raise
+        except Exception as e:
+            raise RedisOperationError(f"Failed to read tasks from Redis: {e}")
+
+    def iter_by_tags(
+        self,
+        tags: Iterable[str],
+        min_priority: int = Task.MIN_PRIORITY,
+        max_priority: int = Task.MAX_PRIORITY,
+        batch_size: Optional[int] = None,
+    ) -> Iterator[Task]:
+        """
+        Stream the tasks carrying every given tag within a priority range from Redis.
+
+        A Lua script intersects the `tasks:tag:{tag}` sets with SINTER and keeps the
+        members whose `tasks` score falls in the priority range, so only matching keys
+        cross the network; their hashes are then fetched one pipelined batch at a time.
+        Delayed tasks are not in `tasks` and are therefore left out.
+
+        Args:
+            tags (Iterable[str]): The tags every returned task must carry.
+            min_priority (int): The minimum priority value.
+            max_priority (int): The maximum priority value.
+            batch_size (Optional[int]): The number of hashes fetched per round trip,
+                defaults to the repository batch size.
+
+        Yields:
+            Task: The next matching task, in index order.
+
+        Raises:
+            RedisOperationError: If there is an error reading tasks from Redis.
+        """
+        tag_keys = [f"{self.keys.tag}{tag}" for tag in sorted(set(tags))]
+        if not tag_keys:
+            yield from self.iter_by_priority(min_priority, max_priority, batch_size)
+            return
+        try:
+            if self._tagged_script is None:
+                self._tagged_script = self.redis_client.get_client().register_script(
+                    TAGGED_TASKS_SCRIPT
+                )
+            task_keys = self.redis_client.execute(
+                lambda client: self._tagged_script(
+                    keys=[self.keys.index, *tag_keys],
+                    args=[min_priority, max_priority + 1],
+                    client=client,
+                ),
+                idempotent=True,
+                read=True,
+            )
+            for chunk in chunked(task_keys, batch_size or self.batch_size):
+                yield from self.redis_client.execute(
+                    lambda client: self._load_tasks(client, chunk),
+                    idempotent=True,
+                    read=True,
+                )
+        except Exception as e:
+            raise RedisOperationError(f"Failed to read tagged tasks from Redis: {e}")
+
+    def search(
+        self, clauses: List[List[str]], offset: int = 0, limit: int = 20
+    ) -> Tuple[List[Task], int]:
+        """
+        Return one page of the queued tasks matching a parsed search query.
+
+        A read-only Lua script intersects and unites the `tasks:token:{token}` sets,
+        expanding prefix terms through the `tasks:tokens` vocabulary with ZRANGEBYLEX,
+        ranks the matches and returns only the keys of the page. Its cost grows with
+        the number of matching tasks, not with the size of the queue.
+
+        Args:
+            clauses (List[List[str]]): The query, see src.utils.search.parse_query().
+            offset (int): The number of ranked matches to skip.
+            limit (int): The maximum number of tasks to return.
+
+        Returns:
+            Tuple[List[Task], int]: The tasks of the page, highest priority and then
+                oldest first, and the total number of matches.
+
+        Raises:
+            RedisOperationError: If there is an error searching tasks in Redis.
+        """
+        args: list = [self.keys.token, offset, limit]
+        for clause in clauses:
+            args.extend([len(clause), *clause])
+
+        def read_page(client: redis.Redis) -> Tuple[List[Task], int]:
+            total, *task_keys = self._search_script(
+                keys=[self.keys.index, self.keys.vocabulary], args=args, client=client
+            )
+            return (self._load_tasks(client, task_keys) if task_keys else []), total
+
+        try:
+            if self._search_script is None:
+                self._search_script = self.redis_client.get_client().register_script(
+                    SEARCH_SCRIPT
+                )
+            return self.redis_client.execute(read_page, idempotent=True, read=True)
+        except Exception as e:
+            raise RedisOperationError(f"Failed to search tasks in Redis: {e}")
+
+    def add_many(self, tasks: Iterable[Task]) -> int:
+        """
+        Add several tasks to Redis, one transaction per batch.
+
+        Args:
+            tasks (Iterable[Task]): The tasks to add.
+
+        Returns:
+            int: The number of tasks added.
+
+        Raises:
+            RedisOperationError: If there is an error adding the tasks to Redis.
+        """
+
+        def write(client: redis.Redis, chunk: List[Task]) -> None:
+            pipeline = client.pipeline()
+            for task in chunk:
+                self._write_task(pipeline, task)
+                self._publish(pipeline, TaskEventType.ADD, task.id, task)
+            pipeline.execute()
+
+        try:
+            added = 0
+            for chunk in chunked(tasks, self.batch_size):
+                self.redis_client.execute(lambda client: write(client, chunk))
+                self.redis_client.record_write()
+                added += len(chunk)
+            return added
+        except Exception as e:
+            raise RedisOperationError(f"Failed to add tasks to Redis: {e}")
+
+    def iter_all(self, batch_size: Optional[int] = None) -> Iterator[Task]:
+        """
+        Stream every task hash in Redis, including hashes missing from the index.
+
+        Keys are walked with a SCAN cursor and each page of hashes is fetched in one
+        pipelined round trip. Like SCAN itself, a task may be returned twice if the
+        keyspace is resized during the walk.
+
+        Args:
+            batch_size (Optional[int]): The SCAN count hint, defaults to the batch size.
+
+        Yields:
+            Task: The next stored task that has not expired.
+
+        Raises:
+            RedisOperationError: If there is an error reading tasks from Redis.
+        """
+
+        def read_page(client: redis.Redis, cursor: int) -> tuple:
+            cursor, task_keys = client.scan(
+                cursor,
+                match=f"{self.keys.task_prefix}*",
+                count=batch_size or self.batch_size,
+            )
+            return cursor, self._load_tasks(client, task_keys) if task_keys else []
+
+        try:
+            # A SCAN cursor is only meaningful to the server that returned it, so
+            # every page, retries included, goes to the same client.
+            scanned = self.redis_client.get_read_client()
+            cursor = 0
+            while True:
+                cursor, tasks = self.redis_client.execute(
+                    lambda _: read_page(scanned, cursor), idempotent=True
+                )
+                yield from tasks
+                if cursor == 0:
+                    return
+        except Exception as e:
+            raise RedisOperationError(f"Failed to scan tasks in Redis: {e}")
+
+    def band_heads(self) -> Dict[int, float]:
+        """
+        Return the creation timestamp of the oldest task of each priority band.
+
+        Reads the head of every `tasks:band:{priority}` queue in one pipelined round trip.
+
+        Returns:
+            Dict[int, float]: The oldest timestamp keyed by priority, for non-empty bands.
+
+        Raises:
+            RedisOperationError: If there is an error reading the band queues.
+        """
+        priorities = range(Task.MIN_PRIORITY, Task.MAX_PRIORITY + 1)
+
+        def read_heads(client: redis.Redis) -> list:
+            pipeline = client.pipeline(transaction=False)
+            for priority in priorities:
+                pipeline.zrange(f"{self.keys.band}{priority}", 0, 0, withscores=True)
+            return pipeline.execute()
+
+        try:
+            heads = self.redis_client.execute(read_heads, idempotent=True)
+            return {
+                priority: head[0][1]
+                for priority, head in zip(priorities, heads)
+                if head
+            }
+        except Exception as e:
+            raise RedisOperationError(f"Failed to read the priority bands: {e}")
+
+    def pop_from_band(
+        self, priority: int, now: float, claim: bool = False
+    ) -> Optional[Task]:
+        """
+        Atomically remove and return the oldest unexpired task of a priority band.
+
+        Args:
+            priority (int): The priority band to dequeue from.
+            now (float): The reference timestamp for expiry.
+            claim (bool): Whether to keep the task in `tasks:status:running` rather
+                than delete it.
+
+        Returns:
+            Optional[Task]: The dequeued task, or None if the band holds no unexpired task.
+
+        Raises:
+            RedisOperationError: If there is an error dequeuing from Redis.
+        """
+        try:
+            if self._pop_script is None:
+                self._pop_script = self.redis_client.get_client().register_script(
+                    POP_BAND_SCRIPT
+                )
+            while True:
+                # Not idempotent: a retried pop could dequeue a second task.
+                fields = self.redis_client.execute(
+                    lambda client: self._pop_script(
+                        keys=[
+                            f"{self.keys.band}{priority}",
+                            self.keys.index,
+                            self.keys.expiry,
+                            self.keys.events,
+                        ],
+                        args=[
+                            self.events_maxlen,
+                            self.keys.task_prefix,
+                            now,
+                            self.batch_size,
+                            self.keys.band,
+                            self.keys.tag,
+                            self.keys.token,
+                            self.keys.vocabulary,
+                            self.keys.status,
+                            int(claim),
+                        ],
+                        client=client,
+                    )
+                )
+                if fields is None:
+                    return None
+                self.redis_client.record_write()
+                if fields:
+                    return Task.model_validate(
+                        {
+                            key.decode("utf-8"): value.decode("utf-8")
+                            for key, value in zip(fields[::2], fields[1::2])
+                        }
+                    )
+        except Exception as e:
+            raise RedisOperationError(f"Failed to dequeue a task from Redis: {e}")
+
+    def transition(
+        self, task_ids: List[str], status: str, from_statuses: Iterable[str], now: float
+    ) -> List[Task]:
+        """
+        Move tasks to another status and index, one MULTI/EXEC transaction per batch.
+
+        Each batch WATCHes its task hashes and reads them, then rewrites those whose
+        status is one of `from_statuses` in a single transaction, which is retried if
+        a task changed meanwhile. A task leaving a status other than "pending" is
+        removed from `tasks:status:{status}`; _write_task() places it in its new one.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to move.
+            status (str): The new status.
+            from_statuses (Iterable[str]): The statuses a task must have to be moved.
+            now (float): The timestamp recorded as `status_at`.
+
+        Returns:
+            List[Task]: The tasks that were moved, as stored afterwards.
+
+        Raises:
+            RedisOperationError: If there is an error changing the tasks in Redis.
+        """
+        sources = set(from_statuses)
+        try:
+            moved = []
+            for chunk in chunked(list(dict.fromkeys(task_ids)), self.batch_size):
+                task_keys = [self.keys.task(task_id) for task_id in chunk]
+                tasks = self.redis_client.execute(
+                    lambda client: client.transaction(
+                        lambda pipeline: self._transition_chunk(
+                            pipeline, task_keys, status, sources, now
+                        ),
+                        *task_keys,
+                        value_from_callable=True,
+                    )
+                )
+                if tasks:
+                    self.redis_client.record_write()
+                moved.extend(tasks)
+            return moved
+        except Exception as e:
+            raise RedisOperationError(f"Failed to change task statuses in Redis: {e}")
+
+    def _transition_chunk(
+        self, pipeline, task_keys: List[str], status: str, sources: set, now: float
+    ) -> List[Task]:
+        """
+        Move one batch of watched tasks to another status within a transaction.
+
+        Args:
+            pipeline: The transaction pipeline, still in WATCH mode.
+            task_keys (List[str]): The keys of the tasks to move.
+            status (str): The new status.
+            sources (set): The statuses a task must have to be moved.
+            now (float): The timestamp recorded as `status_at`.
+
+        Returns:
+            List[Task]: The tasks moved.
+        """
+        stored = [
+            self._parse_task(pipeline.hgetall(task_key)) for task_key in task_keys
+        ]
+        stored = [
+            task for task in stored if task is not None and task.status in sources
+        ]
+        pipeline.multi()
+        for task in stored:
+            if task.status != Task.PENDING:
+                pipeline.zrem(
+                    f"{self.keys.status}{task.status}", self.keys.task(task.id)
+                )
+            task.status, task.status_at = status, now
+            self._write_task(pipeline, task)
+            self._publish(pipeline, TaskEventType.UPDATE, task.id, task)
+        return stored
+
+    def delete_in_status(self, task_ids: List[str], statuses: Iterable[str]) -> int:
+        """
+        Delete the given tasks that still have one of the given statuses.
+
+        The delete script reads each status before removing the task, so a task moved
+        to another status since it was listed is left alone.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to delete.
+            statuses (Iterable[str]): The statuses a task must have to be deleted.
+
+        Returns:
+            int: The number of tasks deleted.
+
+        Raises:
+            RedisOperationError: If there is an error deleting the tasks from Redis.
+        """
+        statuses = sorted(set(statuses))
+        if not statuses:
+            return 0
+        try:
+            return sum(
+                self._delete_keys(
+                    [self.keys.task(task_id) for task_id in chunk], statuses
+                )
+                for chunk in chunked(task_ids, self.batch_size)
+            )
+        except Exception as e:
+            raise RedisOperationError(f"Failed to delete tasks from Redis: {e}")
+
+    def promote_due(self, now: float, batch_size: int) -> int:
+        """
+        Move at most one batch of due delayed tasks into the queue with a Lua script.
+
+        The script reads the due entries of `tasks:delayed` with a limited
+        ZRANGEBYSCORE, so a tick costs O(log n + due) however many tasks are delayed.
+
+        Args:
+            now (float): The reference timestamp.
+            batch_size (int): The maximum number of tasks to promote.
+
+        Returns:
+            int: The number of delayed index entries processed; fewer than
+                `batch_size` means none are due.
+
+        Raises:
+            RedisOperationError: If there is an error promoting tasks in Redis.
+        """
+        try:
+            if self._promote_script is None:
+                self._promote_script = self.redis_client.get_client().register_script(
+                    PROMOTE_DUE_SCRIPT
+                )
+            # Idempotent: an entry is promoted at most once, however often this runs.
+            promoted = self.redis_client.execute(
+                lambda client: self._promote_script(
+                    keys=[self.keys.delayed, self.keys.index],
+                    args=[now, batch_size, self.keys.band],
+                    client=client,
+                ),
+                idempotent=True,
+            )
+            if promoted:
+                self.redis_client.record_write()
+            return promoted
+        except Exception as e:
+            raise RedisOperationError(f"Failed to promote delayed tasks in Redis: {e}")
+
+    def add_if_absent(
+        self, keyed_tasks: Iterable[Tuple[str, Task]], ttl: float
+    ) -> List[Tuple[Task, bool]]:
+        """
+        Add each task unless its deduplication key was recorded within `ttl` seconds.
+
+        Each batch WATCHes its `tasks:dedup:{key}` entries, reads them with one MGET and
+        writes the new tasks with their entries in one MULTI/EXEC, which is retried if
+        a concurrent submission touched one of the keys. A batch therefore costs the
+        same few round trips whether it holds one task or `batch_size`.
+
+        Args:
+            keyed_tasks (Iterable[Tuple[str, Task]]): The key and task of each submission.
+            ttl (float): The number of seconds a key is remembered.
+
+        Returns:
+            List[Tuple[Task, bool]]: The stored task of each submission and whether it
+                was added by this call.
+
+        Raises:
+            RedisOperationError: If there is an error adding the tasks to Redis.
+        """
+        try:
+            results: List[Tuple[Task, bool]] = []
+            for chunk in chunked(keyed_tasks, self.batch_size):
+                added = self.redis_client.execute(
+                    lambda client: self._add_chunk_if_absent(client, chunk, ttl)
+                )
+                if any(created for _, created in added):
+                    self.redis_client.record_write()
+                results.extend(added)
+            return results
+        except Exception as e:
+            raise RedisOperationError(f"Failed to add tasks to Redis: {e}")
+
+    def for_queue(self, queue: str) -> "RedisTaskRepository":
+        """
+        Return a repository over another queue, sharing this repository's Redis client.
+
+        Args:
+            queue (str): The queue name.
+
+        Returns:
+            RedisTaskRepository: The repository of that queue.
+
+        Raises:
+            ValueError: If the queue name is invalid.
+        """
+        if queue == self.queue:
+            return self
+        return RedisTaskRepository(
+            self.redis_client,
+            self.batch_size,
+            self.events_maxlen,
+            queue,
+            self.fetch_workers,
+        )
+
+    def queue_counts(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return the number of queued and delayed tasks of every queue in the `queues` set.
+
+        Both counts of all queues are read with ZCARD in one pipelined round trip.
+
+        Returns:
+            Dict[str, Dict[str, int]]: For each queue name in alphabetical order, the
+                number of "queued" and "delayed" tasks, including expired tasks not
+                yet pruned. The default queue is always listed.
+
+        Raises:
+            RedisOperationError: If there is an error reading the queues.
+        """
+
+        def read_counts(client: redis.Redis) -> Dict[str, Dict[str, int]]:
+            names = {name.decode("utf-8") for name in client.smembers(QUEUES_KEY)}
+            queues = sorted(names | {DEFAULT_QUEUE})
+            pipeline = client.pipeline(transaction=False)
+            for queue in queues:
+                keys = QueueKeys(queue)
+                pipeline.zcard(keys.index)
+                pipeline.zcard(keys.delayed)
+            counts = pipeline.execute()
+            return {
+                queue: {"queued": queued, "delayed": delayed}
+                for queue, queued, delayed in zip(queues, counts[::2], counts[1::2])
+            }
+
+        try:
+            return self.redis_client.execute(read_counts, idempotent=True, read=True)
+        except Exception as e:
+            raise RedisOperationError(f"Failed to count the queues in Redis: {e}")
+
+    def move_to_queue(self, task_ids: List[str], queue: str) -> int:
+        """
+        Move tasks to another queue, keeping their IDs, one transaction per batch.
+
+        Each batch WATCHes its task hashes, reads them, then removes them from this
+        queue with the delete script and writes them to the destination in a single
+        MULTI/EXEC, which is retried if a task changed meanwhile. Both change feeds
+        record the move, as a delete here and an add there.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to move.
+            queue (str): The name of the destination queue.
+
+        Returns:
+            int: The number of tasks that existed and were moved.
+
+        Raises:
+            ValueError: If the destination is invalid or is this queue.
+            RedisOperationError: If there is an error moving the tasks in Redis.
+        """
+        if queue == self.queue:
+            raise ValueError(f"Tasks are already in queue {queue!r}")
+        target = self.for_queue(queue)
+        try:
+            moved = 0
+            for chunk in chunked(task_ids, self.batch_size):
+                task_keys = [self.keys.task(task_id) for task_id in chunk]
+                count = self.redis_client.execute(
+                    lambda client: client.transaction(
+                        lambda pipeline: self._move_chunk(pipeline, task_keys, target),
+                        *task_keys,
+                        value_from_callable=True,
+                    )
+                )
+                if count:
+                    self.redis_client.record_write()
+                moved += count
+            return moved
+        except Exception as e:
+            raise RedisOperationError(f"Failed to move tasks in Redis: {e}")
+
+    def _move_chunk(
+        self, pipeline, task_keys: List[str], target: "RedisTaskRepository"
+    ) -> int:
+        """
+        Move one batch of watched tasks to another queue within a transaction.
+
+        Args:
+            pipeline: The transaction pipeline, still in WATCH mode.
+            task_keys (List[str]): The keys of the tasks to move.
+            target (RedisTaskRepository): The repository of the destination queue.
+
+        Returns:
+            int: The number of tasks moved.
+        """
+        stored = [
+            (task_key, self._parse_task(pipeline.hgetall(task_key)))
+            for task_key in task_keys
+        ]
+        stored = [(task_key, task) for task_key, task in stored if task is not None]
+        pipeline.multi()
+        if stored:
+            self._run_delete_script(pipeline, [task_key for task_key, _ in stored])
+        for _, task in stored:
+            target._write_task(pipeline, task)
+            target._publish(pipeline, TaskEventType.ADD, task.id, task)
+        return len(stored)
+
+    def check_consistency(
+        self,
+        repair: bool = False,
+        on_issue: Optional[Callable[[str, str], None]] = None,
+    ) -> Dict[str, int]:
+        """
+        Check the task hashes against the priority index, band queues and status indexes.
+
+        The index, each band and each status index are walked with ZSCAN and the task
+        hashes with SCAN, one batch at a time, and each batch is checked in pipelined
+        round trips, so Redis is never blocked by the whole keyspace. It finds entries
+        whose hash is gone ("dangling"), hashes that no index points to ("orphaned"),
+        and entries whose score, band or status disagrees with the hash ("mismatched").
+
+        A repair runs a Lua script per batch that re-reads each flagged hash and
+        rebuilds its entries, or drops them if the hash is gone, so tasks changed by
+        clients since they were checked are never damaged.
+
+        Args:
+            repair (bool): Whether to fix the inconsistencies found.
+            on_issue (Optional[Callable[[str, str], None]]): Called with the kind and
+                task ID of each inconsistency.
+
+        Returns:
+            Dict[str, int]: The counts described in TaskRepository.check_consistency().
+
+        Raises:
+            RedisOperationError: If there is an error reading or repairing Redis.
+        """
+        report = dict.fromkeys(CONSISTENCY_COUNTS, 0)
+        walks: List[Tuple[str, Iterator[List], Callable[[List], list]]] = [
+            ("entries", self._scan_pages(self.keys.index), self._check_index_page)
+        ]
+        for priority in range(Task.MIN_PRIORITY, Task.MAX_PRIORITY + 1):
+            walks.append(
+                (
+                    "entries",
+                    self._scan_pages(f"{self.keys.band}{priority}"),
+                    functools.partial(self._check_band_page, priority=priority),
+                )
+            )
+        for status in STATUS_INDEXED:
+            walks.append(
+                (
+                    "entries",
+                    self._scan_pages(f"{self.keys.status}{status}"),
+                    functools.partial(self._check_status_page, status=status),
+                )
+            )
+        walks.append(("hashes", self._scan_pages(None), self._check_hash_page))
+        try:
+            for counter, pages, check in walks:
+                for page in pages:
+                    report[counter] += len(page)
+                    issues = self.redis_client.execute(
+                        lambda _: check(page), idempotent=True
+                    )
+                    for kind, task_key in issues:
+                        report[kind] += 1
+                        if on_issue is not None:
+                            on_issue(kind, task_key[len(self.keys.task_prefix) :])
+                    if repair and issues:
+                        report["repaired"] += self._repair_keys(
+                            sorted({task_key for _, task_key in issues})
+                        )
+            return report
+        except Exception as e:
+            raise RedisOperationError(f"Failed to check the consistency of Redis: {e}")
+
+    def sample_memory(self, sample_size: int = 1000) -> Dict[str, Any]:
+        """
+        Measure the memory of this queue with MEMORY USAGE, sampling per-task keys.
+
+        Task hashes, tag sets, token sets and deduplication keys are sampled from a
+        SCAN of at most `MEMORY_SCAN_FACTOR * sample_size` keys, each measured with
+        MEMORY USAGE and OBJECT ENCODING in pipelined batches. Their counts are exact
+        where an index holds them (tasks and the vocabulary), exact when the SCAN
+        finishes, and otherwise scaled from the share of DBSIZE scanned. The indexes,
+        bands, status indexes and change feed are measured whole.
+
+        Args:
+            sample_size (int): The maximum number of keys of each group measured, and
+                the number of nested elements MEMORY USAGE samples per sorted set.
+
+        Returns:
+            Dict[str, Any]: The measurements described in TaskRepository.sample_memory(),
+                with the `hash-max-*` configuration as the settings.
+
+        Raises:
+            RedisOperationError: If there is an error reading Redis.
+        """
+        prefixes = {
+            MEMORY_TASK_GROUP: self.keys.task_prefix,
+            "tag sets": self.keys.tag,
+            "token sets": self.keys.token,
+            "dedup keys": self.keys.dedup,
+        }
+        structures = {
+            "priority index": [self.keys.index],
+            "expiry index": [self.keys.expiry],
+            "delayed index": [self.keys.delayed],
+            "change feed": [self.keys.events],
+            "vocabulary": [self.keys.vocabulary],
+            "band queues": [
+                f"{self.keys.band}{priority}"
+                for priority in range(Task.MIN_PRIORITY, Task.MAX_PRIORITY + 1)
+            ],
+            "status indexes": [
+                f"{self.keys.status}{status}" for status in STATUS_INDEXED
+            ],
+        }
+        try:
+            sampled, seen, scanned, complete = self.redis_client.execute(
+                lambda client: self._scan_sample(client, prefixes, sample_size),
+                idempotent=True,
+            )
+
+            def read_counts(client: redis.Redis) -> list:
+                pipeline = client.pipeline(transaction=False)
+                for key in (self.keys.index, self.keys.delayed, self.keys.vocabulary):
+                    pipeline.zcard(key)
+                for key in structures["status indexes"]:
+                    pipeline.zcard(key)
+                pipeline.dbsize()
+                return pipeline.execute()
+
+            queued, delayed, vocabulary, *statuses, dbsize = self.redis_client.execute(
+                read_counts, idempotent=True
+            )
+            scale = 1 if complete or not scanned else dbsize / scanned
+            counts = {name: round(count * scale) for name, count in seen.items()}
+            counts[MEMORY_TASK_GROUP] = queued + delayed + sum(statuses)
+            counts["token sets"] = vocabulary
+
+            groups = {}
+            for name, keys in sampled.items():
+                sizes, encodings = self.redis_client.execute(
+                    lambda client: self._measure_keys(client, keys), idempotent=True
+                )
+                groups[name] = {
+                    "count": counts[name],
+                    "sizes": sizes,
+                    "encodings": encodings,
+                }
+            structure_sizes = self.redis_client.execute(
+                lambda client: self._measure_structures(
+                    client, structures, sample_size
+                ),
+                idempotent=True,
+            )
+            return {
+                "tasks": counts[MEMORY_TASK_GROUP],
+                "groups": groups,
+                "structures": structure_sizes,
+                "settings": self.redis_client.execute(
+                    self._encoding_settings, idempotent=True
+                ),
+            }
+        except Exception as e:
+            raise RedisOperationError(f"Failed to measure the memory of Redis: {e}")
+
+    def _scan_sample(
+        self, client: redis.Redis, prefixes: Dict[str, str], sample_size: int
+    ) -> Tuple[Dict[str, List[bytes]], Dict[str, int], int, bool]:
+        """
+        SCAN a bounded share of the keyspace, collecting the keys of each group.
+
+        Returns:
+            Tuple[Dict[str, List[bytes]], Dict[str, int], int, bool]: Up to
+                `sample_size` keys of each group, the number of keys of each group
+                seen, the number of keys scanned, and whether the SCAN finished.
+        """
+        sampled: Dict[str, List[bytes]] = {name: [] for name in prefixes}
+        seen = dict.fromkeys(prefixes, 0)
+        encoded = [(name, prefix.encode("utf-8")) for name, prefix in prefixes.items()]
+        cursor, scanned = 0, 0
+        while True:
+            cursor, keys = client.scan(cursor, count=self.batch_size)
+            scanned += len(keys)
+            for key in keys:
+                for name, prefix in encoded:
+                    if key.startswith(prefix):
+                        seen[name] += 1
+                        if len(sampled[name]) < sample_size:
+                            sampled[name].append(key)
+                        break
+            if cursor == 0:
+                return sampled, seen, scanned, True
+            if scanned >= MEMORY_SCAN_FACTOR * sample_size:
+                return sampled, seen, scanned, False
+
+    def _measure_keys(
+        self, client: redis.Redis, keys: List[bytes]
+    ) -> Tuple[List[int], List[str]]:
+        """
+        Read the MEMORY USAGE and OBJECT ENCODING of keys in pipelined batches.
+
+        Returns:
+            Tuple[List[int], List[str]]: The size and encoding of each key that still
+                exists, in key order.
+        """
+        sizes, encodings = [], []
+        for chunk in chunked(keys, self.batch_size):
+            pipeline = client.pipeline(transaction=False)
+            for key in chunk:
+                pipeline.memory_usage(key)
+                pipeline.object("encoding", key)
+            replies = pipeline.execute(raise_on_error=False)
+            for size, encoding in zip(replies[::2], replies[1::2]):
+                if isinstance(size, int) and isinstance(encoding, bytes):
+                    sizes.append(size)
+                    encodings.append(encoding.decode("utf-8"))
+        return sizes, encodings
+
+    @staticmethod
+    def _measure_structures(
+        client: redis.Redis, structures: Dict[str, List[str]], sample_size: int
+    ) -> Dict[str, int]:
+        """
+        Read the total MEMORY USAGE of each structure in one pipelined round trip.
+
+        Returns:
+            Dict[str, int]: The size in bytes of each structure; missing keys count as 0.
+        """
+        pipeline = client.pipeline(transaction=False)
+        for keys in structures.values():
+            for key in keys:
+                pipeline.memory_usage(key, samples=sample_size)
+        replies = iter(pipeline.execute())
+        return {
+            name: sum(next(replies) or 0 for _ in keys)
+            for name, keys in structures.items()
+        }
+
+    @staticmethod
+    def _encoding_settings(client: redis.Redis) -> Dict[str, str]:
+        """
+        Read the `hash-max-*` settings that choose the encoding of task hashes.
+
+        Returns:
+            Dict[str, str]: The settings, or none if CONFIG is not available.
+        """
+        try:
+            settings = client.config_get("hash-max-*")
+        except redis.ResponseError:
+            return {}
+        return {
+            (name.decode("utf-8") if isinstance(name, bytes) else name): (
+                value.decode("utf-8") if isinstance(value, bytes) else str(value)
+            )
+            for name, value in sorted(settings.items())
+        }
+
+    def _scan_pages(self, sorted_set: Optional[str]) -> Iterator[List]:
+        """
+        Walk a sorted set with ZSCAN, or the task hashes with SCAN, one page at a time.
+
+        Args:
+            sorted_set (Optional[str]): The sorted set to walk, None for the hashes.
+
+        Yields:
+            List: The (task key, score) pairs of a sorted set page, or the task keys.
+        """
+        client = self.redis_client.get_client()
+        cursor = 0
+        while True:
+            if sorted_set is None:
+                cursor, page = self.redis_client.execute(
+                    lambda _: client.scan(
+                        cursor, match=f"{self.keys.task_prefix}*", count=self.batch_size
+                    ),
+                    idempotent=True,
+                )
+                page = [task_key.decode("utf-8") for task_key in page]
+            else:
+                cursor, page = self.redis_client.execute(
+                    lambda _: client.zscan(sorted_set, cursor, count=self.batch_size),
+                    idempotent=True,
+                )
+                page = [(task_key.decode("utf-8"), score) for task_key, score in page]
+            if page:
+                yield page
+            if cursor == 0:
+                return
+
+    def _check_index_page(self, page: List[Tuple[str, float]]) -> List[Tuple[str, str]]:
+        """
+        Check a page of priority index entries against their hashes and bands.
+
+        Returns:
+            List[Tuple[str, str]]: The kind and task key of each inconsistency.
+        """
+        client = self.redis_client.get_client()
+        pipeline = client.pipeline(transaction=False)
+        for task_key, _ in page:
+            pipeline.hmget(task_key, "priority", "timestamp", "status")
+        fields = pipeline.execute()
+        issues, present = [], []
+        for (task_key, score), (priority, timestamp, status) in zip(page, fields):
+            if priority is None:
+                issues.append(("dangling", task_key))
+            elif (
+                status not in (None, Task.PENDING.encode())
+                or score != int(priority) + float(timestamp) / 1e10
+            ):
+                issues.append(("mismatched", task_key))
+            else:
+                present.append((task_key, priority, float(timestamp)))
+        for task_key, priority, timestamp in present:
+            pipeline.zscore(f"{self.keys.band}{priority.decode('utf-8')}", task_key)
+        band_scores = pipeline.execute()
+        for (task_key, _, timestamp), band_score in zip(present, band_scores):
+            if band_score != timestamp:
+                issues.append(("mismatched", task_key))
+        return issues
+
+    def _check_band_page(
+        self, page: List[Tuple[str, float]], priority: int
+    ) -> List[Tuple[str, str]]:
+        """
+        Check a page of a band queue against the hashes and the priority index.
+
+        Returns:
+            List[Tuple[str, str]]: The kind and task key of each inconsistency.
+        """
+        pipeline = self.redis_client.get_client().pipeline(transaction=False)
+        for task_key, _ in page:
+            pipeline.hmget(task_key, "priority", "timestamp", "status")
+            pipeline.zscore(self.keys.index, task_key)
+        replies = pipeline.execute()
+        issues = []
+        for (task_key, score), (priority_field, timestamp, status), index_score in zip(
+            page, replies[::2], replies[1::2]
+        ):
+            if priority_field is None:
+                issues.append(("dangling", task_key))
+            elif (
+                status not in (None, Task.PENDING.encode())
+                or int(priority_field) != priority
+                or float(timestamp) != score
+                or index_score is None
+            ):
+                issues.append(("mismatched", task_key))
+        return issues
+
+    def _check_status_page(
+        self, page: List[Tuple[str, float]], status: str
+    ) -> List[Tuple[str, str]]:
+        """
+        Check a page of a status index against the hashes.
+
+        Returns:
+            List[Tuple[str, str]]: The kind and task key of each inconsistency.
+        """
+        pipeline = self.redis_client.get_client().pipeline(transaction=False)
+        for task_key, _ in page:
+            pipeline.hmget(task_key, "status", "status_at", "timestamp")
+        issues = []
+        for (task_key, score), (status_field, status_at, timestamp) in zip(
+            page, pipeline.execute()
+        ):
+            if timestamp is None:
+                issues.append(("dangling", task_key))
+            elif status_field != status.encode() or score != float(
+                status_at or timestamp
+            ):
+                issues.append(("mismatched", task_key))
+        return issues
+
+    def _check_hash_page(self, task_keys: List[str]) -> List[Tuple[str, str]]:
+        """
+        Find the task hashes of a SCAN page missing from the index of their status.
+
+        A pending task must be queued or delayed; any other task must be in the
+        `tasks:status:{status}` index.
+
+        Returns:
+            List[Tuple[str, str]]: The kind and task key of each inconsistency.
+        """
+        pipeline = self.redis_client.get_client().pipeline(transaction=False)
+        for task_key in task_keys:
+            pipeline.hget(task_key, "status")
+            pipeline.zscore(self.keys.index, task_key)
+            pipeline.zscore(self.keys.delayed, task_key)
+        replies = pipeline.execute()
+        statuses = [
+            (status or Task.PENDING.encode()).decode("utf-8") for status in replies[::3]
+        ]
+        for task_key, status in zip(task_keys, statuses):
+            if status != Task.PENDING:
+                pipeline.zscore(f"{self.keys.status}{status}", task_key)
+        status_scores = iter(pipeline.execute())
+        issues = []
+        for task_key, status, queued, delayed in zip(
+            task_keys, statuses, replies[1::3], replies[2::3]
+        ):
+            if status == Task.PENDING:
+                indexed = queued is not None or delayed is not None
+            else:
+                indexed = next(status_scores) is not None
+            if not indexed:
+                issues.append(("orphaned", task_key))
+        return issues
+
+    def _repair_keys(self, task_keys: List[str]) -> int:
+        """
+        Rebuild the index entries of flagged tasks from their hashes with a Lua script.
+
+        Args:
+            task_keys (List[str]): The keys of the tasks to repair.
+
+        Returns:
+            int: The number of tasks whose entries changed.
+        """
+        if self._repair_script is None:
+            self._repair_script = self.redis_client.get_client().register_script(
+                REPAIR_TASKS_SCRIPT
+            )
+        repaired = self.redis_client.execute(
+            lambda client: self._repair_script(
+                keys=[
+                    self.keys.index,
+                    self.keys.expiry,
+                    self.keys.delayed,
+                    self.keys.vocabulary,
+                    *task_keys,
+                ],
+                args=[
+                    time.time(),
+                    self.keys.band,
+                    self.keys.tag,
+                    self.keys.token,
+                    Task.MIN_PRIORITY,
+                    Task.MAX_PRIORITY,
+                    self.keys.status,
+                    *STATUS_INDEXED,
+                ],
+                client=client,
+            ),
+            idempotent=True,
+        )
+        if repaired:
+            self.redis_client.record_write()
+        return repaired
+
+    def _add_chunk_if_absent(
+        self, client: redis.Redis, chunk: List[Tuple[str, Task]], ttl: float
+    ) -> List[Tuple[Task, bool]]:
+        """
+        Check and insert one batch of keyed tasks in a single optimistic transaction.
+
+        Args:
+            client (redis.Redis): The primary client.
+            chunk (List[Tuple[str, Task]]): The key and task of each submission.
+            ttl (float): The number of seconds a key is remembered.
+
+        Returns:
+            List[Tuple[Task, bool]]: The stored task of each submission and whether it
+                was added.
+        """
+        dedup_keys = [f"{self.keys.dedup}{key}" for key, _ in chunk]
+
+        def write(pipeline) -> List[Tuple[Task, bool]]:
+            stored = dict(zip(dedup_keys, pipeline.mget(dedup_keys)))
+            pipeline.multi()
+            results = []
+            for dedup_key, (_, task) in zip(dedup_keys, chunk):
+                existing = stored[dedup_key]
+                if isinstance(existing, Task):
+                    results.append((existing, False))
+                    continue
+                if existing is not None:
+                    stored[dedup_key] = Task.model_validate_json(existing)
+                    results.append((stored[dedup_key], False))
+                    continue
+                stored[dedup_key] = task
+                pipeline.set(dedup_key, task.model_dump_json(), px=int(ttl * 1000))
+                self._write_task(pipeline, task)
+                self._publish(pipeline, TaskEventType.ADD, task.id, task)
+                results.append((task, True))
+            return results
+
+        return client.transaction(write, *dedup_keys, value_from_callable=True)
+
+    def _load_tasks(self, client: redis.Redis, task_keys: List[bytes]) -> List[Task]:
+        """
+        Fetch several task hashes in one pipelined round trip.
+
+        Args:
+            client (redis.Redis): The client the index page was read from.
+            task_keys (List[bytes]): The keys of the tasks to fetch, as stored in the index.
+
+        Returns:
+            List[Task]: The tasks that exist and have not expired, in key order.
+        """
+        pipeline = client.pipeline(transaction=False)
+        for task_key in task_keys:
+            pipeline.hgetall(task_key)
+        return [
+            task
+            for task in (self._parse_task(data) for data in pipeline.execute())
+            if task is not None
+        ]
+
+    @staticmethod
+    def _parse_task(task_data: dict) -> Optional[Task]:
+        """
+        Build a Task from a raw Redis hash.
+
+        Args:
+            task_data (dict): The hash fields and values as returned by HGETALL.
+
+        Returns:
+            Optional[Task]: The task, or None if the hash is empty or the task has expired.
+        """
+        if not task_data:
+            return None
+        task = Task.model_validate(
+            {k.decode("utf-8"): v.decode("utf-8") for k, v in task_data.items()}
+        )
+        return None if task.is_expired() else task
+
+    def _write_task(self, pipeline, task: Task) -> None:
+        """
+        Queue the commands that store a task hash and its index entries.
+
+        Args:
+            pipeline: The Redis pipeline to queue the commands on.
+            task (Task): The task to store.
+        """
+        task_key = self.keys.task(task.id)
+        score = task.priority + task.timestamp / 1e10
+        mapping = {
+            key: value
+            for key, value in task.model_dump(exclude={"tags"}).items()
+            if value is not None
+        }
+        if task.tags:
+            # Tags cannot contain commas, so they are stored as one joined field.
+            mapping["tags"] = ",".join(task.tags)
+        pipeline.hset(task_key, mapping=mapping)
+        pipeline.sadd(QUEUES_KEY, self.queue)
+        for tag in task.tags:
+            pipeline.sadd(f"{self.keys.tag}{tag}", task_key)
+        tokens = task_tokens(task.name, task.description)
+        for token in tokens:
+            pipeline.sadd(f"{self.keys.token}{token}", task_key)
+        if tokens:
+            pipeline.zadd(self.keys.vocabulary, dict.fromkeys(tokens, 0))
+        if task.status != Task.PENDING:
+            # Claimed and finished tasks leave the queue for their status index.
+            pipeline.zadd(
+                f"{self.keys.status}{task.status}",
+                {task_key: task.status_at or task.timestamp},
+            )
+            for sorted_set in (
+                self.keys.index,
+                f"{self.keys.band}{task.priority}",
+                self.keys.delayed,
+                self.keys.expiry,
+            ):
+                pipeline.zrem(sorted_set, task_key)
+            return
+        if task.is_due():
+            pipeline.zadd(self.keys.index, {task_key: score})
+            pipeline.zadd(
+                f"{self.keys.band}{task.priority}", {task_key: task.timestamp}
+            )
+            pipeline.zrem(self.keys.delayed, task_key)
+        else:
+            # Kept out of the queue until promote_due() moves it in.
+            pipeline.zadd(self.keys.delayed, {task_key: task.run_at})
+            pipeline.zrem(self.keys.index, task_key)
+            pipeline.zrem(f"{self.keys.band}{task.priority}", task_key)
+        if task.expires_at is not None:
+            pipeline.zadd(self.keys.expiry, {task_key: task.expires_at})
+        else:
+            pipeline.zrem(self.keys.expiry, task_key)
+
+    def _delete_score_range(
+        self,
+        min_score: float,
+        max_score: str,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Delete the tasks whose index score falls in a range, one batch at a time.
+
+        Each batch is read with a limited ZRANGEBYSCORE and removed before the next
+        one is read, so Redis is never blocked by a single large command.
+
+        Args:
+            min_score (float): The inclusive minimum score.
+            max_score (str): The maximum score in Redis range syntax.
+            progress (Optional[Callable[[int], None]]): Called with the number of
+                tasks deleted after each batch.
+
+        Returns:
+            int: The number of tasks that were actually deleted.
+        """
+        deleted = 0
+        while True:
+            task_keys = self.redis_client.execute(
+                lambda client: client.zrangebyscore(
+                    self.keys.index, min_score, max_score, start=0, num=self.batch_size
+                ),
+                idempotent=True,
+            )
+            if not task_keys:
+                return deleted
+            count = self._delete_keys(
+                [task_key.decode("utf-8") for task_key in task_keys]
+            )
+            deleted += count
+            if progress:
+                progress(count)
+
+    def _delete_keys(self, task_keys: List[str], statuses: Iterable[str] = ()) -> int:
+        """
+        Remove task hashes and their index entries in a single atomic script.
+
+        The script publishes a delete event for each hash it actually removed, so the
+        change feed always agrees with the returned count. UNLINK frees the hash memory
+        in a background thread, so deleting large batches does not stall the server.
+
+        Args:
+            task_keys (List[str]): The task keys to delete.
+            statuses (Iterable[str]): When given, only tasks with one of these
+                statuses are deleted.
+
+        Returns:
+            int: The number of task hashes that existed and were deleted.
+        """
+        deleted = self.redis_client.execute(
+            lambda client: self._run_delete_script(client, task_keys, statuses)
+        )
+        if deleted:
+            self.redis_client.record_write()
+        return deleted
+
+    def _run_delete_script(
+        self, client, task_keys: List[str], statuses: Iterable[str] = ()
+    ):
+        """
+        Run the delete script on a client, or queue it on a transaction pipeline.
+
+        Args:
+            client: The primary client or a pipeline.
+            task_keys (List[str]): The task keys to delete.
+            statuses (Iterable[str]): When given, only tasks with one of these
+                statuses are deleted.
+
+        Returns:
+            The number of deleted hashes, or the pipeline when queued.
+        """
+        if self._delete_script is None:
+            self._delete_script = self.redis_client.get_client().register_script(
+                DELETE_TASKS_SCRIPT
+            )
+        return self._delete_script(
+            keys=[
+                self.keys.index,
+                self.keys.expiry,
+                self.keys.events,
+                self.keys.delayed,
+                *task_keys,
+            ],
+            args=[
+                self.events_maxlen,
+                self.keys.task_prefix,
+                self.keys.band,
+                self.keys.tag,
+                self.keys.token,
+                self.keys.vocabulary,
+                self.keys.status,
+                *statuses,
+            ],
+            client=client,
+        )
+
+    def latest_event_id(self) -> str:
+        """
+        Return the ID of the last entry of the `tasks:events` stream.
+
+        Returns:
+            str: The event ID, or "0-0" if the stream is empty.
+
+        Raises:
+            RedisOperationError: If there is an error reading the stream.
+        """
+        try:
+            entries = self.redis_client.execute(
+                lambda client: client.xrevrange(self.keys.events, count=1),
+                idempotent=True,
+            )
+            return entries[0][0].decode("utf-8") if entries else "0-0"
+        except Exception as e:
+            raise RedisOperationError(f"Failed to read the change feed: {e}")
+
+    def read_events(
+        self, after_id: str, count: int = 100, block: Optional[float] = None
+    ) -> List[TaskEvent]:
+        """
+        Read change feed events recorded after an event ID.
+
+        Args:
+            after_id (str): Only events with a greater ID are returned.
+            count (int): The maximum number of events to return.
+            block (Optional[float]): Seconds to wait for new events when none are available.
+
+        Returns:
+            List[TaskEvent]: The events in feed order.
+
+        Raises:
+            RedisOperationError: If there is an error reading the stream.
+        """
+        try:
+            block = self.redis_client.max_block(block)
+            response = self.redis_client.execute(
+                lambda client: client.xread(
+                    {self.keys.events: after_id},
+                    count=count,
+                    block=int(block * 1000) if block else None,
+                ),
+                idempotent=True,
+            )
+            return self._parse_events(response)
+        except Exception as e:
+            raise RedisOperationError(f"Failed to read the change feed: {e}")
+
+    def read_group_events(
+        self,
+        group: str,
+        consumer: str,
+        count: int = 100,
+        block: Optional[float] = None,
+        pending: bool = False,
+    ) -> List[TaskEvent]:
+        """
+        Read change feed events on behalf of a consumer group member.
+
+        Args:
+            group (str): The consumer group name.
+            consumer (str): The consumer name within the group.
+            count (int): The maximum number of events to return.
+            block (Optional[float]): Seconds to wait for new events when none are available.
+            pending (bool): Re-read this consumer's unacknowledged events instead.
+
+        Returns:
+            List[TaskEvent]: The events in feed order.
+
+        Raises:
+            RedisOperationError: If there is an error reading the stream.
+        """
+        try:
+            block = self.redis_client.max_block(block)
+            if group not in self._event_groups:
+                self.redis_client.execute(
+                    lambda client: self._create_group(client, group), idempotent=True
+                )
+                self._event_groups.add(group)
+            while True:
+                # Not idempotent: XREADGROUP moves new entries to the pending list.
+                response = self.redis_client.execute(
+                    lambda client: client.xreadgroup(
+                        group,
+                        consumer,
+                        {self.keys.events: "0" if pending else ">"},
+                        count=count,
+                        block=None if pending or not block else int(block * 1000),
+                    )
+                )
+                # Pending entries trimmed from the capped stream come back without
+                # fields; acknowledge them so they leave the pending list.
+                trimmed = [
+                    event_id
+                    for _, entries in response or []
+                    for event_id, fields in entries
+                    if not fields
+                ]
+                if trimmed:
+                    self.redis_client.execute(
+                        lambda client: client.xack(self.keys.events, group, *trimmed),
+                        idempotent=True,
+                    )
+                events = self._parse_events(response)
+                if events or not trimmed:
+                    return events
+        except Exception as e:
+            raise RedisOperationError(f"Failed to read the change feed: {e}")
+
+    def ack_events(self, group: str, event_ids: List[str]) -> int:
+        """
+        Acknowledge change feed events processed by a consumer group.
+
+        Args:
+            group (str): The consumer group name.
+            event_ids (List[str]): The IDs of the processed events.
+
+        Returns:
+            int: The number of events that were pending and are now acknowledged.
+
+        Raises:
+            RedisOperationError: If there is an error acknowledging the events.
+        """
+        if not event_ids:
+            return 0
+        try:
+            return self.redis_client.execute(
+                lambda client: client.xack(self.keys.events, group, *event_ids),
+                idempotent=True,
+            )
+        except Exception as e:
+            raise RedisOperationError(f"Failed to acknowledge change feed events: {e}")
+
+    def _create_group(self, client: redis.Redis, group: str) -> None:
+        """
+        Create a consumer group on the change feed unless it already exists.
+
+        Args:
+            client (redis.Redis): The primary client.
+            group (str): The consumer group name.
+        """
+        try:
+            client.xgroup_create(self.keys.events, group, id="$", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def _publish(
+        self,
+        pipeline,
+        event_type: TaskEventType,
+        task_id: str,
+        task: Optional[Task] = None,
+    ) -> None:
+        """
+        Queue the XADD that records a mutation in the capped `tasks:events` stream.
+
+        Args:
+            pipeline: The transaction pipeline performing the mutation.
+            event_type (TaskEventType): The kind of mutation.
+            task_id (str): The ID of the mutated task.
+            task (Optional[Task]): The task after the mutation.
+        """
+        fields = {"type": event_type.value, "task_id": task_id}
+        if task is not None:
+            fields["task"] = task.model_dump_json()
+        pipeline.xadd(
+            self.keys.events, fields, maxlen=self.events_maxlen, approximate=True
+        )
+
+    @staticmethod
+    def _parse_events(response: list) -> List[TaskEvent]:
+        """
+        Build TaskEvents from an XREAD or XREADGROUP response.
+
+        Entries trimmed from the stream while pending come back without fields and
+        are skipped; read_group_events() acknowledges them.
+
+        Args:
+            response (list): The raw response, a list of (stream, entries) pairs.
+
+        Returns:
+            List[TaskEvent]: The events in feed order.
+        """
+        events = []
+        for _, entries in response or []:
+            for event_id, fields in entries:
+                if not fields:
+                    continue
+                event_id = event_id.decode("utf-8")
+                task = fields.get(b"task")
+                events.append(
+                    TaskEvent(
+                        id=event_id,
+                        type=fields[b"type"].decode("utf-8"),
+                        task_id=fields[b"task_id"].decode("utf-8"),
+                        task=Task.model_validate_json(task) if task else None,
+                        timestamp=int(event_id.split("-")[0]) / 1000,
+                    )
+                )
+        return events
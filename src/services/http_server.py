@@ -0,0 +1,467 @@
+"""
+This module defines a small HTTP/JSON API over a TaskService, for local clients that
+would otherwise pay a process start and a new Redis connection per CLI call.
+
+The server runs on asyncio with the standard library only. Connections are kept alive
+and may pipeline requests, which are answered in order. Service calls run on a bounded
+thread pool sharing the service's Redis connection pool, so a slow call never blocks
+the event loop. Single adds that arrive in the same loop iteration are written
+together in one batch.
+
+Endpoints:
+    POST   /tasks          Adds a task; the body holds add_task() arguments.
+    POST   /tasks/bulk     Adds a list of tasks in batched writes.
+    GET    /tasks          Lists tasks: min_priority, max_priority, tag, offset, limit.
+    GET    /tasks/{id}     Returns a task.
+    PATCH  /tasks/{id}     Updates the name, priority, description or tags of a task.
+    DELETE /tasks/{id}     Deletes a task.
+    POST   /tasks/{id}/status  Moves a task to the status given in the body.
+    POST   /claim          Claims up to `count` tasks in scheduler order; they are
+                           kept as "running" until their status is set.
+
+Classes:
+    TaskHttpServer: The HTTP server.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from itertools import islice
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from src.entities.task import Task
+from src.services.task_service import TaskService
+from src.utils.exceptions import RedisConnectionError, RedisOperationError
+
+logger = logging.getLogger(__name__)
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 16 * 1024 * 1024
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_ADD_BATCH = 500
+
+ADD_FIELDS = frozenset(
+    ("name", "priority", "description", "ttl", "run_at", "idempotency_key", "tags")
+)
+UPDATE_FIELDS = frozenset(("name", "priority", "description", "tags"))
+STATUS_FIELDS = frozenset(("status",))
+
+
+class _HttpError(Exception):
+    """
+    Raised by request handling to answer with an error status.
+    """
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status: HTTPStatus = status
+
+
+class TaskHttpServer:
+    """
+    An HTTP/JSON server exposing the operations of a TaskService.
+
+    Methods:
+        start() -> None: Starts listening; `port` then holds the bound port.
+        close() -> None: Stops listening and closes open connections.
+    """
+
+    def __init__(
+        self,
+        service: TaskService,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        threads: int = 16,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            service (TaskService): The service the requests are run against.
+            host (str): The address to listen on.
+            port (int): The port to listen on, 0 for any free port.
+            threads (int): The number of service calls run at once, which also
+                bounds the number of Redis connections in use.
+        """
+        self.service: TaskService = service
+        self.host: str = host
+        self.port: int = port
+        self.executor = ThreadPoolExecutor(
+            max_workers=threads, thread_name_prefix="luckytask-http"
+        )
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.Task] = set()
+        self._flushes: Set[asyncio.Task] = set()
+        self._pending_adds: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._claim_lock: Optional[asyncio.Lock] = None
+
+    async def start(self) -> None:
+        """
+        Starts listening for connections.
+        """
+        self._claim_lock = asyncio.Lock()
+        self._server = await asyncio.start_server(
+            self._accept, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """
+        Stops listening and closes open connections; service calls already running
+        finish on the thread pool first.
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for connection in list(self._connections):
+            connection.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        self.executor.shutdown(wait=True)
+
+    async def _accept(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Track a connection so close() can end it.
+        """
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            await self._serve_connection(reader, writer)
+        except (asyncio.CancelledError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._connections.discard(connection)
+            writer.close()
+
+    async def _serve_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """
+        Answer the requests of one connection in order until it is closed.
+        """
+        while True:
+            keep_alive = body_read = False
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                return
+            except asyncio.LimitOverrunError:
+                await self._write(
+                    writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, None, False
+                )
+                return
+            try:
+                method, target, headers, keep_alive = _parse_head(head)
+                body = await _read_body(reader, headers)
+                body_read = True
+                status, payload = await self._dispatch(method, target, body)
+            except _HttpError as e:
+                status, payload = e.status, {"error": str(e)}
+                # Without the body read, the next request's start is unknown.
+                keep_alive = keep_alive and body_read and status < 500
+            await self._write(writer, status, payload, keep_alive)
+            if not keep_alive:
+                return
+
+    async def _write(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        payload: Any,
+        keep_alive: bool,
+    ) -> None:
+        """
+        Send one JSON response.
+        """
+        body = b"" if payload is None else _encode(payload)
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def _dispatch(
+        self, method: str, target: str, body: Any
+    ) -> Tuple[HTTPStatus, Any]:
+        """
+        Route a request to its handler and map service errors to HTTP statuses.
+        """
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        try:
+            if parts == ["tasks"] and method == "POST":
+                return HTTPStatus.CREATED, await self._add(body)
+            if parts == ["tasks", "bulk"] and method == "POST":
+                return HTTPStatus.CREATED, {"tasks": await self._add_bulk(body)}
+            if parts == ["tasks"] and method == "GET":
+                return HTTPStatus.OK, await self._list(query)
+            if len(parts) == 2 and parts[0] == "tasks" and parts[1]:
+                if method == "GET":
+                    return HTTPStatus.OK, _found(
+                        await self._call(self.service.get_task, parts[1])
+                    )
+                if method == "PATCH":
+                    fields = _fields(body, UPDATE_FIELDS)
+                    return HTTPStatus.OK, _found(
+                        await self._call(self.service.update_task, parts[1], **fields)
+                    )
+                if method == "DELETE":
+                    if not await self._call(self.service.delete_task, parts[1]):
+                        raise _HttpError(HTTPStatus.NOT_FOUND, "Task not found")
+                    return HTTPStatus.NO_CONTENT, None
+            if (
+                len(parts) == 3
+                and parts[0] == "tasks"
+                and parts[2] == "status"
+                and method == "POST"
+            ):
+                return HTTPStatus.OK, await self._set_status(parts[1], body)
+            if parts == ["claim"] and method == "POST":
+                count = _int_param(query, "count", 1, 1, MAX_PAGE_SIZE)
+                async with self._claim_lock:
+                    tasks = await self._call(self.service.claim_tasks, count)
+                return HTTPStatus.OK, {"tasks": tasks}
+        except ValueError as e:
+            raise _HttpError(HTTPStatus.BAD_REQUEST, str(e))
+        except (RedisConnectionError, RedisOperationError) as e:
+            raise _HttpError(HTTPStatus.SERVICE_UNAVAILABLE, str(e))
+        except _HttpError:
+            raise
+        except Exception:
+            logger.exception("Request %s %s failed", method, target)
+            raise _HttpError(HTTPStatus.INTERNAL_SERVER_ERROR, "Internal error")
+        raise _HttpError(HTTPStatus.NOT_FOUND, f"No route for {method} {url.path}")
+
+    async def _set_status(self, task_id: str, body: Any) -> Task:
+        """
+        Move a task to another status, answering 409 if its status cannot move there.
+        """
+        status = _fields(body, STATUS_FIELDS).get("status")
+        if not isinstance(status, str):
+            raise ValueError("A status is required")
+        moved = await self._call(self.service.set_status, [task_id], status)
+        if moved:
+            return moved[0]
+        task = _found(await self._call(self.service.get_task, task_id))
+        raise _HttpError(
+            HTTPStatus.CONFLICT, f"A {task.status} task cannot become {status}"
+        )
+
+    async def _add(self, body: Any) -> Task:
+        """
+        Queue a single add to be written with the others of this loop iteration.
+        """
+        spec = _task_spec(body)
+        result = asyncio.get_running_loop().create_future()
+        self._pending_adds.append((spec, result))
+        if len(self._pending_adds) == 1:
+            asyncio.get_running_loop().call_soon(self._flush_adds)
+        return await result
+
+    def _flush_adds(self) -> None:
+        """
+        Write the pending single adds in batches.
+        """
+        pending, self._pending_adds = self._pending_adds, []
+        for start in range(0, len(pending), MAX_ADD_BATCH):
+            flush = asyncio.ensure_future(
+                self._write_adds(pending[start : start + MAX_ADD_BATCH])
+            )
+            self._flushes.add(flush)
+            flush.add_done_callback(self._flushes.discard)
+
+    async def _write_adds(
+        self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]
+    ) -> None:
+        """
+        Add a batch of tasks, retrying them one by one if the batch is rejected so
+        an invalid task only fails its own request.
+        """
+        try:
+            tasks = await self._call(self.service.add_tasks, [s for s, _ in batch])
+            outcomes: List[Any] = list(tasks)
+        except Exception:
+            outcomes = []
+            for spec, _ in batch:
+                try:
+                    [task] = await self._call(self.service.add_tasks, [spec])
+                    outcomes.append(task)
+                except Exception as e:
+                    outcomes.append(e)
+        for (_, result), outcome in zip(batch, outcomes):
+            if result.cancelled():
+                continue
+            if isinstance(outcome, Exception):
+                result.set_exception(outcome)
+            else:
+                result.set_result(outcome)
+
+    async def _add_bulk(self, body: Any) -> List[Task]:
+        """
+        Add every task of a bulk request.
+        """
+        if isinstance(body, dict):
+            body = body.get("tasks")
+        if not isinstance(body, list):
+            raise ValueError("The body must be a list of tasks")
+        specs = [_task_spec(item) for item in body]
+        return await self._call(self.service.add_tasks, specs)
+
+    async def _list(self, query: Dict[str, List[str]]) -> Dict[str, Any]:
+        """
+        Return one page of the tasks within a priority range.
+        """
+        min_priority = _int_param(
+            query,
+            "min_priority",
+            Task.MIN_PRIORITY,
+            Task.MIN_PRIORITY,
+            Task.MAX_PRIORITY,
+        )
+        max_priority = _int_param(
+            query,
+            "max_priority",
+            Task.MAX_PRIORITY,
+            Task.MIN_PRIORITY,
+            Task.MAX_PRIORITY,
+        )
+        offset = _int_param(query, "offset", 0, 0, None)
+        limit = _int_param(query, "limit", DEFAULT_PAGE_SIZE, 1, MAX_PAGE_SIZE)
+
+        def page() -> List[Task]:
+            tasks = self.service.iter_tasks(
+                min_priority, max_priority, tags=query.get("tag")
+            )
+            return list(islice(tasks, offset, offset + limit))
+
+        tasks = await self._call(page)
+        return {
+            "tasks": tasks,
+            "next_offset": offset + limit if len(tasks) == limit else None,
+        }
+
+    async def _call(self, function: Callable, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a blocking service call on the thread pool.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(function, *args, **kwargs)
+        )
+
+
+def _parse_head(head: bytes) -> Tuple[str, str, Dict[str, str], bool]:
+    """
+    Parse the request line and headers, and tell whether to keep the connection.
+    """
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise _HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    headers: Dict[str, str] = {}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    connection = headers.get("connection", "").lower()
+    if version == "HTTP/1.1":
+        keep_alive = connection != "close"
+    else:
+        keep_alive = connection == "keep-alive"
+    return method.upper(), target, headers, keep_alive
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str]) -> Any:
+    """
+    Read and decode the JSON body of a request, or return None without one.
+    """
+    if "transfer-encoding" in headers:
+        raise _HttpError(HTTPStatus.NOT_IMPLEMENTED, "Chunked bodies are not supported")
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise _HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise _HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Body too large")
+    if length <= 0:
+        return None
+    data = await reader.readexactly(length)
+    try:
+        return json.loads(data)
+    except ValueError:
+        raise _HttpError(HTTPStatus.BAD_REQUEST, "The body is not valid JSON")
+
+
+def _fields(body: Any, allowed: frozenset) -> Dict[str, Any]:
+    """
+    Check that a body is an object holding only allowed fields.
+    """
+    if not isinstance(body, dict):
+        raise ValueError("The body must be a JSON object")
+    unknown = set(body) - allowed
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return body
+
+
+def _task_spec(body: Any) -> Dict[str, Any]:
+    """
+    Check the body of an add and return it as add_task() keyword arguments.
+    """
+    spec = dict(_fields(body, ADD_FIELDS))
+    if "name" not in spec or "priority" not in spec:
+        raise ValueError("A task needs a name and a priority")
+    spec.setdefault("description", "")
+    return spec
+
+
+def _found(task: Optional[Task]) -> Task:
+    """
+    Return a task, or answer 404 when there is none.
+    """
+    if task is None:
+        raise _HttpError(HTTPStatus.NOT_FOUND, "Task not found")
+    return task
+
+
+def _int_param(
+    query: Dict[str, List[str]],
+    name: str,
+    default: int,
+    low: int,
+    high: Optional[int],
+) -> int:
+    """
+    Read an integer query parameter within bounds.
+    """
+    if name not in query:
+        return default
+    try:
+        value = int(query[name][-1])
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    if value < low or (high is not None and value > high):
+        raise ValueError(f"{name} must be between {low} and {high or 'infinity'}")
+    return value
+
+
+def _encode(payload: Any) -> bytes:
+    """
+    Encode a response payload, which may hold tasks, as compact JSON.
+    """
+    return json.dumps(
+        payload,
+        default=lambda value: value.model_dump(),
+        ensure_ascii=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
@@ -0,0 +1,584 @@
+"""
+This module defines a load generator replaying a mix of operations against a TaskService.
+
+Each client is a thread issuing operations drawn from a weighted mix. In closed-loop
+mode a client sends its next operation as soon as the previous one returns, after an
+optional think time, so the offered load adapts to the store. In open-loop mode the
+clients share a target rate and each one follows a Poisson schedule of its own; an
+operation's latency is measured from the time it was scheduled, not the time it was
+sent, so a stalled store shows up as queueing delay instead of being hidden by
+clients that stopped sending (coordinated omission).
+
+Clients run in one process, or in several processes that each build their own
+service and connections. Latencies are kept in log-bucketed histograms of bounded
+size and ~1% relative error, which merge across threads and processes, and are
+reported once per interval and for the whole run.
+
+Classes:
+    LatencyHistogram: Counts latencies in logarithmic buckets.
+    LoadWindow: The latencies and errors of each operation over a period.
+
+Functions:
+    parse_mix(spec: str) -> Dict[str, float]: Parses an operation mix.
+    run_load(make_service, mix, duration, clients, processes, rate, think_time,
+             interval, preload, page, payload, seed, on_window) -> LoadWindow:
+        Runs the load and returns the statistics of the whole run.
+"""
+
+import math
+import multiprocessing
+import queue
+import random
+import signal
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Callable, Deque, Dict, List, Optional
+
+from src.entities.task import Task
+from src.services.task_service import TaskService
+
+OPERATIONS = ("add", "list", "range", "update", "claim", "delete")
+DEFAULT_MIX = "add=30,list=10,range=15,update=20,claim=15,delete=10"
+PERCENTILES = {"p50": 0.50, "p95": 0.95, "p99": 0.99, "p999": 0.999}
+# Tag of the tasks added by the load generator.
+LOAD_TAG = "loadgen"
+# Each bucket is 2% wider than the previous one, so a percentile read from its
+# geometric middle is within 1% of the true latency.
+GROWTH = 1.02
+_LOG_GROWTH = math.log(GROWTH)
+# The number of task IDs each client remembers for updates and deletes.
+KNOWN_IDS = 10000
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse an operation mix such as "add=30,list=10,claim=60".
+
+    Args:
+        spec (str): Comma-separated `operation=weight` pairs; operations left out
+            are not run.
+
+    Returns:
+        Dict[str, float]: The weight of each operation, summing to 1.
+
+    Raises:
+        ValueError: If an operation is unknown, a weight is not a non-negative
+            number, or every weight is 0.
+    """
+    weights: Dict[str, float] = {}
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        name, separator, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise ValueError(
+                f"Unknown operation {name!r}; choose from {', '.join(OPERATIONS)}"
+            )
+        try:
+            weights[name] = float(weight) if separator else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid weight for {name}: {weight!r}")
+        if weights[name] < 0 or math.isnan(weights[name]):
+            raise ValueError(f"Invalid weight for {name}: {weight!r}")
+    total = sum(weights.values())
+    if not total:
+        raise ValueError("The mix must give at least one operation a positive weight")
+    return {name: weight / total for name, weight in weights.items() if weight}
+
+
+class LatencyHistogram:
+    """
+    Counts latencies in buckets growing by GROWTH from one microsecond.
+
+    A histogram covering latencies from 1µs to an hour holds at most 1112 buckets,
+    whatever the number of samples, and two histograms merge by adding counts.
+
+    Methods:
+        record(seconds: float) -> None: Counts one latency.
+        merge(other: LatencyHistogram) -> None: Adds the counts of another histogram.
+        percentile(fraction: float) -> float: Returns a nearest-rank percentile.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an empty histogram.
+        """
+        self.counts: Dict[int, int] = {}
+        self.count: int = 0
+        self.total: float = 0.0
+        self.max: float = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        Counts one latency.
+
+        Args:
+            seconds (float): The latency in seconds.
+        """
+        bucket = int(math.log(max(seconds * 1e6, 1.0)) / _LOG_GROWTH)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Adds the counts of another histogram to this one.
+
+        Args:
+            other (LatencyHistogram): The histogram to add.
+        """
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns the nearest-rank percentile, to within half a bucket.
+
+        Args:
+            fraction (float): The percentile as a fraction, such as 0.99.
+
+        Returns:
+            float: The latency in seconds, 0 for an empty histogram.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(GROWTH ** (bucket + 0.5) / 1e6, self.max)
+        return self.max
+
+
+class LoadWindow:
+    """
+    The latencies and errors of each operation over one reporting period.
+
+    Methods:
+        record(operation: str, seconds: float) -> None: Counts a completed operation.
+        record_error(operation: str) -> None: Counts a failed operation.
+        merge(other: LoadWindow) -> None: Adds the counts of the same period elsewhere.
+        summary() -> Dict[str, object]: Returns throughput and percentiles.
+    """
+
+    def __init__(self, index: int, elapsed: float = 0.0) -> None:
+        """
+        Initialize an empty window.
+
+        Args:
+            index (int): The position of the window in the run, from 0.
+            elapsed (float): The length of the window in seconds.
+        """
+        self.index: int = index
+        self.elapsed: float = elapsed
+        self.latencies: Dict[str, LatencyHistogram] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, operation: str, seconds: float) -> None:
+        """
+        Counts a completed operation.
+
+        Args:
+            operation (str): The operation name.
+            seconds (float): Its latency.
+        """
+        self.latencies.setdefault(operation, LatencyHistogram()).record(seconds)
+
+    def record_error(self, operation: str) -> None:
+        """
+        Counts an operation that raised.
+
+        Args:
+            operation (str): The operation name.
+        """
+        self.errors[operation] = self.errors.get(operation, 0) + 1
+
+    def merge(self, other: "LoadWindow") -> None:
+        """
+        Adds the counts of another client or process over the same period.
+
+        Args:
+            other (LoadWindow): The window to add.
+        """
+        self.elapsed = max(self.elapsed, other.elapsed)
+        for operation, histogram in other.latencies.items():
+            self.latencies.setdefault(operation, LatencyHistogram()).merge(histogram)
+        for operation, count in other.errors.items():
+            self.errors[operation] = self.errors.get(operation, 0) + count
+
+    def summary(self) -> Dict[str, object]:
+        """
+        Returns the throughput and latency percentiles of the window.
+
+        Returns:
+            Dict[str, object]: The "window" index, "elapsed" seconds, completed
+                "ops", "throughput" in operations per second, "errors", the "p50",
+                "p95", "p99", "p999" and "max" latency in seconds over every
+                operation, and the same figures for each operation under
+                "operations".
+        """
+        overall = LatencyHistogram()
+        for histogram in self.latencies.values():
+            overall.merge(histogram)
+        summary = self._figures(overall, sum(self.errors.values()))
+        summary = {"window": self.index, "elapsed": self.elapsed, **summary}
+        summary["operations"] = {
+            operation: self._figures(
+                self.latencies.get(operation, LatencyHistogram()),
+                self.errors.get(operation, 0),
+            )
+            for operation in OPERATIONS
+            if operation in self.latencies or operation in self.errors
+        }
+        return summary
+
+    def _figures(self, histogram: LatencyHistogram, errors: int) -> Dict[str, float]:
+        """
+        Returns the count, throughput, errors and percentiles of one histogram.
+        """
+        figures = {
+            "ops": histogram.count,
+            "throughput": histogram.count / self.elapsed if self.elapsed else 0.0,
+            "errors": errors,
+        }
+        for name, fraction in PERCENTILES.items():
+            figures[name] = histogram.percentile(fraction)
+        figures["max"] = histogram.max
+        return figures
+
+
+class _Recorder:
+    """
+    The window the clients of one process record into, swapped once per interval.
+    """
+
+    def __init__(self) -> None:
+        self.window = LoadWindow(0)
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, operation: str, seconds: Optional[float]) -> None:
+        """
+        Records a latency, or an error when `seconds` is None.
+        """
+        with self._lock:
+            if seconds is None:
+                self.window.record_error(operation)
+            else:
+                self.window.record(operation, seconds)
+
+    def swap(self) -> LoadWindow:
+        """
+        Closes the current window and opens the next one.
+        """
+        with self._lock:
+            now = time.perf_counter()
+            window, window.elapsed = self.window, now - self.started
+            self.window, self.started = LoadWindow(window.index + 1), now
+        return window
+
+
+class _Client:
+    """
+    Runs operations drawn from the mix until stopped.
+    """
+
+    def __init__(
+        self,
+        service: TaskService,
+        mix: Dict[str, float],
+        recorder: _Recorder,
+        rng: random.Random,
+        known: List[str],
+        rate: Optional[float],
+        think_time: float,
+        page: int,
+        payload: str,
+    ) -> None:
+        self.service = service
+        self.operations = list(mix)
+        self.weights = list(mix.values())
+        self.recorder = recorder
+        self.rng = rng
+        self.known: Deque[str] = deque(known, maxlen=KNOWN_IDS)
+        self.rate = rate
+        self.think_time = think_time
+        self.page = page
+        self.payload = payload
+
+    def run(self, stop: threading.Event) -> None:
+        """
+        Issue operations back to back, or on a Poisson schedule at `rate`.
+        """
+        scheduled = time.perf_counter()
+        while not stop.is_set():
+            if self.rate:
+                scheduled += self.rng.expovariate(self.rate)
+                delay = scheduled - time.perf_counter()
+                if delay > 0 and stop.wait(delay):
+                    return
+            else:
+                scheduled = time.perf_counter()
+            operation = self.rng.choices(self.operations, self.weights)[0]
+            if operation in ("update", "delete") and not self.known:
+                operation = "add"
+            try:
+                self._perform(operation)
+            except Exception:
+                self.recorder.record(operation, None)
+            else:
+                self.recorder.record(operation, time.perf_counter() - scheduled)
+            if not self.rate and self.think_time:
+                stop.wait(self.think_time)
+
+    def _perform(self, operation: str) -> None:
+        """
+        Run one operation against the service.
+        """
+        if operation == "add":
+            task = self.service.add_task(
+                "loadgen", self.rng.randint(1, 10), self.payload, tags=[LOAD_TAG]
+            )
+            self.known.append(task.id)
+        elif operation == "list":
+            list(islice(self.service.iter_tasks(), self.page))
+        elif operation == "range":
+            low = self.rng.randint(Task.MIN_PRIORITY, Task.MAX_PRIORITY)
+            high = self.rng.randint(low, Task.MAX_PRIORITY)
+            list(islice(self.service.iter_tasks(low, high), self.page))
+        elif operation == "update":
+            task_id = self.known[self.rng.randrange(len(self.known))]
+            self.service.update_task(task_id, priority=self.rng.randint(1, 10))
+        elif operation == "claim":
+            claimed = self.service.claim_tasks(1)
+            self.service.set_status([task.id for task in claimed], Task.DONE)
+        else:
+            self.service.delete_task(self.known.popleft())
+
+
+def _run_clients(
+    service: TaskService,
+    mix: Dict[str, float],
+    process: int,
+    duration: float,
+    clients: int,
+    rate: Optional[float],
+    think_time: float,
+    interval: float,
+    preload: int,
+    page: int,
+    payload: int,
+    seed: Optional[int],
+    stop: threading.Event,
+    emit: Callable[[LoadWindow], None],
+) -> None:
+    """
+    Run the clients of one process, emitting a window every `interval` seconds.
+    """
+    preloaded = [
+        task.id
+        for task in service.add_tasks(
+            {
+                "name": "loadgen",
+                "priority": index % 10 + 1,
+                "description": "x" * payload,
+                "tags": [LOAD_TAG],
+            }
+            for index in range(preload)
+        )
+    ]
+    recorder = _Recorder()
+    workers = []
+    for index in range(clients):
+        client = _Client(
+            service,
+            mix,
+            recorder,
+            random.Random(f"{seed}-{process}-{index}" if seed is not None else None),
+            preloaded[index::clients],
+            rate / clients if rate else None,
+            think_time,
+            page,
+            "x" * payload,
+        )
+        workers.append(threading.Thread(target=client.run, args=(stop,), daemon=True))
+    deadline = time.monotonic() + duration
+    for worker in workers:
+        worker.start()
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or stop.wait(min(interval, remaining)):
+                break
+            if time.monotonic() < deadline:
+                emit(recorder.swap())
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+        emit(recorder.swap())
+
+
+def _load_process(
+    make_service: Callable[[], TaskService],
+    process: int,
+    options: dict,
+    stop: threading.Event,
+    reports: "multiprocessing.Queue",
+) -> None:
+    """
+    The entry point of a load process; windows are sent back on `reports`.
+    """
+    # The parent turns Ctrl-C into `stop`, so the last window is still reported.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _run_clients(
+        make_service(), process=process, stop=stop, emit=reports.put, **options
+    )
+    reports.put(None)
+
+
+def run_load(
+    make_service: Callable[[], TaskService],
+    mix: Dict[str, float],
+    duration: float,
+    clients: int = 10,
+    processes: int = 1,
+    rate: Optional[float] = None,
+    think_time: float = 0.0,
+    interval: float = 5.0,
+    preload: int = 1000,
+    page: int = 100,
+    payload: int = 64,
+    seed: Optional[int] = None,
+    on_window: Optional[Callable[[LoadWindow], None]] = None,
+) -> LoadWindow:
+    """
+    Replay a mix of operations against the service and measure their latencies.
+
+    With one process the clients run as threads of the caller, over the service
+    `make_service` builds once. With several, every process builds its own service,
+    and so its own connections, so `make_service` must be a picklable module-level
+    function. Each process first adds its share of `preload` tasks, which its
+    clients update and delete; an update or delete drawn by a client that knows no
+    task adds one instead. Ctrl-C ends the run early.
+
+    Args:
+        make_service (Callable[[], TaskService]): Builds the service to load.
+        mix (Dict[str, float]): The weight of each operation, see parse_mix().
+        duration (float): Seconds the load runs for.
+        clients (int): Client threads per process.
+        processes (int): The number of processes.
+        rate (Optional[float]): The total operations per second offered in open-loop
+            mode; None runs closed loop.
+        think_time (float): Seconds a closed-loop client waits between operations.
+        interval (float): Seconds between reported windows.
+        preload (int): Tasks added before the load starts.
+        page (int): Tasks read by each list and range operation.
+        payload (int): Characters in the description of each added task.
+        seed (Optional[int]): Seeds the operation choices for a repeatable run.
+        on_window (Optional[Callable[[LoadWindow], None]]): Receives each window,
+            merged across processes, as soon as every process has reported it.
+
+    Returns:
+        LoadWindow: The statistics of the whole run, with index -1.
+
+    Raises:
+        ValueError: If a count, the duration, the interval or the rate is not positive.
+    """
+    if min(duration, interval, clients, processes) <= 0 or (
+        rate is not None and rate <= 0
+    ):
+        raise ValueError(
+            "duration, interval, clients, processes and rate must be positive"
+        )
+    options = {
+        "mix": mix,
+        "duration": duration,
+        "clients": clients,
+        "rate": rate / processes if rate else None,
+        "think_time": think_time,
+        "interval": interval,
+        "preload": preload // processes,
+        "page": page,
+        "payload": payload,
+        "seed": seed,
+    }
+    total = LoadWindow(-1)
+    pending: Dict[int, List[LoadWindow]] = {}
+    measured = [0.0]
+
+    def collect(window: LoadWindow) -> None:
+        pending.setdefault(window.index, []).append(window)
+        if len(pending[window.index]) == processes:
+            publish(pending.pop(window.index))
+
+    def publish(windows: List[LoadWindow]) -> None:
+        merged = LoadWindow(windows[0].index)
+        for window in windows:
+            merged.merge(window)
+        total.merge(merged)
+        measured[0] += merged.elapsed
+        if on_window is not None:
+            on_window(merged)
+
+    if processes == 1:
+        stop = threading.Event()
+        try:
+            _run_clients(make_service(), process=0, stop=stop, emit=collect, **options)
+        except KeyboardInterrupt:
+            stop.set()
+    else:
+        _run_processes(make_service, processes, options, collect)
+    for index in sorted(pending):
+        publish(pending[index])
+    # The preload is left out: windows only cover the time the clients ran.
+    total.elapsed = measured[0]
+    return total
+
+
+def _run_processes(
+    make_service: Callable[[], TaskService],
+    processes: int,
+    options: dict,
+    collect: Callable[[LoadWindow], None],
+) -> None:
+    """
+    Run the clients in separate processes and pass their windows to `collect`.
+    """
+    stop = multiprocessing.Event()
+    reports: multiprocessing.Queue = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(
+            target=_load_process,
+            args=(make_service, index, options, stop, reports),
+        )
+        for index in range(processes)
+    ]
+    finished = 0
+    try:
+        for worker in workers:
+            worker.start()
+        while finished < processes:
+            try:
+                window = reports.get(timeout=0.2)
+            except queue.Empty:
+                if not any(worker.is_alive() for worker in workers):
+                    break
+                continue
+            except KeyboardInterrupt:
+                stop.set()
+                continue
+            if window is None:
+                finished += 1
+            else:
+                collect(window)
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
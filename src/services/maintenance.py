@@ -0,0 +1,69 @@
+"""
+maintenance.py
+
+This module defines the BackgroundSweeper class, which runs periodic maintenance
+work such as pruning expired tasks in a daemon thread.
+"""
+
+import logging
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundSweeper(threading.Thread):
+    """
+    A daemon thread that calls a sweep function at a fixed interval until stopped.
+
+    The sweep function returns how much work it did. When it reports a full batch,
+    the next sweep starts right away so a backlog is drained in bounded chunks
+    instead of waiting a whole interval between them.
+
+    Methods:
+        run() -> None:
+            Runs sweeps until stop() is called.
+        stop(timeout: Optional[float]) -> None:
+            Signals the thread to stop and waits for it to finish.
+    """
+
+    def __init__(
+        self, sweep: Callable[[], int], interval: float, batch_size: int
+    ) -> None:
+        """
+        Initialize the sweeper.
+
+        Args:
+            sweep (Callable[[], int]): The function to call on each sweep.
+            interval (float): The number of seconds to wait between idle sweeps.
+            batch_size (int): The batch size the sweep function works with.
+        """
+        super().__init__(daemon=True)
+        self.sweep: Callable[[], int] = sweep
+        self.interval: float = interval
+        self.batch_size: int = batch_size
+        self._stopped: threading.Event = threading.Event()
+
+    def run(self) -> None:
+        """
+        Runs sweeps until stop() is called. Errors are logged and retried on the next sweep.
+        """
+        while not self._stopped.is_set():
+            try:
+                processed = self.sweep()
+            except Exception:
+                logger.exception("Background sweep failed")
+                processed = 0
+            if processed < self.batch_size:
+                self._stopped.wait(self.interval)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Signals the thread to stop and waits for it to finish.
+
+        Args:
+            timeout (float): The maximum number of seconds to wait.
+        """
+        self._stopped.set()
+        if self.is_alive():
+            self.join(timeout)
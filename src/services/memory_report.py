@@ -0,0 +1,154 @@
+"""
+This module turns the memory samples of a repository into a capacity planning report.
+
+Sampled groups of keys are extrapolated to their estimated count with a normal
+confidence interval on the mean key size, corrected for sampling without replacement.
+Structures measured whole are added as they are. The per-task cost then projects the
+memory needed for a target number of tasks, once for the sampled mix of task hash
+encodings and once for each encoding on its own.
+
+Functions:
+    estimate_total(sizes: List[int], count: int) -> Tuple[float, float]:
+        Extrapolates sampled key sizes to a total and its margin of error.
+    build_memory_report(sample: Dict[str, Any], target_tasks: Optional[int])
+            -> Dict[str, Any]:
+        Builds the report from the output of TaskRepository.sample_memory().
+"""
+
+import math
+import statistics
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.repositories.base_repository import MEMORY_TASK_GROUP
+
+# The standard normal quantile of a two-sided 95% confidence interval.
+Z_95 = 1.96
+# Structures whose size is capped rather than proportional to the number of tasks.
+CAPPED_STRUCTURES = frozenset(("change feed",))
+
+
+def estimate_total(sizes: List[int], count: int) -> Tuple[float, float]:
+    """
+    Extrapolate the sizes of sampled keys to the total size of `count` keys.
+
+    Args:
+        sizes (List[int]): The sizes in bytes of the sampled keys.
+        count (int): The estimated number of keys in the group.
+
+    Returns:
+        Tuple[float, float]: The estimated total in bytes and the half-width of its
+            95% confidence interval, which is 0 when every key was measured.
+    """
+    if not sizes or not count:
+        return 0.0, 0.0
+    total = statistics.fmean(sizes) * count
+    if len(sizes) < 2 or len(sizes) >= count:
+        return total, 0.0
+    correction = math.sqrt((count - len(sizes)) / (count - 1))
+    margin = Z_95 * count * statistics.stdev(sizes) / math.sqrt(len(sizes))
+    return total, margin * correction
+
+
+def build_memory_report(
+    sample: Dict[str, Any], target_tasks: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Build a capacity planning report from the output of TaskRepository.sample_memory().
+
+    Margins of independent rows are combined in quadrature. A projection keeps the
+    capped change feed at its current size and assumes everything else grows in
+    proportion to the number of tasks, which overstates the vocabulary and tag
+    sets, whose size depends on distinct words and tags.
+
+    Args:
+        sample (Dict[str, Any]): The measurements of the repository.
+        target_tasks (Optional[int]): The number of tasks to project memory for.
+
+    Returns:
+        Dict[str, Any]: "tasks"; "rows", each with the "name", key "count" and
+            "sampled" key count (None for structures measured whole), "total" bytes
+            and "margin"; the overall "total",
+            "margin" and "per_task" bytes; the "settings"; and, with a target, the
+            "projections", each with the task hash "encoding" ("mix" for the
+            sampled mix), its "share" of the sample, and the "per_task", "total"
+            and "margin" bytes.
+    """
+    rows = []
+    for name, group in sample["groups"].items():
+        total, margin = estimate_total(group["sizes"], group["count"])
+        rows.append(
+            {
+                "name": name,
+                "count": group["count"],
+                "sampled": len(group["sizes"]),
+                "total": total,
+                "margin": margin,
+            }
+        )
+    for name, size in sample["structures"].items():
+        rows.append(
+            {"name": name, "count": None, "sampled": None, "total": size, "margin": 0.0}
+        )
+    tasks = sample["tasks"]
+    total = sum(row["total"] for row in rows)
+    margin = math.sqrt(sum(row["margin"] ** 2 for row in rows))
+    report = {
+        "tasks": tasks,
+        "rows": rows,
+        "total": total,
+        "margin": margin,
+        "per_task": total / tasks if tasks else 0.0,
+        "settings": sample["settings"],
+    }
+    if target_tasks is not None:
+        report["projections"] = _project(sample, rows, report, target_tasks)
+    return report
+
+
+def _project(
+    sample: Dict[str, Any],
+    rows: List[Dict[str, Any]],
+    report: Dict[str, Any],
+    target_tasks: int,
+) -> List[Dict[str, Any]]:
+    """
+    Project the memory of `target_tasks` tasks for the sampled mix and each encoding.
+    """
+    tasks = sample["tasks"]
+    if not tasks:
+        return []
+    capped = sum(row["total"] for row in rows if row["name"] in CAPPED_STRUCTURES)
+    per_task = (report["total"] - capped) / tasks
+    projections = [
+        {
+            "encoding": "mix",
+            "share": 1.0,
+            "per_task": per_task,
+            "total": per_task * target_tasks + capped,
+            "margin": report["margin"] / tasks * target_tasks,
+        }
+    ]
+    group = sample["groups"].get(MEMORY_TASK_GROUP)
+    if not group or not group["sizes"]:
+        return projections
+    hashes = next(row for row in rows if row["name"] == MEMORY_TASK_GROUP)
+    other = per_task - hashes["total"] / tasks
+    other_margin = math.sqrt(max(report["margin"] ** 2 - hashes["margin"] ** 2, 0.0))
+    by_encoding: Dict[str, List[int]] = {}
+    for size, encoding in zip(group["sizes"], group["encodings"]):
+        by_encoding.setdefault(encoding, []).append(size)
+    for encoding, sizes in sorted(by_encoding.items()):
+        encoded_per_task = statistics.fmean(sizes) + other
+        per_task_margin = other_margin / tasks
+        if len(sizes) > 1:
+            per_task_margin += Z_95 * statistics.stdev(sizes) / math.sqrt(len(sizes))
+        projections.append(
+            {
+                "encoding": encoding,
+                "share": len(sizes) / len(group["sizes"]),
+                "per_task": encoded_per_task,
+                "total": encoded_per_task * target_tasks + capped,
+                "margin": per_task_margin * target_tasks,
+            }
+        )
+    return projections
@@ -0,0 +1,223 @@
+"""
+This module defines the policies deciding which priority band the next task is dequeued from.
+
+Every policy looks only at the head of each non-empty band, so a dequeue decision costs
+one O(log n) read per band regardless of how many tasks are queued.
+
+Classes:
+    Scheduler: The interface of a dequeue policy.
+    StrictPriorityScheduler: Always serves the highest non-empty band.
+    WeightedRoundRobinScheduler: Serves bands in proportion to their weights.
+    AgeBoostScheduler: Raises a band's effective priority as its oldest task waits.
+    WaitTimeMetrics: Per-band statistics of how long dequeued tasks waited.
+
+Functions:
+    make_scheduler(name: str) -> Scheduler: Builds a scheduler from its name.
+"""
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, Optional
+
+from src.entities.task import Task
+
+
+class Scheduler(ABC):
+    """
+    Scheduler is the interface of a dequeue policy.
+
+    Methods:
+        select(heads: Dict[int, float], now: float) -> int:
+            Picks the priority band to dequeue from.
+    """
+
+    @abstractmethod
+    def select(self, heads: Dict[int, float], now: float) -> int:
+        """
+        Picks the priority band to dequeue from.
+
+        Args:
+            heads (Dict[int, float]): The creation timestamp of the oldest task of each
+                non-empty band, keyed by priority; never empty.
+            now (float): The current timestamp.
+
+        Returns:
+            int: The priority of the chosen band, one of the keys of `heads`.
+        """
+        pass
+
+
+class StrictPriorityScheduler(Scheduler):
+    """
+    Always serves the highest non-empty band, the order `list` displays tasks in.
+    Lower bands only progress while every higher band is empty.
+    """
+
+    def select(self, heads: Dict[int, float], now: float) -> int:
+        """
+        Picks the highest non-empty band.
+        """
+        return max(heads)
+
+
+class WeightedRoundRobinScheduler(Scheduler):
+    """
+    Serves the non-empty bands in proportion to their weights.
+
+    Uses the smooth weighted round-robin algorithm: with weights 3 and 1 the bands
+    are served A A B A rather than A A A B, so no band waits a full cycle.
+    """
+
+    def __init__(self, weights: Optional[Dict[int, int]] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            weights (Optional[Dict[int, int]]): The weight of each priority band;
+                by default a band's weight is its priority.
+        """
+        self.weights: Dict[int, int] = weights or {
+            priority: priority
+            for priority in range(Task.MIN_PRIORITY, Task.MAX_PRIORITY + 1)
+        }
+        self._credit: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def select(self, heads: Dict[int, float], now: float) -> int:
+        """
+        Picks the band with the most accumulated credit.
+        """
+        with self._lock:
+            total = 0
+            for priority in heads:
+                weight = self.weights.get(priority, 1)
+                self._credit[priority] = self._credit.get(priority, 0) + weight
+                total += weight
+            chosen = max(heads, key=lambda priority: (self._credit[priority], priority))
+            self._credit[chosen] -= total
+            return chosen
+
+
+class AgeBoostScheduler(Scheduler):
+    """
+    Serves the band with the highest effective priority, where a band gains one
+    level for every `aging_interval` seconds its oldest task has waited. A task can
+    therefore wait at most about `aging_interval` seconds per level it has to climb.
+    """
+
+    def __init__(self, aging_interval: float = 60.0):
+        """
+        Initialize the scheduler.
+
+        Args:
+            aging_interval (float): Seconds of waiting worth one priority level.
+        """
+        self.aging_interval: float = aging_interval
+
+    def select(self, heads: Dict[int, float], now: float) -> int:
+        """
+        Picks the band whose oldest task has the highest boosted priority.
+        """
+        return max(
+            heads,
+            key=lambda priority: (
+                priority + (now - heads[priority]) / self.aging_interval,
+                priority,
+            ),
+        )
+
+
+SCHEDULERS = {
+    "strict": StrictPriorityScheduler,
+    "weighted": WeightedRoundRobinScheduler,
+    "age-boost": AgeBoostScheduler,
+}
+
+
+def make_scheduler(name: str) -> Scheduler:
+    """
+    Build a scheduler with its default settings from its name.
+
+    Args:
+        name (str): One of "strict", "weighted" or "age-boost".
+
+    Returns:
+        Scheduler: The scheduler.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    if name not in SCHEDULERS:
+        raise ValueError(f"Unknown scheduler: {name!r}")
+    return SCHEDULERS[name]()
+
+
+class WaitTimeMetrics:
+    """
+    Per-band statistics of how long dequeued tasks waited since they were created.
+
+    Percentiles are computed over the most recent `window` samples of each band.
+
+    Methods:
+        record(priority: int, wait: float) -> None: Records the wait of a dequeued task.
+        summary() -> Dict[int, Dict[str, float]]: Returns the statistics of each band.
+    """
+
+    def __init__(self, window: int = 1000):
+        """
+        Initialize empty statistics.
+
+        Args:
+            window (int): The number of recent samples kept per band.
+        """
+        self.window: int = window
+        self._samples: Dict[int, deque] = {}
+        self._counts: Dict[int, int] = {}
+        self._totals: Dict[int, float] = {}
+        self._maxima: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, priority: int, wait: float) -> None:
+        """
+        Records the wait of a dequeued task.
+
+        Args:
+            priority (int): The band the task was dequeued from.
+            wait (float): Seconds between the task's creation and its dequeue.
+        """
+        with self._lock:
+            self._samples.setdefault(priority, deque(maxlen=self.window)).append(wait)
+            self._counts[priority] = self._counts.get(priority, 0) + 1
+            self._totals[priority] = self._totals.get(priority, 0.0) + wait
+            self._maxima[priority] = max(self._maxima.get(priority, wait), wait)
+
+    def summary(self) -> Dict[int, Dict[str, float]]:
+        """
+        Returns the statistics of each band that had a task dequeued.
+
+        Returns:
+            Dict[int, Dict[str, float]]: For each priority, the "count", "mean",
+                "p50", "p95" and "max" wait in seconds.
+        """
+        with self._lock:
+            summary = {}
+            for priority in sorted(self._samples, reverse=True):
+                samples = sorted(self._samples[priority])
+                count = self._counts[priority]
+                summary[priority] = {
+                    "count": count,
+                    "mean": self._totals[priority] / count,
+                    "p50": _percentile(samples, 0.50),
+                    "p95": _percentile(samples, 0.95),
+                    "max": self._maxima[priority],
+                }
+            return summary
+
+
+def _percentile(samples: list, fraction: float) -> float:
+    """
+    Return the nearest-rank percentile of sorted samples.
+    """
+    return samples[max(0, math.ceil(fraction * len(samples)) - 1)]
@@ -0,0 +1,217 @@
+"""
+snapshot.py
+
+This module reads and writes task store snapshots.
+
+A snapshot is a 6-byte header (the magic bytes b"LTSK", a format version and a flags
+byte), followed by a body of length-prefixed records and a trailer. Each record is a
+big-endian uint32 length and the task serialized as compact JSON, so snapshots stay
+readable by any backend as the Task model grows new optional fields. A zero length
+ends the body. When the compressed flag is set the body, including its end marker,
+is a single zlib stream. The trailer holds the number of records (uint64) and the
+CRC32 of the uncompressed body (uint32).
+
+Both directions stream: tasks are encoded and compressed one at a time, and are
+decoded while the file is read in fixed-size chunks.
+"""
+
+import struct
+import zlib
+from typing import BinaryIO, Iterable, Iterator
+
+from src.entities.task import Task
+from src.utils.exceptions import SnapshotError
+
+MAGIC = b"LTSK"
+VERSION = 1
+FLAG_COMPRESSED = 0x01
+READ_CHUNK_SIZE = 1 << 16
+
+_HEADER = struct.Struct(">4sBB")
+_LENGTH = struct.Struct(">I")
+_TRAILER = struct.Struct(">QI")
+
+
+def write_snapshot(
+    tasks: Iterable[Task], stream: BinaryIO, compress: bool = True
+) -> int:
+    """
+    Write tasks to a stream as a snapshot.
+
+    Args:
+        tasks (Iterable[Task]): The tasks to write.
+        stream (BinaryIO): The binary stream to write to.
+        compress (bool): Whether to zlib-compress the body.
+
+    Returns:
+        int: The number of tasks written.
+    """
+    stream.write(_HEADER.pack(MAGIC, VERSION, FLAG_COMPRESSED if compress else 0))
+    compressor = zlib.compressobj() if compress else None
+    checksum = 0
+    count = 0
+
+    def emit(data: bytes) -> None:
+        nonlocal checksum
+        checksum = zlib.crc32(data, checksum)
+        stream.write(compressor.compress(data) if compressor else data)
+
+    for task in tasks:
+        record = task.model_dump_json().encode("utf-8")
+        emit(_LENGTH.pack(len(record)) + record)
+        count += 1
+    emit(_LENGTH.pack(0))
+    if compressor:
+        stream.write(compressor.flush())
+    stream.write(_TRAILER.pack(count, checksum))
+    return count
+
+
+class _BodyReader:
+    """
+    Reads the uncompressed body of a snapshot in exact-size pieces.
+
+    Methods:
+        read(size: int) -> bytes: Reads exactly `size` bytes of the body.
+        trailer() -> bytes: Returns the bytes that follow the body.
+    """
+
+    def __init__(self, stream: BinaryIO, compressed: bool):
+        """
+        Initialize the reader.
+
+        Args:
+            stream (BinaryIO): The snapshot stream, positioned after the header.
+            compressed (bool): Whether the body is zlib-compressed.
+        """
+        self.stream: BinaryIO = stream
+        self.decompressor = zlib.decompressobj() if compressed else None
+        self.buffer: bytearray = bytearray()
+
+    def read(self, size: int) -> bytes:
+        """
+        Reads exactly `size` bytes of the body.
+
+        Args:
+            size (int): The number of bytes to read.
+
+        Returns:
+            bytes: The bytes read.
+
+        Raises:
+            SnapshotError: If the snapshot ends early.
+        """
+        while len(self.buffer) < size:
+            chunk = self.stream.read(READ_CHUNK_SIZE)
+            if not chunk:
+                raise SnapshotError("Snapshot is truncated")
+            if self.decompressor:
+                try:
+                    chunk = self.decompressor.decompress(chunk)
+                except zlib.error as e:
+                    raise SnapshotError(f"Snapshot body is corrupted: {e}")
+            self.buffer += chunk
+        data = bytes(self.buffer[:size])
+        del self.buffer[:size]
+        return data
+
+    def trailer(self) -> bytes:
+        """
+        Returns the bytes that follow the body.
+
+        Returns:
+            bytes: The trailer bytes.
+        """
+        if self.decompressor:
+            while not self.decompressor.eof:
+                chunk = self.stream.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    raise SnapshotError("Snapshot is truncated")
+                self.buffer += self.decompressor.decompress(chunk)
+            rest = self.decompressor.unused_data
+        else:
+            rest = bytes(self.buffer)
+        return rest + self.stream.read(_TRAILER.size - len(rest))
+
+
+def _records(stream: BinaryIO) -> Iterator[bytes]:
+    """
+    Read the raw records of a snapshot, checking the trailer once the body ends.
+
+    Args:
+        stream (BinaryIO): The binary stream to read from.
+
+    Yields:
+        bytes: The next serialized task.
+
+    Raises:
+        SnapshotError: If the snapshot is malformed, truncated or corrupted.
+    """
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise SnapshotError("Snapshot is truncated")
+    magic, version, flags = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise SnapshotError("Not a LuckyTask snapshot")
+    if version != VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}")
+
+    body = _BodyReader(stream, bool(flags & FLAG_COMPRESSED))
+    checksum = 0
+    count = 0
+    while True:
+        length_bytes = body.read(_LENGTH.size)
+        checksum = zlib.crc32(length_bytes, checksum)
+        (length,) = _LENGTH.unpack(length_bytes)
+        if length == 0:
+            break
+        record = body.read(length)
+        checksum = zlib.crc32(record, checksum)
+        count += 1
+        yield record
+
+    trailer = body.trailer()
+    if len(trailer) != _TRAILER.size:
+        raise SnapshotError("Snapshot trailer is missing")
+    if _TRAILER.unpack(trailer) != (count, checksum):
+        raise SnapshotError("Snapshot checksum mismatch")
+
+
+def read_snapshot(stream: BinaryIO) -> Iterator[Task]:
+    """
+    Read the tasks of a snapshot from a stream.
+
+    The checksum and record count are only known once the whole body has been read,
+    so a corrupted snapshot raises after the preceding tasks were yielded. Call
+    verify_snapshot() first to reject a bad file before loading anything.
+
+    Args:
+        stream (BinaryIO): The binary stream to read from.
+
+    Yields:
+        Task: The next task of the snapshot.
+
+    Raises:
+        SnapshotError: If the snapshot is malformed, truncated or corrupted.
+    """
+    for number, record in enumerate(_records(stream), start=1):
+        try:
+            yield Task.model_validate_json(record)
+        except ValueError as e:
+            raise SnapshotError(f"Snapshot record {number} is invalid: {e}")
+
+
+def verify_snapshot(stream: BinaryIO) -> int:
+    """
+    Check a snapshot's structure and checksum without decoding its tasks.
+
+    Args:
+        stream (BinaryIO): The binary stream to read from.
+
+    Returns:
+        int: The number of tasks in the snapshot.
+
+    Raises:
+        SnapshotError: If the snapshot is malformed, truncated or corrupted.
+    """
+    return sum(1 for _ in _records(stream))
@@ -4,42 +4,158 @@ task_service.py
 This module defines the TaskService class for managing tasks.
 """
 
-from typing import List, Optional
+import hashlib
+import os
+import socket
+import time
+from itertools import islice
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 from src.entities.task import Task
-from src.repositories.base_repository import TaskRepository
+from src.entities.task_event import TaskEvent
+from src.repositories.base_repository import TaskRepository, validate_queue_name
+from src.services.maintenance import BackgroundSweeper
+from src.services.memory_report import build_memory_report
+from src.services.scheduler import Scheduler, StrictPriorityScheduler, WaitTimeMetrics
+from src.services.snapshot import read_snapshot, verify_snapshot, write_snapshot
+from src.services.task_view import TaskView
+from src.utils.batching import chunked
+from src.utils.search import parse_query
 
 
 class TaskService:
     """
     TaskService provides an interface for managing tasks by interacting with a TaskRepository.
 
+    A service may be shared by threads when its repository is thread-safe, as both
+    bundled repositories are; the scheduler and wait metrics lock their own state.
+
     Methods:
-        add_task(name: str, priority: int, description: str) -> Task:
+        add_task(name: str, priority: int, description: str, ttl: Optional[float],
+                 run_at: Optional[float], idempotency_key: Optional[str],
+                 tags: Optional[Iterable[str]]) -> Task:
             Adds a new task to the repository.
+        add_tasks(specs: Iterable[Dict[str, Any]]) -> List[Task]:
+            Adds several tasks in batched writes.
+        get_task(task_id: str) -> Optional[Task]:
+            Retrieves a task by its ID.
+        get_tasks(task_ids: List[str]) -> List[Task]:
+            Retrieves several tasks by their IDs.
         get_all_tasks() -> List[Task]:
             Retrieves all tasks from the repository.
         get_tasks_by_priority(priority: int) -> List[Task]:
             Retrieves tasks from the repository by priority.
         get_tasks_by_priority_range(min_priority: int, max_priority: int) -> List[Task]:
             Retrieves tasks from the repository within a priority range.
+        iter_tasks(min_priority: int, max_priority: int, tags: Optional[Iterable[str]])
+                -> Iterator[Task]:
+            Streams tasks from the repository within a priority range, optionally
+            only those carrying every given tag.
+        search(query: str, offset: int, limit: int) -> Tuple[List[Task], int]:
+            Returns one page of the tasks whose name or description match a query.
         delete_task(task_id: str) -> bool:
             Deletes a task from the repository.
         update_task(task_id: str, **kwargs) -> Optional[Task]:
             Updates a task in the repository.
+        delete_tasks(task_ids: List[str], progress) -> int:
+            Deletes several tasks from the repository.
+        delete_tasks_by_priority_range(min_priority: int, max_priority: int, progress) -> int:
+            Deletes all tasks within a priority range from the repository.
+        delete_tasks_older_than(timestamp: float, progress) -> int:
+            Deletes the queued tasks created before a timestamp from the repository.
+        prune_expired_tasks(batch_size: int, now: Optional[float]) -> int:
+            Deletes one batch of expired tasks from the repository.
+        start_pruner(interval: float, batch_size: int) -> BackgroundSweeper:
+            Starts a background thread that prunes expired tasks periodically.
+        promote_due_tasks(batch_size: int, now: Optional[float]) -> int:
+            Moves one batch of due delayed tasks into the queue.
+        start_promoter(interval: float, batch_size: int) -> BackgroundSweeper:
+            Starts a background thread that promotes due delayed tasks periodically.
+        subscribe(group: Optional[str], consumer: Optional[str], after_id: Optional[str],
+                  batch_size: int, block: float) -> Iterator[TaskEvent]:
+            Iterates over the change feed of task mutations.
+        open_view(min_priority: int, max_priority: int, top: Optional[int]) -> TaskView:
+            Loads a live view of the tasks within a priority range.
+        check_consistency(repair: bool, on_issue: Optional[Callable[[str, str], None]])
+                -> Dict[str, int]:
+            Checks that the stored tasks and their indexes agree.
+        memory_report(sample_size: int, target_tasks: Optional[int]) -> Dict[str, Any]:
+            Estimates the memory used by the store from sampled keys.
+        export_snapshot(stream: BinaryIO, compress: bool) -> int:
+            Writes every task to a snapshot stream.
+        import_snapshot(stream: BinaryIO, verify: bool, dedupe: bool) -> int:
+            Adds every task of a snapshot stream to the repository.
+        dequeue_task(now: Optional[float]) -> Optional[Task]:
+            Removes and returns the next task chosen by the scheduler.
+        dequeue_tasks(count: int, now: Optional[float]) -> List[Task]:
+            Removes and returns up to `count` tasks chosen by the scheduler.
+        claim_tasks(count: int, now: Optional[float]) -> List[Task]:
+            Moves up to `count` tasks chosen by the scheduler to the "running" status.
+        requeue_tasks(tasks: List[Task]) -> int:
+            Puts dequeued tasks back into the queue.
+        set_status(task_ids: List[str], status: str, now: Optional[float]) -> List[Task]:
+            Moves tasks to another status.
+        iter_tasks_by_status(status: str, before: Optional[float]) -> Iterator[Task]:
+            Streams the tasks of a status other than "pending".
+        reclaim_stale_tasks(timeout: float, batch_size: int, now: Optional[float]) -> int:
+            Sets one batch of tasks running for longer than `timeout` back to pending.
+        start_reclaimer(timeout: float, interval: float, batch_size: int)
+                -> BackgroundSweeper:
+            Starts a background thread that reclaims stale running tasks periodically.
+        archive_tasks(stream: BinaryIO, before: float, statuses: Iterable[str],
+                      compress: bool) -> int:
+            Writes finished tasks to a snapshot stream, then deletes them.
+        wait_times() -> Dict[int, Dict[str, float]]:
+            Returns per-band statistics of how long dequeued tasks waited.
+        content_key(name: str, priority: int, description: str) -> str:
+            Returns the deduplication key derived from a task's content.
+        list_queues() -> Dict[str, Dict[str, int]]:
+            Returns the number of queued and delayed tasks of every queue.
+        move_tasks(task_ids: List[str], queue: str) -> int:
+            Moves tasks from this service's queue to another queue.
     """
 
-    def __init__(self, repository: TaskRepository):
+    def __init__(
+        self,
+        repository: TaskRepository,
+        scheduler: Optional[Scheduler] = None,
+        dedup_ttl: float = 86400.0,
+    ):
         """
         Initialize the TaskService with a repository.
 
         Args:
             repository (TaskRepository): The repository to use for task management.
+            scheduler (Optional[Scheduler]): The policy choosing the priority band
+                dequeue_task() serves next, strict priority order by default.
+            dedup_ttl (float): The number of seconds an idempotency key is remembered.
 
         """
         self.repository: TaskRepository = repository
+        self.dedup_ttl: float = dedup_ttl
+        self.scheduler: Scheduler = scheduler or StrictPriorityScheduler()
+        self.wait_metrics: WaitTimeMetrics = WaitTimeMetrics()
 
-    def add_task(self, name: str, priority: int, description: str) -> Task:
+    def add_task(
+        self,
+        name: str,
+        priority: int,
+        description: str,
+        ttl: Optional[float] = None,
+        run_at: Optional[float] = None,
+        idempotency_key: Optional[str] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Task:
         """
         Adds a new task to the repository.
 
@@ -47,15 +163,135 @@ class TaskService:
             name (str): The name of the task.
             priority (int): The priority of the task.
             description (str): The description of the task.
+            ttl (Optional[float]): The number of seconds after which the task expires,
+                counted from `run_at` for a delayed task.
+            run_at (Optional[float]): The timestamp before which the task stays delayed.
+            idempotency_key (Optional[str]): A key identifying the submission; a repeated
+                key within `dedup_ttl` seconds adds nothing. See content_key().
+            tags (Optional[Iterable[str]]): The labels of the task.
 
         Returns:
-            Task: The added Task object.
+            Task: The added Task object, or the task first submitted with the same key.
+
+        Raises:
+            ValueError: If `ttl` is not a positive number of seconds.
 
         """
-        task: Task = Task(name=name, priority=priority, description=description)
+        task = self._new_task(name, priority, description, ttl, run_at, tags)
+        if idempotency_key is not None:
+            [(stored, _)] = self.repository.add_if_absent(
+                [(idempotency_key, task)], self.dedup_ttl
+            )
+            return stored
         self.repository.add(task)
         return task
 
+    def add_tasks(self, specs: Iterable[Dict[str, Any]]) -> List[Task]:
+        """
+        Adds several tasks, writing them in batches rather than one round trip each.
+
+        Args:
+            specs (Iterable[Dict[str, Any]]): The keyword arguments of add_task() for
+                each task.
+
+        Returns:
+            List[Task]: For each spec in order, the added task, or the task first
+                submitted with the same idempotency key.
+
+        Raises:
+            ValueError: If a spec is invalid; no task is added then.
+
+        """
+        results: List[Optional[Task]] = []
+        new_tasks: List[Task] = []
+        keyed: List[Tuple[int, Tuple[str, Task]]] = []
+        for spec in specs:
+            fields = dict(spec)
+            key = fields.pop("idempotency_key", None)
+            task = self._new_task(**fields)
+            if key is None:
+                new_tasks.append(task)
+                results.append(task)
+            else:
+                keyed.append((len(results), (key, task)))
+                results.append(None)
+        self.repository.add_many(new_tasks)
+        if keyed:
+            stored = self.repository.add_if_absent(
+                [pair for _, pair in keyed], self.dedup_ttl
+            )
+            for (position, _), (task, _) in zip(keyed, stored):
+                results[position] = task
+        return [task for task in results if task is not None]
+
+    def _new_task(
+        self,
+        name: str,
+        priority: int,
+        description: str,
+        ttl: Optional[float] = None,
+        run_at: Optional[float] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Task:
+        """
+        Build a task, deriving its expiry from the TTL.
+        """
+        if ttl is not None and ttl <= 0:
+            raise ValueError("TTL must be a positive number of seconds")
+        task: Task = Task(
+            name=name,
+            priority=priority,
+            description=description,
+            run_at=run_at,
+            tags=list(tags or []),
+        )
+        if ttl is not None:
+            task.expires_at = max(task.timestamp, run_at or 0) + ttl
+        return task
+
+    @staticmethod
+    def content_key(name: str, priority: int, description: str) -> str:
+        """
+        Returns the deduplication key derived from a task's content.
+
+        Args:
+            name (str): The name of the task.
+            priority (int): The priority of the task.
+            description (str): The description of the task.
+
+        Returns:
+            str: A SHA-256 digest of the name, priority and description.
+
+        """
+        content = "\0".join((name, str(priority), description))
+        return "content:" + hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """
+        Retrieves a task by its ID.
+
+        Args:
+            task_id (str): The ID of the task.
+
+        Returns:
+            Optional[Task]: The task, or None if it does not exist.
+
+        """
+        return self.repository.get_by_id(task_id)
+
+    def get_tasks(self, task_ids: List[str]) -> List[Task]:
+        """
+        Retrieves several tasks by their IDs, in batches rather than one by one.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks.
+
+        Returns:
+            List[Task]: The tasks that exist, in the order of `task_ids`.
+
+        """
+        return self.repository.get_many(task_ids)
+
     def get_all_tasks(self) -> List[Task]:
         """
         Retrieves all tasks from the repository.
@@ -95,6 +331,59 @@ class TaskService:
         """
         return self.repository.list_by_priority(min_priority, max_priority)
 
+    def iter_tasks(
+        self,
+        min_priority: int = Task.MIN_PRIORITY,
+        max_priority: int = Task.MAX_PRIORITY,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Iterator[Task]:
+        """
+        Streams tasks from the repository within a priority range.
+
+        Unlike the get_* methods, tasks are yielded as the repository fetches them,
+        so large result sets are never held in memory at once.
+
+        Args:
+            min_priority (int): The minimum priority value.
+            max_priority (int): The maximum priority value.
+            tags (Optional[Iterable[str]]): When given, only tasks carrying every one
+                of these tags are returned.
+
+        Returns:
+            Iterator[Task]: An iterator over the Task objects within the priority range.
+
+        """
+        if tags:
+            return self.repository.iter_by_tags(tags, min_priority, max_priority)
+        return self.repository.iter_by_priority(min_priority, max_priority)
+
+    def search(
+        self, query: str, offset: int = 0, limit: int = 20
+    ) -> Tuple[List[Task], int]:
+        """
+        Returns one page of the queued tasks whose name or description match a query.
+
+        Terms of a query must all match, `OR` separates alternatives and a trailing
+        `*` matches any word starting with the term, as in "deploy api*" or
+        "refund OR chargeback".
+
+        Args:
+            query (str): The search query.
+            offset (int): The number of ranked matches to skip.
+            limit (int): The maximum number of tasks to return.
+
+        Returns:
+            Tuple[List[Task], int]: The tasks of the page, highest priority and then
+                oldest first, and the total number of matches.
+
+        Raises:
+            ValueError: If the query has no searchable term or the page is invalid.
+
+        """
+        if offset < 0 or limit < 1:
+            raise ValueError("Offset must not be negative and limit must be positive")
+        return self.repository.search(parse_query(query), offset, limit)
+
     def delete_task(self, task_id: str) -> bool:
         """
         Deletes a task from the repository.
@@ -119,6 +408,9 @@ class TaskService:
         Returns:
             Optional[Task]: The updated Task object if successful, None if the task was not found.
 
+        Raises:
+            ValueError: If an updated field is invalid.
+
         """
         task: Optional[Task] = self.repository.get_by_id(task_id)
         if not task:
@@ -127,7 +419,672 @@ class TaskService:
         updated_fields: dict = {
             key: value for key, value in kwargs.items() if value is not None
         }
-        for key, value in updated_fields.items():
-            setattr(task, key, value)
+        # Validating the merged fields rejects an out-of-range priority or empty name
+        # and normalizes the tags.
+        validated = Task.model_validate({**task.model_dump(), **updated_fields})
+        # The update goes through a copy, so a failed update leaves the fetched task,
+        # which may be shared with a cache, unchanged.
+        return self.repository.update(
+            task.model_copy(
+                update={key: getattr(validated, key) for key in updated_fields}
+            )
+        )
+
+    def delete_tasks(
+        self, task_ids: List[str], progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Deletes several tasks from the repository.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to delete.
+            progress (Optional[Callable[[int], None]]): Called with the number of
+                tasks deleted after each batch.
+
+        Returns:
+            int: The number of tasks that were deleted.
+
+        """
+        return self.repository.delete_many(task_ids, progress)
+
+    def delete_tasks_by_priority_range(
+        self,
+        min_priority: int,
+        max_priority: int,
+        progress: Optional[Callable[[int], None]] = None,
+    ) -> int:
+        """
+        Deletes all tasks within a priority range from the repository.
+
+        Args:
+            min_priority (int): The minimum priority value.
+            max_priority (int): The maximum priority value.
+            progress (Optional[Callable[[int], None]]): Called with the number of
+                tasks deleted after each batch.
+
+        Returns:
+            int: The number of tasks that were deleted.
+
+        """
+        return self.repository.delete_by_priority(min_priority, max_priority, progress)
+
+    def delete_tasks_older_than(
+        self, timestamp: float, progress: Optional[Callable[[int], None]] = None
+    ) -> int:
+        """
+        Deletes the queued tasks created before a timestamp from the repository.
+
+        Args:
+            timestamp (float): Tasks with a creation timestamp lower than this are deleted.
+            progress (Optional[Callable[[int], None]]): Called with the number of
+                tasks deleted after each batch.
+
+        Returns:
+            int: The number of tasks that were deleted.
+
+        """
+        return self.repository.delete_older_than(timestamp, progress)
+
+    def prune_expired_tasks(
+        self, batch_size: int = 500, now: Optional[float] = None
+    ) -> int:
+        """
+        Deletes one batch of expired tasks from the repository.
+
+        Args:
+            batch_size (int): The maximum number of tasks to delete.
+            now (Optional[float]): The reference timestamp, defaults to the current time.
+
+        Returns:
+            int: The number of expired entries removed; fewer than `batch_size`
+                means none are left.
+
+        """
+        return self.repository.prune_expired(
+            time.time() if now is None else now, batch_size
+        )
+
+    def start_pruner(
+        self, interval: float = 60.0, batch_size: int = 500
+    ) -> BackgroundSweeper:
+        """
+        Starts a background thread that prunes expired tasks periodically.
+
+        Args:
+            interval (float): The number of seconds to wait between idle sweeps.
+            batch_size (int): The maximum number of tasks deleted per sweep.
+
+        Returns:
+            BackgroundSweeper: The running thread; call stop() to end it.
+
+        """
+        pruner = BackgroundSweeper(
+            lambda: self.prune_expired_tasks(batch_size), interval, batch_size
+        )
+        pruner.start()
+        return pruner
+
+    def promote_due_tasks(
+        self, batch_size: int = 500, now: Optional[float] = None
+    ) -> int:
+        """
+        Moves one batch of delayed tasks whose `run_at` has come into the queue.
+
+        Args:
+            batch_size (int): The maximum number of tasks to promote.
+            now (Optional[float]): The reference timestamp, defaults to the current time.
+
+        Returns:
+            int: The number of delayed entries processed; fewer than `batch_size`
+                means none are due.
+
+        """
+        return self.repository.promote_due(
+            time.time() if now is None else now, batch_size
+        )
+
+    def start_promoter(
+        self, interval: float = 1.0, batch_size: int = 500
+    ) -> BackgroundSweeper:
+        """
+        Starts a background thread that promotes due delayed tasks periodically.
+
+        Args:
+            interval (float): The number of seconds to wait between idle sweeps.
+            batch_size (int): The maximum number of tasks promoted per sweep.
+
+        Returns:
+            BackgroundSweeper: The running thread; call stop() to end it.
+
+        """
+        promoter = BackgroundSweeper(
+            lambda: self.promote_due_tasks(batch_size), interval, batch_size
+        )
+        promoter.start()
+        return promoter
+
+    def subscribe(
+        self,
+        group: Optional[str] = None,
+        consumer: Optional[str] = None,
+        after_id: Optional[str] = None,
+        batch_size: int = 100,
+        block: float = 1.0,
+    ) -> Iterator[TaskEvent]:
+        """
+        Iterates over the change feed of task mutations, waiting for new events forever.
+
+        Without a group, every subscriber sees every event recorded after `after_id`
+        (by default, after the subscription starts). With a group, events are shared
+        among the group's consumers; a consumer first re-reads the events it received
+        but did not acknowledge, and each batch is acknowledged once the caller has
+        asked for the event after it, so events are processed at least once.
+
+        Args:
+            group (Optional[str]): The consumer group to read as.
+            consumer (Optional[str]): The consumer name, defaults to host name and PID.
+            after_id (Optional[str]): The event ID to start after, ignored for groups.
+            batch_size (int): The maximum number of events fetched per read.
+            block (float): Seconds each read waits for new events.
+
+        Returns:
+            Iterator[TaskEvent]: An endless iterator over change feed events.
+
+        Raises:
+            ValueError: If `block` is not a positive number of seconds.
+
+        """
+        if not block or block <= 0:
+            raise ValueError("block must be a positive number of seconds")
+        if group is None:
+            return self._follow_events(
+                after_id or self.repository.latest_event_id(), batch_size, block
+            )
+        consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        # Reading the pending events now also creates the group, so the events
+        # recorded from this call on are delivered to it.
+        pending = self.repository.read_group_events(
+            group, consumer, batch_size, pending=True
+        )
+        return self._follow_group_events(group, consumer, pending, batch_size, block)
+
+    def open_view(
+        self,
+        min_priority: int = Task.MIN_PRIORITY,
+        max_priority: int = Task.MAX_PRIORITY,
+        top: Optional[int] = None,
+    ) -> TaskView:
+        """
+        Loads a live view of the tasks within a priority range.
+
+        The change feed position is read before the snapshot, so mutations made while
+        the snapshot streams in are replayed by the view's first refresh().
+
+        Args:
+            min_priority (int): The minimum priority value.
+            max_priority (int): The maximum priority value.
+            top (Optional[int]): The maximum number of tasks returned by the view.
+
+        Returns:
+            TaskView: The loaded view; call refresh() to apply new mutations.
+
+        """
+        view = TaskView(
+            self.repository,
+            self.repository.latest_event_id(),
+            min_priority,
+            max_priority,
+            top,
+        )
+        view.load(self.iter_tasks(min_priority, max_priority))
+        return view
+
+    def dequeue_task(self, now: Optional[float] = None) -> Optional[Task]:
+        """
+        Removes and returns the next task chosen by the scheduler.
+
+        Due delayed tasks are promoted first, so consumers do not depend on a
+        separate promoter. The scheduler only sees the oldest task of each priority
+        band. If another consumer empties the chosen band first, the decision is
+        made again.
+
+        Args:
+            now (Optional[float]): The reference timestamp, defaults to the current time.
+
+        Returns:
+            Optional[Task]: The dequeued task, or None if no unexpired task is queued.
+
+        """
+        self.promote_due_tasks(now=now)
+        return self._pop_next(now)
 
-        return self.repository.update(task)
+    def dequeue_tasks(self, count: int, now: Optional[float] = None) -> List[Task]:
+        """
+        Removes and returns up to `count` tasks in the order dequeue_task() would.
+
+        Due delayed tasks are promoted once for the whole batch. Each task is still
+        popped atomically, so concurrent consumers never receive the same task.
+
+        Args:
+            count (int): The maximum number of tasks to dequeue.
+            now (Optional[float]): The reference timestamp, defaults to the current time.
+
+        Returns:
+            List[Task]: The dequeued tasks, fewer than `count` if the queue ran out.
+
+        """
+        return self._pop_batch(count, now, claim=False)
+
+    def claim_tasks(self, count: int, now: Optional[float] = None) -> List[Task]:
+        """
+        Claims up to `count` tasks in the order dequeue_tasks() would.
+
+        A claimed task is not deleted but moved to the "running" status, so it can
+        later be marked done or failed with set_status(), or put back as pending.
+
+        Args:
+            count (int): The maximum number of tasks to claim.
+            now (Optional[float]): The reference timestamp, defaults to the current time.
+
+        Returns:
+            List[Task]: The claimed tasks, fewer than `count` if the queue ran out.
+
+        """
+        return self._pop_batch(count, now, claim=True)
+
+    def requeue_tasks(self, tasks: List[Task]) -> int:
+        """
+        Puts dequeued tasks back into the queue, keeping their IDs and timestamps.
+
+        Args:
+            tasks (List[Task]): Tasks previously returned by dequeue_task(s).
+
+        Returns:
+            int: The number of tasks requeued.
+
+        """
+        return self.repository.add_many(tasks)
+
+    def set_status(
+        self, task_ids: List[str], status: str, now: Optional[float] = None
+    ) -> List[Task]:
+        """
+        Moves tasks to another status, following Task.TRANSITIONS.
+
+        Tasks that are missing or whose current status cannot move to `status` are
+        left unchanged. A task set back to "pending" is queued again.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to change.
+            status (str): The new status.
+            now (Optional[float]): The timestamp recorded as `status_at`, defaults to
+                the current time.
+
+        Returns:
+            List[Task]: The tasks whose status changed.
+
+        Raises:
+            ValueError: If the status is unknown.
+
+        """
+        if status not in Task.STATUSES:
+            raise ValueError(f"Status must be one of {', '.join(Task.STATUSES)}")
+        sources = [
+            source for source in Task.STATUSES if status in Task.TRANSITIONS[source]
+        ]
+        return self.repository.transition(
+            task_ids, status, sources, time.time() if now is None else now
+        )
+
+    def iter_tasks_by_status(
+        self, status: str, before: Optional[float] = None
+    ) -> Iterator[Task]:
+        """
+        Streams the tasks of a status other than "pending", oldest status change first.
+
+        Args:
+            status (str): "running", "done" or "failed".
+            before (Optional[float]): When given, only tasks whose status changed
+                before this timestamp are returned.
+
+        Returns:
+            Iterator[Task]: An iterator over the tasks of that status.
+
+        Raises:
+            ValueError: If the status has no index of its own.
+
+        """
+        self._check_indexed_status(status)
+        return self.repository.iter_by_status(status, before)
+
+    def reclaim_stale_tasks(
+        self, timeout: float, batch_size: int = 500, now: Optional[float] = None
+    ) -> int:
+        """
+        Sets one batch of tasks claimed more than `timeout` seconds ago back to pending.
+
+        A worker killed outright leaves its claimed tasks running forever; reclaiming
+        queues them again. A task whose handler is merely slow is reclaimed too and
+        may run twice, so `timeout` must exceed the longest handler run. Tasks that
+        finished since they were read are left alone.
+
+        Args:
+            timeout (float): The number of seconds after which a running task is stale.
+            batch_size (int): The maximum number of tasks to reclaim.
+            now (Optional[float]): The reference timestamp, defaults to the current time.
+
+        Returns:
+            int: The number of stale tasks found; fewer than `batch_size` means none
+                are left.
+
+        """
+        now = time.time() if now is None else now
+        stale = [
+            task.id
+            for task in islice(
+                self.repository.iter_by_status(Task.RUNNING, now - timeout, batch_size),
+                batch_size,
+            )
+        ]
+        if stale:
+            self.repository.transition(stale, Task.PENDING, [Task.RUNNING], now)
+        return len(stale)
+
+    def start_reclaimer(
+        self, timeout: float, interval: float = 60.0, batch_size: int = 500
+    ) -> BackgroundSweeper:
+        """
+        Starts a background thread that reclaims stale running tasks periodically.
+
+        Args:
+            timeout (float): The number of seconds after which a running task is stale.
+            interval (float): The number of seconds to wait between idle sweeps.
+            batch_size (int): The maximum number of tasks reclaimed per sweep.
+
+        Returns:
+            BackgroundSweeper: The running thread; call stop() to end it.
+
+        """
+        reclaimer = BackgroundSweeper(
+            lambda: self.reclaim_stale_tasks(timeout, batch_size), interval, batch_size
+        )
+        reclaimer.start()
+        return reclaimer
+
+    def archive_tasks(
+        self,
+        stream: BinaryIO,
+        before: float,
+        statuses: Iterable[str] = (Task.DONE, Task.FAILED),
+        compress: bool = True,
+    ) -> int:
+        """
+        Writes finished tasks to a snapshot stream, then deletes them.
+
+        The tasks are streamed from their status indexes, so the archive costs
+        nothing per pending task. A task whose status changed after it was written
+        is kept, so it may appear in the archive and still be stored. The snapshot
+        can be restored with import_snapshot(), into any queue or backend.
+
+        Args:
+            stream (BinaryIO): The binary stream to write the snapshot to.
+            before (float): Only tasks whose status changed before this timestamp
+                are archived.
+            statuses (Iterable[str]): The statuses to archive.
+            compress (bool): Whether to compress the snapshot body.
+
+        Returns:
+            int: The number of tasks archived.
+
+        Raises:
+            ValueError: If a status has no index of its own.
+
+        """
+        statuses = list(dict.fromkeys(statuses))
+        for status in statuses:
+            self._check_indexed_status(status)
+        archived: List[str] = []
+
+        def collect() -> Iterator[Task]:
+            for status in statuses:
+                for task in self.repository.iter_by_status(status, before):
+                    archived.append(task.id)
+                    yield task
+
+        count = write_snapshot(collect(), stream, compress)
+        for chunk in chunked(archived, 500):
+            self.repository.delete_in_status(chunk, statuses)
+        return count
+
+    def wait_times(self) -> Dict[int, Dict[str, float]]:
+        """
+        Returns per-band statistics of how long tasks dequeued by this service waited.
+
+        Returns:
+            Dict[int, Dict[str, float]]: For each priority, the "count", "mean", "p50",
+                "p95" and "max" wait in seconds.
+
+        """
+        return self.wait_metrics.summary()
+
+    def list_queues(self) -> Dict[str, Dict[str, int]]:
+        """
+        Returns the number of queued and delayed tasks of every queue of the storage.
+
+        Returns:
+            Dict[str, Dict[str, int]]: For each queue name, the number of "queued" and
+                "delayed" tasks.
+
+        """
+        return self.repository.queue_counts()
+
+    def move_tasks(self, task_ids: List[str], queue: str) -> int:
+        """
+        Moves tasks from this service's queue to another queue, keeping their IDs.
+
+        Args:
+            task_ids (List[str]): The IDs of the tasks to move.
+            queue (str): The name of the destination queue.
+
+        Returns:
+            int: The number of tasks that existed and were moved.
+
+        Raises:
+            ValueError: If the destination name is invalid or is the current queue.
+
+        """
+        validate_queue_name(queue)
+        return self.repository.move_to_queue(task_ids, queue)
+
+    def check_consistency(
+        self,
+        repair: bool = False,
+        on_issue: Optional[Callable[[str, str], None]] = None,
+    ) -> Dict[str, int]:
+        """
+        Checks that the stored tasks and their indexes agree, optionally repairing them.
+
+        Args:
+            repair (bool): Whether to fix the inconsistencies found.
+            on_issue (Optional[Callable[[str, str], None]]): Called with the kind of
+                each inconsistency, "dangling", "orphaned" or "mismatched", and the
+                task ID.
+
+        Returns:
+            Dict[str, int]: The number of index "entries" and task "hashes" checked,
+                of each kind of inconsistency, and of tasks "repaired".
+
+        """
+        return self.repository.check_consistency(repair, on_issue)
+
+    def memory_report(
+        self, sample_size: int = 1000, target_tasks: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Estimates the memory used by the store and, optionally, by a target task count.
+
+        Args:
+            sample_size (int): The maximum number of keys of each group measured.
+            target_tasks (Optional[int]): The number of tasks to project memory for.
+
+        Returns:
+            Dict[str, Any]: The report described in build_memory_report().
+
+        Raises:
+            ValueError: If the sample size or target is not positive.
+
+        """
+        if sample_size < 1 or (target_tasks is not None and target_tasks < 1):
+            raise ValueError("The sample size and target must be positive")
+        return build_memory_report(
+            self.repository.sample_memory(sample_size), target_tasks
+        )
+
+    def export_snapshot(self, stream: BinaryIO, compress: bool = True) -> int:
+        """
+        Writes every task to a snapshot stream.
+
+        Args:
+            stream (BinaryIO): The binary stream to write the snapshot to.
+            compress (bool): Whether to compress the snapshot body.
+
+        Returns:
+            int: The number of tasks written.
+
+        """
+        return write_snapshot(self.repository.iter_all(), stream, compress)
+
+    def import_snapshot(
+        self, stream: BinaryIO, verify: bool = True, dedupe: bool = False
+    ) -> int:
+        """
+        Adds every task of a snapshot stream to the repository.
+
+        Snapshots are repository-agnostic, so one taken from any backend can be
+        imported into any other. With `verify`, the whole stream is checked first
+        and rewound, so a corrupted file is rejected before any task is written.
+
+        Args:
+            stream (BinaryIO): The binary stream to read the snapshot from; it must be
+                seekable when `verify` is set.
+            verify (bool): Whether to check the snapshot before importing it.
+            dedupe (bool): Whether to skip tasks whose content was already submitted
+                within `dedup_ttl` seconds, including earlier rows of the snapshot.
+
+        Returns:
+            int: The number of tasks imported.
+
+        Raises:
+            SnapshotError: If the snapshot is malformed, truncated or corrupted.
+
+        """
+        if verify:
+            start = stream.tell()
+            verify_snapshot(stream)
+            stream.seek(start)
+        if not dedupe:
+            return self.repository.add_many(read_snapshot(stream))
+        imported = 0
+        for batch in chunked(read_snapshot(stream), 500):
+            added = self.repository.add_if_absent(
+                (
+                    (self.content_key(task.name, task.priority, task.description), task)
+                    for task in batch
+                ),
+                self.dedup_ttl,
+            )
+            imported += sum(created for _, created in added)
+        return imported
+
+    def _pop_batch(self, count: int, now: Optional[float], claim: bool) -> List[Task]:
+        """
+        Promote due tasks once, then pop or claim up to `count` tasks.
+        """
+        self.promote_due_tasks(now=now)
+        tasks: List[Task] = []
+        while len(tasks) < count:
+            task = self._pop_next(now, claim)
+            if task is None:
+                break
+            tasks.append(task)
+        return tasks
+
+    @staticmethod
+    def _check_indexed_status(status: str) -> None:
+        """
+        Raise a ValueError unless the status has an index of its own.
+        """
+        indexed = [name for name in Task.STATUSES if name != Task.PENDING]
+        if status not in indexed:
+            raise ValueError(f"Status must be one of {', '.join(indexed)}")
+
+    def _pop_next(self, now: Optional[float], claim: bool = False) -> Optional[Task]:
+        """
+        Pop the task of the band the scheduler selects, retrying if it was emptied.
+        """
+        while True:
+            current = time.time() if now is None else now
+            heads = self.repository.band_heads()
+            if not heads:
+                return None
+            priority = self.scheduler.select(heads, current)
+            task = self.repository.pop_from_band(priority, current, claim)
+            if task is not None:
+                self.wait_metrics.record(task.priority, current - task.timestamp)
+                return task
+
+    def _follow_events(
+        self, after_id: str, batch_size: int, block: float
+    ) -> Iterator[TaskEvent]:
+        """
+        Yields the change feed events recorded after an event ID, forever.
+
+        Args:
+            after_id (str): The event ID to start after.
+            batch_size (int): The maximum number of events fetched per read.
+            block (float): Seconds each read waits for new events.
+
+        Yields:
+            TaskEvent: The next change feed event.
+        """
+        last_id = after_id
+        while True:
+            for event in self.repository.read_events(last_id, batch_size, block):
+                last_id = event.id
+                yield event
+
+    def _follow_group_events(
+        self,
+        group: str,
+        consumer: str,
+        pending: List[TaskEvent],
+        batch_size: int,
+        block: float,
+    ) -> Iterator[TaskEvent]:
+        """
+        Yields the change feed events delivered to a consumer group member, forever.
+
+        The consumer's pending events are replayed first; each batch is acknowledged
+        once the caller asks for the event after it.
+
+        Args:
+            group (str): The consumer group name.
+            consumer (str): The consumer name within the group.
+            pending (List[TaskEvent]): The first batch of pending events to replay.
+            batch_size (int): The maximum number of events fetched per read.
+            block (float): Seconds each read waits for new events.
+
+        Yields:
+            TaskEvent: The next change feed event.
+        """
+        events = pending
+        replaying = True
+        while True:
+            if replaying and not events:
+                replaying = False
+            if events:
+                yield from events
+                self.repository.ack_events(group, [event.id for event in events])
+            events = self.repository.read_group_events(
+                group, consumer, batch_size, block, pending=replaying
+            )
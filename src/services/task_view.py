@@ -0,0 +1,171 @@
+"""
+task_view.py
+
+This module defines the TaskView class, a live in-memory view of the tasks within a
+priority range that is kept up to date from the change feed.
+"""
+
+import time
+from typing import Dict, Iterable, List, Optional
+
+from src.entities.task import Task
+from src.entities.task_event import TaskEvent, TaskEventType
+from src.repositories.base_repository import TaskRepository
+
+
+class TaskView:
+    """
+    A live view of the tasks within a priority range.
+
+    The view is loaded once from a snapshot and then follows the change feed from
+    the position recorded just before the snapshot, so no mutation is missed and
+    the repository is never scanned again.
+
+    Methods:
+        load(tasks: Iterable[Task]) -> None:
+            Replaces the content of the view with a snapshot.
+        apply(event: TaskEvent) -> bool:
+            Applies a change feed event to the view.
+        refresh(block: float) -> bool:
+            Applies the change feed events recorded since the last refresh.
+        tasks(now: Optional[float]) -> List[Task]:
+            Returns the tasks in the view, highest priority first.
+    """
+
+    def __init__(
+        self,
+        repository: TaskRepository,
+        after_id: str,
+        min_priority: int = Task.MIN_PRIORITY,
+        max_priority: int = Task.MAX_PRIORITY,
+        top: Optional[int] = None,
+    ):
+        """
+        Initialize an empty view.
+
+        Args:
+            repository (TaskRepository): The repository whose change feed is followed.
+            after_id (str): The change feed position the view is up to date with.
+            min_priority (int): The minimum priority of the tasks in the view.
+            max_priority (int): The maximum priority of the tasks in the view.
+            top (Optional[int]): The maximum number of tasks returned by tasks().
+        """
+        self.repository: TaskRepository = repository
+        self.last_event_id: str = after_id
+        self.min_priority: int = min_priority
+        self.max_priority: int = max_priority
+        self.top: Optional[int] = top
+        self._tasks: Dict[str, Task] = {}
+        self._next_expiry: Optional[float] = None
+
+    def __len__(self) -> int:
+        """Returns the number of tasks held by the view."""
+        return len(self._tasks)
+
+    def load(self, tasks: Iterable[Task]) -> None:
+        """
+        Replaces the content of the view with a snapshot.
+
+        Args:
+            tasks (Iterable[Task]): The tasks within the priority range.
+        """
+        self._tasks = {}
+        for task in tasks:
+            self._put(task)
+
+    def apply(self, event: TaskEvent) -> bool:
+        """
+        Applies a change feed event to the view.
+
+        Events are idempotent, so events already reflected by the snapshot are harmless.
+
+        Args:
+            event (TaskEvent): The event to apply.
+
+        Returns:
+            bool: True if the content of the view changed.
+        """
+        self.last_event_id = event.id
+        if event.type == TaskEventType.DELETE or event.task is None:
+            return self._tasks.pop(event.task_id, None) is not None
+        if (
+            self.min_priority <= event.task.priority <= self.max_priority
+            and event.task.status == Task.PENDING
+        ):
+            self._put(event.task)
+            return True
+        # An update can move a task out of the priority range or out of the queue.
+        return self._tasks.pop(event.task_id, None) is not None
+
+    def refresh(self, block: float = 0.0) -> bool:
+        """
+        Applies the change feed events recorded since the last refresh.
+
+        Args:
+            block (float): Seconds to wait for events when none are available.
+
+        Returns:
+            bool: True if the content of the view changed, including by expiry.
+        """
+        changed = False
+        for event in self.repository.read_events(
+            self.last_event_id, count=1000, block=block or None
+        ):
+            changed = self.apply(event) or changed
+        return self._drop_expired() or changed
+
+    def tasks(self, now: Optional[float] = None) -> List[Task]:
+        """
+        Returns the tasks in the view, highest priority first, oldest first within a priority.
+
+        Args:
+            now (Optional[float]): The reference time for expiry and delays, defaults
+                to the current time.
+
+        Returns:
+            List[Task]: At most `top` tasks that are due and not expired.
+        """
+        now = time.time() if now is None else now
+        ordered = sorted(
+            (
+                task
+                for task in self._tasks.values()
+                if task.is_due(now) and not task.is_expired(now)
+            ),
+            key=lambda task: (-task.priority, task.timestamp),
+        )
+        return ordered[: self.top] if self.top is not None else ordered
+
+    def _put(self, task: Task) -> None:
+        """
+        Stores a task and tracks the earliest expiry in the view.
+
+        Args:
+            task (Task): The task to store.
+        """
+        self._tasks[task.id] = task
+        if task.expires_at is not None and (
+            self._next_expiry is None or task.expires_at < self._next_expiry
+        ):
+            self._next_expiry = task.expires_at
+
+    def _drop_expired(self) -> bool:
+        """
+        Removes expired tasks once the earliest expiry in the view has passed.
+
+        Returns:
+            bool: True if any task was removed.
+        """
+        now = time.time()
+        if self._next_expiry is None or self._next_expiry > now:
+            return False
+        expired = [task.id for task in self._tasks.values() if task.is_expired(now)]
+        for task_id in expired:
+            del self._tasks[task_id]
+        expiries = [
+            task.expires_at
+            for task in self._tasks.values()
+            if task.expires_at is not None
+        ]
+        self._next_expiry = min(expiries) if expiries else None
+        return bool(expired)
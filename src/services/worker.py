@@ -0,0 +1,338 @@
+"""
+This module defines the runner that executes queued tasks with a user handler.
+
+A handler is any function taking a Task, named as `module:function`. Tasks are claimed
+with TaskService.claim_tasks(), whose Lua pop moves each task to "running" atomically,
+so any number of workers can share a queue without running a task twice. Finished
+tasks are marked "done" or "failed" rather than deleted.
+
+Classes:
+    WorkerStats: Counts of the tasks one worker has run.
+    Worker: Claims tasks in batches and runs them on a thread pool.
+
+Functions:
+    load_handler(spec: str) -> Callable[[Task], object]: Imports a handler.
+    run_worker_processes(make_service, handler_spec, processes, concurrency, prefetch,
+                         burst, report_interval, on_report) -> List[WorkerStats]:
+        Runs workers in several processes until stopped.
+"""
+
+import importlib
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, List, Optional, Set
+
+from src.entities.task import Task
+from src.services.task_service import TaskService
+
+logger = logging.getLogger(__name__)
+
+
+def load_handler(spec: str) -> Callable[[Task], object]:
+    """
+    Import the handler named by a `module:function` spec.
+
+    Args:
+        spec (str): The module path and the function name, such as "jobs.email:send".
+
+    Returns:
+        Callable[[Task], object]: The handler.
+
+    Raises:
+        ValueError: If the spec is malformed or does not name a callable.
+        ImportError: If the module cannot be imported.
+    """
+    module_name, separator, function_name = spec.partition(":")
+    if not separator or not module_name or not function_name:
+        raise ValueError(f"Handler must be given as module:function, got {spec!r}")
+    handler = getattr(importlib.import_module(module_name), function_name, None)
+    if not callable(handler):
+        raise ValueError(f"{function_name!r} in {module_name!r} is not callable")
+    return handler
+
+
+class WorkerStats:
+    """
+    Counts of the tasks one worker has run.
+
+    Methods:
+        throughput() -> float: Returns the tasks finished per second so far.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize empty counts.
+
+        Args:
+            name (str): The name of the worker.
+        """
+        self.name: str = name
+        self.succeeded: int = 0
+        self.failed: int = 0
+        self.started_at: float = time.monotonic()
+        self.elapsed: float = 0.0
+
+    def throughput(self) -> float:
+        """
+        Returns the tasks finished, successfully or not, per second of running time.
+        """
+        if self.elapsed <= 0:
+            return 0.0
+        return (self.succeeded + self.failed) / self.elapsed
+
+
+class Worker:
+    """
+    Claims tasks in priority order and runs them on a pool of handler threads.
+
+    The claiming loop keeps up to `prefetch` claimed tasks in a local buffer and tops
+    it up whenever it falls to half, so handlers rarely wait on a round trip. The
+    tasks finished by each wait are marked done or failed together. When stopped,
+    the worker lets running handlers finish and sets the tasks it claimed but did
+    not start back to pending.
+
+    Methods:
+        run(stop: Optional[threading.Event], burst: bool) -> WorkerStats:
+            Runs tasks until stopped, or until the queue is empty in burst mode.
+    """
+
+    def __init__(
+        self,
+        service: TaskService,
+        handler: Callable[[Task], object],
+        concurrency: int = 1,
+        prefetch: Optional[int] = None,
+        poll_interval: float = 0.5,
+        name: Optional[str] = None,
+        report_interval: Optional[float] = None,
+        on_report: Optional[Callable[[WorkerStats], None]] = None,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            service (TaskService): The service of the queue to consume.
+            handler (Callable[[Task], object]): Runs one task; an exception marks it failed.
+            concurrency (int): The number of handler threads.
+            prefetch (Optional[int]): The number of claimed tasks kept ready,
+                twice the concurrency by default.
+            poll_interval (float): Seconds to wait before polling an empty queue again.
+            name (Optional[str]): The name reported with the statistics.
+            report_interval (Optional[float]): Seconds between calls to `on_report`.
+            on_report (Optional[Callable[[WorkerStats], None]]): Receives the statistics
+                periodically and once more when the worker stops.
+
+        Raises:
+            ValueError: If the concurrency or prefetch is not positive.
+        """
+        if concurrency < 1 or (prefetch is not None and prefetch < 1):
+            raise ValueError("Concurrency and prefetch must be positive")
+        self.service: TaskService = service
+        self.handler: Callable[[Task], object] = handler
+        self.concurrency: int = concurrency
+        self.prefetch: int = prefetch or 2 * concurrency
+        self.poll_interval: float = poll_interval
+        self.stats: WorkerStats = WorkerStats(name or f"worker-{os.getpid()}")
+        self.report_interval: Optional[float] = report_interval
+        self.on_report: Optional[Callable[[WorkerStats], None]] = on_report
+
+    def run(
+        self, stop: Optional[threading.Event] = None, burst: bool = False
+    ) -> WorkerStats:
+        """
+        Runs tasks until `stop` is set, or until the queue is empty in burst mode.
+
+        Args:
+            stop (Optional[threading.Event]): Set to stop the worker gracefully.
+            burst (bool): Whether to return once no task is left to claim.
+
+        Returns:
+            WorkerStats: The statistics of this run.
+        """
+        stop = stop or threading.Event()
+        buffer: Deque[Task] = deque()
+        running: Dict[Future, Task] = {}
+        next_report = self._next_report()
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix=self.stats.name
+        ) as pool:
+            try:
+                while not stop.is_set():
+                    if len(buffer) <= self.prefetch // 2:
+                        buffer.extend(
+                            self.service.claim_tasks(self.prefetch - len(buffer))
+                        )
+                    while buffer and len(running) < self.concurrency:
+                        task = buffer.popleft()
+                        running[pool.submit(self.handler, task)] = task
+                    if not running:
+                        if burst:
+                            break
+                        stop.wait(self.poll_interval)
+                    else:
+                        done, _ = wait(
+                            running,
+                            timeout=self.poll_interval,
+                            return_when=FIRST_COMPLETED,
+                        )
+                        self._finish(done, running)
+                    if next_report is not None and time.monotonic() >= next_report:
+                        self._report()
+                        next_report = self._next_report()
+            finally:
+                if buffer:
+                    self.service.set_status([task.id for task in buffer], Task.PENDING)
+                self._finish(wait(running).done, running)
+        self._report()
+        return self.stats
+
+    def _finish(self, done: Set[Future], running: Dict[Future, Task]) -> None:
+        """
+        Count finished handler calls and mark their tasks done or failed.
+        """
+        outcomes: Dict[str, List[str]] = {Task.DONE: [], Task.FAILED: []}
+        for future in done:
+            task = running.pop(future)
+            error = future.exception()
+            if error is None:
+                self.stats.succeeded += 1
+                outcomes[Task.DONE].append(task.id)
+            else:
+                self.stats.failed += 1
+                outcomes[Task.FAILED].append(task.id)
+                logger.error("Task handler failed", exc_info=error)
+        for status, task_ids in outcomes.items():
+            if task_ids:
+                self.service.set_status(task_ids, status)
+
+    def _next_report(self) -> Optional[float]:
+        """
+        Return when the next periodic report is due, or None without periodic reports.
+        """
+        if self.on_report is None or not self.report_interval:
+            return None
+        return time.monotonic() + self.report_interval
+
+    def _report(self) -> None:
+        """
+        Update the elapsed time and pass the statistics to `on_report`.
+        """
+        self.stats.elapsed = time.monotonic() - self.stats.started_at
+        if self.on_report is not None:
+            self.on_report(self.stats)
+
+
+def _worker_process(
+    make_service: Callable[[], TaskService],
+    handler_spec: str,
+    name: str,
+    concurrency: int,
+    prefetch: Optional[int],
+    burst: bool,
+    report_interval: Optional[float],
+    stop: threading.Event,
+    reports: "multiprocessing.Queue",
+) -> None:
+    """
+    The entry point of a worker process; statistics are sent back on `reports`.
+    """
+    # The parent turns Ctrl-C into `stop`, so in-flight tasks can finish here.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    worker = Worker(
+        make_service(),
+        load_handler(handler_spec),
+        concurrency=concurrency,
+        prefetch=prefetch,
+        name=name,
+        report_interval=report_interval,
+        on_report=reports.put,
+    )
+    worker.run(stop, burst)
+
+
+def run_worker_processes(
+    make_service: Callable[[], TaskService],
+    handler_spec: str,
+    processes: int = 1,
+    concurrency: int = 1,
+    prefetch: Optional[int] = None,
+    burst: bool = False,
+    report_interval: Optional[float] = None,
+    on_report: Optional[Callable[[WorkerStats], None]] = None,
+) -> List[WorkerStats]:
+    """
+    Run workers in separate processes until interrupted, or until the queue is empty.
+
+    Every process builds its own service, and so its own Redis connections, with
+    `make_service`, which must therefore be a picklable module-level function.
+    SIGINT and SIGTERM stop the workers gracefully.
+
+    Args:
+        make_service (Callable[[], TaskService]): Builds the service of the queue.
+        handler_spec (str): The handler as `module:function`.
+        processes (int): The number of worker processes.
+        concurrency (int): The number of handler threads per process.
+        prefetch (Optional[int]): The number of claimed tasks each process keeps ready.
+        burst (bool): Whether workers exit once the queue is empty.
+        report_interval (Optional[float]): Seconds between periodic reports.
+        on_report (Optional[Callable[[WorkerStats], None]]): Receives each report in
+            the parent process.
+
+    Returns:
+        List[WorkerStats]: The final statistics of each worker, by name.
+
+    Raises:
+        ValueError: If the handler spec is invalid or `processes` is not positive.
+        ImportError: If the handler module cannot be imported.
+    """
+    if processes < 1:
+        raise ValueError("At least one worker process is needed")
+    load_handler(handler_spec)
+    stop = multiprocessing.Event()
+    reports: multiprocessing.Queue = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(
+            target=_worker_process,
+            args=(
+                make_service,
+                handler_spec,
+                f"worker-{index + 1}",
+                concurrency,
+                prefetch,
+                burst,
+                report_interval,
+                stop,
+                reports,
+            ),
+        )
+        for index in range(processes)
+    ]
+    previous_sigterm = signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    latest: Dict[str, WorkerStats] = {}
+    try:
+        for process in workers:
+            process.start()
+        while any(process.is_alive() for process in workers) or not reports.empty():
+            try:
+                stats = reports.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            except KeyboardInterrupt:
+                stop.set()
+                continue
+            latest[stats.name] = stats
+            if on_report is not None:
+                on_report(stats)
+    finally:
+        stop.set()
+        for process in workers:
+            process.join()
+        signal.signal(signal.SIGTERM, previous_sigterm)
+    return [latest[name] for name in sorted(latest)]
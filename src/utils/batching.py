@@ -0,0 +1,26 @@
+"""
+This module provides helpers for processing iterables in fixed-size batches.
+"""
+
+from itertools import islice
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+
+def chunked(iterable: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Split an iterable into lists of at most `size` items.
+
+    Args:
+        iterable (Iterable[T]): The items to split.
+        size (int): The maximum number of items per chunk.
+
+    Yields:
+        List[T]: The next chunk of items.
+    """
+    if size < 1:
+        raise ValueError("Chunk size must be at least 1")
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
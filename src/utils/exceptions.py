@@ -4,6 +4,8 @@ This module defines custom exceptions for the Redis client operations.
 Classes:
     RedisConnectionError: Raised when a Redis connection error occurs.
     RedisOperationError: Raised when a Redis operation error occurs.
+    SnapshotError: Raised when a snapshot file is malformed or corrupted.
+    CircuitOpenError: Raised when a call is rejected by an open circuit breaker.
 """
 
 
@@ -17,3 +19,15 @@ class RedisOperationError(Exception):
     """Raised when a Redis operation error occurs."""
 
     pass
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is malformed or corrupted."""
+
+    pass
+
+
+class CircuitOpenError(RedisConnectionError):
+    """Raised when a call is rejected by an open circuit breaker."""
+
+    pass
@@ -0,0 +1,45 @@
+"""
+This module provides a helper for measuring the memory held by Python objects.
+"""
+
+import sys
+from collections import deque
+from typing import Optional, Set
+
+
+def deep_sizeof(obj: object, seen: Optional[Set[int]] = None) -> int:
+    """
+    Estimate the bytes held by an object and everything it references.
+
+    Containers, instance attributes and pydantic fields are followed; each object
+    is counted once, and objects whose id is already in `seen` are skipped, which
+    lets several calls share the cost of common objects.
+
+    Args:
+        obj (object): The object to measure.
+        seen (Optional[Set[int]]): The ids of objects already counted; updated in place.
+
+    Returns:
+        int: The estimated size in bytes.
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    pending = [obj]
+    while pending:
+        current = pending.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+        if isinstance(current, dict):
+            pending.extend(current.keys())
+            pending.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset, deque)):
+            pending.extend(current)
+        elif not isinstance(current, (str, bytes, int, float, bool, type(None))):
+            if isinstance(getattr(current, "__dict__", None), dict):
+                pending.append(current.__dict__)
+            fields_set = getattr(current, "__pydantic_fields_set__", None)
+            if fields_set is not None:
+                pending.append(fields_set)
+    return size
@@ -0,0 +1,113 @@
+"""
+This module provides the tokenizer and query parser of the full-text task search.
+
+A query is a list of clauses joined by the `OR` keyword; a task matches a clause when
+it contains every term of the clause. A term ending with `*` matches any token it
+prefixes.
+
+Tokens are runs of ASCII letters and digits and of non-ASCII characters, with ASCII
+lowercased. The Redis Lua scripts split stored names and descriptions with the same
+byte-level rule, so both sides always agree on which index sets a task belongs to.
+"""
+
+import re
+from typing import Iterable, List, Set
+
+_TOKEN = re.compile(rb"[a-z0-9\x80-\xff]+")
+
+PREFIX_MARK = "*"
+
+
+def tokenize(text: str) -> Set[str]:
+    """
+    Split text into its distinct search tokens.
+
+    Args:
+        text (str): The text to split.
+
+    Returns:
+        Set[str]: The tokens, see the module documentation.
+    """
+    return set(_split(text))
+
+
+def task_tokens(name: str, description: str) -> Set[str]:
+    """
+    Return the tokens a task is indexed under.
+
+    Args:
+        name (str): The name of the task.
+        description (str): The description of the task.
+
+    Returns:
+        Set[str]: The tokens of the name and description.
+    """
+    return tokenize(f"{name} {description}")
+
+
+def parse_query(query: str) -> List[List[str]]:
+    """
+    Parse a search query into clauses of terms.
+
+    Words are split into tokens like indexed text, so "on-call" requires both "on"
+    and "call". A trailing `*` makes the last token of a word a prefix term.
+
+    Args:
+        query (str): The query, such as "deploy api*" or "refund OR chargeback".
+
+    Returns:
+        List[List[str]]: The clauses; each term is a token, or a token followed by
+            `*` for a prefix term.
+
+    Raises:
+        ValueError: If the query contains no searchable term.
+    """
+    clauses: List[List[str]] = [[]]
+    for word in query.split():
+        if word == "OR":
+            clauses.append([])
+            continue
+        if word == "AND":
+            continue
+        tokens = _split(word)
+        if tokens and word.endswith(PREFIX_MARK):
+            tokens[-1] += PREFIX_MARK
+        for token in tokens:
+            if token not in clauses[-1]:
+                clauses[-1].append(token)
+    clauses = [clause for clause in clauses if clause]
+    if not clauses:
+        raise ValueError("The search query contains no searchable term")
+    return clauses
+
+
+def _split(text: str) -> List[str]:
+    """
+    Split text into its search tokens, in order and with repetitions.
+    """
+    # bytes.lower() only folds ASCII, exactly like string.lower in Redis Lua.
+    return [
+        token.decode("utf-8") for token in _TOKEN.findall(text.encode("utf-8").lower())
+    ]
+
+
+def matches(clauses: List[List[str]], tokens: Iterable[str]) -> bool:
+    """
+    Tell whether a task's tokens satisfy a parsed query.
+
+    Args:
+        clauses (List[List[str]]): The parsed query, see parse_query().
+        tokens (Iterable[str]): The tokens of the task.
+
+    Returns:
+        bool: True if every term of at least one clause matches a token.
+    """
+    tokens = set(tokens)
+
+    def term_matches(term: str) -> bool:
+        if term.endswith(PREFIX_MARK):
+            prefix = term[: -len(PREFIX_MARK)]
+            return any(token.startswith(prefix) for token in tokens)
+        return term in tokens
+
+    return any(all(term_matches(term) for term in clause) for clause in clauses)
@@ -0,0 +1,155 @@
+"""
+Unit tests for CachedTaskRepository in front of a FakeTaskRepository.
+
+Tests:
+- test_lru_and_ttl: Verifies tasks are evicted least recently used first and expire.
+- test_writes_through_the_cache: Verifies local writes update the cache at once.
+- test_bounded_staleness: Verifies changes made elsewhere are seen within the window.
+- test_reset_when_behind: Verifies the cache is cleared when too many events wait.
+- test_racing_fill_is_dropped: Verifies a read racing a write does not cache the old task.
+"""
+
+import unittest
+
+from src.repositories.cached_repository import CachedTaskRepository
+from src.repositories.fake_repository import FakeTaskRepository
+from src.services.task_service import TaskService
+
+
+class FakeClock:
+    """
+    A clock that only moves when told to.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCachedTaskRepository(unittest.TestCase):
+    """
+    TestCachedTaskRepository contains unit tests for the task cache.
+
+    Methods:
+        setUp() -> None:
+            Sets up a cached service and a direct one over the same store.
+        test_lru_and_ttl() -> None:
+            Verifies tasks are evicted least recently used first and expire.
+        test_writes_through_the_cache() -> None:
+            Verifies local writes update the cache at once.
+        test_bounded_staleness() -> None:
+            Verifies changes made elsewhere are seen within the window.
+        test_reset_when_behind() -> None:
+            Verifies the cache is cleared when too many events wait.
+        test_racing_fill_is_dropped() -> None:
+            Verifies a read racing a write does not cache the old task.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a cache of three tasks and a service writing around it.
+        """
+        self.clock = FakeClock()
+        self.store = FakeTaskRepository()
+        self.cache = CachedTaskRepository(
+            self.store, max_size=3, ttl=60.0, max_staleness=1.0, clock=self.clock
+        )
+        self.service = TaskService(self.cache)
+        self.other = TaskService(self.store)
+        self.ids = [
+            self.other.add_task(f"task {index}", 5, "").id for index in range(5)
+        ]
+
+    def test_lru_and_ttl(self) -> None:
+        """
+        Test case for the size and age limits of the cache.
+        """
+        for task_id in self.ids[:3]:
+            self.service.get_task(task_id)
+        self.service.get_task(self.ids[0])
+        self.service.get_task(self.ids[3])
+        self.assertEqual(
+            list(self.cache._entries), [self.ids[2], self.ids[0], self.ids[3]]
+        )
+
+        tasks = self.service.get_tasks([self.ids[3], "missing", self.ids[0]])
+        self.assertEqual([task.id for task in tasks], [self.ids[3], self.ids[0]])
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (3, 5))
+        self.assertEqual((stats["evictions"], stats["size"]), (1, 3))
+
+        self.clock.now = 61.0
+        self.service.get_task(self.ids[0])
+        self.assertEqual(self.cache.stats()["expirations"], 1)
+
+    def test_writes_through_the_cache(self) -> None:
+        """
+        Test case for writes made through the cached repository.
+        """
+        task = self.service.get_task(self.ids[0])
+        task.name = "changed by the caller"
+        task.tags.append("changed")
+        cached = self.service.get_task(self.ids[0])
+        self.assertEqual((cached.name, cached.tags), ("task 0", []))
+
+        self.service.update_task(self.ids[0], name="renamed")
+        self.assertEqual(self.service.get_task(self.ids[0]).name, "renamed")
+        [claimed] = self.service.claim_tasks(1)
+        self.assertEqual(self.service.get_task(claimed.id).status, "running")
+        self.service.delete_task(self.ids[0])
+        self.assertIsNone(self.service.get_task(self.ids[0]))
+        self.assertEqual(self.cache.stats()["hits"], 4)
+
+    def test_bounded_staleness(self) -> None:
+        """
+        Test case for changes made around the cache, seen once the window has passed.
+        """
+        self.service.get_tasks(self.ids[:2])
+        self.other.update_task(self.ids[0], name="renamed")
+        self.other.delete_task(self.ids[1])
+        self.assertEqual(self.service.get_task(self.ids[0]).name, "task 0")
+        self.assertIsNotNone(self.service.get_task(self.ids[1]))
+
+        self.clock.now = 1.0
+        self.assertEqual(self.service.get_task(self.ids[0]).name, "renamed")
+        self.assertIsNone(self.service.get_task(self.ids[1]))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["invalidations"]), (3, 1))
+
+    def test_reset_when_behind(self) -> None:
+        """
+        Test case for more waiting events than a sync reads.
+        """
+        cache = CachedTaskRepository(self.store, sync_batch=2, clock=self.clock)
+        cache.get_many(self.ids)
+        self.other.update_task(self.ids[0], priority=9)
+        cache.sync()
+        self.assertEqual((cache.stats()["resets"], cache.stats()["size"]), (0, 5))
+        self.assertEqual(cache.get_by_id(self.ids[0]).priority, 9)
+        for task_id in self.ids[:2]:
+            self.other.update_task(task_id, priority=8)
+        cache.sync()
+        self.assertEqual((cache.stats()["resets"], cache.stats()["size"]), (1, 0))
+        self.assertEqual(cache.get_by_id(self.ids[0]).priority, 8)
+
+    def test_racing_fill_is_dropped(self) -> None:
+        """
+        Test case for a task fetched before a write and returned after it.
+        """
+        fetch = self.store.get_by_id
+
+        def fetch_then_write(task_id):
+            task = fetch(task_id).model_copy()
+            self.cache.update(task.model_copy(update={"name": "written meanwhile"}))
+            return task
+
+        self.store.get_by_id = fetch_then_write
+        self.assertEqual(self.service.get_task(self.ids[0]).name, "task 0")
+        del self.store.get_by_id
+        self.assertEqual(self.service.get_task(self.ids[0]).name, "written meanwhile")
+
+
+if __name__ == "__main__":
+    unittest.main()
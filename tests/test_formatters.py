@@ -0,0 +1,136 @@
+"""
+Unit tests for the streaming task formatters used by the listing commands.
+
+Tests:
+- test_json_output: Verifies JSON output is a valid array of all tasks.
+- test_ndjson_output: Verifies NDJSON output has one JSON document per task.
+- test_csv_output: Verifies CSV output has a header row and one row per task.
+- test_table_output: Verifies table output has a header and one line per task.
+- test_empty_output: Verifies empty listings still produce valid documents.
+- test_row_output: Verifies rows other than tasks are written with their own fields.
+"""
+
+import csv
+import io
+import json
+import unittest
+
+from src.cli.formatters import write_rows, write_tasks
+from src.entities.task import Task
+
+
+class TestFormatters(unittest.TestCase):
+    """
+    TestFormatters contains unit tests for write_tasks.
+
+    Methods:
+        setUp() -> None:
+            Creates the tasks written by each test.
+        test_json_output() -> None:
+            Verifies JSON output is a valid array of all tasks.
+        test_ndjson_output() -> None:
+            Verifies NDJSON output has one JSON document per task.
+        test_csv_output() -> None:
+            Verifies CSV output has a header row and one row per task.
+        test_table_output() -> None:
+            Verifies table output has a header and one line per task.
+        test_empty_output() -> None:
+            Verifies empty listings still produce valid documents.
+        test_row_output() -> None:
+            Verifies rows other than tasks are written with their own fields.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create the tasks written by each test.
+        """
+        self.tasks: list[Task] = [
+            Task(name=f"Task {index}", priority=3, description='Say "hi", then go')
+            for index in range(3)
+        ]
+
+    def render(self, output_format: str, tasks: list[Task]) -> str:
+        """
+        Write tasks in a format and return the decoded output.
+        """
+        stream = io.BytesIO()
+        count = write_tasks(iter(tasks), output_format, stream)
+        self.assertEqual(count, len(tasks))
+        return stream.getvalue().decode("utf-8")
+
+    def test_json_output(self) -> None:
+        """
+        Test case for JSON output.
+        """
+        documents = json.loads(self.render("json", self.tasks))
+        self.assertEqual([Task.model_validate(doc) for doc in documents], self.tasks)
+
+    def test_ndjson_output(self) -> None:
+        """
+        Test case for NDJSON output.
+        """
+        lines = self.render("ndjson", self.tasks).splitlines()
+        self.assertEqual([Task.model_validate_json(line) for line in lines], self.tasks)
+
+    def test_csv_output(self) -> None:
+        """
+        Test case for CSV output.
+        """
+        rows = list(csv.DictReader(io.StringIO(self.render("csv", self.tasks))))
+        self.assertEqual([row["id"] for row in rows], [task.id for task in self.tasks])
+        self.assertEqual(rows[0]["description"], 'Say "hi", then go')
+
+    def test_table_output(self) -> None:
+        """
+        Test case for table output.
+        """
+        lines = self.render("table", self.tasks).splitlines()
+        self.assertTrue(lines[0].startswith("ID"))
+        self.assertEqual(len(lines), len(self.tasks) + 2)
+
+    def test_empty_output(self) -> None:
+        """
+        Test case for listings without tasks.
+        """
+        self.assertEqual(json.loads(self.render("json", [])), [])
+        self.assertEqual(self.render("csv", []).splitlines()[0].split(",")[0], "id")
+        self.assertEqual(self.render("ndjson", []), "")
+
+    def test_row_output(self) -> None:
+        """
+        Test case for queue counts written in each format.
+        """
+        rows = [
+            {"queue": "default", "queued": 3, "delayed": 0},
+            {"queue": "payments", "queued": 12, "delayed": 2},
+        ]
+
+        def render(output_format: str) -> str:
+            stream = io.BytesIO()
+            count = write_rows(
+                iter(rows),
+                output_format,
+                ["queue", "queued", "delayed"],
+                lambda row: f"{row['queue']}={row['queued']}",
+                stream,
+            )
+            self.assertEqual(count, len(rows))
+            return stream.getvalue().decode("utf-8")
+
+        self.assertEqual(json.loads(render("json")), rows)
+        self.assertEqual(render("text"), "default=3\npayments=12\n")
+        self.assertEqual(
+            list(csv.reader(io.StringIO(render("csv")))),
+            [
+                ["queue", "queued", "delayed"],
+                ["default", "3", "0"],
+                ["payments", "12", "2"],
+            ],
+        )
+        self.assertEqual(
+            render("table").splitlines()[0].split(), ["QUEUE", "QUEUED", "DELAYED"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
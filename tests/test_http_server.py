@@ -0,0 +1,169 @@
+"""
+Unit tests for the HTTP API server using a FakeTaskRepository.
+
+Tests:
+- test_task_crud: Verifies tasks are added, fetched, updated and deleted.
+- test_bulk_add_list_and_claim: Verifies bulk adds, listings, claims and status changes.
+- test_errors: Verifies invalid requests are answered with an error status.
+- test_pipelined_requests: Verifies pipelined requests are answered in order.
+"""
+
+import asyncio
+import http.client
+import json
+import socket
+import threading
+import unittest
+from typing import Any, Optional, Tuple
+
+from src.repositories.fake_repository import FakeTaskRepository
+from src.services.http_server import TaskHttpServer
+from src.services.task_service import TaskService
+
+
+class TestTaskHttpServer(unittest.TestCase):
+    """
+    TestTaskHttpServer contains unit tests for the HTTP API server.
+
+    Methods:
+        setUp() -> None:
+            Starts a server over a FakeTaskRepository on a background event loop.
+        tearDown() -> None:
+            Stops the server and its event loop.
+        request(method: str, path: str, body: Any) -> Tuple[int, Any]:
+            Sends a request on the shared keep-alive connection.
+        test_task_crud() -> None:
+            Verifies tasks are added, fetched, updated and deleted.
+        test_bulk_add_list_and_claim() -> None:
+            Verifies bulk adds, listings, claims and status changes.
+        test_errors() -> None:
+            Verifies invalid requests are answered with an error status.
+        test_pipelined_requests() -> None:
+            Verifies pipelined requests are answered in order.
+    """
+
+    def setUp(self) -> None:
+        """
+        Start a server on a free port and open a keep-alive connection to it.
+        """
+        self.service = TaskService(FakeTaskRepository())
+        self.server = TaskHttpServer(self.service, port=0, threads=2)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self.loop).result(5)
+        self.connection = http.client.HTTPConnection(
+            "127.0.0.1", self.server.port, timeout=5
+        )
+
+    def tearDown(self) -> None:
+        """
+        Close the connection, the server and the event loop.
+        """
+        self.connection.close()
+        asyncio.run_coroutine_threadsafe(self.server.close(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+        self.loop.close()
+
+    def request(
+        self, method: str, path: str, body: Optional[Any] = None
+    ) -> Tuple[int, Any]:
+        """
+        Send a request and return the status and decoded body of the response.
+        """
+        data = None if body is None else json.dumps(body)
+        self.connection.request(method, path, body=data)
+        response = self.connection.getresponse()
+        payload = response.read()
+        return response.status, json.loads(payload) if payload else None
+
+    def test_task_crud(self) -> None:
+        """
+        Test case for the single-task endpoints over one connection.
+        """
+        status, task = self.request(
+            "POST", "/tasks", {"name": "Deploy", "priority": 7, "tags": ["ops"]}
+        )
+        self.assertEqual(status, 201)
+        self.assertEqual((task["name"], task["priority"]), ("Deploy", 7))
+        self.assertEqual(self.request("GET", f"/tasks/{task['id']}"), (200, task))
+
+        status, updated = self.request(
+            "PATCH", f"/tasks/{task['id']}", {"priority": 9, "description": "Now"}
+        )
+        self.assertEqual((status, updated["priority"]), (200, 9))
+        self.assertEqual(self.service.get_task(task["id"]).description, "Now")
+
+        self.assertEqual(self.request("DELETE", f"/tasks/{task['id']}"), (204, None))
+        self.assertEqual(self.request("GET", f"/tasks/{task['id']}")[0], 404)
+        self.assertEqual(self.request("DELETE", f"/tasks/{task['id']}")[0], 404)
+
+    def test_bulk_add_list_and_claim(self) -> None:
+        """
+        Test case for adding many tasks, paging through them, claiming and finishing them.
+        """
+        specs = [{"name": f"task {p}", "priority": p} for p in range(1, 6)]
+        status, body = self.request("POST", "/tasks/bulk", {"tasks": specs})
+        self.assertEqual((status, len(body["tasks"])), (201, 5))
+
+        status, page = self.request("GET", "/tasks?min_priority=2&limit=3")
+        self.assertEqual([t["priority"] for t in page["tasks"]], [2, 3, 4])
+        self.assertEqual(page["next_offset"], 3)
+        _, page = self.request("GET", "/tasks?min_priority=2&limit=3&offset=3")
+        self.assertEqual(
+            ([t["priority"] for t in page["tasks"]], page["next_offset"]), ([5], None)
+        )
+
+        status, claimed = self.request("POST", "/claim?count=2")
+        self.assertEqual([t["priority"] for t in claimed["tasks"]], [5, 4])
+        self.assertEqual(len(self.service.get_all_tasks()), 3)
+
+        path = f"/tasks/{claimed['tasks'][0]['id']}/status"
+        status, task = self.request("POST", path, {"status": "done"})
+        self.assertEqual((status, task["status"]), (200, "done"))
+        self.assertEqual(self.request("POST", path, {"status": "running"})[0], 409)
+        self.assertEqual(self.request("POST", path, {"status": "lost"})[0], 400)
+
+    def test_errors(self) -> None:
+        """
+        Test case for rejected requests, which keep the connection usable.
+        """
+        self.assertEqual(
+            self.request("POST", "/tasks", {"name": "x", "priority": 11})[0], 400
+        )
+        self.assertEqual(self.request("POST", "/tasks", {"name": "x"})[0], 400)
+        status, error = self.request(
+            "POST", "/tasks", {"name": "x", "priority": 1, "owner": "me"}
+        )
+        self.assertEqual((status, error), (400, {"error": "Unknown fields: owner"}))
+        self.assertEqual(self.request("GET", "/tasks?limit=0")[0], 400)
+        self.assertEqual(self.request("GET", "/nowhere")[0], 404)
+        self.assertEqual(self.service.get_all_tasks(), [])
+        self.assertEqual(
+            self.request("POST", "/tasks", {"name": "ok", "priority": 1})[0], 201
+        )
+
+    def test_pipelined_requests(self) -> None:
+        """
+        Test case for several requests written before any response is read.
+        """
+        requests = b"".join(
+            b"POST /tasks HTTP/1.1\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)
+            for body in (
+                json.dumps({"name": f"task {p}", "priority": p}).encode()
+                for p in (1, 2, 3)
+            )
+        )
+        with socket.create_connection(("127.0.0.1", self.server.port), 5) as client:
+            client.sendall(
+                requests + b"GET /tasks HTTP/1.1\r\nConnection: close\r\n\r\n"
+            )
+            data = b""
+            while chunk := client.recv(65536):
+                data += chunk
+        self.assertEqual(data.count(b"HTTP/1.1 201 Created"), 3)
+        listing = json.loads(data.rsplit(b"\r\n\r\n", 1)[1])
+        self.assertEqual(
+            [t["name"] for t in listing["tasks"]], ["task 1", "task 2", "task 3"]
+        )
@@ -0,0 +1,103 @@
+"""
+Unit tests for the task ID generators.
+
+Tests:
+- test_ulid: Verifies ULIDs are compact, strictly increasing and carry their creation time.
+- test_snowflake: Verifies snowflake IDs are compact, strictly increasing and carry their
+  creation time.
+- test_uuid_ids_carry_no_time: Verifies uuid4 IDs keep working without a timestamp.
+- test_configure_ids: Verifies new tasks use the configured generator.
+"""
+
+import time
+import unittest
+
+from src.entities.ids import (
+    SnowflakeGenerator,
+    UlidGenerator,
+    UuidGenerator,
+    configure_ids,
+    id_timestamp,
+)
+from src.entities.task import Task
+
+
+class TestIds(unittest.TestCase):
+    """
+    TestIds contains unit tests for the task ID generators.
+
+    Methods:
+        tearDown() -> None:
+            Restores the default ID generator.
+        test_ulid() -> None:
+            Verifies ULIDs are compact, strictly increasing and carry their creation time.
+        test_snowflake() -> None:
+            Verifies snowflake IDs are compact, strictly increasing and carry their
+            creation time.
+        test_uuid_ids_carry_no_time() -> None:
+            Verifies uuid4 IDs keep working without a timestamp.
+        test_configure_ids() -> None:
+            Verifies new tasks use the configured generator.
+    """
+
+    def tearDown(self) -> None:
+        """
+        Restore the default ID generator.
+        """
+        configure_ids("uuid4")
+
+    def assert_time_ordered(self, ids: list, length: int, started: float) -> None:
+        """
+        Check the length, strict ordering and embedded time of generated IDs.
+        """
+        self.assertTrue(all(len(task_id) == length for task_id in ids))
+        self.assertEqual(ids, sorted(set(ids)))
+        self.assertAlmostEqual(id_timestamp(ids[0]), started, delta=1.0)
+
+    def test_ulid(self) -> None:
+        """
+        Test case for ULID generation.
+        """
+        started = time.time()
+        generator = UlidGenerator()
+        self.assert_time_ordered([generator.new_id() for _ in range(5000)], 26, started)
+
+    def test_snowflake(self) -> None:
+        """
+        Test case for snowflake ID generation, including sequence overflow.
+        """
+        started = time.time()
+        generator = SnowflakeGenerator(worker_id=7)
+        self.assert_time_ordered(
+            [generator.new_id() for _ in range(10000)], 13, started
+        )
+        with self.assertRaises(ValueError):
+            SnowflakeGenerator(worker_id=1024)
+
+    def test_uuid_ids_carry_no_time(self) -> None:
+        """
+        Test case for uuid4 IDs, which have no embedded time.
+        """
+        task_id = UuidGenerator().new_id()
+        self.assertEqual(len(task_id), 36)
+        self.assertIsNone(id_timestamp(task_id))
+
+    def test_configure_ids(self) -> None:
+        """
+        Test case for selecting the generator of new task IDs.
+        """
+        configure_ids("ulid")
+        first = Task(name="First", priority=1, description="D")
+        second = Task(name="Second", priority=1, description="D")
+        self.assertEqual(len(first.id), 26)
+        self.assertLess(first.id, second.id)
+        with self.assertRaises(ValueError):
+            configure_ids("guid")
+        with self.assertRaises(ValueError):
+            configure_ids("snowflake")
+        configure_ids("snowflake", worker_id=3)
+        self.assertEqual(len(Task(name="Third", priority=1, description="D").id), 13)
+
+
+if __name__ == "__main__":
+    unittest.main()
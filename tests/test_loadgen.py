@@ -0,0 +1,123 @@
+"""
+Unit tests for the load generator using a FakeTaskRepository.
+
+Tests:
+- test_parse_mix: Verifies operation mixes are normalized and validated.
+- test_latency_histogram: Verifies percentiles are within the bucket error and merge.
+- test_closed_loop: Verifies every operation of the mix runs and windows are reported.
+- test_open_loop: Verifies the offered rate is followed.
+"""
+
+import math
+import random
+import unittest
+
+from src.repositories.fake_repository import FakeTaskRepository
+from src.services.loadgen import (
+    GROWTH,
+    OPERATIONS,
+    LatencyHistogram,
+    parse_mix,
+    run_load,
+)
+from src.services.task_service import TaskService
+
+
+class TestLoadGenerator(unittest.TestCase):
+    """
+    TestLoadGenerator contains unit tests for the load generator.
+
+    Methods:
+        setUp() -> None:
+            Sets up a TaskService over a FakeTaskRepository.
+        test_parse_mix() -> None:
+            Verifies operation mixes are normalized and validated.
+        test_latency_histogram() -> None:
+            Verifies percentiles are within the bucket error and merge.
+        test_closed_loop() -> None:
+            Verifies every operation of the mix runs and windows are reported.
+        test_open_loop() -> None:
+            Verifies the offered rate is followed.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up the service the load is run against.
+        """
+        self.repository = FakeTaskRepository()
+        self.service = TaskService(self.repository)
+
+    def test_parse_mix(self) -> None:
+        """
+        Test case for parsing operation weights.
+        """
+        self.assertEqual(parse_mix("add=3, claim=1"), {"add": 0.75, "claim": 0.25})
+        self.assertEqual(parse_mix("list,delete=0"), {"list": 1.0})
+        for spec in ("add=1,push=1", "add=x", "add=-1", "add=0", ""):
+            with self.assertRaises(ValueError, msg=spec):
+                parse_mix(spec)
+
+    def test_latency_histogram(self) -> None:
+        """
+        Test case for percentiles read from merged histograms.
+        """
+        rng = random.Random(7)
+        samples = sorted(rng.lognormvariate(-7, 1) for _ in range(10000))
+        first, second = LatencyHistogram(), LatencyHistogram()
+        for index, sample in enumerate(samples):
+            (first if index % 2 else second).record(sample)
+        first.merge(second)
+        self.assertEqual((first.count, first.max), (10000, samples[-1]))
+        for fraction in (0.5, 0.95, 0.99, 0.999):
+            exact = samples[math.ceil(fraction * len(samples)) - 1]
+            self.assertLessEqual(
+                abs(first.percentile(fraction) / exact - 1), math.sqrt(GROWTH) - 1
+            )
+        self.assertEqual(LatencyHistogram().percentile(0.5), 0.0)
+
+    def test_closed_loop(self) -> None:
+        """
+        Test case for a short closed-loop run over every operation.
+        """
+        windows = []
+        total = run_load(
+            lambda: self.service,
+            parse_mix(",".join(OPERATIONS)),
+            duration=0.5,
+            clients=4,
+            interval=0.2,
+            preload=100,
+            seed=1,
+            on_window=windows.append,
+        )
+        self.assertEqual([window.index for window in windows], [0, 1, 2])
+        summary = total.summary()
+        self.assertEqual(summary["ops"], sum(w.summary()["ops"] for w in windows))
+        self.assertEqual(summary["errors"], 0)
+        self.assertEqual(set(summary["operations"]), set(OPERATIONS))
+        self.assertAlmostEqual(total.elapsed, 0.5, delta=0.1)
+        self.assertLessEqual(summary["p50"], summary["p99"])
+        self.assertTrue(self.repository.tag_index["loadgen"])
+        with self.assertRaises(ValueError):
+            run_load(lambda: self.service, {"add": 1.0}, duration=0)
+
+    def test_open_loop(self) -> None:
+        """
+        Test case for a run offering a fixed rate of operations.
+        """
+        total = run_load(
+            lambda: self.service,
+            {"add": 1.0},
+            duration=1.0,
+            clients=2,
+            rate=100,
+            interval=1.0,
+            preload=0,
+            seed=1,
+        )
+        self.assertGreater(total.summary()["ops"], 60)
+        self.assertLess(total.summary()["ops"], 140)
+
+
+if __name__ == "__main__":
+    unittest.main()
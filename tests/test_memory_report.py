@@ -0,0 +1,67 @@
+"""
+Unit tests for the memory report using a FakeTaskRepository.
+
+Tests:
+- test_estimate_total: Verifies sampled sizes are extrapolated with a confidence interval.
+- test_memory_report: Verifies the report covers every structure and projects a target.
+"""
+
+import unittest
+
+from src.repositories.fake_repository import FakeTaskRepository
+from src.services.memory_report import estimate_total
+from src.services.task_service import TaskService
+
+
+class TestMemoryReport(unittest.TestCase):
+    """
+    TestMemoryReport contains unit tests for the memory report.
+
+    Methods:
+        test_estimate_total() -> None:
+            Verifies sampled sizes are extrapolated with a confidence interval.
+        test_memory_report() -> None:
+            Verifies the report covers every structure and projects a target.
+    """
+
+    def test_estimate_total(self) -> None:
+        """
+        Test case for extrapolating a sample to the size of its group.
+        """
+        self.assertEqual(estimate_total([], 10), (0.0, 0.0))
+        self.assertEqual(estimate_total([10, 20, 30], 3), (60.0, 0.0))
+        total, margin = estimate_total([10, 20, 30], 300)
+        self.assertEqual(total, 6000.0)
+        self.assertAlmostEqual(margin, 1.96 * 300 * 10 / 3**0.5 * (297 / 299) ** 0.5)
+        self.assertLess(estimate_total([10, 20, 30], 4)[1], margin)
+
+    def test_memory_report(self) -> None:
+        """
+        Test case for a sampled report and projection over an in-memory store.
+        """
+        service = TaskService(FakeTaskRepository())
+        for index in range(200):
+            service.add_task(f"task {index}", index % 10 + 1, "x" * index, tags=["a"])
+
+        report = service.memory_report(sample_size=50, target_tasks=1000)
+        rows = {row["name"]: row for row in report["rows"]}
+        self.assertEqual((report["tasks"], rows["task hashes"]["count"]), (200, 200))
+        self.assertEqual(rows["task hashes"]["sampled"], 50)
+        self.assertGreater(rows["task hashes"]["margin"], 0)
+        self.assertTrue({"priority index", "tag index", "change feed"} <= set(rows))
+        self.assertAlmostEqual(
+            report["total"], sum(row["total"] for row in report["rows"])
+        )
+
+        mix, python = report["projections"]
+        self.assertEqual((mix["encoding"], python["encoding"]), ("mix", "python"))
+        self.assertAlmostEqual(
+            mix["total"], mix["per_task"] * 1000 + rows["change feed"]["total"]
+        )
+        self.assertGreater(mix["total"], report["total"])
+        with self.assertRaises(ValueError):
+            service.memory_report(sample_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
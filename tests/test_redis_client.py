@@ -0,0 +1,112 @@
+"""
+Unit tests for RedisClient read routing, using stand-in connections.
+
+Tests:
+- test_reads_without_replicas_use_primary: Verifies reads fall back to the primary.
+- test_round_robin: Verifies reads rotate over the replicas.
+- test_least_latency: Verifies reads go to the fastest replica.
+- test_read_your_writes: Verifies reads stay on the primary right after a write.
+- test_parse_address: Verifies replica addresses are parsed and validated.
+"""
+
+import unittest
+from unittest import mock
+
+from src.adapters.redis_client import RedisClient, parse_address
+
+
+class StubConnection:
+    """
+    Stands in for a redis.Redis connection.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def ping(self) -> bool:
+        return True
+
+
+class TestRedisClient(unittest.TestCase):
+    """
+    TestRedisClient contains unit tests for RedisClient read routing.
+
+    Methods:
+        make_client(**kwargs) -> RedisClient:
+            Builds a RedisClient wired to stub connections.
+        test_reads_without_replicas_use_primary() -> None:
+            Verifies reads fall back to the primary.
+        test_round_robin() -> None:
+            Verifies reads rotate over the replicas.
+        test_least_latency() -> None:
+            Verifies reads go to the fastest replica.
+        test_read_your_writes() -> None:
+            Verifies reads stay on the primary right after a write.
+        test_parse_address() -> None:
+            Verifies replica addresses are parsed and validated.
+    """
+
+    def make_client(self, replicas: int = 2, **kwargs) -> RedisClient:
+        """
+        Build a RedisClient wired to a stub primary and stub replicas.
+        """
+        client = RedisClient(**kwargs)
+        client.client = StubConnection("primary")
+        client.replica_clients = [
+            StubConnection(f"replica-{index}") for index in range(replicas)
+        ]
+        client._latencies = [0.0] * replicas
+        return client
+
+    def test_reads_without_replicas_use_primary(self) -> None:
+        """
+        Test case for sending reads to the primary when there is no replica.
+        """
+        client = self.make_client(replicas=0)
+        self.assertEqual(client.get_read_client().name, "primary")
+
+    def test_round_robin(self) -> None:
+        """
+        Test case for rotating reads over the replicas.
+        """
+        client = self.make_client()
+        names = [client.get_read_client().name for _ in range(4)]
+        self.assertEqual(names, ["replica-0", "replica-1", "replica-0", "replica-1"])
+        self.assertEqual(client.get_client().name, "primary")
+
+    def test_least_latency(self) -> None:
+        """
+        Test case for sending reads to the replica with the lowest latency.
+        """
+        client = self.make_client(read_strategy="least-latency", latency_interval=60)
+        with mock.patch.object(client, "_measure_latencies"):
+            client._latencies = [0.02, 0.005]
+            client._latencies_measured_at = float("inf")
+            self.assertEqual(client.get_read_client().name, "replica-1")
+            self.assertEqual(client.get_read_client().name, "replica-1")
+
+    def test_read_your_writes(self) -> None:
+        """
+        Test case for pinning reads to the primary during the read-your-writes window.
+        """
+        client = self.make_client(read_your_writes=30)
+        self.assertTrue(client.get_read_client().name.startswith("replica"))
+        client.record_write()
+        self.assertEqual(client.get_read_client().name, "primary")
+        client._last_write -= 31
+        self.assertTrue(client.get_read_client().name.startswith("replica"))
+
+    def test_parse_address(self) -> None:
+        """
+        Test case for parsing host:port replica addresses.
+        """
+        self.assertEqual(parse_address("10.0.0.2:6380"), ("10.0.0.2", 6380))
+        self.assertEqual(parse_address("replica"), ("replica", 6379))
+        with self.assertRaises(ValueError):
+            parse_address("replica:port")
+        with self.assertRaises(ValueError):
+            RedisClient(read_strategy="random")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+"""
+Unit tests for RedisTaskRepository using an in-process stub of the Redis client.
+
+Tests:
+- test_iter_by_priority_with_tied_scores: Verifies score-cursor paging returns every
+  task exactly once when many index entries share a score.
+- test_iter_by_priority_range: Verifies paging stops at the end of the priority range.
+- test_get_many: Verifies batches fetched by a thread pool come back in ID order.
+- test_read_group_events: Verifies the consumer group is created on the change feed
+  once before events are read and acknowledged.
+"""
+
+import unittest
+from typing import Optional
+
+import redis
+
+from src.entities.task import Task
+from src.entities.task_event import TaskEventType
+from src.repositories.redis_repository import RedisTaskRepository
+
+
+class StubPipeline:
+    """
+    A non-transactional pipeline that queues HGETALL calls against a StubRedis.
+    """
+
+    def __init__(self, redis: "StubRedis"):
+        self.redis = redis
+        self.keys: list[bytes] = []
+
+    def hgetall(self, key) -> None:
+        self.keys.append(key if isinstance(key, bytes) else key.encode("utf-8"))
+
+    def execute(self) -> list[dict]:
+        return [self.redis.hashes.get(key, {}) for key in self.keys]
+
+
+class StubRedis:
+    """
+    The subset of the redis.Redis API used by RedisTaskRepository.iter_by_priority.
+    """
+
+    def __init__(self) -> None:
+        self.hashes: dict[bytes, dict] = {}
+        self.index: list[tuple[float, bytes]] = []
+        self.groups: dict[tuple[str, str], list] = {}  # [next entry, pending]
+        self.entries: dict[str, list] = {}
+
+    def add(self, task: Task, score: Optional[float] = None) -> None:
+        key = f"task:{task.id}".encode("utf-8")
+        self.hashes[key] = {
+            field.encode("utf-8"): str(value).encode("utf-8")
+            for field, value in task.model_dump().items()
+            if value is not None
+        }
+        self.index.append(
+            (task.priority + task.timestamp / 1e10 if score is None else score, key)
+        )
+        self.index.sort()
+
+    def zrangebyscore(self, name, min, max, start, num, withscores):
+        def above_min(score: float) -> bool:
+            return score >= float(min)
+
+        def below_max(score: float) -> bool:
+            if isinstance(max, str) and max.startswith("("):
+                return score < float(max[1:])
+            return score <= float(max)
+
+        matches = [
+            (key, score)
+            for score, key in self.index
+            if above_min(score) and below_max(score)
+        ]
+        return matches[start : start + num]
+
+    def pipeline(self, transaction: bool = True) -> StubPipeline:
+        return StubPipeline(self)
+
+    def xgroup_create(self, name, groupname, id="$", mkstream=False) -> None:
+        if (name, groupname) in self.groups:
+            raise redis.ResponseError("BUSYGROUP Consumer Group name already exists")
+        self.entries.setdefault(name, [])
+        self.groups[name, groupname] = [len(self.entries[name]), []]
+
+    def xreadgroup(self, groupname, consumername, streams, count=None, block=None):
+        [(name, last_id)] = streams.items()
+        group = self.groups[name, groupname]
+        if last_id == ">":
+            delivered = self.entries[name][group[0] :][:count]
+            group[0] += len(delivered)
+            group[1] += delivered
+        else:
+            delivered = list(group[1])
+        return [(name.encode("utf-8"), delivered)] if delivered else []
+
+    def xack(self, name, groupname, *ids) -> int:
+        group = self.groups[name, groupname]
+        pending = [entry for entry in group[1] if entry[0].decode("utf-8") not in ids]
+        acked, group[1] = len(group[1]) - len(pending), pending
+        return acked
+
+
+class StubRedisClient:
+    """
+    Stands in for RedisClient, always returning the same StubRedis.
+    """
+
+    def __init__(self, redis: StubRedis):
+        self.redis = redis
+
+    def get_client(self) -> StubRedis:
+        return self.redis
+
+    def get_read_client(self) -> StubRedis:
+        return self.redis
+
+    def execute(self, operation, idempotent=False, read=False):
+        return operation(self.redis)
+
+    def max_block(self, block: Optional[float]) -> Optional[float]:
+        return block
+
+
+class TestRedisTaskRepository(unittest.TestCase):
+    """
+    TestRedisTaskRepository contains unit tests for RedisTaskRepository paging.
+
+    Methods:
+        setUp() -> None:
+            Sets up a RedisTaskRepository backed by a StubRedis.
+        test_iter_by_priority_with_tied_scores() -> None:
+            Verifies every task is returned exactly once despite tied scores.
+        test_iter_by_priority_range() -> None:
+            Verifies paging stops at the end of the priority range.
+        test_get_many() -> None:
+            Verifies batches fetched by a thread pool come back in ID order.
+        test_read_group_events() -> None:
+            Verifies the consumer group is created once before events are read.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a RedisTaskRepository backed by a StubRedis.
+        """
+        self.redis = StubRedis()
+        self.repository = RedisTaskRepository(StubRedisClient(self.redis))
+
+    def test_iter_by_priority_with_tied_scores(self) -> None:
+        """
+        Test case for paging through runs of tied scores longer than a page.
+        """
+        tasks = [
+            Task(name=f"Task {index}", priority=3, description="D", timestamp=1000.0)
+            for index in range(7)
+        ] + [
+            Task(name=f"Task {index}", priority=3, description="D", timestamp=2000.0)
+            for index in range(7, 10)
+        ]
+        for task in tasks:
+            self.redis.add(task)
+
+        for batch_size in (1, 2, 3, 7, 20):
+            result = list(self.repository.iter_by_priority(1, 10, batch_size))
+            self.assertEqual(
+                sorted(task.id for task in result),
+                sorted(task.id for task in tasks),
+                f"batch_size={batch_size}",
+            )
+
+    def test_iter_by_priority_range(self) -> None:
+        """
+        Test case for returning only the tasks within the priority range.
+        """
+        tasks = [
+            Task(name=f"Task {index}", priority=index, description="D")
+            for index in range(1, 11)
+        ]
+        for task in tasks:
+            self.redis.add(task)
+
+        result = list(self.repository.iter_by_priority(4, 6, batch_size=2))
+        self.assertEqual([task.priority for task in result], [4, 5, 6])
+
+    def test_get_many(self) -> None:
+        """
+        Test case for a multi-key read split into batches fetched in parallel.
+        """
+        tasks = [
+            Task(name=f"Task {index}", priority=5, description="D")
+            for index in range(7)
+        ]
+        for task in tasks:
+            self.redis.add(task)
+        ids = [task.id for task in reversed(tasks)]
+        ids.insert(3, "missing")
+
+        for fetch_workers in (1, 3):
+            repository = RedisTaskRepository(
+                StubRedisClient(self.redis), batch_size=2, fetch_workers=fetch_workers
+            )
+            result = repository.get_many(ids)
+            self.assertEqual([task.id for task in result], ids[:3] + ids[4:])
+        self.assertEqual(self.repository.get_many([]), [])
+        with self.assertRaises(ValueError):
+            RedisTaskRepository(StubRedisClient(self.redis), fetch_workers=0)
+
+    def test_read_group_events(self) -> None:
+        """
+        Test case for a consumer group reading the change feed for the first time.
+        """
+        events = self.repository.keys.events
+        self.assertEqual(self.repository.read_group_events("workers", "w1"), [])
+        self.assertEqual(list(self.redis.groups), [(events, "workers")])
+
+        task = Task(name="Task", priority=5, description="D")
+        fields = {b"type": b"add", b"task_id": task.id.encode("utf-8")}
+        self.redis.entries[events].append((b"1000-0", fields))
+        [event] = self.repository.read_group_events("workers", "w1")
+        self.assertEqual((event.type, event.task_id), (TaskEventType.ADD, task.id))
+        self.assertEqual(event.timestamp, 1.0)
+        self.assertEqual(
+            len(self.repository.read_group_events("workers", "w1", pending=True)), 1
+        )
+        self.assertEqual(self.repository.ack_events("workers", [event.id]), 1)
+
+        repository = RedisTaskRepository(StubRedisClient(self.redis))
+        self.assertEqual(repository.read_group_events("workers", "w2"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+"""
+Unit tests for the retry policy, the circuit breaker and RedisClient.execute().
+
+Tests:
+- test_breaker_transitions: Verifies the closed, open and half-open transitions.
+- test_backoff_delays: Verifies retry delays are jittered and capped.
+- test_execute_retries_idempotent_operations: Verifies transient errors are retried.
+- test_execute_does_not_retry_writes: Verifies non-idempotent operations run once.
+- test_execute_fails_fast_when_open: Verifies calls are rejected while the breaker is open.
+"""
+
+import unittest
+
+import redis
+
+from src.adapters.redis_client import RedisClient
+from src.adapters.resilience import CircuitBreaker, RetryPolicy
+from src.utils.exceptions import CircuitOpenError
+
+
+class Clock:
+    """
+    A manually advanced time source.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FlakyOperation:
+    """
+    An operation failing with a connection error a given number of times.
+    """
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self, client) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise redis.ConnectionError("Connection refused")
+        return "OK"
+
+
+class TestResilience(unittest.TestCase):
+    """
+    TestResilience contains unit tests for retries and the circuit breaker.
+
+    Methods:
+        setUp() -> None:
+            Sets up a RedisClient with a manual clock and no backoff sleeps.
+        test_breaker_transitions() -> None:
+            Verifies the closed, open and half-open transitions.
+        test_backoff_delays() -> None:
+            Verifies retry delays are jittered and capped.
+        test_execute_retries_idempotent_operations() -> None:
+            Verifies transient errors are retried.
+        test_execute_does_not_retry_writes() -> None:
+            Verifies non-idempotent operations run once.
+        test_execute_fails_fast_when_open() -> None:
+            Verifies calls are rejected while the breaker is open.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a RedisClient with a manual clock and no backoff sleeps.
+        """
+        self.clock = Clock()
+        self.transitions: list = []
+        breaker = CircuitBreaker(
+            failure_threshold=3, reset_timeout=10, clock=self.clock
+        )
+        breaker.on_state_change.append(
+            lambda old, new: self.transitions.append((old, new))
+        )
+        self.client = RedisClient(
+            retry_policy=RetryPolicy(retries=2, rng=lambda: 0.0), breaker=breaker
+        )
+        self.client.client = object()
+
+    def test_breaker_transitions(self) -> None:
+        """
+        Test case for opening, half-opening and closing the breaker.
+        """
+        breaker = self.client.breaker
+        # Listeners run outside the lock, so they may read the breaker.
+        seen: list = []
+        breaker.on_state_change.append(lambda old, new: seen.append(breaker.state))
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+
+        self.clock.now = 10
+        self.assertEqual(breaker.state, "half-open")
+        breaker.before_call()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_call()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, "open")
+
+        self.clock.now = 20
+        breaker.before_call()
+        breaker.record_success()
+        self.assertEqual(breaker.state, "closed")
+        self.assertEqual(
+            self.transitions,
+            [
+                ("closed", "open"),
+                ("open", "half-open"),
+                ("half-open", "open"),
+                ("open", "half-open"),
+                ("half-open", "closed"),
+            ],
+        )
+        self.assertEqual(seen, [new for _, new in self.transitions])
+
+    def test_backoff_delays(self) -> None:
+        """
+        Test case for jittered exponential backoff delays.
+        """
+        ceilings = RetryPolicy(
+            retries=6, base_delay=0.1, max_delay=1.0, rng=lambda: 1.0
+        )
+        self.assertEqual(ceilings.delays(), [0.1, 0.2, 0.4, 0.8, 1.0, 1.0])
+        for delay, ceiling in zip(RetryPolicy(retries=6).delays(), [0.05, 0.1, 0.2]):
+            self.assertTrue(0 <= delay <= ceiling)
+
+    def test_execute_retries_idempotent_operations(self) -> None:
+        """
+        Test case for retrying idempotent operations after transient errors.
+        """
+        operation = FlakyOperation(failures=2)
+        self.assertEqual(self.client.execute(operation, idempotent=True), "OK")
+        self.assertEqual(operation.calls, 3)
+        self.assertEqual(self.client.breaker.state, "closed")
+
+        operation = FlakyOperation(failures=3)
+        with self.assertRaises(redis.ConnectionError):
+            self.client.execute(operation, idempotent=True)
+        self.assertEqual(operation.calls, 3)
+
+    def test_execute_does_not_retry_writes(self) -> None:
+        """
+        Test case for running non-idempotent operations exactly once.
+        """
+        operation = FlakyOperation(failures=1)
+        with self.assertRaises(redis.ConnectionError):
+            self.client.execute(operation)
+        self.assertEqual(operation.calls, 1)
+
+    def test_execute_fails_fast_when_open(self) -> None:
+        """
+        Test case for rejecting calls without trying them while the breaker is open.
+        """
+        for _ in range(3):
+            with self.assertRaises(redis.ConnectionError):
+                self.client.execute(FlakyOperation(failures=1))
+        operation = FlakyOperation(failures=0)
+        with self.assertRaises(CircuitOpenError):
+            self.client.execute(operation, idempotent=True)
+        self.assertEqual(operation.calls, 0)
+
+        self.clock.now = 10
+        self.assertEqual(self.client.execute(operation), "OK")
+        self.assertEqual(self.client.breaker.state, "closed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Unit tests for the dequeue schedulers using a FakeTaskRepository.
+
+Tests:
+- test_strict_priority: Verifies the strict policy drains higher bands first.
+- test_weighted_round_robin: Verifies bands are served in proportion to their weights.
+- test_age_boost: Verifies a long-waiting low band overtakes a busy high band.
+- test_dequeue_skips_removed_tasks: Verifies deleted, moved and expired tasks are not dequeued.
+- test_wait_times: Verifies per-band wait statistics.
+"""
+
+import time
+import unittest
+from collections import Counter
+
+from src.repositories.fake_repository import FakeTaskRepository
+from src.services.scheduler import (
+    AgeBoostScheduler,
+    StrictPriorityScheduler,
+    WeightedRoundRobinScheduler,
+)
+from src.services.task_service import TaskService
+
+
+class TestScheduler(unittest.TestCase):
+    """
+    TestScheduler contains unit tests for the dequeue schedulers.
+
+    Methods:
+        setUp() -> None:
+            Sets up a TaskService with a FakeTaskRepository.
+        fill(priority: int, count: int, timestamp: float) -> None:
+            Adds tasks to a priority band.
+        test_strict_priority() -> None:
+            Verifies the strict policy drains higher bands first.
+        test_weighted_round_robin() -> None:
+            Verifies bands are served in proportion to their weights.
+        test_age_boost() -> None:
+            Verifies a long-waiting low band overtakes a busy high band.
+        test_dequeue_skips_removed_tasks() -> None:
+            Verifies deleted, moved and expired tasks are not dequeued.
+        test_wait_times() -> None:
+            Verifies per-band wait statistics.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a TaskService with a FakeTaskRepository.
+        """
+        self.repository = FakeTaskRepository()
+        self.service = TaskService(self.repository)
+
+    def fill(self, priority: int, count: int, timestamp: float = 0.0) -> None:
+        """
+        Add `count` tasks to a priority band, created at increasing timestamps.
+        """
+        for index in range(count):
+            task = self.service.add_task(f"P{priority} #{index}", priority, "D")
+            task.timestamp = timestamp + index
+            self.repository.update(task)
+
+    def test_strict_priority(self) -> None:
+        """
+        Test case for draining bands from the highest priority down, oldest first.
+        """
+        self.service.scheduler = StrictPriorityScheduler()
+        self.fill(2, 2)
+        self.fill(7, 2)
+        names = [self.service.dequeue_task(now=100).name for _ in range(4)]
+        self.assertEqual(names, ["P7 #0", "P7 #1", "P2 #0", "P2 #1"])
+        self.assertIsNone(self.service.dequeue_task(now=100))
+
+    def test_weighted_round_robin(self) -> None:
+        """
+        Test case for serving bands in proportion to their weights.
+        """
+        self.service.scheduler = WeightedRoundRobinScheduler({9: 3, 1: 1})
+        self.fill(9, 30)
+        self.fill(1, 30)
+        served = Counter(self.service.dequeue_task(now=100).priority for _ in range(20))
+        self.assertEqual(served, {9: 15, 1: 5})
+
+    def test_age_boost(self) -> None:
+        """
+        Test case for a waiting low band overtaking a high band with fresh arrivals.
+        """
+        self.service.scheduler = AgeBoostScheduler(aging_interval=10)
+        self.fill(1, 1, timestamp=0)
+        self.fill(5, 5, timestamp=50)
+        # At t=50 band 1 has aged to 1 + 5 = 6 and beats band 5's fresh head.
+        self.assertEqual(self.service.dequeue_task(now=50).priority, 1)
+
+        self.fill(1, 1, timestamp=50)
+        self.assertEqual(self.service.dequeue_task(now=50).priority, 5)
+
+    def test_dequeue_skips_removed_tasks(self) -> None:
+        """
+        Test case for never dequeuing tasks that were deleted, moved or expired.
+        """
+        deleted = self.service.add_task("Deleted", 3, "D")
+        moved = self.service.add_task("Moved", 3, "D")
+        self.service.add_task("Expired", 3, "D", ttl=0.001)
+        kept = self.service.add_task("Kept", 3, "D")
+        self.service.delete_task(deleted.id)
+        self.service.update_task(moved.id, priority=8)
+        time.sleep(0.01)
+
+        self.assertEqual(self.service.dequeue_task().id, moved.id)
+        self.assertEqual(self.service.dequeue_task().id, kept.id)
+        self.assertIsNone(self.service.dequeue_task())
+        self.assertEqual(self.repository.tasks, {})
+
+    def test_wait_times(self) -> None:
+        """
+        Test case for per-band wait time statistics.
+        """
+        self.fill(4, 4, timestamp=0)
+        for _ in range(4):
+            self.service.dequeue_task(now=10)
+        wait = self.service.wait_times()[4]
+        self.assertEqual(wait["count"], 4)
+        self.assertEqual(wait["max"], 10)
+        self.assertEqual(wait["mean"], 8.5)
+        self.assertEqual(wait["p50"], 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
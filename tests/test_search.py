@@ -0,0 +1,61 @@
+"""
+Unit tests for the full-text search tokenizer and query parser.
+
+Tests:
+- test_tokenize: Verifies text is split into lowercased, distinct tokens.
+- test_parse_query: Verifies OR clauses, AND terms and prefix terms are parsed.
+- test_matches: Verifies a parsed query is evaluated against a task's tokens.
+"""
+
+import unittest
+
+from src.utils.search import matches, parse_query, tokenize
+
+
+class TestSearch(unittest.TestCase):
+    """
+    TestSearch contains unit tests for the full-text search helpers.
+
+    Methods:
+        test_tokenize() -> None:
+            Verifies text is split into lowercased, distinct tokens.
+        test_parse_query() -> None:
+            Verifies OR clauses, AND terms and prefix terms are parsed.
+        test_matches() -> None:
+            Verifies a parsed query is evaluated against a task's tokens.
+    """
+
+    def test_tokenize(self) -> None:
+        """
+        Test case for splitting text on punctuation and folding ASCII case.
+        """
+        self.assertEqual(
+            tokenize("Deploy the API-gateway, deploy v2 Café"),
+            {"deploy", "the", "api", "gateway", "v2", "café"},
+        )
+        self.assertEqual(tokenize(" -- "), set())
+
+    def test_parse_query(self) -> None:
+        """
+        Test case for parsing alternatives, required terms and prefixes.
+        """
+        self.assertEqual(
+            parse_query("deploy AND api* OR on-call"),
+            [["deploy", "api*"], ["on", "call"]],
+        )
+        self.assertEqual(parse_query("Refund refund"), [["refund"]])
+        with self.assertRaises(ValueError):
+            parse_query("OR * --")
+
+    def test_matches(self) -> None:
+        """
+        Test case for evaluating a query against the tokens of a task.
+        """
+        tokens = tokenize("Deploy the API gateway")
+        self.assertTrue(matches(parse_query("deploy gate*"), tokens))
+        self.assertFalse(matches(parse_query("deploy web"), tokens))
+        self.assertTrue(matches(parse_query("deploy web OR api"), tokens))
+
+
+if __name__ == "__main__":
+    unittest.main()
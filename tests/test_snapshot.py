@@ -0,0 +1,120 @@
+"""
+Unit tests for task store snapshots.
+
+Tests:
+- test_round_trip: Verifies a snapshot restores every task, with and without compression.
+- test_corrupted_snapshot_is_rejected: Verifies a damaged file is rejected before import.
+- test_truncated_snapshot_is_rejected: Verifies a truncated file is rejected.
+- test_not_a_snapshot: Verifies files without the snapshot header are rejected.
+- test_import_with_dedupe: Verifies a deduplicated import skips repeated content.
+"""
+
+import io
+import unittest
+
+from src.repositories.fake_repository import FakeTaskRepository
+from src.services.snapshot import verify_snapshot
+from src.services.task_service import TaskService
+from src.utils.exceptions import SnapshotError
+
+
+class TestSnapshot(unittest.TestCase):
+    """
+    TestSnapshot contains unit tests for exporting and importing snapshots.
+
+    Methods:
+        setUp() -> None:
+            Sets up a TaskService holding a few tasks.
+        test_round_trip() -> None:
+            Verifies a snapshot restores every task.
+        test_corrupted_snapshot_is_rejected() -> None:
+            Verifies a damaged file is rejected before import.
+        test_truncated_snapshot_is_rejected() -> None:
+            Verifies a truncated file is rejected.
+        test_not_a_snapshot() -> None:
+            Verifies files without the snapshot header are rejected.
+        test_import_with_dedupe() -> None:
+            Verifies a deduplicated import skips repeated content.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a TaskService holding a few tasks.
+        """
+        self.service: TaskService = TaskService(repository=FakeTaskRepository())
+        for index in range(20):
+            self.service.add_task(
+                name=f"Task {index}", priority=index % 10 + 1, description="D" * 40
+            )
+
+    def export(self, compress: bool = True) -> bytes:
+        """
+        Export the service's tasks and return the snapshot bytes.
+        """
+        stream = io.BytesIO()
+        self.assertEqual(self.service.export_snapshot(stream, compress), 20)
+        return stream.getvalue()
+
+    def export_all(self) -> bytes:
+        """
+        Export every task of the service and return the snapshot bytes.
+        """
+        stream = io.BytesIO()
+        self.service.export_snapshot(stream)
+        return stream.getvalue()
+
+    def test_round_trip(self) -> None:
+        """
+        Test case for restoring every task into another repository.
+        """
+        for compress in (True, False):
+            target = TaskService(repository=FakeTaskRepository())
+            count = target.import_snapshot(io.BytesIO(self.export(compress)))
+            self.assertEqual(count, 20)
+            self.assertEqual(
+                sorted(task.id for task in target.get_all_tasks()),
+                sorted(task.id for task in self.service.get_all_tasks()),
+            )
+        self.assertLess(len(self.export(True)), len(self.export(False)))
+
+    def test_corrupted_snapshot_is_rejected(self) -> None:
+        """
+        Test case for rejecting a damaged snapshot without importing anything.
+        """
+        for compress in (True, False):
+            data = bytearray(self.export(compress))
+            data[len(data) // 2] ^= 0xFF
+            repository = FakeTaskRepository()
+            with self.assertRaises(SnapshotError):
+                TaskService(repository).import_snapshot(io.BytesIO(bytes(data)))
+            self.assertEqual(repository.tasks, {})
+
+    def test_truncated_snapshot_is_rejected(self) -> None:
+        """
+        Test case for rejecting a truncated snapshot.
+        """
+        with self.assertRaises(SnapshotError):
+            verify_snapshot(io.BytesIO(self.export()[:-5]))
+
+    def test_not_a_snapshot(self) -> None:
+        """
+        Test case for rejecting files that are not snapshots.
+        """
+        with self.assertRaises(SnapshotError):
+            verify_snapshot(io.BytesIO(b"id,name,priority\n"))
+
+    def test_import_with_dedupe(self) -> None:
+        """
+        Test case for skipping repeated content when importing with dedupe.
+        """
+        for index in range(5):
+            self.service.add_task(name="Copy", priority=2, description="Same")
+        data = self.export_all()
+        target = TaskService(repository=FakeTaskRepository())
+        self.assertEqual(target.import_snapshot(io.BytesIO(data), dedupe=True), 21)
+        self.assertEqual(target.import_snapshot(io.BytesIO(data), dedupe=True), 0)
+        self.assertEqual(len(target.get_all_tasks()), 21)
+
+
+if __name__ == "__main__":
+    unittest.main()
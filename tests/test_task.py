@@ -51,6 +51,51 @@ class TestTask(unittest.TestCase):
         self.assertIsInstance(task.timestamp, float)
         self.assertAlmostEqual(task.timestamp, time.time(), delta=1)
 
+    def test_task_expiry(self):
+        """Test that a Task only expires once its expires_at has passed"""
+        task = Task(name="Sample Task", priority=5, description="A sample task")
+        self.assertFalse(task.is_expired())
+        task.expires_at = 100.0
+        self.assertFalse(task.is_expired(now=99.0))
+        self.assertTrue(task.is_expired(now=100.0))
+
+    def test_task_is_due(self):
+        """Test that a delayed Task only becomes due once its run_at has come"""
+        task = Task(name="Sample Task", priority=5, description="A sample task")
+        self.assertTrue(task.is_due())
+        task.run_at = 100.0
+        self.assertFalse(task.is_due(now=99.0))
+        self.assertTrue(task.is_due(now=100.0))
+
+    def test_task_tags(self):
+        """Test that tags are normalized and malformed tags are rejected"""
+        task = Task(
+            name="Sample Task",
+            priority=5,
+            description="A sample task",
+            tags=["b", "a", "b"],
+        )
+        self.assertEqual(task.tags, ["a", "b"])
+        task = Task(
+            name="Sample Task", priority=5, description="A sample task", tags="y,x"
+        )
+        self.assertEqual(task.tags, ["x", "y"])
+        with self.assertRaises(ValidationError):
+            Task(
+                name="Sample Task", priority=5, description="A sample task", tags=[" "]
+            )
+
+    def test_task_status(self):
+        """Test that tasks start pending, unknown statuses are rejected and only pending
+        tasks expire"""
+        task = Task(name="Sample Task", priority=5, description="A sample task")
+        self.assertEqual((task.status, task.status_at), (Task.PENDING, None))
+        with self.assertRaises(ValidationError):
+            Task(name="Sample Task", priority=5, description="", status="lost")
+        task.expires_at = 100.0
+        task.status = Task.RUNNING
+        self.assertFalse(task.is_expired(now=200.0))
+
 
 if __name__ == "__main__":
     unittest.main()
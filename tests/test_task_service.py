@@ -4,15 +4,37 @@ Unit tests for TaskService using a FakeTaskRepository.
 Tests:
 - test_add_task: Verifies adding a task to the service and repository.
 - test_get_all_tasks: Verifies retrieving all tasks from the service.
+- test_index_order: Verifies tied priorities come back in the order of the Redis index.
 - test_get_tasks_by_priority: Verifies retrieving tasks by priority from the service.
 - test_get_tasks_by_priority_range: Verifies retrieving tasks within a priority range from the service.
 - test_delete_task: Verifies deleting a task from the service and repository.
 - test_update_task: Verifies updating a task in the service and repository.
+- test_delete_tasks: Verifies deleting several tasks by ID from the service.
+- test_delete_tasks_by_priority_range: Verifies deleting tasks within a priority range.
+- test_delete_tasks_older_than: Verifies deleting tasks created before a timestamp.
+- test_expired_tasks_are_hidden: Verifies reads never return expired tasks.
+- test_prune_expired_tasks: Verifies pruning expired tasks in bounded batches.
+- test_start_pruner: Verifies the background pruner deletes expired tasks.
+- test_subscribe: Verifies subscribers receive every mutation in order.
+- test_subscribe_with_group: Verifies consumer groups share and acknowledge events.
+- test_change_feed_is_capped: Verifies the in-memory change feed is bounded.
+- test_delayed_tasks: Verifies delayed tasks stay out of the queue until promoted.
+- test_idempotent_add_task: Verifies a repeated idempotency key adds nothing.
+- test_tagged_tasks: Verifies tag filters and the maintenance of the tag index.
+- test_search: Verifies ranked, paginated full-text search as tasks change.
+- test_queues: Verifies queues are isolated, counted and can exchange tasks.
+- test_status_lifecycle: Verifies claimed tasks move between statuses and indexes.
+- test_reclaim_stale_tasks: Verifies tasks left running past a timeout are queued again.
+- test_archive_tasks: Verifies finished tasks are archived to a snapshot and deleted.
 """
 
+import io
+import time
 import unittest
+from itertools import islice
 
 from src.entities.task import Task
+from src.entities.task_event import TaskEventType
 from src.repositories.fake_repository import FakeTaskRepository
 from src.services.task_service import TaskService
 
@@ -28,6 +50,8 @@ class TestTaskServiceWithFakeRepository(unittest.TestCase):
             Verifies adding a task to the service and repository.
         test_get_all_tasks() -> None:
             Verifies retrieving all tasks from the service.
+        test_index_order() -> None:
+            Verifies tied priorities come back in the order of the Redis index.
         test_get_tasks_by_priority() -> None:
             Verifies retrieving tasks by priority from the service.
         test_get_tasks_by_priority_range() -> None:
@@ -36,6 +60,40 @@ class TestTaskServiceWithFakeRepository(unittest.TestCase):
             Verifies deleting a task from the service and repository.
         test_update_task() -> None:
             Verifies updating a task in the service and repository.
+        test_delete_tasks() -> None:
+            Verifies deleting several tasks by ID from the service.
+        test_delete_tasks_by_priority_range() -> None:
+            Verifies deleting tasks within a priority range.
+        test_delete_tasks_older_than() -> None:
+            Verifies deleting tasks created before a timestamp.
+        test_expired_tasks_are_hidden() -> None:
+            Verifies reads never return expired tasks.
+        test_prune_expired_tasks() -> None:
+            Verifies pruning expired tasks in bounded batches.
+        test_start_pruner() -> None:
+            Verifies the background pruner deletes expired tasks.
+        test_subscribe() -> None:
+            Verifies subscribers receive every mutation in order.
+        test_subscribe_with_group() -> None:
+            Verifies consumer groups share and acknowledge events.
+        test_change_feed_is_capped() -> None:
+            Verifies the in-memory change feed is bounded.
+        test_delayed_tasks() -> None:
+            Verifies delayed tasks stay out of the queue until promoted.
+        test_idempotent_add_task() -> None:
+            Verifies a repeated idempotency key adds nothing.
+        test_tagged_tasks() -> None:
+            Verifies tag filters and the maintenance of the tag index.
+        test_search() -> None:
+            Verifies ranked, paginated full-text search as tasks change.
+        test_queues() -> None:
+            Verifies queues are isolated, counted and can exchange tasks.
+        test_status_lifecycle() -> None:
+            Verifies claimed tasks move between statuses and indexes.
+        test_reclaim_stale_tasks() -> None:
+            Verifies tasks left running past a timeout are queued again.
+        test_archive_tasks() -> None:
+            Verifies finished tasks are archived to a snapshot and deleted.
     """
 
     def setUp(self) -> None:
@@ -45,6 +103,16 @@ class TestTaskServiceWithFakeRepository(unittest.TestCase):
         self.fake_repository: FakeTaskRepository = FakeTaskRepository()
         self.service: TaskService = TaskService(repository=self.fake_repository)
 
+    def add_expired_task(self, name: str) -> Task:
+        """
+        Store a task that expired a second ago directly in the repository.
+        """
+        task = Task(
+            name=name, priority=5, description="Gone", expires_at=time.time() - 1
+        )
+        self.fake_repository.add(task)
+        return task
+
     def test_add_task(self) -> None:
         """
         Test case for adding a task to the service.
@@ -73,6 +141,27 @@ class TestTaskServiceWithFakeRepository(unittest.TestCase):
         self.assertIn(task1, result)
         self.assertIn(task2, result)
 
+    def test_index_order(self) -> None:
+        """
+        Test case for ordering tasks by `priority + timestamp / 1e10`, then by ID.
+        """
+        tasks = [
+            Task(id=task_id, name="Job", priority=5, description="D", timestamp=ts)
+            for task_id, ts in (("a", 300.0), ("c", 200.0), ("b", 200.0), ("d", 100.0))
+        ]
+        tasks.append(Task(id="e", name="Job", priority=4, description="D"))
+        for task in tasks:
+            task.tags = ["t"]
+            self.fake_repository.add(task)
+        expected = ["e", "d", "b", "c", "a"]
+
+        self.assertEqual([task.id for task in self.service.get_all_tasks()], expected)
+        self.assertEqual(
+            [task.id for task in self.service.iter_tasks(4, 5, tags=["t"])], expected
+        )
+        page, _ = self.service.search("job")
+        self.assertEqual([task.id for task in page], ["d", "b", "c", "a", "e"])
+
     def test_get_tasks_by_priority(self) -> None:
         """
         Test case for retrieving tasks by priority from the service.
@@ -131,6 +220,383 @@ class TestTaskServiceWithFakeRepository(unittest.TestCase):
         self.assertEqual(updated_task.description, "Updated Description")
         self.assertEqual(self.fake_repository.tasks[task.id], updated_task)
 
+        # A failed update leaves the task the service fetched untouched.
+        fetched = self.fake_repository.get_by_id(task.id)
+        self.fake_repository.get_by_id = lambda task_id: fetched
+        self.fake_repository.update = lambda task: 1 / 0
+        with self.assertRaises(ZeroDivisionError):
+            self.service.update_task(task.id, name="Lost", tags=["lost"])
+        self.assertEqual(fetched, updated_task)
+
+    def test_delete_tasks(self) -> None:
+        """
+        Test case for deleting several tasks by ID from the service.
+        """
+        task1: Task = self.service.add_task(
+            name="Task 1", priority=3, description="Description 1"
+        )
+        task2: Task = self.service.add_task(
+            name="Task 2", priority=5, description="Description 2"
+        )
+        task3: Task = self.service.add_task(
+            name="Task 3", priority=7, description="Description 3"
+        )
+        reported: list[int] = []
+
+        result: int = self.service.delete_tasks(
+            [task1.id, task2.id, "missing"], progress=reported.append
+        )
+        self.assertEqual(result, 2)
+        self.assertEqual(sum(reported), 2)
+        self.assertEqual(self.service.get_all_tasks(), [task3])
+
+    def test_delete_tasks_by_priority_range(self) -> None:
+        """
+        Test case for deleting tasks within a priority range from the service.
+        """
+        self.service.add_task(name="Task 1", priority=3, description="Description 1")
+        self.service.add_task(name="Task 2", priority=5, description="Description 2")
+        task3: Task = self.service.add_task(
+            name="Task 3", priority=7, description="Description 3"
+        )
+
+        result: int = self.service.delete_tasks_by_priority_range(3, 5)
+        self.assertEqual(result, 2)
+        self.assertEqual(self.service.get_all_tasks(), [task3])
+
+    def test_delete_tasks_older_than(self) -> None:
+        """
+        Test case for deleting tasks created before a timestamp from the service.
+        """
+        old_task = Task(name="Old", priority=4, description="Old", timestamp=100.0)
+        self.fake_repository.add(old_task)
+        new_task: Task = self.service.add_task(
+            name="New", priority=4, description="New"
+        )
+        running = Task(name="Running", priority=4, description="D", timestamp=100.0)
+        self.fake_repository.add(running)
+        self.service.set_status([running.id], "running")
+
+        result: int = self.service.delete_tasks_older_than(200.0)
+        self.assertEqual(result, 1)
+        self.assertEqual(self.service.get_all_tasks(), [new_task])
+        self.assertEqual(self.service.get_task(running.id).status, "running")
+
+    def test_expired_tasks_are_hidden(self) -> None:
+        """
+        Test case for hiding expired tasks from reads before they are pruned.
+        """
+        expired: Task = self.add_expired_task("Expired")
+        live: Task = self.service.add_task(
+            name="Live", priority=5, description="Here", ttl=3600
+        )
+
+        self.assertIn(expired.id, self.fake_repository.tasks)
+        self.assertIsNone(self.fake_repository.get_by_id(expired.id))
+        self.assertEqual(self.service.get_all_tasks(), [live])
+        self.assertEqual(self.service.get_tasks_by_priority(5), [live])
+        with self.assertRaises(ValueError):
+            self.service.add_task(name="Bad", priority=5, description="TTL", ttl=0)
+
+    def test_prune_expired_tasks(self) -> None:
+        """
+        Test case for pruning expired tasks in bounded batches.
+        """
+        for index in range(3):
+            self.add_expired_task(f"Expired {index}")
+        live: Task = self.service.add_task(name="Live", priority=5, description="Here")
+
+        self.assertEqual(self.service.prune_expired_tasks(batch_size=2), 2)
+        self.assertEqual(self.service.prune_expired_tasks(batch_size=2), 1)
+        self.assertEqual(self.service.prune_expired_tasks(batch_size=2), 0)
+        self.assertEqual(list(self.fake_repository.tasks), [live.id])
+
+    def test_start_pruner(self) -> None:
+        """
+        Test case for pruning expired tasks from a background thread.
+        """
+        expired: Task = self.add_expired_task("Expired")
+
+        pruner = self.service.start_pruner(interval=0.01)
+        try:
+            for _ in range(100):
+                if expired.id not in self.fake_repository.tasks:
+                    break
+                time.sleep(0.01)
+        finally:
+            pruner.stop()
+        self.assertNotIn(expired.id, self.fake_repository.tasks)
+
+    def test_subscribe(self) -> None:
+        """
+        Test case for receiving every mutation from the change feed.
+        """
+        events = self.service.subscribe(block=0.01)
+        task: Task = self.service.add_task(
+            name="Task 1", priority=3, description="Description 1"
+        )
+        self.service.update_task(task.id, name="Renamed")
+        self.service.delete_task(task.id)
+
+        received = list(islice(events, 3))
+        self.assertEqual(
+            [event.type for event in received],
+            [TaskEventType.ADD, TaskEventType.UPDATE, TaskEventType.DELETE],
+        )
+        self.assertEqual(received[0].task.name, "Task 1")
+        with self.assertRaises(ValueError):
+            self.service.subscribe(block=0)
+        self.assertEqual(received[1].task.name, "Renamed")
+        self.assertIsNone(received[2].task)
+        self.assertTrue(all(event.task_id == task.id for event in received))
+
+    def test_subscribe_with_group(self) -> None:
+        """
+        Test case for sharing and acknowledging change feed events in a consumer group.
+        """
+        self.fake_repository.read_group_events("dashboard", "first")
+        for index in range(4):
+            self.service.add_task(
+                name=f"Task {index}", priority=3, description="Description"
+            )
+
+        first = self.fake_repository.read_group_events("dashboard", "first", count=2)
+        second = self.fake_repository.read_group_events("dashboard", "second")
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 2)
+        self.assertNotEqual(first[0].id, second[0].id)
+
+        self.assertEqual(self.fake_repository.ack_events("dashboard", [first[0].id]), 1)
+        redelivered = list(islice(self.service.subscribe("dashboard", "first"), 1))
+        self.assertEqual(redelivered, [first[1]])
+
+    def test_change_feed_is_capped(self) -> None:
+        """
+        Test case for bounding the number of retained change feed events.
+        """
+        repository = FakeTaskRepository(events_maxlen=2)
+        for index in range(5):
+            repository.add(Task(name=f"Task {index}", priority=3, description="D"))
+
+        events = repository.read_events("0-0")
+        self.assertEqual([event.task.name for event in events], ["Task 3", "Task 4"])
+        self.assertEqual(repository.latest_event_id(), events[-1].id)
+
+    def test_delayed_tasks(self) -> None:
+        """
+        Test case for keeping delayed tasks out of the queue until they are promoted.
+        """
+        now = time.time()
+        later = self.service.add_task("Later", 5, "D", ttl=10, run_at=now + 60)
+        soon = self.service.add_task("Soon", 5, "D", run_at=now + 1)
+        cancelled = self.service.add_task("Cancelled", 5, "D", run_at=now + 1)
+        self.service.delete_task(cancelled.id)
+
+        self.assertEqual(later.expires_at, now + 70)
+        self.assertEqual(self.service.get_all_tasks(), [])
+        self.assertEqual(self.fake_repository.get_by_id(later.id), later)
+        self.assertIsNone(self.service.dequeue_task(now=now))
+
+        self.assertEqual(self.service.promote_due_tasks(batch_size=1, now=now + 2), 1)
+        self.assertEqual(self.service.promote_due_tasks(now=now + 2), 1)
+        self.assertEqual(self.service.get_all_tasks(), [soon])
+        self.assertEqual(self.service.dequeue_task(now=now + 2), soon)
+        self.assertEqual(self.service.dequeue_task(now=now + 61), later)
+
+    def test_idempotent_add_task(self) -> None:
+        """
+        Test case for returning the original task when an idempotency key repeats.
+        """
+        first = self.service.add_task("Task", 3, "D", idempotency_key="order-42")
+        retry = self.service.add_task("Task", 3, "D", idempotency_key="order-42")
+        self.assertEqual(retry, first)
+        self.assertEqual(len(self.service.get_all_tasks()), 1)
+
+        self.service.dequeue_task()
+        retry = self.service.add_task("Task", 3, "D", idempotency_key="order-42")
+        self.assertEqual(retry.id, first.id)
+        self.assertEqual(self.service.get_all_tasks(), [])
+
+        key = self.service.content_key("Task", 3, "D")
+        self.assertNotEqual(key, self.service.content_key("Task", 4, "D"))
+        self.service.dedup_ttl = 0.001
+        self.service.add_task("Task", 3, "D", idempotency_key=key)
+        time.sleep(0.01)
+        self.service.add_task("Task", 3, "D", idempotency_key=key)
+        self.assertEqual(len(self.service.get_all_tasks()), 2)
+
+    def test_tagged_tasks(self) -> None:
+        """
+        Test case for filtering tasks by tags as they are updated, deleted and dequeued.
+        """
+        both = self.service.add_task("Both", 5, "D", tags=["eu", "payments"])
+        payments = self.service.add_task("Payments", 3, "D", tags=["payments"])
+        eu = self.service.add_task("EU", 8, "D", tags=["eu"])
+
+        self.assertEqual(
+            list(self.service.iter_tasks(tags=["payments"])), [payments, both]
+        )
+        self.assertEqual(list(self.service.iter_tasks(tags=["payments", "eu"])), [both])
+        self.assertEqual(
+            list(self.service.iter_tasks(4, 10, tags=["payments"])), [both]
+        )
+        self.assertEqual(list(self.service.iter_tasks(tags=["unknown"])), [])
+
+        both = self.service.update_task(both.id, tags=["search"])
+        self.assertEqual(list(self.service.iter_tasks(tags=["eu"])), [eu])
+        self.assertEqual(list(self.service.iter_tasks(tags=["search"])), [both])
+
+        self.service.delete_task(payments.id)
+        self.assertEqual(self.service.dequeue_task(), eu)
+        self.assertEqual(self.fake_repository.tag_index, {"search": {both.id}})
+
+    def test_search(self) -> None:
+        """
+        Test case for searching names and descriptions through the inverted index.
+        """
+        api = self.service.add_task("Deploy API", 5, "Roll out the gateway")
+        web = self.service.add_task("Deploy web", 5, "Roll out the frontend")
+        refund = self.service.add_task("Refund", 8, "Order 42")
+
+        self.assertEqual(self.service.search("deploy"), ([api, web], 2))
+        self.assertEqual(self.service.search("deploy gate*"), ([api], 1))
+        self.assertEqual(
+            self.service.search("roll OR order", offset=1, limit=1), ([api], 3)
+        )
+
+        web = self.service.update_task(web.id, description="Refund the frontend")
+        self.assertEqual(self.service.search("refund"), ([refund, web], 2))
+        self.assertEqual(self.service.search("fro*")[1], 1)
+        self.service.delete_task(refund.id)
+        self.assertEqual(self.service.search("order"), ([], 0))
+        self.assertNotIn("order", self.fake_repository.vocabulary)
+        with self.assertRaises(ValueError):
+            self.service.search("--")
+
+    def test_queues(self) -> None:
+        """
+        Test case for isolating queues and moving tasks between them.
+        """
+        payments = TaskService(self.fake_repository.for_queue("payments"))
+        urgent = self.service.add_task("Refund", 9, "Order 42", tags=["eu"])
+        later = self.service.add_task("Report", 2, "D", run_at=time.time() + 60)
+        kept = self.service.add_task("Cleanup", 1, "D")
+        payments.add_task("Charge", 5, "Order 43")
+
+        self.assertEqual(len(payments.get_all_tasks()), 1)
+        self.assertEqual(
+            self.service.list_queues(),
+            {
+                "default": {"queued": 2, "delayed": 1},
+                "payments": {"queued": 1, "delayed": 0},
+            },
+        )
+
+        self.assertEqual(
+            self.service.move_tasks([urgent.id, later.id, "missing"], "payments"), 2
+        )
+        self.assertEqual(self.service.get_all_tasks(), [kept])
+        self.assertEqual(list(payments.iter_tasks(tags=["eu"])), [urgent])
+        self.assertEqual(payments.search("order")[1], 2)
+        self.assertEqual(payments.dequeue_task(), urgent)
+        self.assertEqual(self.service.list_queues()["payments"]["delayed"], 1)
+        with self.assertRaises(ValueError):
+            self.service.move_tasks([kept.id], "default")
+        with self.assertRaises(ValueError):
+            self.service.move_tasks([kept.id], "bad:name")
+
+    def test_status_lifecycle(self) -> None:
+        """
+        Test case for claiming tasks and moving them through their statuses.
+        """
+        low = self.service.add_task("Low", 2, "D", ttl=60)
+        high = self.service.add_task("High", 8, "D")
+
+        claimed = self.service.claim_tasks(1, now=100.0)
+        self.assertEqual([task.id for task in claimed], [high.id])
+        self.assertEqual((claimed[0].status, claimed[0].status_at), ("running", 100.0))
+        self.assertEqual(self.service.get_all_tasks(), [low])
+        self.assertEqual(self.service.get_task(high.id).status, "running")
+        self.assertEqual(
+            [task.id for task in self.service.iter_tasks_by_status("running")],
+            [high.id],
+        )
+
+        failed = self.service.set_status([high.id, "missing"], "failed", now=101.0)
+        self.assertEqual(
+            [(task.id, task.status_at) for task in failed], [(high.id, 101.0)]
+        )
+        self.assertEqual(self.service.set_status([high.id], "running"), [])
+        self.assertEqual(list(self.service.iter_tasks_by_status("running")), [])
+        requeued = self.service.set_status([high.id], "pending")
+        self.assertEqual(requeued[0].status, "pending")
+        self.assertEqual(self.service.dequeue_task(), requeued[0])
+
+        self.service.claim_tasks(1)
+        self.assertEqual(self.service.prune_expired_tasks(now=time.time() + 120), 0)
+        self.service.set_status([low.id], "done")
+        self.assertEqual(self.service.set_status([low.id], "pending"), [])
+        with self.assertRaises(ValueError):
+            self.service.set_status([low.id], "lost")
+        with self.assertRaises(ValueError):
+            self.service.iter_tasks_by_status("pending")
+
+    def test_reclaim_stale_tasks(self) -> None:
+        """
+        Test case for recovering the tasks of a worker that died while running them.
+        """
+        tasks = [self.service.add_task(f"Task {n}", 5, "D") for n in range(5)]
+        abandoned = self.service.claim_tasks(3, now=100.0)
+        [recent] = self.service.claim_tasks(1, now=200.0)
+        self.service.set_status([abandoned[0].id], "done", now=150.0)
+
+        self.assertEqual(self.service.reclaim_stale_tasks(60, now=200.0), 2)
+        self.assertEqual(
+            [task.id for task in self.service.iter_tasks_by_status("running")],
+            [recent.id],
+        )
+        self.assertEqual(
+            {task.id for task in self.service.get_all_tasks()},
+            {abandoned[1].id, abandoned[2].id, tasks[4].id},
+        )
+        self.assertEqual(self.service.reclaim_stale_tasks(60, now=200.0), 0)
+        self.assertEqual(self.service.reclaim_stale_tasks(60, batch_size=1), 1)
+
+        reclaimer = self.service.start_reclaimer(0.01, interval=0.01)
+        try:
+            time.sleep(0.1)
+        finally:
+            reclaimer.stop()
+        self.assertEqual(list(self.service.iter_tasks_by_status("running")), [])
+
+    def test_archive_tasks(self) -> None:
+        """
+        Test case for archiving finished tasks and restoring them elsewhere.
+        """
+        for priority in (1, 2, 3, 4):
+            self.service.add_task(f"task {priority}", priority, "D")
+        first, second, third = (task.id for task in self.service.claim_tasks(3))
+        self.service.set_status([first], "done", now=100.0)
+        self.service.set_status([second], "failed", now=200.0)
+        self.service.set_status([third], "done", now=300.0)
+
+        stream = io.BytesIO()
+        self.assertEqual(self.service.archive_tasks(stream, before=250.0), 2)
+        self.assertEqual(
+            [task.id for task in self.service.iter_tasks_by_status("done")], [third]
+        )
+        self.assertEqual(list(self.service.iter_tasks_by_status("failed")), [])
+        self.assertEqual(len(self.service.get_all_tasks()), 1)
+
+        restored = TaskService(FakeTaskRepository())
+        stream.seek(0)
+        self.assertEqual(restored.import_snapshot(stream), 2)
+        self.assertEqual(
+            [task.id for task in restored.iter_tasks_by_status("failed")], [second]
+        )
+        with self.assertRaises(ValueError):
+            self.service.archive_tasks(io.BytesIO(), 0.0, statuses=["pending"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,81 @@
+"""
+Unit tests for TaskView using a FakeTaskRepository.
+
+Tests:
+- test_open_view_loads_snapshot: Verifies the view starts from the current tasks in range.
+- test_refresh_applies_mutations: Verifies mutations are applied without re-listing.
+- test_top_limits_tasks: Verifies the view returns the highest priority tasks first.
+"""
+
+import unittest
+
+from src.entities.task import Task
+from src.repositories.fake_repository import FakeTaskRepository
+from src.services.task_service import TaskService
+
+
+class TestTaskView(unittest.TestCase):
+    """
+    TestTaskView contains unit tests for live task views.
+
+    Methods:
+        setUp() -> None:
+            Sets up the test environment with a FakeTaskRepository and TaskService.
+        test_open_view_loads_snapshot() -> None:
+            Verifies the view starts from the current tasks in range.
+        test_refresh_applies_mutations() -> None:
+            Verifies mutations are applied without re-listing.
+        test_top_limits_tasks() -> None:
+            Verifies the view returns the highest priority tasks first.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up test environment with FakeTaskRepository and TaskService.
+        """
+        self.fake_repository: FakeTaskRepository = FakeTaskRepository()
+        self.service: TaskService = TaskService(repository=self.fake_repository)
+
+    def test_open_view_loads_snapshot(self) -> None:
+        """
+        Test case for loading the tasks within the priority range.
+        """
+        inside: Task = self.service.add_task(name="Inside", priority=5, description="D")
+        self.service.add_task(name="Outside", priority=9, description="D")
+
+        view = self.service.open_view(4, 6)
+        self.assertEqual(view.tasks(), [inside])
+
+    def test_refresh_applies_mutations(self) -> None:
+        """
+        Test case for applying adds, updates and deletes from the change feed.
+        """
+        first: Task = self.service.add_task(name="First", priority=5, description="D")
+        second: Task = self.service.add_task(name="Second", priority=5, description="D")
+        view = self.service.open_view(4, 6)
+        self.fake_repository.list_by_priority = None  # re-listing would now fail
+
+        third: Task = self.service.add_task(name="Third", priority=6, description="D")
+        self.service.update_task(first.id, priority=9)
+        self.service.delete_task(second.id)
+        self.service.add_task(name="Ignored", priority=1, description="D")
+
+        self.assertTrue(view.refresh())
+        self.assertEqual(view.tasks(), [third])
+        self.assertFalse(view.refresh())
+
+    def test_top_limits_tasks(self) -> None:
+        """
+        Test case for returning at most `top` tasks, highest priority first.
+        """
+        for priority in (2, 8, 5):
+            self.service.add_task(
+                name=f"P{priority}", priority=priority, description="D"
+            )
+
+        view = self.service.open_view(top=2)
+        self.assertEqual([task.priority for task in view.tasks()], [8, 5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+"""
+Stress tests for sharing a TaskService over a FakeTaskRepository between threads.
+
+Tests:
+- test_get_many: Verifies several tasks are fetched in ID order, skipping missing ones.
+- test_mixed_operations: Verifies mixed concurrent operations keep the indexes
+  consistent and never hand a task out twice.
+- test_isolated_tasks: Verifies tasks passed in or returned share no state with the store.
+- test_opposite_moves: Verifies moves between two queues in both directions at once
+  neither deadlock nor lose tasks.
+"""
+
+import random
+import sys
+import threading
+import unittest
+from typing import List
+
+from src.entities.task import Task
+from src.repositories.fake_repository import FakeTaskRepository
+from src.services.task_service import TaskService
+
+THREADS = 8
+OPERATIONS = 300
+
+
+class TestThreadSafety(unittest.TestCase):
+    """
+    TestThreadSafety contains stress tests for concurrent use of a TaskService.
+
+    Methods:
+        setUp() -> None:
+            Sets up a TaskService over a FakeTaskRepository holding tagged tasks.
+        run_operations(seed: int) -> None:
+            Runs a random mix of reads and writes against the shared service.
+        test_get_many() -> None:
+            Verifies several tasks are fetched in ID order, skipping missing ones.
+        test_mixed_operations() -> None:
+            Verifies mixed concurrent operations keep the indexes consistent and
+            never hand a task out twice.
+        test_isolated_tasks() -> None:
+            Verifies tasks passed in or returned share no state with the store.
+        test_opposite_moves() -> None:
+            Verifies opposite moves between two queues neither deadlock nor lose tasks.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a shared service whose queue holds 200 tagged tasks.
+        """
+        self.repository = FakeTaskRepository()
+        self.service = TaskService(self.repository)
+        self.ids: List[str] = [
+            self.service.add_task(
+                f"task {index}", index % 10 + 1, "seeded", tags=[f"t{index % 3}"]
+            ).id
+            for index in range(200)
+        ]
+        self.handed_out: List[str] = []
+        self.errors: List[BaseException] = []
+        self.start = threading.Barrier(THREADS)
+
+    def run_operations(self, seed: int) -> None:
+        """
+        Run a random mix of operations, recording the tasks handed out and any error.
+        """
+        rng = random.Random(seed)
+        try:
+            self.start.wait()
+            for index in range(OPERATIONS):
+                operation = rng.randrange(10)
+                task_id = rng.choice(self.ids)
+                if operation == 0:
+                    task = self.service.add_task(
+                        f"added {seed}-{index}", rng.randint(1, 10), "new", tags=["t0"]
+                    )
+                    self.ids.append(task.id)
+                elif operation == 1:
+                    self.service.get_task(task_id)
+                    self.service.get_tasks(rng.sample(self.ids, 20))
+                elif operation == 2:
+                    self.service.get_all_tasks()
+                elif operation == 3:
+                    self.service.update_task(task_id, priority=rng.randint(1, 10))
+                elif operation == 4:
+                    self.service.delete_task(task_id)
+                elif operation == 5:
+                    claimed = self.service.claim_tasks(2)
+                    self.handed_out.extend(task.id for task in claimed)
+                    self.service.set_status(
+                        [task.id for task in claimed], rng.choice(["done", "failed"])
+                    )
+                elif operation == 6:
+                    dequeued = self.service.dequeue_tasks(2)
+                    self.handed_out.extend(task.id for task in dequeued)
+                elif operation == 7:
+                    list(self.service.iter_tasks(tags=["t0"]))
+                    list(self.service.iter_tasks_by_status("done"))
+                elif operation == 8:
+                    self.service.search("seeded", limit=5)
+                else:
+                    self.service.add_tasks(
+                        [{"name": "bulk", "priority": 3, "description": ""}] * 3
+                    )
+        except BaseException as e:
+            self.errors.append(e)
+
+    def test_get_many(self) -> None:
+        """
+        Test case for fetching several tasks by ID in one call.
+        """
+        wanted = [self.ids[5], "missing", self.ids[2], self.ids[7]]
+        tasks = self.service.get_tasks(wanted)
+        self.assertEqual([task.id for task in tasks], [wanted[0], *wanted[2:]])
+        self.assertEqual(self.service.get_tasks([]), [])
+
+    def test_mixed_operations(self) -> None:
+        """
+        Test case for many threads reading and writing the same store at once.
+        """
+        interval = sys.getswitchinterval()
+        # Switching threads as often as possible makes unguarded races show up.
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [
+                threading.Thread(target=self.run_operations, args=(seed,))
+                for seed in range(THREADS)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(60)
+        finally:
+            sys.setswitchinterval(interval)
+
+        self.assertEqual(self.errors, [])
+        self.assertEqual(len(self.handed_out), len(set(self.handed_out)))
+        repository = self.repository
+        self.assertEqual(repository.priority_index, sorted(repository.priority_index))
+        queued = sorted(
+            (task.priority + task.timestamp / 1e10, task.id)
+            for task in repository.tasks.values()
+            if task.status == Task.PENDING and task.id not in repository.delayed
+        )
+        self.assertEqual(repository.priority_index, queued)
+        for status, index in repository.status_index.items():
+            self.assertEqual(
+                set(index),
+                {
+                    task.id
+                    for task in repository.tasks.values()
+                    if task.status == status
+                },
+            )
+        self.assertEqual(
+            set(repository.task_tags),
+            {task.id for task in repository.tasks.values() if task.tags},
+        )
+
+    def test_isolated_tasks(self) -> None:
+        """
+        Test case for changing tasks on either side of the store boundary.
+        """
+        task = Task(name="Task", priority=5, description="D", tags=["a"])
+        self.repository.add(task)
+        task.tags.append("b")
+        fetched = self.service.get_task(task.id)
+        self.assertEqual(fetched.tags, ["a"])
+        fetched.priority = 9
+        fetched.tags.append("c")
+        self.assertEqual(self.service.get_task(task.id).priority, 5)
+        self.assertEqual(self.service.get_task(task.id).tags, ["a"])
+        self.assertEqual(self.repository.tag_index.get("c"), None)
+
+    def test_opposite_moves(self) -> None:
+        """
+        Test case for two threads moving tasks between the same queues both ways.
+        """
+        other = TaskService(self.repository.for_queue("other"))
+        other_ids = [other.add_task(f"other {n}", 5, "").id for n in range(200)]
+
+        def move(service: TaskService, ids: List[str], queue: str) -> None:
+            try:
+                self.start.wait()
+                for index in range(0, len(ids), 5):
+                    service.move_tasks(ids[index : index + 5], queue)
+            except BaseException as e:
+                self.errors.append(e)
+
+        self.start = threading.Barrier(2)
+        threads = [
+            threading.Thread(target=move, args=(self.service, self.ids, "other")),
+            threading.Thread(target=move, args=(other, other_ids, "default")),
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        self.assertFalse(any(thread.is_alive() for thread in threads))
+        self.assertEqual(self.errors, [])
+        self.assertEqual(set(self.repository.tasks), set(other_ids))
+        self.assertEqual(set(self.repository.for_queue("other").tasks), set(self.ids))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+"""
+Unit tests for the worker runner using a FakeTaskRepository.
+
+Tests:
+- test_load_handler: Verifies handlers are resolved from module:function specs.
+- test_burst_run: Verifies tasks run in priority order and failures are counted.
+- test_stop_requeues_prefetched: Verifies claimed but unstarted tasks are requeued.
+"""
+
+import threading
+import unittest
+
+from src.entities.task import Task
+from src.repositories.fake_repository import FakeTaskRepository
+from src.services.task_service import TaskService
+from src.services.worker import Worker, load_handler
+
+
+class TestWorker(unittest.TestCase):
+    """
+    TestWorker contains unit tests for the worker runner.
+
+    Methods:
+        setUp() -> None:
+            Sets up a TaskService over a FakeTaskRepository holding a few tasks.
+        test_load_handler() -> None:
+            Verifies handlers are resolved from module:function specs.
+        test_burst_run() -> None:
+            Verifies tasks run in priority order and failures are counted.
+        test_stop_requeues_prefetched() -> None:
+            Verifies claimed but unstarted tasks are requeued.
+    """
+
+    def setUp(self) -> None:
+        """
+        Set up a service whose queue holds tasks of priorities 1 to 5.
+        """
+        self.service = TaskService(FakeTaskRepository())
+        for priority in (3, 1, 5, 2, 4):
+            self.service.add_task(f"task {priority}", priority, "")
+
+    def test_load_handler(self) -> None:
+        """
+        Test case for resolving handler specs.
+        """
+        self.assertIs(load_handler("os.path:join"), __import__("os").path.join)
+        for spec in ("os.path", "os.path:", "os:sep", "os.path:missing"):
+            with self.assertRaises(ValueError):
+                load_handler(spec)
+
+    def test_burst_run(self) -> None:
+        """
+        Test case for running every task once, in priority order, then exiting.
+        """
+        seen = []
+
+        def handler(task: Task) -> None:
+            seen.append(task.priority)
+            if task.priority == 2:
+                raise RuntimeError("boom")
+
+        with self.assertLogs("src.services.worker", level="ERROR"):
+            stats = Worker(self.service, handler, prefetch=2).run(burst=True)
+        self.assertEqual(seen, [5, 4, 3, 2, 1])
+        self.assertEqual((stats.succeeded, stats.failed), (4, 1))
+        self.assertEqual(self.service.get_all_tasks(), [])
+
+    def test_stop_requeues_prefetched(self) -> None:
+        """
+        Test case for putting prefetched tasks back when the worker is stopped.
+        """
+        stop = threading.Event()
+        seen = []
+
+        def handler(task: Task) -> None:
+            seen.append(task.priority)
+            stop.set()
+
+        stats = Worker(self.service, handler, prefetch=4).run(stop)
+        self.assertEqual(seen, [5])
+        self.assertEqual(stats.succeeded, 1)
+        remaining = sorted(task.priority for task in self.service.get_all_tasks())
+        self.assertEqual(remaining, [1, 2, 3, 4])